@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class BacktestResult(object):
+
+    def __init__(self, weights, returns, periods_per_year=252):
+        """
+        Initializer method for the BacktestResult class.
+        :param weights: A time x symbol dataframe of the weights held over each bar.
+        :type weights: pd.DataFrame
+        :param returns: A dataframe indexed by time containing the gross_return, cost, net_return, turnover and equity
+        columns.
+        :type returns: pd.DataFrame
+        :param periods_per_year: The number of bars in a year. Used to annualize the metrics.
+        :type periods_per_year: int
+        """
+
+        self.__weights = weights
+        self.__returns = returns
+        self.__periods_per_year = periods_per_year
+
+    @property
+    def weights(self):
+        return self.__weights
+
+    @property
+    def returns(self):
+        return self.__returns
+
+    @property
+    def equity(self):
+        return self.__returns['equity']
+
+    @property
+    def metrics(self):
+        """
+        Property to get the summary metrics of the backtest.
+        :return: A dictionary containing the total return, annualized return and volatility, sharpe ratio, maximum
+        drawdown and average turnover.
+        :rtype: dict
+        """
+
+        return self.compute_metrics(self.__returns['net_return'].to_numpy(),
+                                    self.__returns['turnover'].to_numpy(),
+                                    self.__periods_per_year)
+
+    @staticmethod
+    def compute_metrics(net_returns, turnover, periods_per_year=252):
+        """
+        Method to compute the summary metrics from arrays of net returns and turnover.
+        :param net_returns: The net returns of each bar.
+        :type net_returns: np.ndarray
+        :param turnover: The turnover of each bar.
+        :type turnover: np.ndarray
+        :param periods_per_year: The number of bars in a year.
+        :type periods_per_year: int
+        :return: A dictionary containing the metrics.
+        :rtype: dict
+        """
+
+        growth = np.cumprod(1.0 + net_returns)
+        total_return = growth[-1] - 1.0 if growth.shape[0] else 0.0
+        years = net_returns.shape[0] / periods_per_year
+
+        # Annualize the return and the volatility of the returns.
+        annual_return = (1.0 + total_return) ** (1.0 / years) - 1.0 if years > 0 and total_return > -1.0 else np.nan
+        annual_volatility = np.std(net_returns, ddof=1) * np.sqrt(periods_per_year) if net_returns.shape[0] > 1 \
+            else np.nan
+        sharpe = np.mean(net_returns) / np.std(net_returns, ddof=1) * np.sqrt(periods_per_year) \
+            if net_returns.shape[0] > 1 and np.std(net_returns, ddof=1) > 0 else np.nan
+
+        # The drawdown is measured against the running peak of the equity curve.
+        drawdowns = growth / np.maximum.accumulate(np.r_[1.0, growth])[1:] - 1.0 if growth.shape[0] else np.zeros(1)
+
+        return {'total_return': total_return,
+                'annual_return': annual_return,
+                'annual_volatility': annual_volatility,
+                'sharpe': sharpe,
+                'max_drawdown': drawdowns.min(),
+                'average_turnover': np.mean(turnover) if turnover.shape[0] else 0.0}
+
+    def __repr__(self):
+        return 'BacktestResult({})'.format(', '.join('{}={:.4f}'.format(key, value)
+                                                     for key, value in self.metrics.items()))
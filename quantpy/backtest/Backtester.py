@@ -0,0 +1,266 @@
+import itertools
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from pebble import ProcessPool
+
+from quantpy.backtest.BacktestResult import BacktestResult
+
+# The shared price and return arrays a sweep worker attached to in its initializer.
+_worker_state = {}
+
+
+class Backtester(object):
+
+    def __init__(self, panel, dividends=None, splits=None, commission_bps=0.0, slippage_bps=0.0, initial_capital=1.0,
+                 price_field='close', prices_split_adjusted=True, periods_per_year=252):
+        """
+        Initializer method for the Backtester class. The backtester runs a strategy's target weights over a time x
+        symbol quote panel and accounts for the positions, PnL, transaction costs and slippage with array operations.
+        :param panel: The quote panel containing the price histories.
+        :type panel: QuotePanel
+        :param dividends: Optional. A dictionary mapping symbols to the dividends dataframe of the YahooQuoteReader
+        (amount and date columns). Dividends are paid out as cash on the first bar on or after their date.
+        :type dividends: dict
+        :param splits: Optional. A dictionary mapping symbols to the splits dataframe of the YahooQuoteReader
+        (numerator, denominator and date columns).
+        :type splits: dict
+        :param commission_bps: The commission charged on the traded value in basis points.
+        :type commission_bps: float
+        :param slippage_bps: The slippage paid on the traded value in basis points.
+        :type slippage_bps: float
+        :param initial_capital: The starting value of the portfolio.
+        :type initial_capital: float
+        :param price_field: The panel field the trades are executed at. Default is close.
+        :type price_field: str
+        :param prices_split_adjusted: Are the prices already adjusted for splits? The chart API adjusts its prices for
+        splits, so the split events are only applied to raw price histories.
+        :type prices_split_adjusted: bool
+        :param periods_per_year: The number of bars in a year. Used to annualize the metrics.
+        :type periods_per_year: int
+        """
+
+        self.__panel = panel
+        self.__price_field = price_field
+        self.__cost_rate = (commission_bps + slippage_bps) / 10000.0
+        self.__initial_capital = initial_capital
+        self.__periods_per_year = periods_per_year
+
+        # The total returns are computed once and shared by every run of the backtester.
+        self.__asset_returns = self._total_returns(panel, dividends, splits, price_field, prices_split_adjusted)
+
+    @property
+    def panel(self):
+        return self.__panel
+
+    @property
+    def asset_returns(self):
+        """
+        Property to get the total return of each symbol over each bar, including dividends and splits.
+        :return: A time x symbol dataframe of the returns.
+        :rtype: pd.DataFrame
+        """
+
+        return pd.DataFrame(self.__asset_returns, index=self.__panel.index, columns=self.__panel.symbols)
+
+    @staticmethod
+    def _total_returns(panel, dividends, splits, price_field, prices_split_adjusted):
+        """
+        Method to compute the total return of each symbol over each bar. A holder of the stock on bar t receives the
+        price change, the dividends paid on bar t and the extra shares of a split on bar t.
+        :return: A time x symbol array of the total returns. Missing prices have a return of zero.
+        :rtype: np.ndarray
+        """
+
+        prices = panel.values(price_field)
+        previous_prices = np.vstack([np.full((1, prices.shape[1]), np.nan), prices[:-1]])
+        end_values = prices.copy()
+
+        if splits and not prices_split_adjusted:
+            split_ratios = {symbol: split_dataframe.assign(ratio=split_dataframe['numerator'] /
+                                                          split_dataframe['denominator'])
+                            for symbol, split_dataframe in splits.items() if split_dataframe is not None}
+            end_values *= panel.align_events(split_ratios, 'ratio', fill_value=1.0, combine=np.multiply).to_numpy()
+
+        if dividends:
+            end_values += panel.align_events(dividends, 'amount').to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = end_values / previous_prices - 1.0
+
+        returns[~np.isfinite(returns)] = 0.0
+
+        return returns
+
+    @staticmethod
+    def _simulate(weights, asset_returns, cost_rate):
+        """
+        Method to account for the positions of a set of target weights. The weights decided on bar t are traded at the
+        end of bar t and held over bar t + 1, so a strategy can never trade on a price it has not seen yet.
+        :param weights: A time x symbol array of the target weights.
+        :type weights: np.ndarray
+        :param asset_returns: A time x symbol array of the total returns.
+        :type asset_returns: np.ndarray
+        :param cost_rate: The commission and slippage paid on each unit of turnover.
+        :type cost_rate: float
+        :return: A tuple containing the held weights, gross returns, costs, net returns and turnover.
+        :rtype: tuple
+        """
+
+        weights = np.nan_to_num(weights)
+
+        # Hold the previous bar's target weights.
+        held = np.vstack([np.zeros((1, weights.shape[1])), weights[:-1]])
+        gross = np.einsum('ij,ij->i', held, asset_returns)
+
+        # Between trades the weights drift with the returns. The turnover is the distance from the drifted weights
+        # to the new target weights.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drifted = held * (1.0 + asset_returns) / (1.0 + gross)[:, None]
+
+        drifted = np.nan_to_num(drifted)
+        turnover = np.abs(weights - drifted).sum(axis=1)
+        costs = turnover * cost_rate
+
+        return held, gross, costs, gross - costs, turnover
+
+    @staticmethod
+    def _strategy_weights(strategy, prices, params):
+        """
+        Method to run a strategy and get its target weights as an array.
+        :param strategy: A function taking a time x symbol dataframe of prices and keyword parameters and returning
+        a time x symbol dataframe (or array) of target weights.
+        :type strategy: callable
+        :param prices: The time x symbol dataframe of prices.
+        :type prices: pd.DataFrame
+        :param params: The keyword parameters of the strategy.
+        :type params: dict
+        :return: The target weights.
+        :rtype: np.ndarray
+        """
+
+        weights = strategy(prices, **params)
+
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.reindex(index=prices.index, columns=prices.columns).to_numpy(dtype=np.float64)
+
+        weights = np.asarray(weights, dtype=np.float64)
+
+        if weights.shape != prices.shape:
+            raise ValueError('Strategy weights have shape {}, expected {}.'.format(weights.shape, prices.shape))
+
+        return weights
+
+    def run(self, strategy, **params):
+        """
+        Method to backtest a strategy.
+        :param strategy: A function taking a time x symbol dataframe of prices and keyword parameters and returning
+        a time x symbol dataframe (or array) of target weights.
+        :type strategy: callable
+        :param params: The keyword parameters passed to the strategy.
+        :return: The result of the backtest.
+        :rtype: BacktestResult
+        """
+
+        prices = self.__panel[self.__price_field]
+        weights = self._strategy_weights(strategy, prices, params)
+
+        held, gross, costs, net, turnover = self._simulate(weights, self.__asset_returns, self.__cost_rate)
+
+        returns = pd.DataFrame({'gross_return': gross, 'cost': costs, 'net_return': net, 'turnover': turnover,
+                                'equity': self.__initial_capital * np.cumprod(1.0 + net)},
+                               index=prices.index)
+
+        return BacktestResult(pd.DataFrame(held, index=prices.index, columns=prices.columns), returns,
+                              self.__periods_per_year)
+
+    def sweep(self, strategy, param_grid, max_workers=None):
+        """
+        Method to backtest a strategy over many parameter sets in parallel. The prices and returns are copied once into
+        shared memory which every worker process attaches to, so they are never pickled per parameter set.
+        :param strategy: A module level function taking a time x symbol dataframe of prices and keyword parameters and
+        returning the target weights.
+        :type strategy: callable
+        :param param_grid: Either a dictionary mapping parameter names to lists of values (every combination is run) or
+        a list of parameter dictionaries.
+        :type param_grid: Union[dict, list]
+        :param max_workers: The number of worker processes. Default is the number of cores.
+        :type max_workers: int
+        :return: A dataframe with one row per parameter set containing the parameters and the metrics.
+        :rtype: pd.DataFrame
+        """
+
+        if isinstance(param_grid, dict):
+            names = list(param_grid.keys())
+            param_sets = [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+        else:
+            param_sets = list(param_grid)
+
+        prices = self.__panel.values(self.__price_field)
+        blocks = [self._share_array(prices), self._share_array(self.__asset_returns)]
+
+        try:
+            initargs = ([(block.name, array.shape) for block, array in zip(blocks, [prices, self.__asset_returns])],
+                        self.__panel.index, self.__panel.symbols, strategy, self.__cost_rate, self.__periods_per_year)
+
+            with ProcessPool(max_workers or multiprocessing.cpu_count(), initializer=_attach_worker,
+                             initargs=initargs) as pool:
+                # The .map method completes the parameter sets asynchronously but returns them in order.
+                results = list(pool.map(_sweep_worker, param_sets).result())
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return pd.DataFrame([{**params, **metrics} for params, metrics in zip(param_sets, results)])
+
+    @staticmethod
+    def _share_array(array):
+        """
+        Method to copy an array into a new shared memory block.
+        :param array: The float64 array to share.
+        :type array: np.ndarray
+        :return: The shared memory block.
+        :rtype: shared_memory.SharedMemory
+        """
+
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=np.float64, buffer=block.buf)[:] = array
+
+        return block
+
+
+def _attach_worker(blocks, index, symbols, strategy, cost_rate, periods_per_year):
+    """
+    Initializer of the sweep worker processes. Attaches to the shared price and return arrays.
+    """
+
+    arrays = []
+
+    for name, shape in blocks:
+        block = shared_memory.SharedMemory(name=name)
+        arrays.append(np.ndarray(shape, dtype=np.float64, buffer=block.buf))
+
+        # Keep the block referenced for as long as the worker lives.
+        _worker_state.setdefault('blocks', []).append(block)
+
+    _worker_state['prices'] = pd.DataFrame(arrays[0], index=index, columns=symbols, copy=False)
+    _worker_state['asset_returns'] = arrays[1]
+    _worker_state['strategy'] = strategy
+    _worker_state['cost_rate'] = cost_rate
+    _worker_state['periods_per_year'] = periods_per_year
+
+
+def _sweep_worker(params):
+    """
+    Function to backtest one parameter set inside a sweep worker process.
+    :return: The metrics of the backtest.
+    :rtype: dict
+    """
+
+    weights = Backtester._strategy_weights(_worker_state['strategy'], _worker_state['prices'], params)
+    _, _, _, net, turnover = Backtester._simulate(weights, _worker_state['asset_returns'], _worker_state['cost_rate'])
+
+    return BacktestResult.compute_metrics(net, turnover, _worker_state['periods_per_year'])
@@ -0,0 +1,84 @@
+import datetime
+import warnings
+import pandas as pd
+from dateutil.relativedelta import MO, TH
+from pandas.tseries.holiday import AbstractHolidayCalendar, Holiday, GoodFriday, USLaborDay, USMemorialDay, \
+    USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+from pandas.tseries.offsets import DateOffset, Day
+
+
+class NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """
+    The full day holidays of the New York Stock Exchange. New Year's Day falling on a Saturday is not observed on the
+    Friday before, unlike the federal holiday.
+    """
+
+    rules = [
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        Holiday('Martin Luther King Jr. Day', month=1, day=1, start_date=datetime.datetime(1998, 1, 1),
+                offset=DateOffset(weekday=MO(3))),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date=datetime.datetime(2022, 1, 1), observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas Day', month=12, day=25, observance=nearest_workday),
+    ]
+
+    # The days the exchange closed for unscheduled events and national days of mourning.
+    SPECIAL_CLOSURES = ['1994-04-27', '2001-09-11', '2001-09-12', '2001-09-13', '2001-09-14', '2004-06-11',
+                        '2007-01-02', '2012-10-29', '2012-10-30', '2018-12-05', '2025-01-09']
+
+    # The early close rules: the days around Independence Day, the day after Thanksgiving and Christmas Eve. The eves
+    # only close early on Monday through Thursday, since a Friday eve is the observed holiday itself. Until 2012 a
+    # Wednesday July 3 was a full session and a Friday July 5 closed early instead. There are no early closes around
+    # Independence Day before 1995.
+    EARLY_CLOSE_RULES = [
+        Holiday('Day Before Independence Day', month=7, day=3, start_date=datetime.datetime(1995, 1, 1),
+                days_of_week=(0, 1, 3)),
+        Holiday('Wednesday Before Independence Day', month=7, day=3, start_date=datetime.datetime(2013, 1, 1),
+                days_of_week=(2,)),
+        Holiday('Friday After Independence Day', month=7, day=5, start_date=datetime.datetime(1996, 1, 1),
+                end_date=datetime.datetime(2012, 12, 31), days_of_week=(4,)),
+        Holiday('Day After Thanksgiving', month=11, day=1, offset=[DateOffset(weekday=TH(4)), Day(1)]),
+        Holiday('Christmas Eve', month=12, day=24, days_of_week=(0, 1, 2, 3)),
+    ]
+
+    # The local time of the early closes.
+    EARLY_CLOSE_TIME = datetime.time(13, 0)
+
+    def sessions_closed(self, start, end):
+        """
+        Method to get every weekday the exchange was closed.
+        :param start: The first date.
+        :param end: The last date.
+        :return: The sorted closed dates.
+        :rtype: pd.DatetimeIndex
+        """
+
+        special = pd.DatetimeIndex(self.SPECIAL_CLOSURES)
+        special = special[(special >= pd.Timestamp(start)) & (special <= pd.Timestamp(end))]
+
+        return self.holidays(start, end).union(special)
+
+    def early_closes(self, start, end):
+        """
+        Method to get the days the exchange closed early.
+        :param start: The first date.
+        :param end: The last date.
+        :return: The sorted early close dates.
+        :rtype: pd.DatetimeIndex
+        """
+
+        dates = pd.DatetimeIndex([])
+
+        # The offsets of the day after Thanksgiving are applied date by date, which pandas warns about.
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', pd.errors.PerformanceWarning)
+
+            for rule in self.EARLY_CLOSE_RULES:
+                dates = dates.union(rule.dates(start, end))
+
+        return dates.difference(self.sessions_closed(start, end))
@@ -0,0 +1,369 @@
+import functools
+import re
+import numpy as np
+import pandas as pd
+from quantpy.calendars.NYSEHolidayCalendar import NYSEHolidayCalendar
+
+
+class TradingCalendar(object):
+
+    # The length of a bar in seconds for each intraday interval.
+    INTRADAY_SECONDS = {'1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800, '60m': 3600, '90m': 5400, '1h': 3600}
+
+    # The periods accepted by the Yahoo Finance chart endpoint.
+    _PERIOD_PATTERN = re.compile(r'^(\d+)(d|wk|mo|y)$')
+
+    def __init__(self, name, timezone, open_time, close_time, start, end, closed_dates=(), early_closes=None,
+                 weekmask='Mon Tue Wed Thu Fri'):
+        """
+        Initializer method for the TradingCalendar class. The sessions of the exchange between start and end are
+        precomputed into sorted arrays of dates and of the unix open and close times, so every query is a binary search
+        or a vectorized operation over them.
+        :param name: The name of the calendar.
+        :type name: str
+        :param timezone: The timezone of the exchange, e.g. America/New_York.
+        :type timezone: str
+        :param open_time: The local open time, e.g. 09:30.
+        :type open_time: str
+        :param close_time: The local close time, e.g. 16:00.
+        :type close_time: str
+        :param start: The first date of the calendar.
+        :type start: str, date, Timestamp
+        :param end: The last date of the calendar.
+        :type end: str, date, Timestamp
+        :param closed_dates: The weekdays the exchange is closed, e.g. holidays.
+        :type closed_dates: list
+        :param early_closes: Optional. A dictionary mapping dates to their local early close times.
+        :type early_closes: dict
+        :param weekmask: The days of the week the exchange trades.
+        :type weekmask: str
+        """
+
+        self.__name = name
+        self.__timezone = timezone
+        self.__start = pd.Timestamp(start).normalize()
+        self.__end = pd.Timestamp(end).normalize()
+
+        holidays = pd.DatetimeIndex(closed_dates).normalize().to_numpy(dtype='datetime64[D]')
+        self.__sessions = np.arange(self.__start.to_datetime64().astype('datetime64[D]'),
+                                    self.__end.to_datetime64().astype('datetime64[D]') + 1)
+        self.__sessions = self.__sessions[np.is_busday(self.__sessions, weekmask=weekmask, holidays=holidays)]
+
+        # The local open and close times of every session, converted to unix seconds once.
+        local_dates = pd.DatetimeIndex(self.__sessions)
+        open_offset = pd.Timedelta(open_time + ':00')
+        close_offsets = pd.Series(pd.Timedelta(close_time + ':00'), index=local_dates)
+
+        for date, early_close in (early_closes or {}).items():
+            date = pd.Timestamp(date).normalize()
+
+            if date in close_offsets.index:
+                close_offsets[date] = pd.Timedelta(str(early_close))
+
+        self.__opens = self._unix(local_dates + open_offset)
+        self.__closes = self._unix(local_dates + pd.TimedeltaIndex(close_offsets.to_numpy()))
+        self.__early = self.__closes - self.__opens < (pd.Timedelta(close_time + ':00') -
+                                                       open_offset).total_seconds()
+
+    def _unix(self, local_times):
+        # Localize to the exchange timezone, which accounts for daylight saving time, then convert to unix seconds.
+        utc = local_times.tz_localize(self.__timezone).tz_convert(None)
+
+        return utc.to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def nyse(cls, start='1990-01-01', end='2040-12-31'):
+        """
+        Method to get the calendar of the New York Stock Exchange. Calendars are cached, so every caller shares the
+        precomputed arrays.
+        :rtype: TradingCalendar
+        """
+
+        holidays = NYSEHolidayCalendar()
+        early_closes = {date: holidays.EARLY_CLOSE_TIME for date in holidays.early_closes(start, end)}
+
+        return cls('NYSE', 'America/New_York', '09:30', '16:00', start, end, holidays.sessions_closed(start, end),
+                   early_closes)
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def timezone(self):
+        return self.__timezone
+
+    @property
+    def sessions(self):
+        """
+        Property to get the session dates.
+        :rtype: np.ndarray of datetime64[D]
+        """
+
+        return self.__sessions
+
+    @property
+    def opens(self):
+        """
+        Property to get the unix open time of every session.
+        :rtype: np.ndarray of int64
+        """
+
+        return self.__opens
+
+    @property
+    def closes(self):
+        """
+        Property to get the unix close time of every session.
+        :rtype: np.ndarray of int64
+        """
+
+        return self.__closes
+
+    @property
+    def early_closes(self):
+        return self.__sessions[self.__early]
+
+    def _dates(self, dates):
+        # Any dates, timestamps or strings become datetime64[D] dates.
+        return pd.DatetimeIndex(np.atleast_1d(dates)).tz_localize(None).to_numpy(dtype='datetime64[D]')
+
+    def _check_range(self, dates):
+        if len(dates) and (dates.min() < self.__sessions[0] or dates.max() > self.__sessions[-1]):
+            raise ValueError('Dates outside of the {} calendar ({} to {}).'.format(
+                self.__name, self.__sessions[0], self.__sessions[-1]))
+
+    def is_session(self, dates):
+        """
+        Method to check which dates are sessions.
+        :param dates: The dates.
+        :return: A boolean array.
+        :rtype: np.ndarray
+        """
+
+        dates = self._dates(dates)
+        positions = np.searchsorted(self.__sessions, dates)
+
+        return (positions < len(self.__sessions)) & \
+            (self.__sessions[np.minimum(positions, len(self.__sessions) - 1)] == dates)
+
+    def is_open(self, unix_times):
+        """
+        Method to check whether the exchange is open at unix times.
+        :param unix_times: The unix times in seconds.
+        :return: A boolean array.
+        :rtype: np.ndarray
+        """
+
+        unix_times = np.atleast_1d(np.asarray(unix_times, dtype=np.int64))
+
+        # The last session opened at or before each time, if it has not closed yet.
+        positions = np.searchsorted(self.__opens, unix_times, side='right') - 1
+        valid = positions >= 0
+
+        return valid & (unix_times < self.__closes[np.maximum(positions, 0)])
+
+    def sessions_in_range(self, start, end):
+        """
+        Method to get the sessions between two dates, both included.
+        :rtype: np.ndarray of datetime64[D]
+        """
+
+        start, end = self._dates([start, end])
+
+        return self.__sessions[np.searchsorted(self.__sessions, start):np.searchsorted(self.__sessions, end, 'right')]
+
+    def session_offset(self, dates, sessions):
+        """
+        Method to move dates by a number of sessions. A date that is not a session first rolls forward to the next
+        session for positive offsets and back to the previous session otherwise.
+        :param dates: The dates.
+        :param sessions: The number of sessions to move, one for every date or one for all.
+        :return: The moved dates.
+        :rtype: np.ndarray of datetime64[D]
+        """
+
+        dates = self._dates(dates)
+        self._check_range(dates)
+        sessions = np.broadcast_to(np.asarray(sessions, dtype=np.int64), dates.shape)
+
+        forward = np.searchsorted(self.__sessions, dates, side='left')
+        backward = np.searchsorted(self.__sessions, dates, side='right') - 1
+
+        # On a session both positions are the same. Otherwise rolling to it counts as the first step.
+        is_session = forward == backward
+        positions = np.where(sessions > 0, forward + sessions - 1 + is_session,
+                             backward + sessions + ~is_session * (sessions < 0))
+
+        if positions.min() < 0 or positions.max() >= len(self.__sessions):
+            raise ValueError('Offset moves outside of the {} calendar.'.format(self.__name))
+
+        return self.__sessions[positions]
+
+    def session_count(self, start, end):
+        """
+        Method to count the sessions between dates, both included.
+        :param start: The start dates.
+        :param end: The end dates.
+        :return: The number of sessions between each pair of dates.
+        :rtype: np.ndarray
+        """
+
+        start = self._dates(start)
+        end = self._dates(end)
+
+        return np.maximum(np.searchsorted(self.__sessions, end, side='right') -
+                          np.searchsorted(self.__sessions, start, side='left'), 0)
+
+    def session_dates(self, unix_times):
+        """
+        Method to get the local exchange date of unix times.
+        :rtype: np.ndarray of datetime64[D]
+        """
+
+        local = pd.to_datetime(np.atleast_1d(np.asarray(unix_times, dtype=np.int64)), unit='s', utc=True)
+        local = local.tz_convert(self.__timezone)
+
+        return local.tz_localize(None).to_numpy(dtype='datetime64[D]')
+
+    def period_start(self, end, period):
+        """
+        Method to find the start of a period ending at a unix time. Day periods count sessions, e.g. 5d starts at the
+        open of the fifth last session, while week, month and year periods are calendar offsets, and ytd starts on the
+        first session of the year.
+        :param end: The unix end time.
+        :type end: int
+        :param period: The period, e.g. 1d, 5d, 1mo, 6mo, 1y, ytd.
+        :type period: str
+        :return: The unix start time.
+        :rtype: int
+        """
+
+        if period == 'ytd':
+            year_start = np.datetime64('{}-01-01'.format(self.session_dates(end)[0].astype(object).year))
+            return int(self.__opens[np.searchsorted(self.__sessions, year_start)])
+
+        count, unit = self._parse_period(period)
+
+        if unit == 'd':
+            # The sessions that had opened by the end time.
+            position = np.searchsorted(self.__opens, end, side='right') - 1 - (count - 1)
+
+            if position < 0:
+                raise ValueError('Period starts before the {} calendar.'.format(self.__name))
+
+            return int(self.__opens[position])
+
+        local_end = pd.Timestamp(end, unit='s', tz='UTC').tz_convert(self.__timezone)
+
+        return int((local_end - self._offset(count, unit)).timestamp())
+
+    def period_end(self, start, period):
+        """
+        Method to find the end of a period starting at a unix time, see period_start.
+        :param start: The unix start time.
+        :type start: int
+        :param period: The period, e.g. 1d, 5d, 1mo, 6mo, 1y, ytd.
+        :type period: str
+        :return: The unix end time.
+        :rtype: int
+        """
+
+        if period == 'ytd':
+            year_end = np.datetime64('{}-12-31'.format(self.session_dates(start)[0].astype(object).year))
+            return int(self.__closes[np.searchsorted(self.__sessions, year_end, side='right') - 1])
+
+        count, unit = self._parse_period(period)
+
+        if unit == 'd':
+            # The sessions that had not closed by the start time.
+            position = np.searchsorted(self.__closes, start, side='right') + (count - 1)
+
+            if position >= len(self.__sessions):
+                raise ValueError('Period ends after the {} calendar.'.format(self.__name))
+
+            return int(self.__closes[position])
+
+        local_start = pd.Timestamp(start, unit='s', tz='UTC').tz_convert(self.__timezone)
+
+        return int((local_start + self._offset(count, unit)).timestamp())
+
+    def _parse_period(self, period):
+        match = self._PERIOD_PATTERN.match(str(period))
+
+        if match is None:
+            raise ValueError('Period not properly defined.')
+
+        return int(match.group(1)), match.group(2)
+
+    @staticmethod
+    def _offset(count, unit):
+        if unit == 'wk':
+            return pd.DateOffset(weeks=count)
+        elif unit == 'mo':
+            return pd.DateOffset(months=count)
+
+        return pd.DateOffset(years=count)
+
+    def bar_times(self, start, end, interval):
+        """
+        Method to get the unix open time of every regular session bar between two unix times.
+        :param start: The unix start time.
+        :type start: int
+        :param end: The unix end time, excluded.
+        :type end: int
+        :param interval: The interval, e.g. 1m, 5m or 1d. Daily bars open at the session open.
+        :type interval: str
+        :return: The sorted bar times.
+        :rtype: np.ndarray of int64
+        """
+
+        first = np.searchsorted(self.__closes, start, side='right')
+        last = np.searchsorted(self.__opens, end, side='left')
+        opens = self.__opens[first:last]
+        closes = self.__closes[first:last]
+
+        if interval == '1d':
+            bars = opens
+        elif interval in self.INTRADAY_SECONDS:
+            step = self.INTRADAY_SECONDS[interval]
+
+            # Lay the bars of every session out in one array: each bar is its session's open plus a multiple of the
+            # step, with the multiple restarting at 0 for every session.
+            counts = -(-(closes - opens) // step)
+            session_starts = np.repeat(np.cumsum(counts) - counts, counts)
+            bars = np.repeat(opens, counts) + (np.arange(counts.sum()) - session_starts) * step
+        else:
+            raise ValueError('Bars are only defined for 1d and intraday intervals.')
+
+        return bars[(bars >= start) & (bars < end)]
+
+    def missing_bars(self, unix_times, interval, start=None, end=None):
+        """
+        Method to find the regular session bars missing from a series of bar times.
+        :param unix_times: The unix times of the bars present.
+        :param interval: The interval of the bars, e.g. 1m or 1d.
+        :type interval: str
+        :param start: Optional. The unix start time. Default is the first bar present.
+        :type start: int
+        :param end: Optional. The unix end time, excluded. Default is after the last bar present.
+        :type end: int
+        :return: The unix times of the missing bars. Daily bars are compared by session date, since the daily bars of
+        Yahoo Finance are not always stamped with the open time.
+        :rtype: np.ndarray of int64
+        """
+
+        unix_times = np.asarray(unix_times, dtype=np.int64)
+
+        if start is None and not len(unix_times):
+            return np.array([], dtype=np.int64)
+
+        start = int(unix_times.min()) if start is None else int(start)
+        end = int(unix_times.max()) + 1 if end is None else int(end)
+        expected = self.bar_times(start, end, interval)
+
+        if interval == '1d':
+            return expected[~np.isin(self.session_dates(expected), self.session_dates(unix_times))]
+
+        return expected[~np.isin(expected, unix_times)]
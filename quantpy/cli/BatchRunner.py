@@ -0,0 +1,270 @@
+import concurrent.futures
+import json
+import os
+import re
+import sys
+import time
+import warnings
+import requests
+from pebble import ThreadPool
+from quantpy.data.base.CachedSession import CachedSession
+from quantpy.data.base.RateLimiter import RateLimiter
+from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+
+
+class BatchRunner(object):
+
+    # The file extension of each output format.
+    FORMATS = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+    # The name of the checkpoint file in the output directory.
+    CHECKPOINT_FILE = '_checkpoint.json'
+
+    def __init__(self, symbols, output_dir, kind='quotes', modules=None, quote_options=None, output_format='csv',
+                 workers=8, rate_limit=None, cache_dir=None, cache_ttl=86400, resume=False, timeout=5,
+                 progress=sys.stderr, progress_interval=1.0, checkpoint_every=100, session=None):
+        """
+        Initializer method for the BatchRunner class. The runner reads a universe of symbols and writes every table of
+        every symbol to its own file, e.g. <output_dir>/quote/AAPL.csv. Completed symbols are recorded in a checkpoint
+        so an interrupted run can be resumed.
+        :param symbols: The symbols to read.
+        :type symbols: list
+        :param output_dir: The directory of the output files and the checkpoint.
+        :type output_dir: str
+        :param kind: Read quotes or summary modules.
+        :type kind: str
+        :param modules: The summary modules to read, e.g. ['financial_data', 'earnings']. Only used for summaries.
+        :type modules: list
+        :param quote_options: The keyword arguments of YahooQuoteReader, e.g. {'period': '1y', 'events': True}.
+        :type quote_options: dict
+        :param output_format: The output format: csv, parquet or arrow.
+        :type output_format: str
+        :param workers: The number of symbols read at once.
+        :type workers: int
+        :param rate_limit: Optional. The maximum number of requests per second.
+        :type rate_limit: float
+        :param cache_dir: Optional. A directory caching the responses, see CachedSession.
+        :type cache_dir: str
+        :param cache_ttl: The number of seconds a cached response is used.
+        :type cache_ttl: float
+        :param resume: Skip the symbols completed by a previous run with the same output directory?
+        :type resume: bool
+        :param timeout: The amount of time until a request times out.
+        :type timeout: float
+        :param progress: The stream progress is written to. None disables the progress.
+        :param progress_interval: The number of seconds between two progress updates.
+        :type progress_interval: float
+        :param checkpoint_every: The number of completed symbols between two checkpoint writes.
+        :type checkpoint_every: int
+        :param session: Optional. The session used for the requests, which is left open. Default is a new session,
+        cached when a cache directory is given.
+        :type session: requests.Session
+        """
+
+        if kind not in ('quotes', 'summary'):
+            raise ValueError('Kind must be quotes or summary.')
+
+        if output_format not in self.FORMATS:
+            raise ValueError('Output format must be one of {}.'.format(', '.join(self.FORMATS)))
+
+        modules = list(modules or [])
+        unknown = [module for module in modules if module not in YahooSummaryReader.MODULE_PROPERTIES]
+
+        if kind == 'summary' and not modules:
+            raise ValueError('No summary modules chosen.')
+        if unknown:
+            raise ValueError('Unknown modules {}.'.format(', '.join(unknown)))
+
+        self.__symbols = list(dict.fromkeys(symbols))
+        self.__output_dir = output_dir
+        self.__kind = kind
+        self.__modules = modules
+        self.__quote_options = dict(quote_options or {})
+        self.__output_format = output_format
+        self.__workers = workers
+        self.__rate_limiter = RateLimiter(rate_limit)
+        self.__cache_dir = cache_dir
+        self.__cache_ttl = cache_ttl
+        self.__resume = resume
+        self.__timeout = timeout
+        self.__progress = progress
+        self.__progress_interval = progress_interval
+        self.__checkpoint_every = checkpoint_every
+        self.__session = session
+
+        self._check_format()
+
+    def _check_format(self):
+        # Parquet and Arrow files are written through pyarrow, which is optional.
+        if self.__output_format in ('parquet', 'arrow'):
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError('The {} output format needs pyarrow to be installed.'.format(self.__output_format))
+
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.__output_dir, self.CHECKPOINT_FILE)
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path) as checkpoint_file:
+                return set(json.load(checkpoint_file).get('completed', []))
+        except (OSError, ValueError):
+            return set()
+
+    def _save_checkpoint(self, completed, failed):
+        # Write to a temporary file first so an interrupted write never corrupts the checkpoint.
+        temporary_path = self.checkpoint_path + '.tmp'
+
+        with open(temporary_path, 'w') as checkpoint_file:
+            json.dump({'completed': sorted(completed), 'failed': failed}, checkpoint_file)
+
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _reader(self, symbol):
+        if self.__kind == 'quotes':
+            return YahooQuoteReader(symbol, timeout=self.__timeout, **self.__quote_options)
+
+        include = {'include_' + module: True for module in self.__modules}
+
+        return YahooSummaryReader(symbol, timeout=self.__timeout, **include)
+
+    def _properties(self):
+        if self.__kind == 'quotes':
+            return ['quote', 'dividends', 'splits'] if self.__quote_options.get('events') else ['quote']
+
+        return [prop for module in self.__modules for prop in YahooSummaryReader.MODULE_PROPERTIES[module]]
+
+    def _process(self, symbol, session):
+        """
+        Method to read one symbol and write its tables.
+        :return: A tuple of the symbol and the status of the read, or None if it succeeded.
+        :rtype: tuple
+        """
+
+        # A cached session acquires the rate limiter itself, and only for the requests that miss the cache.
+        if not isinstance(session, CachedSession):
+            self.__rate_limiter.acquire()
+
+        response = self._reader(symbol).single_read(symbol, session)
+
+        if response.status is not None and not response.status.ok:
+            return symbol, response.status
+
+        for prop in self._properties():
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    table = getattr(response, prop)
+            except Exception:
+                # A missing module is not a failure of the symbol, it is just not written.
+                continue
+
+            if table is not None and not table.empty:
+                self._write(table, prop, symbol)
+
+        return symbol, None
+
+    def _write(self, table, name, symbol):
+        directory = os.path.join(self.__output_dir, name)
+        os.makedirs(directory, exist_ok=True)
+
+        # Keep the symbol readable in the file name, replacing the characters a file system might not accept.
+        file_name = '{}.{}'.format(re.sub(r'[^A-Za-z0-9._^=-]', '_', symbol), self.FORMATS[self.__output_format])
+        path = os.path.join(directory, file_name)
+
+        if self.__output_format == 'csv':
+            table.to_csv(path, index=False)
+        elif self.__output_format == 'parquet':
+            table.to_parquet(path, index=False)
+        else:
+            table.reset_index(drop=True).to_feather(path)
+
+    def run(self):
+        """
+        Method to read every symbol.
+        :return: A dictionary with the number of symbols completed, skipped, the failed symbols mapped to their
+        statuses and the number of seconds the run took.
+        :rtype: dict
+        """
+
+        os.makedirs(self.__output_dir, exist_ok=True)
+
+        completed = self._load_checkpoint() if self.__resume else set()
+        pending = [symbol for symbol in self.__symbols if symbol not in completed]
+        skipped = len(self.__symbols) - len(pending)
+        failed = {}
+
+        if self.__session is not None:
+            session = self.__session
+        elif self.__cache_dir:
+            session = CachedSession(self.__cache_dir, self.__cache_ttl, self.__rate_limiter)
+        else:
+            session = requests.Session()
+
+        start = time.monotonic()
+        last_progress = 0.0
+        done = 0
+
+        try:
+            with ThreadPool(self.__workers) as pool:
+                futures = {pool.schedule(self._process, args=[symbol, session]): symbol for symbol in pending}
+
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        done += 1
+
+                        # An error writing the tables fails the symbol, not the run.
+                        try:
+                            symbol, status = future.result()
+                        except Exception as e:
+                            symbol, status = futures[future], e
+
+                        if status is None:
+                            completed.add(symbol)
+                        else:
+                            failed[symbol] = status
+
+                        if done % self.__checkpoint_every == 0:
+                            self._save_checkpoint(completed, self._failed_dict(failed))
+
+                        if time.monotonic() - last_progress >= self.__progress_interval:
+                            last_progress = time.monotonic()
+                            self._report_progress(done, len(pending), len(failed), last_progress - start)
+
+                except BaseException:
+                    # Leaving the pool waits for its workers, so the pending symbols are dropped first and only the
+                    # reads in flight are waited for.
+                    for future in futures:
+                        future.cancel()
+                    pool.stop()
+                    raise
+
+        finally:
+            # Checkpoint whatever finished, even when interrupted.
+            self._save_checkpoint(completed, self._failed_dict(failed))
+
+            if session is not self.__session:
+                session.close()
+
+        seconds = time.monotonic() - start
+        self._report_progress(done, len(pending), len(failed), seconds, final=True)
+
+        return {'completed': done - len(failed), 'skipped': skipped, 'failed': failed, 'seconds': seconds}
+
+    @staticmethod
+    def _failed_dict(failed):
+        return {symbol: str(status) for symbol, status in failed.items()}
+
+    def _report_progress(self, done, total, failed_count, seconds, final=False):
+        if self.__progress is None:
+            return
+
+        rate = done / seconds if seconds > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else 0.0
+
+        self.__progress.write('\r{}/{} symbols  {:.1f} symbols/s  {} failed  eta {:.0f}s'.format(
+            done, total, rate, failed_count, eta) + ('\n' if final else ''))
+        self.__progress.flush()
@@ -2,7 +2,11 @@ import abc
 import requests
 import multiprocessing
 import itertools
+import time
+import pandas as pd
 from pebble import ProcessPool
+from quantpy.data.base.ReadPipeline import ReadPipeline
+from quantpy.data.base.ReaderHook import ReaderHook, ReadRecord, TimedResponse
 
 
 class BaseReader(object):
@@ -20,7 +24,7 @@ class BaseReader(object):
         if isinstance(symbols, str):
             self._symbols = symbols.split(' ')
         else:
-            self._symbols = [symbols]
+            self._symbols = list(symbols)
 
         self._timeout = timeout
         self._read_called = False
@@ -96,15 +100,129 @@ class BaseReader(object):
 
         return symbol_data
 
-    def multi_read(self):
+    @staticmethod
+    def status_report(symbol_data):
+        """
+        Function to collect every error of a read into one table. Failed reads and modules that failed to parse each
+        get a row, so the report stays small no matter how many symbols succeeded.
+        :param symbol_data: The result of read, either a response or a dictionary mapping symbols to responses.
+        :return: A dataframe with the symbol, module, code, http_status, retryable and message columns.
+        :rtype: pd.DataFrame
+        """
+
+        responses = symbol_data.values() if isinstance(symbol_data, dict) else [symbol_data]
+        rows = [status.to_tuple() for response in responses if response is not None
+                for status in BaseReader._error_statuses(response)]
+
+        return pd.DataFrame.from_records(rows, columns=['symbol', 'module', 'code', 'http_status', 'retryable',
+                                                        'message'])
+
+    @staticmethod
+    def retryable_symbols(symbol_data):
+        """
+        Function to get the symbols whose read failed with an error that could go away when read again.
+        :param symbol_data: The result of read, either a response or a dictionary mapping symbols to responses.
+        :return: The list of symbols to retry.
+        :rtype: list
+        """
+
+        responses = symbol_data.values() if isinstance(symbol_data, dict) else [symbol_data]
+        statuses = [BaseReader._response_status(response) for response in responses]
+
+        return [status.symbol for status in statuses if status is not None and status.retryable]
+
+    @staticmethod
+    def _response_status(symbol_data):
+        """
+        Function to get the status of the read of a parsed response.
+        :param symbol_data: A response, or a tuple of a value and its status, as parsed by the snapshot and options
+        readers.
+        :return: The status, or None.
+        :rtype: YahooReadStatus
+        """
+
+        if isinstance(symbol_data, tuple) and len(symbol_data) == 2:
+            return symbol_data[1]
+
+        return getattr(symbol_data, 'status', None)
+
+    @staticmethod
+    def _error_statuses(symbol_data):
+        # A response reports its failed modules too, a (value, status) tuple only the status of its read.
+        if not isinstance(symbol_data, tuple):
+            return symbol_data._error_statuses()
+
+        status = BaseReader._response_status(symbol_data)
+
+        return [status] if status is not None and not status.ok else []
+
+    @property
+    def _stream_response(self):
+        """
+        Property to get whether the response bodies are parsed as they download, instead of being read whole first.
+        Readers with a streaming parser override it.
+        :rtype: bool
+        """
+
+        return False
+
+    @property
+    def _endpoint(self):
+        """
+        Property to get the name of the API endpoint, e.g. chart or quoteSummary. Used to label the read metrics.
+        :return: The name of the endpoint.
+        :rtype: str
+        """
+
+        return self._url.rstrip('/{}').rsplit('/', 1)[-1]
+
+    def _symbol_url(self, symbol):
+        """
+        Function to get the request url of a symbol. Readers whose symbols need encoding override it.
+        :param symbol: The symbol being requested.
+        :type symbol: str
+        :return: The url.
+        :rtype: str
+        """
+
+        return self._url.format(symbol)
+
+    def multi_read(self, symbols=None):
+        """
+        Function to read many symbols in parallel.
+        :param symbols: Optional. The symbols to read. Default is the reader's symbols.
+        :type symbols: list
+        :return: A dictionary mapping the symbols to their responses.
+        :rtype: dict
+        """
+
+        symbols = self._symbols if symbols is None else symbols
         symbol_json_dict = {}
+
+        # Only the symbols that are not cached are read. The cache lives in this process, so the results are cached
+        # here rather than in the workers.
+        for symbol in symbols:
+            cached = self._cache_lookup(symbol)
+
+            if cached is not None:
+                symbol_json_dict[symbol] = cached
+
+        symbols = [symbol for symbol in symbols if symbol not in symbol_json_dict]
+
+        if not symbols:
+            return symbol_json_dict
+
         session = requests.Session()
 
+        # Decide in this process whether the reads are instrumented. The records are sent back with the results and
+        # handed to the hooks here, since hooks registered in a worker process would never be seen.
+        instrumented = ReaderHook.enabled()
+
         with ProcessPool(multiprocessing.cpu_count()) as pool:
             # Gets a ProcessMapFuture object using the ProcessPool's .map method.
             # The .map method completes the processes asynchronously.
             results = pool.map(self.single_read_wrapper,
-                               zip(self._symbols, itertools.repeat(session)))
+                               zip(symbols, itertools.repeat(session), itertools.repeat(instrumented)))
 
             # Gets an iterator from the ProcessPool's .map method result.
             results_interator = results.result()
@@ -114,10 +232,14 @@ class BaseReader(object):
             while True:
                 try:
                     # Gets the next value in the iterator.
-                    symbol_data = next(results_interator)
+                    symbol, symbol_data, record = next(results_interator)
+
+                    # Maps the symbol to its response.
+                    symbol_json_dict[symbol] = symbol_data
+                    self._cache_store(symbol, symbol_data)
 
-                    # Appends it to the symbol tuple list.
-                    symbol_json_dict.update(symbol_data[0])
+                    if record is not None:
+                        ReaderHook.emit_read(record)
 
                 except StopIteration:
                     # Iterators throw a StopIteration exception when they are done.
@@ -127,6 +249,33 @@ class BaseReader(object):
 
         return symbol_json_dict
 
+    def pipeline_read(self, symbols=None, sink=None, max_connections=16, workers=None, queue_size=None, session=None):
+        """
+        Function to read many symbols through a staged pipeline: the requests run concurrently on an event loop, the
+        responses are parsed in a process pool sized to the cores and handed to the sink, with bounded queues between
+        the stages. Unlike multi_read, the network and the parsing overlap, and memory stays flat for any number of
+        symbols when a sink is given. See ReadPipeline.
+        :param symbols: Optional. The symbols to read, any iterable. Default is the reader's symbols.
+        :type symbols: iterable
+        :param sink: Optional. A function called with the symbol and the response of every read. Default collects the
+        responses into the returned dictionary.
+        :type sink: callable
+        :param max_connections: The maximum number of requests in flight at once.
+        :type max_connections: int
+        :param workers: Optional. The number of parse processes. Default is the number of cores.
+        :type workers: int
+        :param queue_size: Optional. The capacity of the queues between the stages.
+        :type queue_size: int
+        :param session: Optional. The session used for the requests.
+        :type session: requests.Session
+        :return: A dictionary mapping the symbols to their responses, or the number of responses written to the sink.
+        :rtype: dict or int
+        """
+
+        pipeline = ReadPipeline(self, sink, max_connections, workers, queue_size, session)
+
+        return pipeline.run(symbols)
+
     def single_read(self, symbol, session=None):
         """
         Function to read a single symbol from the requested url and sanitize the
@@ -139,24 +288,125 @@ class BaseReader(object):
         :rtype dict
         """
 
+        cached = self._cache_lookup(symbol)
+
+        if cached is not None:
+            return cached
+
+        if not ReaderHook.enabled():
+            symbol_data = self._read_symbol(symbol, session)
+        else:
+            record = ReadRecord(self._endpoint, symbol)
+            symbol_data = self._read_symbol(symbol, session, record)
+            ReaderHook.emit_read(record)
+
+        self._cache_store(symbol, symbol_data)
+
+        return symbol_data
+
+    def _cache_lookup(self, symbol):
+        """
+        Method to build the response of a symbol from a parsed cache. Readers with a cache override it.
+        :param symbol: The symbol being requested.
+        :type symbol: str
+        :return: The response, or None if it is not cached.
+        """
+
+        return None
+
+    def _cache_store(self, symbol, symbol_data):
+        """
+        Method to add the parsed response of a symbol to a cache. Readers with a cache override it.
+        :param symbol: The symbol that was read.
+        :type symbol: str
+        :param symbol_data: The parsed response.
+        """
+
+        pass
+
+    def _read_symbol(self, symbol, session=None, record=None, params=None):
+        """
+        Function to request and parse a single symbol. If a read record is given, the time spent in each phase of the
+        read is added to it.
+        :param symbol: The symbol being requested.
+        :type symbol str
+        :param session: The session to be used when requesting. Default is None.
+        :type session: requests.Session
+        :param record: Optional. The record of the read.
+        :type record: ReadRecord
+        :param params: Optional. The parameters of the request. Default is the reader's parameters.
+        :type params: dict
+        :return: The parsed response.
+        """
+
         try:
-            if session:
-                # If using a session, then send the request using the session.
-                response = session.get(url=self._url.format(symbol),
-                                       params=self._params,
-                                       timeout=self._timeout)
-            else:
-                # If not using a session, then use requests to send the request.
-                response = requests.get(url=self._url.format(symbol),
-                                        params=self._params,
-                                        timeout=self._timeout)
+            start = time.perf_counter() if record is not None else None
+
+            # When instrumented, the body is streamed so the wait for the headers and the download are timed apart.
+            requester = session if session else requests
+            response = requester.get(url=self._symbol_url(symbol),
+                                     params=self._params if params is None else params,
+                                     timeout=self._timeout,
+                                     stream=record is not None or self._stream_response)
+
+            if record is not None:
+                record.add_phase('request', time.perf_counter() - start)
+                record.status_code = response.status_code
+                start = time.perf_counter()
+
+                if self._stream_response:
+                    # A streamed body downloads while it is parsed, so the download is part of the parse time.
+                    record.response_bytes = int(response.headers.get('Content-Length', 0))
+                else:
+                    record.response_bytes = len(response.content)
+                    record.add_phase('download', time.perf_counter() - start)
+
+                response = TimedResponse(response, record)
+                start = time.perf_counter()
 
             # Parse the response.
-            return self._parse_response(symbol, response)
+            symbol_data = self._parse_response(symbol, response)
+
+            if record is not None:
+                # The decode time was recorded by the timed response, so it is not part of the parse time.
+                record.add_phase('parse', time.perf_counter() - start - record.phases.get('decode', 0.0))
+                record.error = self._response_error_name(symbol_data)
+
+            return symbol_data
 
         except Exception as response_error:
+            if record is not None:
+                record.error = type(response_error).__name__
+
             # Catches all other errors related to getting the information.
             return self._parse_response_error(symbol, response_error)
 
+    @staticmethod
+    def _response_error_name(symbol_data):
+        """
+        Function to get the name of the error a parsed response carries, if any.
+        :return: The status code of a failed read, e.g. SYMBOL_NOT_FOUND, the class name of the error, or None.
+        :rtype: str
+        """
+
+        # The responses of the Yahoo readers carry the status of the read, which names the error even when the
+        # exception is only a message.
+        status = BaseReader._response_status(symbol_data)
+
+        if status is not None and not status.ok:
+            return status.code.name
+
+        exception = getattr(symbol_data, 'exception', None)
+
+        if exception is None:
+            return None
+        elif isinstance(exception, Exception):
+            return type(exception).__name__
+        else:
+            return 'Error'
+
     def single_read_wrapper(self, arguments):
-        return self.single_read(*arguments)
+        symbol, session, instrumented = arguments
+        record = ReadRecord(self._endpoint, symbol) if instrumented else None
+
+        return symbol, self._read_symbol(symbol, session, record), record
@@ -3,10 +3,11 @@ import abc
 
 class BaseResponse:
 
-    def __init__(self, symbol, exception=None):
+    def __init__(self, symbol, exception=None, status=None):
 
         self._symbol = symbol
         self._exception = exception
+        self._status = status
 
     @property
     def symbol(self):
@@ -16,6 +17,49 @@ class BaseResponse:
     def exception(self):
         return self._exception
 
+    @property
+    def status(self):
+        return self._status
+
+    def _error_statuses(self):
+        """
+        Method to get the statuses of the read and of every property that failed to parse.
+        :return: A list of the statuses that are errors.
+        :rtype: list
+        """
+
+        errors = [self._status] if self._status is not None and not self._status.ok else []
+
+        # A module that fails to parse sets an error on every property built from it, so report each module once.
+        seen = set()
+
+        for value in vars(self).values():
+            if isinstance(value, BaseResponse.SummaryObject) and value.error_occurred and value.error is not None:
+                key = (getattr(value.error, 'module', None), getattr(value.error, 'code', None))
+
+                if key not in seen:
+                    seen.add(key)
+                    errors.append(value.error)
+
+        return errors
+
+    def _property_state(self, name):
+        """
+        Method to get the stored state of a property without raising its error.
+        :param name: The name of the property.
+        :type name: str
+        :return: A tuple of the value and the error of the property, or None if the property was never assigned.
+        :rtype: tuple
+        """
+
+        # The summary objects are private attributes of the subclass.
+        summary_object = vars(self).get('_{}__{}'.format(type(self).__name__, name))
+
+        if summary_object is None:
+            return None
+
+        return summary_object.value, summary_object.error
+
     @abc.abstractmethod
     def _handle_read(self, summary_object):
         raise NotImplementedError('Subclass has not implemented property.')
@@ -52,7 +96,7 @@ class BaseResponse:
         @error.setter
         def error(self, value):
             self._error_occurred = True
-            _error = value
+            self._error = value
 
         @property
         def error_occurred(self):
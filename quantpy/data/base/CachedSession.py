@@ -0,0 +1,81 @@
+import hashlib
+import os
+import time
+import urllib.parse
+import requests
+from quantpy.data.base.ReaderHook import ReaderHook
+
+
+class CachedSession(requests.Session):
+
+    def __init__(self, cache_dir, ttl=86400, rate_limiter=None):
+        """
+        Initializer method for the CachedSession class. A requests session that keeps the body of every successful GET
+        on disk and answers repeated GETs from it while it is younger than the ttl. Pass it to a reader's single_read
+        so batch jobs do not download the same data twice.
+        :param cache_dir: The directory of the cached bodies.
+        :type cache_dir: str
+        :param ttl: The number of seconds a cached body is used.
+        :type ttl: float
+        :param rate_limiter: Optional. A rate limiter acquired before every request that is not answered from the cache.
+        :type rate_limiter: RateLimiter
+        """
+
+        super().__init__()
+
+        self.__cache_dir = cache_dir
+        self.__ttl = ttl
+        self.__rate_limiter = rate_limiter
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _cache_path(self, url, params):
+        # The key covers the url and the sorted parameters, so equal requests share an entry.
+        query = urllib.parse.urlencode(sorted((key, str(value)) for key, value in (params or {}).items()))
+        key = hashlib.sha1('{}?{}'.format(url, query).encode('utf-8')).hexdigest()
+
+        return os.path.join(self.__cache_dir, key[:2], key + '.json')
+
+    def get(self, url, params=None, **kwargs):
+        path = self._cache_path(url, params)
+
+        try:
+            if time.time() - os.path.getmtime(path) < self.__ttl:
+                with open(path, 'rb') as cache_file:
+                    content = cache_file.read()
+
+                # The reader urls end with the endpoint and the symbol, e.g. /v8/finance/chart/AAPL.
+                endpoint, symbol = (['', ''] + urllib.parse.unquote(urllib.parse.urlsplit(url).path).split('/'))[-2:]
+                ReaderHook.emit_cache_hit(endpoint, symbol)
+
+                return self._cached_response(url, content)
+        except OSError:
+            pass
+
+        if self.__rate_limiter is not None:
+            self.__rate_limiter.acquire()
+
+        response = super().get(url, params=params, **kwargs)
+
+        # Only successful responses are cached, errors are asked again next time.
+        if response.status_code == 200:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Write to a temporary file first so a reader never sees a partial body.
+            temporary_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(temporary_path, 'wb') as cache_file:
+                cache_file.write(response.content)
+
+            os.replace(temporary_path, path)
+
+        return response
+
+    @staticmethod
+    def _cached_response(url, content):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = content
+
+        return response
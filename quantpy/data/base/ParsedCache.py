@@ -0,0 +1,162 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from quantpy.data.base.ReaderHook import ReaderHook
+
+
+class ParsedCache(object):
+
+    def __init__(self, max_bytes=256 * 1024 ** 2, ttl=300, module_ttls=None):
+        """
+        Initializer method for the ParsedCache class. An in-process cache of parsed reader results, e.g. the module
+        dataframes of summary responses, so a long running process does not parse the same data again. Entries are
+        evicted least recently used first once their total size is over the budget. The size of an entry is the deep
+        memory usage of its dataframes, so a few large statement histories weigh as much as many small modules.
+        The cached dataframes are shared with every caller and must not be modified in place.
+        :param max_bytes: The maximum total size of the entries in bytes.
+        :type max_bytes: int
+        :param ttl: The default number of seconds an entry is used.
+        :type ttl: float
+        :param module_ttls: Optional. A dictionary mapping modules to their own ttl, e.g. {'financial_data': 60,
+        'income_statement_history': 86400} or, for quotes, intervals such as {'1m': 30}.
+        :type module_ttls: dict
+        """
+
+        self.__max_bytes = max_bytes
+        self.__ttl = ttl
+        self.__module_ttls = dict(module_ttls or {})
+
+        # The entries map a key to its expiry time, size and value, least recently used first.
+        self.__entries = OrderedDict()
+        self.__bytes = 0
+        self.__counts = {'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0, 'rejections': 0}
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        # A reader pickled to a worker process takes an empty cache with the same settings, not the entries.
+        return {'max_bytes': self.__max_bytes, 'ttl': self.__ttl, 'module_ttls': self.__module_ttls}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    @staticmethod
+    def sizeof(value):
+        """
+        Method to estimate the memory footprint of a cached value in bytes.
+        :param value: A dataframe, a container of them, or any other object.
+        :return: The number of bytes.
+        :rtype: int
+        """
+
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(ParsedCache.sizeof(item) for item in value.values())
+
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(ParsedCache.sizeof(item) for item in value)
+
+        return sys.getsizeof(value)
+
+    def ttl(self, module=None):
+        return self.__module_ttls.get(module, self.__ttl)
+
+    @property
+    def stats(self):
+        """
+        Property to get the counts of the cache: the entries and their bytes, the hits and misses, and the entries
+        dropped because they expired, were evicted for space, or were larger than the whole budget.
+        :rtype: dict
+        """
+
+        with self.__lock:
+            stats = dict(self.__counts, entries=len(self.__entries), bytes=self.__bytes, max_bytes=self.__max_bytes)
+
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+
+        return stats
+
+    def get(self, key, endpoint=None):
+        """
+        Method to get a cached value.
+        :param key: The key, e.g. (symbol, module) or (symbol, interval, range).
+        :type key: tuple
+        :param endpoint: Optional. The endpoint reported to the reader hooks on a hit, whose symbol is the first item of
+        the key. Default does not report the hit.
+        :type endpoint: str
+        :return: The value, or None when it is not cached or expired.
+        """
+
+        with self.__lock:
+            entry = self.__entries.get(key)
+
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self.__counts['expirations'] += 1
+                entry = None
+
+            if entry is None:
+                self.__counts['misses'] += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__counts['hits'] += 1
+
+        if endpoint is not None:
+            ReaderHook.emit_cache_hit(endpoint, key[0])
+
+        return entry[2]
+
+    def put(self, key, value, module=None):
+        """
+        Method to cache a value, evicting the least recently used entries until it fits.
+        :param key: The key.
+        :type key: tuple
+        :param value: The value.
+        :param module: Optional. The module of the value, which picks its ttl.
+        :type module: str
+        :return: Was the value cached? A value larger than the whole budget is not.
+        :rtype: bool
+        """
+
+        size = self.sizeof(value)
+        expires = time.monotonic() + self.ttl(module)
+
+        with self.__lock:
+            if key in self.__entries:
+                self._remove(key)
+
+            if size > self.__max_bytes:
+                self.__counts['rejections'] += 1
+                return False
+
+            while self.__entries and self.__bytes + size > self.__max_bytes:
+                self._remove(next(iter(self.__entries)))
+                self.__counts['evictions'] += 1
+
+            self.__entries[key] = (expires, size, value)
+            self.__bytes += size
+
+        return True
+
+    def _remove(self, key):
+        # Called with the lock held.
+        self.__bytes -= self.__entries.pop(key)[1]
+
+    def invalidate(self, symbol=None):
+        """
+        Method to drop the entries of a symbol, or every entry.
+        :param symbol: Optional. The symbol, the first item of the keys. Default drops every entry.
+        :type symbol: str
+        """
+
+        with self.__lock:
+            for key in [key for key in self.__entries if symbol is None or key[0] == symbol]:
+                self._remove(key)
@@ -0,0 +1,50 @@
+import threading
+import time
+
+
+class RateLimiter(object):
+
+    def __init__(self, rate, burst=1):
+        """
+        Initializer method for the RateLimiter class. A token bucket shared by many threads.
+        :param rate: The number of acquisitions allowed per second. None or 0 disables the limit.
+        :type rate: float
+        :param burst: The number of acquisitions allowed at once after being idle.
+        :type burst: int
+        """
+
+        self.__rate = rate
+        self.__burst = max(burst, 1)
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Method to wait until a token is available and take it.
+        """
+
+        if not self.__rate:
+            return
+
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+                self.__updated = now
+
+                if self.__tokens >= 1.0:
+                    self.__tokens -= 1.0
+                    return
+
+                wait = (1.0 - self.__tokens) / self.__rate
+
+            # Sleep outside of the lock so the other threads can check the bucket too.
+            time.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
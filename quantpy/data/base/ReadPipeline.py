@@ -0,0 +1,276 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from pebble import ProcessPool
+from quantpy.data.base.ReaderHook import ReaderHook, ReadRecord
+
+
+class RawResponse(object):
+
+    def __init__(self, url, status_code, content, headers=None):
+        """
+        Initializer method for the RawResponse class. A downloaded response body that is sent to a parse worker in
+        place of the requests.Response, which cannot be pickled. It offers the part of the requests.Response interface
+        the readers parse.
+        :param url: The url of the request.
+        :type url: str
+        :param status_code: The HTTP status code.
+        :type status_code: int
+        :param content: The response body.
+        :type content: bytes
+        :param headers: Optional. The response headers.
+        :type headers: dict
+        """
+
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.decode_seconds = 0.0
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self, **kwargs):
+        start = time.perf_counter()
+        data = json.loads(self.content, **kwargs)
+        self.decode_seconds += time.perf_counter() - start
+
+        return data
+
+
+# The reader of the parse worker processes, set once by the pool initializer instead of being pickled with every task.
+_worker_reader = None
+
+
+def _initialize_worker(reader):
+    global _worker_reader
+    _worker_reader = reader
+
+
+def _parse_in_worker(symbol, raw_response):
+    # Decode the JSON and build the response object, timing both.
+    start = time.perf_counter()
+
+    try:
+        symbol_data = _worker_reader._parse_response(symbol, raw_response)
+    except Exception as parse_error:
+        symbol_data = _worker_reader._parse_response_error(symbol, parse_error)
+
+    return symbol_data, raw_response.decode_seconds, time.perf_counter() - start - raw_response.decode_seconds
+
+
+class ReadPipeline(object):
+
+    def __init__(self, reader, sink=None, max_connections=16, workers=None, queue_size=None, session=None):
+        """
+        Initializer method for the ReadPipeline class. The pipeline reads the symbols of a reader in three stages: the
+        requests run on an asyncio loop, the JSON decoding and dataframe building run in a process pool, and the parsed
+        responses are handed to the sink one at a time. The stages are joined by bounded queues, so a stage that falls
+        behind blocks the one before it and the number of responses held in memory does not grow with the universe.
+        :param reader: The reader whose requests and parsing are used, e.g. a YahooQuoteReader.
+        :type reader: BaseReader
+        :param sink: Optional. A function called with the symbol and the parsed response of every read, e.g. a store's
+        write method. It is called from one thread, so it does not need to be thread-safe. Default collects the
+        responses into the dictionary returned by run.
+        :type sink: callable
+        :param max_connections: The maximum number of requests in flight at once.
+        :type max_connections: int
+        :param workers: Optional. The number of parse processes. Default is the number of cores.
+        :type workers: int
+        :param queue_size: Optional. The capacity of the queues between the stages. Default is twice the number of
+        workers.
+        :type queue_size: int
+        :param session: Optional. The session used for the requests, e.g. a CachedSession with a rate limiter.
+        :type session: requests.Session
+        """
+
+        self.__reader = reader
+        self.__sink = sink
+        self.__max_connections = max_connections
+        self.__workers = workers or multiprocessing.cpu_count()
+        self.__queue_size = queue_size or 2 * self.__workers
+        self.__session = session
+        self.__stats = {}
+
+    @property
+    def stats(self):
+        """
+        Property to get the counts of the last run: the symbols answered from the reader's cache, fetched, parsed and
+        written, and the largest number of items that waited in each queue.
+        :rtype: dict
+        """
+
+        return dict(self.__stats)
+
+    def run(self, symbols=None):
+        """
+        Method to read the symbols through the pipeline.
+        :param symbols: Optional. The symbols to read, which can be any iterable, e.g. a generator over a large
+        universe. Default is the reader's symbols.
+        :type symbols: iterable
+        :return: A dictionary mapping the symbols to their responses when there is no sink, otherwise the number of
+        responses written to the sink.
+        :rtype: dict or int
+        """
+
+        return asyncio.run(self.run_async(symbols))
+
+    async def run_async(self, symbols=None):
+        """
+        Method to read the symbols through the pipeline on a running event loop, see run.
+        """
+
+        symbols = iter(self.__reader._symbols if symbols is None else symbols)
+        results = {} if self.__sink is None else None
+        sink = self.__sink if self.__sink is not None else results.__setitem__
+
+        self.__stats = {'cached': 0, 'fetched': 0, 'parsed': 0, 'written': 0, 'max_fetched_queue': 0,
+                        'max_parsed_queue': 0}
+
+        fetched_queue = asyncio.Queue(self.__queue_size)
+        parsed_queue = asyncio.Queue(self.__queue_size)
+        session = self.__session if self.__session is not None else requests.Session()
+
+        # The requests block, so they run in threads. The pipeline waits on them from the event loop.
+        fetch_executor = ThreadPoolExecutor(self.__max_connections)
+        sink_executor = ThreadPoolExecutor(1)
+        pool = ProcessPool(self.__workers, initializer=_initialize_worker, initargs=(self.__reader,))
+
+        fetchers = [self._fetch_stage(symbols, fetched_queue, parsed_queue, session, fetch_executor)
+                    for _ in range(self.__max_connections)]
+        fetchers = [asyncio.create_task(fetcher) for fetcher in fetchers]
+        parsers = [asyncio.create_task(self._parse_stage(fetched_queue, parsed_queue, pool))
+                   for _ in range(self.__workers)]
+        writer = asyncio.create_task(self._sink_stage(parsed_queue, sink, sink_executor))
+
+        closer = asyncio.create_task(self._close_stages(fetchers, parsers, fetched_queue, parsed_queue))
+
+        try:
+            # Any stage that fails stops the whole pipeline, instead of leaving the others blocked on full queues.
+            await asyncio.gather(closer, writer, *parsers, *fetchers)
+        finally:
+            for task in fetchers + parsers + [writer, closer]:
+                task.cancel()
+
+            pool.stop()
+            pool.join()
+            fetch_executor.shutdown(wait=False, cancel_futures=True)
+            sink_executor.shutdown(wait=True)
+
+            if self.__session is None:
+                session.close()
+
+        return results if results is not None else self.__stats['written']
+
+    @staticmethod
+    async def _close_stages(fetchers, parsers, fetched_queue, parsed_queue):
+        # Once every symbol is fetched, each parser stops at its own end marker, then the writer stops at one.
+        await asyncio.gather(*fetchers)
+
+        for _ in parsers:
+            await fetched_queue.put(None)
+
+        await asyncio.gather(*parsers)
+        await parsed_queue.put(None)
+
+    def _fetch(self, symbol, session, record):
+        """
+        Method to download the body of one symbol. Runs in a fetch thread.
+        :return: The raw response, or the exception raised by the request.
+        :rtype: RawResponse or Exception
+        """
+
+        start = time.perf_counter()
+
+        try:
+            response = session.get(url=self.__reader._symbol_url(symbol), params=self.__reader._params,
+                                   timeout=self.__reader._timeout)
+            raw_response = RawResponse(response.url, response.status_code, response.content,
+                                       dict(response.headers))
+        except Exception as response_error:
+            raw_response = response_error
+
+        if record is not None:
+            record.add_phase('request', time.perf_counter() - start)
+
+            if isinstance(raw_response, RawResponse):
+                record.response_bytes = len(raw_response.content)
+                record.status_code = raw_response.status_code
+
+        return raw_response
+
+    async def _fetch_stage(self, symbols, fetched_queue, parsed_queue, session, executor):
+        loop = asyncio.get_running_loop()
+
+        # The fetchers share the symbol iterator, so the symbols are only pulled as fast as the queue is drained.
+        for symbol in symbols:
+            # A cached response skips the request and the parse.
+            cached = self.__reader._cache_lookup(symbol)
+
+            if cached is not None:
+                self.__stats['cached'] += 1
+                await parsed_queue.put((symbol, cached, None))
+                continue
+
+            record = ReadRecord(self.__reader._endpoint, symbol) if ReaderHook.enabled() else None
+            raw_response = await loop.run_in_executor(executor, self._fetch, symbol, session, record)
+            self.__stats['fetched'] += 1
+
+            await fetched_queue.put((symbol, raw_response, record))
+            self.__stats['max_fetched_queue'] = max(self.__stats['max_fetched_queue'], fetched_queue.qsize())
+
+    async def _parse_stage(self, fetched_queue, parsed_queue, pool):
+        while True:
+            item = await fetched_queue.get()
+
+            if item is None:
+                return
+
+            symbol, raw_response, record = item
+
+            if isinstance(raw_response, Exception):
+                # Failed requests have nothing to parse.
+                symbol_data = self.__reader._parse_response_error(symbol, raw_response)
+            else:
+                try:
+                    future = pool.schedule(_parse_in_worker, args=[symbol, raw_response])
+                    symbol_data, decode_seconds, parse_seconds = await asyncio.wrap_future(future)
+
+                    if record is not None:
+                        record.add_phase('decode', decode_seconds)
+                        record.add_phase('parse', parse_seconds)
+                except Exception as worker_error:
+                    # The worker process died or the response could not be sent back.
+                    symbol_data = self.__reader._parse_response_error(symbol, worker_error)
+
+            if record is not None:
+                record.error = self.__reader._response_error_name(symbol_data)
+
+            self.__reader._cache_store(symbol, symbol_data)
+            self.__stats['parsed'] += 1
+
+            await parsed_queue.put((symbol, symbol_data, record))
+            self.__stats['max_parsed_queue'] = max(self.__stats['max_parsed_queue'], parsed_queue.qsize())
+
+    async def _sink_stage(self, parsed_queue, sink, executor):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            item = await parsed_queue.get()
+
+            if item is None:
+                return
+
+            symbol, symbol_data, record = item
+
+            # The records are emitted here, since hooks registered in a worker process would never be seen.
+            if record is not None:
+                ReaderHook.emit_read(record)
+
+            await loop.run_in_executor(executor, sink, symbol, symbol_data)
+            self.__stats['written'] += 1
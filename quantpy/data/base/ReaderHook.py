@@ -0,0 +1,114 @@
+import threading
+import time
+
+
+class ReaderHook(object):
+    """
+    Base class for the hooks that observe the reads of every reader. Subclasses override the methods they need. Hooks
+    are registered globally with ReaderHook.register. While no hook is registered the readers skip all instrumentation.
+    """
+
+    # The registered hooks. Kept as a tuple so the readers can iterate it without holding the lock.
+    _hooks = ()
+    _lock = threading.Lock()
+
+    def on_read(self, record):
+        """
+        Method called after every symbol read.
+        :param record: The record of the read.
+        :type record: ReadRecord
+        """
+
+        pass
+
+    def on_cache_hit(self, endpoint, symbol):
+        """
+        Method called when a read is answered from a cache instead of the API.
+        :param endpoint: The name of the API endpoint.
+        :type endpoint: str
+        :param symbol: The symbol that was read.
+        :type symbol: str
+        """
+
+        pass
+
+    @classmethod
+    def register(cls, hook):
+        with ReaderHook._lock:
+            if hook not in ReaderHook._hooks:
+                ReaderHook._hooks = ReaderHook._hooks + (hook,)
+
+    @classmethod
+    def unregister(cls, hook):
+        with ReaderHook._lock:
+            ReaderHook._hooks = tuple(registered for registered in ReaderHook._hooks if registered is not hook)
+
+    @classmethod
+    def enabled(cls):
+        return bool(ReaderHook._hooks)
+
+    @classmethod
+    def emit_read(cls, record):
+        for hook in ReaderHook._hooks:
+            hook.on_read(record)
+
+    @classmethod
+    def emit_cache_hit(cls, endpoint, symbol):
+        for hook in ReaderHook._hooks:
+            hook.on_cache_hit(endpoint, symbol)
+
+
+class ReadRecord(object):
+
+    def __init__(self, endpoint, symbol):
+        """
+        Initializer method for the ReadRecord class. A read record holds the timings of the phases of one symbol read.
+        The phases are request (connecting, TLS and waiting for the response headers), download (the response body),
+        decode (response.json()) and parse (building the response object).
+        :param endpoint: The name of the API endpoint.
+        :type endpoint: str
+        :param symbol: The symbol being read.
+        :type symbol: str
+        """
+
+        self.endpoint = endpoint
+        self.symbol = symbol
+        self.phases = {}
+        self.response_bytes = 0
+        self.status_code = None
+        self.error = None
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @property
+    def total_seconds(self):
+        return sum(self.phases.values())
+
+
+class TimedResponse(object):
+
+    def __init__(self, response, record):
+        """
+        Initializer method for the TimedResponse class. Wraps a requests.Response so the time spent decoding its JSON is
+        recorded, and the decoded JSON is reused if the parser asks for it more than once.
+        :param response: The response being wrapped.
+        :type response: requests.Response
+        :param record: The record of the read.
+        :type record: ReadRecord
+        """
+
+        self.__response = response
+        self.__record = record
+        self.__json = None
+
+    def json(self, **kwargs):
+        if self.__json is None:
+            start = time.perf_counter()
+            self.__json = self.__response.json(**kwargs)
+            self.__record.add_phase('decode', time.perf_counter() - start)
+
+        return self.__json
+
+    def __getattr__(self, name):
+        return getattr(self.__response, name)
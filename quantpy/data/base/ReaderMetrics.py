@@ -0,0 +1,133 @@
+import bisect
+import threading
+from collections import defaultdict
+
+from quantpy.data.base.ReaderHook import ReaderHook
+
+
+class ReaderMetrics(ReaderHook):
+
+    # The default upper bounds (in seconds) of the latency histogram buckets.
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='quantpy_reader'):
+        """
+        Initializer method for the ReaderMetrics class. A hook that counts the requests, response bytes, errors and
+        cache hits of every endpoint and keeps a latency histogram of every read phase. Register it with
+        ReaderHook.register(metrics) and export it with to_prometheus.
+        :param buckets: The upper bounds of the latency histogram buckets in seconds.
+        :type buckets: tuple
+        :param prefix: The prefix of the exported metric names.
+        :type prefix: str
+        """
+
+        self.__buckets = tuple(sorted(buckets))
+        self.__prefix = prefix
+        self.__lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Method to set every metric back to zero.
+        """
+
+        with self.__lock:
+            self.__requests = defaultdict(int)
+            self.__response_bytes = defaultdict(int)
+            self.__errors = defaultdict(int)
+            self.__cache_hits = defaultdict(int)
+
+            # Histograms are keyed by (endpoint, phase) and hold the per bucket counts, the sum and the count.
+            self.__histograms = defaultdict(lambda: [[0] * (len(self.__buckets) + 1), 0.0, 0])
+
+    def on_read(self, record):
+        with self.__lock:
+            self.__requests[record.endpoint] += 1
+            self.__response_bytes[record.endpoint] += record.response_bytes
+
+            if record.error is not None:
+                self.__errors[(record.endpoint, record.error)] += 1
+
+            for phase, seconds in record.phases.items():
+                histogram = self.__histograms[(record.endpoint, phase)]
+                histogram[0][bisect.bisect_left(self.__buckets, seconds)] += 1
+                histogram[1] += seconds
+                histogram[2] += 1
+
+            total = self.__histograms[(record.endpoint, 'total')]
+            total[0][bisect.bisect_left(self.__buckets, record.total_seconds)] += 1
+            total[1] += record.total_seconds
+            total[2] += 1
+
+    def on_cache_hit(self, endpoint, symbol):
+        with self.__lock:
+            self.__cache_hits[endpoint] += 1
+
+    def snapshot(self):
+        """
+        Method to get a copy of the current metrics.
+        :return: A dictionary containing the requests, response_bytes, cache_hits and errors counters, and the latency
+        histograms as (bucket counts, sum, count) tuples.
+        :rtype: dict
+        """
+
+        with self.__lock:
+            return {'requests': dict(self.__requests),
+                    'response_bytes': dict(self.__response_bytes),
+                    'cache_hits': dict(self.__cache_hits),
+                    'errors': dict(self.__errors),
+                    'latency': {key: (list(value[0]), value[1], value[2]) for key, value in self.__histograms.items()}}
+
+    def to_prometheus(self, openmetrics=False):
+        """
+        Method to export the metrics in the Prometheus text exposition format.
+        :param openmetrics: Export in the OpenMetrics format instead (adds the # EOF terminator).
+        :type openmetrics: bool
+        :return: The exported metrics.
+        :rtype: str
+        """
+
+        snapshot = self.snapshot()
+        lines = []
+
+        counters = [('requests', 'Number of symbol reads.', snapshot['requests'], ('endpoint',)),
+                    ('response_bytes', 'Number of response body bytes read.', snapshot['response_bytes'],
+                     ('endpoint',)),
+                    ('cache_hits', 'Number of reads answered from a cache.', snapshot['cache_hits'], ('endpoint',)),
+                    ('errors', 'Number of failed reads by error class.', snapshot['errors'], ('endpoint', 'error'))]
+
+        for name, description, values, label_names in counters:
+            metric = '{}_{}'.format(self.__prefix, name)
+            lines.append('# HELP {}_total {}'.format(metric, description) if not openmetrics else
+                         '# HELP {} {}'.format(metric, description))
+            lines.append('# TYPE {}{} counter'.format(metric, '' if openmetrics else '_total'))
+
+            for key, value in sorted(values.items()):
+                key = key if isinstance(key, tuple) else (key,)
+                lines.append('{}_total{{{}}} {}'.format(metric, self._labels(zip(label_names, key)), value))
+
+        metric = '{}_phase_seconds'.format(self.__prefix)
+        lines.append('# HELP {} Latency of each read phase.'.format(metric))
+        lines.append('# TYPE {} histogram'.format(metric))
+
+        for (endpoint, phase), (counts, total, count) in sorted(snapshot['latency'].items()):
+            labels = [('endpoint', endpoint), ('phase', phase)]
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.__buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                lines.append('{}_bucket{{{}}} {}'.format(metric, self._labels(labels + [('le', str(bound))]),
+                                                         cumulative))
+
+            lines.append('{}_sum{{{}}} {}'.format(metric, self._labels(labels), repr(total)))
+            lines.append('{}_count{{{}}} {}'.format(metric, self._labels(labels), count))
+
+        if openmetrics:
+            lines.append('# EOF')
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _labels(labels):
+        return ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                        for name, value in labels)
@@ -1,11 +1,16 @@
 from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
 from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
+from quantpy.data.yahoo.YahooSnapshotReader import YahooSnapshotReader
 
 
 def get_yahoo_quote(symbols, start=None, end=None, interval='1d', events=False, pre_post=True):
     return YahooQuoteReader(symbols, start, end, interval, events, pre_post).read()
 
 
+def get_yahoo_snapshot(symbols, fields=None):
+    return YahooSnapshotReader(symbols, fields).read()
+
+
 def get_yahoo_summary(symbols):
     return YahooSummaryReader(symbols).read()
 
@@ -0,0 +1,48 @@
+import json
+
+
+class QuoteDelta(object):
+
+    __slots__ = ('symbol', 'polled_at', 'new_bars', 'revised_bars')
+
+    def __init__(self, symbol, polled_at, new_bars, revised_bars):
+        """
+        Initializer method for the QuoteDelta class. A delta holds the bars of one poll that were not seen before and
+        the bars that changed since they were last seen, e.g. the still forming bar of the current minute.
+        :param symbol: The symbol polled.
+        :type symbol: str
+        :param polled_at: The unix time of the poll.
+        :type polled_at: int
+        :param new_bars: The new bars, with the same columns as YahooQuoteResponse.quote.
+        :type new_bars: pd.DataFrame
+        :param revised_bars: The revised bars.
+        :type revised_bars: pd.DataFrame
+        """
+
+        self.symbol = symbol
+        self.polled_at = polled_at
+        self.new_bars = new_bars
+        self.revised_bars = revised_bars
+
+    @property
+    def empty(self):
+        return self.new_bars.empty and self.revised_bars.empty
+
+    def to_dict(self):
+        """
+        Method to get the delta as a dictionary of plain python values.
+        :rtype: dict
+        """
+
+        # Missing values become None so the dictionary can be serialized to JSON.
+        return {'symbol': self.symbol,
+                'polled_at': self.polled_at,
+                'new': self.new_bars.astype(object).where(self.new_bars.notna(), None).to_dict('records'),
+                'revised': self.revised_bars.astype(object).where(self.revised_bars.notna(), None).to_dict('records')}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), default=float)
+
+    def __repr__(self):
+        return 'QuoteDelta(symbol={}, new={}, revised={})'.format(self.symbol, len(self.new_bars),
+                                                                   len(self.revised_bars))
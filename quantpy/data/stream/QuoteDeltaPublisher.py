@@ -0,0 +1,83 @@
+import socket
+import threading
+
+
+class QuoteDeltaPublisher(object):
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Initializer method for the QuoteDeltaPublisher class. The publisher is a local pub/sub socket: clients connect
+        over TCP and receive every delta as one line of JSON. Subscribe it to a QuotePoller like any other callback.
+        :param host: The address to listen on.
+        :type host: str
+        :param port: The port to listen on. Default is any free port, see address.
+        :type port: int
+        """
+
+        self.__server = socket.create_server((host, port))
+        self.__clients = []
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+        # Accept subscribers in the background.
+        self.__thread = threading.Thread(target=self._accept, daemon=True)
+        self.__thread.start()
+
+    @property
+    def address(self):
+        return self.__server.getsockname()[:2]
+
+    @property
+    def subscriber_count(self):
+        with self.__lock:
+            return len(self.__clients)
+
+    def _accept(self):
+        while not self.__closed:
+            try:
+                client, _ = self.__server.accept()
+            except OSError:
+                # The server socket was closed.
+                break
+
+            with self.__lock:
+                self.__clients.append(client)
+
+    def __call__(self, delta):
+        """
+        Method to send a delta to every subscriber. Subscribers that disconnected are dropped.
+        :param delta: The delta to publish.
+        :type delta: QuoteDelta
+        """
+
+        message = (delta.to_json() + '\n').encode('utf-8')
+
+        with self.__lock:
+            clients = list(self.__clients)
+
+        for client in clients:
+            try:
+                client.sendall(message)
+            except OSError:
+                with self.__lock:
+                    if client in self.__clients:
+                        self.__clients.remove(client)
+
+                client.close()
+
+    def close(self):
+        self.__closed = True
+
+        # Shutting the server socket down wakes the accept thread.
+        try:
+            self.__server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+        self.__server.close()
+
+        with self.__lock:
+            for client in self.__clients:
+                client.close()
+
+            self.__clients = []
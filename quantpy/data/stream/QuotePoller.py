@@ -0,0 +1,333 @@
+import asyncio
+import datetime
+import heapq
+import threading
+import time
+import warnings
+import pandas as pd
+import requests
+from pebble import ThreadPool
+from quantpy.data.stream.QuoteDelta import QuoteDelta
+from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
+from quantpy.utils.utils import unix_seconds
+
+
+class QuotePoller(object):
+
+    # The length of a bar in seconds for each intraday interval.
+    _BAR_SECONDS = {'1m': 60, '2m': 120, '5m': 300, '15m': 900, '30m': 1800, '60m': 3600, '90m': 5400, '1h': 3600}
+
+    # The columns compared to detect a revised bar.
+    _BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, symbols, interval='1m', poll_seconds=60, revision_bars=2, warmup_seconds=3600, pre_post=False,
+                 max_workers=16, timeout=2, calendar=None, session=None):
+        """
+        Initializer method for the QuotePoller class. The poller keeps polling the chart of every symbol and publishes
+        the new and revised bars of each poll to its subscribers. Only the window since the last bar seen is requested,
+        and the polls of the symbols are spread evenly across the poll interval.
+        :param symbols: The list of symbols to poll.
+        :type symbols: str or list
+        :param interval: The intraday interval of the bars, e.g. 1m or 5m.
+        :type interval: str
+        :param poll_seconds: The number of seconds between two polls of the same symbol.
+        :type poll_seconds: float
+        :param revision_bars: The number of most recent bars requested again and checked for revisions. The last bar
+        of a poll is usually still forming, so at least 1.
+        :type revision_bars: int
+        :param warmup_seconds: The number of seconds of history requested by the first poll of a symbol.
+        :type warmup_seconds: int
+        :param pre_post: Include the pre and post market bars?
+        :type pre_post: bool
+        :param max_workers: The maximum number of polls in flight at once.
+        :type max_workers: int
+        :param timeout: The amount of time until a request times out.
+        :type timeout: float
+        :param calendar: Optional. The trading calendar of the symbols. Without the pre and post market bars, the polls
+        due while the exchange is closed are skipped.
+        :type calendar: TradingCalendar
+        :param session: Optional. The session used for the requests. Default is a new session.
+        :type session: requests.Session
+        """
+
+        if interval not in self._BAR_SECONDS:
+            raise ValueError('Interval must be one of {}.'.format(', '.join(self._BAR_SECONDS)))
+
+        if revision_bars < 1:
+            raise ValueError('revision_bars must be at least 1.')
+
+        self.__symbols = symbols.split(' ') if isinstance(symbols, str) else list(symbols)
+        self.__interval = interval
+        self.__bar_seconds = self._BAR_SECONDS[interval]
+        self.__poll_seconds = poll_seconds
+        self.__revision_bars = revision_bars
+        self.__warmup_seconds = warmup_seconds
+        self.__pre_post = pre_post
+        self.__max_workers = max_workers
+        self.__timeout = timeout
+        self.__calendar = calendar
+
+        # The state of each symbol: the time of the last bar seen and the most recent bars, keyed by their time.
+        self.__last_times = {symbol: None for symbol in self.__symbols}
+        self.__recent_bars = {symbol: {} for symbol in self.__symbols}
+        self.__statuses = {}
+        self.__subscriber_errors = {}
+
+        self.__subscribers = ()
+        self.__lock = threading.Lock()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+        self.__session = session if session is not None else requests.Session()
+
+    @property
+    def symbols(self):
+        return list(self.__symbols)
+
+    @property
+    def errors(self):
+        """
+        Property to get the status of the last failed poll of every symbol whose last poll failed.
+        :rtype: dict
+        """
+
+        with self.__lock:
+            return dict(self.__statuses)
+
+    @property
+    def subscriber_errors(self):
+        """
+        Property to get the exception raised by every subscriber whose last call failed, keyed by the subscriber.
+        :rtype: dict
+        """
+
+        with self.__lock:
+            return dict(self.__subscriber_errors)
+
+    def last_bar_time(self, symbol):
+        return self.__last_times[symbol]
+
+    def subscribe(self, callback):
+        """
+        Method to subscribe a callback to the deltas. Callbacks are called from the poller's worker threads, so they
+        need to be thread safe.
+        :param callback: A callable taking a QuoteDelta.
+        :type callback: callable
+        :return: The callback, so it can be unsubscribed later.
+        """
+
+        with self.__lock:
+            self.__subscribers = self.__subscribers + (callback,)
+
+        return callback
+
+    def unsubscribe(self, callback):
+        with self.__lock:
+            self.__subscribers = tuple(subscriber for subscriber in self.__subscribers if subscriber is not callback)
+            self.__subscriber_errors.pop(callback, None)
+
+    def queue(self, maxsize=0):
+        """
+        Method to get an asyncio queue receiving the deltas. Must be called from within the running event loop that
+        consumes the queue.
+        :param maxsize: The maximum size of the queue. Deltas are dropped while a bounded queue is full.
+        :type maxsize: int
+        :return: The queue.
+        :rtype: asyncio.Queue
+        """
+
+        loop = asyncio.get_running_loop()
+        delta_queue = asyncio.Queue(maxsize)
+
+        def put(delta):
+            if not delta_queue.full():
+                delta_queue.put_nowait(delta)
+
+        # The deltas are handed over to the event loop's thread.
+        self.subscribe(lambda delta: loop.call_soon_threadsafe(put, delta))
+
+        return delta_queue
+
+    def poll(self, symbol, now=None):
+        """
+        Method to poll one symbol once and publish its delta.
+        :param symbol: The symbol to poll.
+        :type symbol: str
+        :param now: Optional. The unix time of the poll. Default is the current time.
+        :type now: int
+        :return: The delta of the poll, or None if the poll failed.
+        :rtype: QuoteDelta
+        """
+
+        now = int(time.time()) if now is None else int(now)
+        last_time = self.__last_times[symbol]
+
+        # Request the bars that might still be revised and everything after them.
+        if last_time is None:
+            start = now - self.__warmup_seconds
+        else:
+            start = last_time - (self.__revision_bars - 1) * self.__bar_seconds
+
+        reader = YahooQuoteReader(symbol,
+                                  start=datetime.datetime.fromtimestamp(start),
+                                  end=datetime.datetime.fromtimestamp(now + self.__bar_seconds),
+                                  period=None,
+                                  interval=self.__interval,
+                                  pre_post=self.__pre_post,
+                                  timeout=self.__timeout)
+
+        response = reader.single_read(symbol, self.__session)
+
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                quote = response.quote
+        except Exception:
+            quote = None
+
+        if quote is None:
+            # A read that succeeded can still fail to parse its quote, whose own status then describes the failure.
+            state = response._property_state('quote')
+            status = response.status
+
+            if (status is None or status.ok) and state is not None and state[1] is not None:
+                status = state[1]
+
+            with self.__lock:
+                self.__statuses[symbol] = status
+
+            return None
+
+        with self.__lock:
+            self.__statuses.pop(symbol, None)
+
+        delta = self._update(symbol, quote, now)
+
+        if not delta.empty:
+            self._publish(delta)
+
+        return delta
+
+    def _publish(self, delta):
+        """
+        Method to hand a delta to every subscriber. The state of the symbol already moved past the delta, so a failing
+        subscriber must not keep it from the others. Its exception is recorded in subscriber_errors instead.
+        :param delta: The delta of a poll.
+        :type delta: QuoteDelta
+        """
+
+        for subscriber in self.__subscribers:
+            try:
+                subscriber(delta)
+            except Exception as e:
+                with self.__lock:
+                    self.__subscriber_errors[subscriber] = e
+            else:
+                if subscriber in self.__subscriber_errors:
+                    with self.__lock:
+                        self.__subscriber_errors.pop(subscriber, None)
+
+    def _update(self, symbol, quote, now):
+        """
+        Method to compare the bars of a poll with the state of the symbol and update the state.
+        :param symbol: The symbol polled.
+        :type symbol: str
+        :param quote: The quote dataframe of the poll.
+        :type quote: pd.DataFrame
+        :param now: The unix time of the poll.
+        :type now: int
+        :return: The delta of the poll.
+        :rtype: QuoteDelta
+        """
+
+        # Yahoo Finance sends empty bars for the minutes without trades.
+        quote = quote.dropna(subset=['close'])
+        quote = quote.drop_duplicates('date', keep='last').sort_values('date').reset_index(drop=True)
+
+        last_time = self.__last_times[symbol]
+        recent_bars = self.__recent_bars[symbol]
+
+        columns = [column for column in self._BAR_COLUMNS if column in quote.columns]
+        bars = [tuple(None if pd.isna(value) else value for value in row)
+                for row in quote[columns].itertuples(index=False, name=None)]
+        times = unix_seconds(quote['date']).tolist()
+
+        is_new = [last_time is None or bar_time > last_time for bar_time in times]
+        is_revised = [not new and bar_time in recent_bars and recent_bars[bar_time] != bar
+                      for new, bar_time, bar in zip(is_new, times, bars)]
+
+        # Keep the most recent bars, which the next poll requests again.
+        recent_bars.update(zip(times, bars))
+        for bar_time in sorted(recent_bars)[:-self.__revision_bars]:
+            del recent_bars[bar_time]
+
+        if times:
+            self.__last_times[symbol] = max(times[-1], last_time or times[-1])
+
+        return QuoteDelta(symbol, now, quote[is_new].reset_index(drop=True), quote[is_revised].reset_index(drop=True))
+
+    def _schedule(self, start):
+        # Spread the first polls of the symbols evenly across one poll interval.
+        step = self.__poll_seconds / max(len(self.__symbols), 1)
+
+        return [(start + index * step, index, symbol) for index, symbol in enumerate(self.__symbols)]
+
+    def run(self):
+        """
+        Method to poll until stop is called. Each symbol is polled once per poll interval at its own offset in the
+        interval, so the requests are spread evenly instead of arriving in bursts.
+        """
+
+        if not self.__symbols:
+            return
+
+        self.__stop_event.clear()
+        schedule = self._schedule(time.time())
+        heapq.heapify(schedule)
+        in_flight = {}
+
+        with ThreadPool(self.__max_workers) as pool:
+            while not self.__stop_event.is_set():
+                due, index, symbol = schedule[0]
+
+                # Wait until the next poll is due, waking up early if the poller is stopped.
+                if self.__stop_event.wait(max(due - time.time(), 0.0)):
+                    break
+
+                heapq.heapreplace(schedule, (due + self.__poll_seconds, index, symbol))
+
+                # A symbol whose previous poll is still in flight skips this interval.
+                if symbol in in_flight and not in_flight[symbol].done():
+                    continue
+
+                # There are no new bars to poll for while the exchange is closed.
+                if self.__calendar is not None and not self.__pre_post and not self.__calendar.is_open(time.time())[0]:
+                    continue
+
+                in_flight[symbol] = pool.schedule(self.poll, args=[symbol])
+
+            pool.stop()
+
+    def start(self):
+        """
+        Method to start polling in a background thread.
+        """
+
+        if self.__thread is not None and self.__thread.is_alive():
+            raise RuntimeError('The poller is already running.')
+
+        self.__stop_event.clear()
+        self.__thread = threading.Thread(target=self.run, daemon=True)
+        self.__thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Method to stop polling and wait for the background thread to finish.
+        :param timeout: Optional. The maximum number of seconds to wait.
+        :type timeout: float
+        """
+
+        self.__stop_event.set()
+
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+            self.__thread = None
@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+from quantpy.data.transform.QuotePanel import QuotePanel
+from quantpy.utils.utils import unix_seconds
+
+
+class CorporateActionAdjuster(object):
+
+    # The fields adjusted like prices. Volumes are adjusted for splits only, in the opposite direction.
+    PRICE_FIELDS = ('open', 'high', 'low', 'close')
+    VOLUME_FIELD = 'volume'
+
+    def __init__(self, panel, splits=None, dividends=None, price_field='close'):
+        """
+        Initializer method for the CorporateActionAdjuster class. The adjuster keeps the raw prices of a panel and the
+        cumulative adjustment factor of every bar of every symbol. The factor of a bar is the product of the factors of
+        every event after it, computed for the whole panel at once with a reversed cumulative product.
+        A split of numerator for denominator on bar t divides the prices before t by numerator / denominator. A
+        dividend D on bar t multiplies the prices before t by 1 - D / C, where C is the previous close in the share
+        units of bar t, so the total return adjusted prices grow by the total return of each bar.
+        :param panel: The quote panel of raw, unadjusted, prices.
+        :type panel: QuotePanel
+        :param splits: Optional. A dictionary mapping symbols to the splits dataframe of the YahooQuoteReader.
+        :type splits: dict
+        :param dividends: Optional. A dictionary mapping symbols to the dividends dataframe of the YahooQuoteReader.
+        :type dividends: dict
+        :param price_field: The field of the previous close used by the dividend factors.
+        :type price_field: str
+        """
+
+        self.__panel = panel
+        self.__bar_seconds = panel.index.as_unit('s').asi8
+        self.__raw = {field: panel.values(field) for field in panel.fields
+                      if field in self.PRICE_FIELDS or field == self.VOLUME_FIELD}
+
+        # The previous valid close of every bar, used to turn dividends into factors.
+        self.__previous_close = panel[price_field].ffill().shift(1).to_numpy(dtype=np.float64)
+
+        # The events of every bar: the product of the split ratios and the sum of the dividends.
+        shape = (len(panel.index), len(panel.symbols))
+        self.__split_ratios = np.ones(shape)
+        self.__dividends = np.zeros(shape)
+        self._add_events(self.__split_ratios, self._event_cells(splits, 'split'), np.multiply)
+        self._add_events(self.__dividends, self._event_cells(dividends, 'dividend'), np.add)
+
+        # The cumulative factors of every bar.
+        self.__split_factors = self._cumulative(1.0 / self.__split_ratios)
+        self.__dividend_factors = self._cumulative(self._dividend_factors(self.__dividends, self.__split_ratios,
+                                                                          self.__previous_close))
+
+        self.__adjusted = {}
+        self._adjust()
+
+    @classmethod
+    def from_quotes(cls, quote_responses, price_field='close'):
+        """
+        Method to build an adjuster from the responses of a YahooQuoteReader read with events.
+        :param quote_responses: A dictionary mapping symbols to YahooQuoteResponse objects.
+        :type quote_responses: dict
+        :param price_field: The field of the previous close used by the dividend factors.
+        :type price_field: str
+        :rtype: CorporateActionAdjuster
+        """
+
+        quotes, splits, dividends = {}, {}, {}
+
+        for symbol, response in quote_responses.items():
+            if response.status is not None and not response.status.ok:
+                continue
+
+            quotes[symbol] = response.quote
+            splits[symbol] = response.splits
+            dividends[symbol] = response.dividends
+
+        panel = QuotePanel.from_quotes(quotes, fields=cls.PRICE_FIELDS + (cls.VOLUME_FIELD,))
+
+        return cls(panel, splits, dividends, price_field)
+
+    @property
+    def panel(self):
+        return self.__panel
+
+    @staticmethod
+    def _cumulative(bar_factors):
+        """
+        Method to turn the factors of the events on each bar into the factor of each bar: the product of the factors of
+        every later bar of the same symbol.
+        :param bar_factors: A time x symbol array of the event factors, 1 on bars without an event.
+        :type bar_factors: np.ndarray
+        :rtype: np.ndarray
+        """
+
+        later = np.vstack([bar_factors[1:], np.ones((1, bar_factors.shape[1]))])
+
+        return np.cumprod(later[::-1], axis=0)[::-1].copy()
+
+    @staticmethod
+    def _dividend_factors(dividends, split_ratios, previous_close):
+        # The previous close is converted to the share units of the bar before comparing it with the dividend.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factors = 1.0 - dividends * split_ratios / previous_close
+
+        # Dividends without a previous close, or larger than it, cannot be adjusted for.
+        return np.where(np.isfinite(factors) & (factors > 0.0), factors, 1.0)
+
+    def _event_cells(self, events, kind):
+        """
+        Method to find the cell of every event: the first bar on or after its date in the column of its symbol. Events
+        outside of the panel are dropped.
+        :param events: A dictionary mapping symbols to splits or dividends dataframes.
+        :type events: dict
+        :param kind: The kind of events, split or dividend.
+        :type kind: str
+        :return: A tuple containing the rows, columns and values of the events.
+        :rtype: tuple
+        """
+
+        rows, columns, values = [], [], []
+
+        for symbol, event_dataframe in (events or {}).items():
+            if event_dataframe is None or event_dataframe.empty or symbol not in self.__panel.symbols:
+                continue
+
+            if kind == 'split':
+                event_values = (event_dataframe['numerator'] / event_dataframe['denominator']).to_numpy(np.float64)
+            else:
+                event_values = event_dataframe['amount'].to_numpy(dtype=np.float64)
+
+            event_rows = np.searchsorted(self.__bar_seconds, unix_seconds(event_dataframe['date']))
+            in_panel = event_rows < len(self.__bar_seconds)
+
+            rows.append(event_rows[in_panel])
+            columns.append(np.full(in_panel.sum(), self.__panel.symbols.get_loc(symbol)))
+            values.append(event_values[in_panel])
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+
+        return np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+
+    @staticmethod
+    def _add_events(bar_events, cells, combine):
+        # Several events on the same bar are combined: split ratios multiply and dividends add up.
+        rows, columns, values = cells
+        combine.at(bar_events, (rows, columns), values)
+
+    def _adjust(self):
+        # Prices are multiplied by the factors and volumes divided by the split factors, so the traded value is kept.
+        factors = self.__split_factors * self.__dividend_factors
+
+        for field, raw in self.__raw.items():
+            if field == self.VOLUME_FIELD:
+                self.__adjusted[field] = raw / self.__split_factors
+            else:
+                self.__adjusted[field] = raw * factors
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=self.__panel.index, columns=self.__panel.symbols)
+
+    def split_factors(self):
+        """
+        Method to get the cumulative split factor of every bar.
+        :rtype: pd.DataFrame
+        """
+
+        return self._frame(self.__split_factors.copy())
+
+    def dividend_factors(self):
+        """
+        Method to get the cumulative dividend factor of every bar.
+        :rtype: pd.DataFrame
+        """
+
+        return self._frame(self.__dividend_factors.copy())
+
+    def split_adjusted(self, field='close'):
+        """
+        Method to get a field adjusted for splits only.
+        :param field: The field, e.g. close or volume.
+        :type field: str
+        :return: A time x symbol dataframe of the adjusted field.
+        :rtype: pd.DataFrame
+        """
+
+        if field == self.VOLUME_FIELD:
+            return self._frame(self.__adjusted[field].copy())
+
+        return self._frame(self.__raw[field] * self.__split_factors)
+
+    def total_return_adjusted(self, field='close'):
+        """
+        Method to get a field adjusted for splits and dividends, like the adjusted close of the chart API.
+        :param field: The field, e.g. close.
+        :type field: str
+        :return: A time x symbol dataframe of the adjusted field.
+        :rtype: pd.DataFrame
+        """
+
+        return self._frame(self.__adjusted[field].copy())
+
+    def adjusted_panel(self):
+        """
+        Method to get a quote panel of the total return adjusted prices and the split adjusted volumes.
+        :rtype: QuotePanel
+        """
+
+        return QuotePanel({field: self._frame(values.copy()) for field, values in self.__adjusted.items()})
+
+    def add_events(self, splits=None, dividends=None):
+        """
+        Method to apply new events, e.g. a split announced after the histories were adjusted. Only the bars before each
+        new event change, so their factors and adjusted values are rescaled in place instead of adjusting every bar
+        again, and nothing is read again.
+        :param splits: Optional. A dictionary mapping symbols to the new splits dataframes.
+        :type splits: dict
+        :param dividends: Optional. A dictionary mapping symbols to the new dividends dataframes.
+        :type dividends: dict
+        :return: The number of events applied.
+        :rtype: int
+        """
+
+        split_cells = self._event_cells(splits, 'split')
+        dividend_cells = self._event_cells(dividends, 'dividend')
+
+        # The factors of the bars with new events, before and after the events are added.
+        rows = np.concatenate([split_cells[0], dividend_cells[0]])
+        columns = np.concatenate([split_cells[1], dividend_cells[1]])
+        cells = tuple(np.unique(np.stack([rows, columns]), axis=1))
+
+        previous_close = self.__previous_close[cells]
+        old_splits = self.__split_ratios[cells]
+        old_dividends = self._dividend_factors(self.__dividends[cells], old_splits, previous_close)
+
+        self._add_events(self.__split_ratios, split_cells, np.multiply)
+        self._add_events(self.__dividends, dividend_cells, np.add)
+
+        new_splits = self.__split_ratios[cells]
+        new_dividends = self._dividend_factors(self.__dividends[cells], new_splits, previous_close)
+
+        for row, column, split_change, dividend_change in zip(*cells, old_splits / new_splits,
+                                                             new_dividends / old_dividends):
+            self.__split_factors[:row, column] *= split_change
+            self.__dividend_factors[:row, column] *= dividend_change
+
+            for field, adjusted in self.__adjusted.items():
+                adjusted[:row, column] *= 1.0 / split_change if field == self.VOLUME_FIELD else \
+                    split_change * dividend_change
+
+        return len(rows)
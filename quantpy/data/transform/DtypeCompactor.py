@@ -0,0 +1,196 @@
+import threading
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_object_dtype
+from quantpy.data.transform.QuotePanel import QuotePanel
+
+
+class DtypeCompactor(object):
+
+    # The price columns of the quote dataframes and panels.
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'adjclose')
+
+    # The volume columns.
+    VOLUME_COLUMNS = ('volume',)
+
+    # The columns of repeated strings, e.g. the sectors of a universe or the firms of the upgrades and downgrades.
+    CATEGORICAL_COLUMNS = ('sector', 'industry', 'country', 'currency', 'exchange', 'financial_currency', 'period',
+                           'filer_name', 'filer_relation', 'relation', 'ownership', 'action', 'firm', 'from_grade',
+                           'to_grade', 'type', 'recommendation_key', 'contract_size')
+
+    # The columns of dates, as unix seconds or ISO strings.
+    DATE_COLUMNS = ('date', 'end_date', 'start_date', 'epoch_date', 'epoch_grade_date', 'report_date',
+                    'ex_dividend_date', 'dividend_date', 'latest_transaction_date', 'position_direct_date',
+                    'last_fiscal_year_end', 'next_fiscal_year_end', 'most_recent_quarter', 'last_split_date',
+                    'expiry', 'last_trade_date')
+
+    def __init__(self, price_dtype='float32', volume_dtype='uint64', float_dtype=None, categorical_columns=None,
+                 date_columns=None):
+        """
+        Initializer method for the DtypeCompactor class. The compactor converts the quote and summary dataframes to
+        smaller dtypes. Every categorical column shares one categorical dtype across all the dataframes compacted,
+        so the strings of a universe are stored once and each row only holds a small integer code.
+        :param price_dtype: The dtype of the prices, e.g. float32. None keeps float64.
+        :type price_dtype: str
+        :param volume_dtype: The dtype of the volumes, e.g. uint64 or int32. Volumes with nulls use the nullable
+        version of the dtype.
+        :type volume_dtype: str
+        :param float_dtype: Optional. The dtype of the other float columns of the summaries. Default is float64, since
+        the statement values do not fit the precision of float32.
+        :type float_dtype: str
+        :param categorical_columns: Optional. The columns stored as categories. Default is CATEGORICAL_COLUMNS.
+        :type categorical_columns: list
+        :param date_columns: Optional. The columns stored as UTC datetimes. Default is DATE_COLUMNS.
+        :type date_columns: list
+        """
+
+        self.__price_dtype = price_dtype
+        self.__volume_dtype = volume_dtype
+        self.__float_dtype = float_dtype
+        self.__categorical_columns = frozenset(self.CATEGORICAL_COLUMNS if categorical_columns is None
+                                               else categorical_columns)
+        self.__date_columns = frozenset(self.DATE_COLUMNS if date_columns is None else date_columns)
+
+        # The categorical dtype of every column, grown as new values appear.
+        self.__categories = {}
+        self.__lock = threading.Lock()
+
+    def __getstate__(self):
+        # The readers are pickled to their worker processes, which cannot take the lock.
+        state = self.__dict__.copy()
+        del state['_DtypeCompactor__lock']
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def memory_usage(frame):
+        """
+        Method to get the number of bytes used by a dataframe, including the strings of its object columns.
+        :rtype: int
+        """
+
+        return int(frame.memory_usage(index=True, deep=True).sum())
+
+    def _category_dtype(self, column, values):
+        """
+        Method to get the shared categorical dtype of a column, extended with any new values.
+        :rtype: pd.CategoricalDtype
+        """
+
+        with self.__lock:
+            dtype = self.__categories.get(column)
+            known = dtype.categories if dtype is not None else pd.Index([], dtype=object)
+            new = pd.Index(values.dropna().unique()).difference(known)
+
+            if dtype is None or len(new):
+                dtype = pd.CategoricalDtype(known.append(new))
+                self.__categories[column] = dtype
+
+            return dtype
+
+    def _volume(self, values):
+        if values.isna().any():
+            # The nullable integer dtypes are capitalized, e.g. UInt64.
+            return values.astype(self.__volume_dtype.capitalize().replace('Uint', 'UInt'))
+
+        return values.astype(self.__volume_dtype)
+
+    @staticmethod
+    def _date(values):
+        """
+        Method to convert a column of unix seconds or ISO date strings to UTC datetimes. A column that does not parse
+        is kept as it is.
+        """
+
+        try:
+            if is_numeric_dtype(values):
+                return pd.to_datetime(values, unit='s', utc=True)
+
+            return pd.to_datetime(values, format='ISO8601', utc=True)
+        except (TypeError, ValueError, OverflowError):
+            return values
+
+    def compact(self, frame):
+        """
+        Method to compact a quote or summary dataframe.
+        :param frame: The dataframe.
+        :type frame: pd.DataFrame
+        :return: A new dataframe with compact dtypes.
+        :rtype: pd.DataFrame
+        """
+
+        if frame is None:
+            return None
+
+        columns = {}
+
+        for column in frame.columns:
+            values = frame[column]
+
+            if column in self.PRICE_COLUMNS and self.__price_dtype is not None and is_numeric_dtype(values):
+                values = values.astype(self.__price_dtype)
+            elif column in self.VOLUME_COLUMNS and self.__volume_dtype is not None and is_numeric_dtype(values):
+                values = self._volume(values)
+            elif column in self.__date_columns:
+                values = self._date(values)
+            elif column in self.__categorical_columns and (is_object_dtype(values) or values.dtype == 'str'):
+                values = values.astype(self._category_dtype(column, values))
+            elif self.__float_dtype is not None and values.dtype == np.float64:
+                values = values.astype(self.__float_dtype)
+
+            columns[column] = values
+
+        return pd.DataFrame(columns, index=frame.index)
+
+    def compact_responses(self, responses, properties):
+        """
+        Method to compact the dataframes of read responses in place.
+        :param responses: A response, or a dictionary mapping symbols to responses.
+        :type responses: BaseResponse or dict
+        :param properties: The names of the response properties holding dataframes.
+        :type properties: list
+        :return: The responses.
+        """
+
+        for response in (responses.values() if isinstance(responses, dict) else [responses]):
+            if response is None:
+                continue
+
+            for prop in properties:
+                state = response._property_state(prop)
+
+                if state is not None and isinstance(state[0], pd.DataFrame):
+                    setattr(response, prop, self.compact(state[0]))
+
+        return responses
+
+    def compact_panel(self, panel):
+        """
+        Method to compact a quote panel. The panel fields hold nulls, so they stay floats: the prices become the price
+        dtype, and so do the volumes when they are small enough to be exact in it.
+        :param panel: The quote panel.
+        :type panel: QuotePanel
+        :rtype: QuotePanel
+        """
+
+        fields = {}
+
+        for field in panel.fields:
+            frame = panel[field]
+
+            if field in self.PRICE_COLUMNS and self.__price_dtype is not None:
+                frame = frame.astype(self.__price_dtype)
+            elif field in self.VOLUME_COLUMNS and self.__price_dtype is not None:
+                # Integers are exact in a float up to 2 to the power of its mantissa bits, plus one.
+                exact = 2 ** (np.finfo(self.__price_dtype).nmant + 1)
+
+                if np.nanmax(frame.to_numpy(), initial=0.0) < exact:
+                    frame = frame.astype(self.__price_dtype)
+
+            fields[field] = frame
+
+        return QuotePanel(fields)
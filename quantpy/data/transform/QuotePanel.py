@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+from quantpy.utils.utils import unix_seconds
+
+
+class QuotePanel(object):
+
+    def __init__(self, fields):
+        """
+        Initializer method for the QuotePanel class. A quote panel holds one time x symbol dataframe per quote field
+        (open, high, low, close, adjclose, volume) that all share the same index and columns.
+        :param fields: A dictionary mapping field names to time x symbol dataframes.
+        :type fields: dict
+        """
+
+        if not fields:
+            raise ValueError('A quote panel needs at least one field.')
+
+        # Align every field to the union of the dates and symbols so that the underlying arrays line up.
+        frames = list(fields.values())
+        index = frames[0].index
+        columns = frames[0].columns
+
+        for frame in frames[1:]:
+            index = index.union(frame.index)
+            columns = columns.union(frame.columns, sort=False)
+
+        self.__fields = {name: frame.reindex(index=index, columns=columns) for name, frame in fields.items()}
+        self.__index = index
+        self.__symbols = columns
+
+    @classmethod
+    def from_quotes(cls, quote_dataframes, fields=('open', 'high', 'low', 'close', 'adjclose', 'volume')):
+        """
+        Method to build a quote panel from the quote dataframes returned by the YahooQuoteReader.
+        :param quote_dataframes: A dictionary mapping symbols to quote dataframes with a unix (seconds) or datetime date
+        column.
+        :type quote_dataframes: dict
+        :param fields: The quote fields to include in the panel.
+        :type fields: tuple
+        :return: The quote panel.
+        :rtype: QuotePanel
+        """
+
+        # Stack every symbol side by side in one frame. The columns become a (symbol, field) multi index.
+        stacked = pd.concat({symbol: quote_dataframe.drop_duplicates('date', keep='last').set_index('date')
+                             for symbol, quote_dataframe in quote_dataframes.items()}, axis=1)
+        # The dates are unix seconds, or datetimes when the quotes were compacted.
+        stacked.index = pd.to_datetime(stacked.index, unit='s', utc=True) if stacked.index.dtype.kind in 'iuf' else \
+            pd.to_datetime(stacked.index, utc=True)
+        stacked.sort_index(inplace=True)
+
+        panel_fields = {}
+
+        for field in fields:
+            if field in stacked.columns.get_level_values(1):
+                panel_fields[field] = stacked.xs(field, axis=1, level=1)
+
+        return cls(panel_fields)
+
+    @property
+    def index(self):
+        return self.__index
+
+    @property
+    def symbols(self):
+        return self.__symbols
+
+    @property
+    def fields(self):
+        return list(self.__fields.keys())
+
+    def __getitem__(self, field):
+        return self.__fields[field]
+
+    def __contains__(self, field):
+        return field in self.__fields
+
+    def values(self, field, dtype=np.float64):
+        """
+        Method to get a field of the panel as a contiguous time x symbol array.
+        :param field: The field name.
+        :type field: str
+        :param dtype: The dtype of the array.
+        :return: The field's values.
+        :rtype: np.ndarray
+        """
+
+        return np.ascontiguousarray(self.__fields[field].to_numpy(dtype=dtype))
+
+    def returns(self, field='close'):
+        """
+        Method to get the simple returns of a field.
+        :param field: The field to get the returns of. Default is close.
+        :type field: str
+        :return: A time x symbol dataframe of the returns. The first row is NaN.
+        :rtype: pd.DataFrame
+        """
+
+        return self.__fields[field].pct_change(fill_method=None)
+
+    def align_events(self, events, value_column, fill_value=0.0, combine=np.add):
+        """
+        Method to align per symbol event tables (e.g. the dividends or splits of the YahooQuoteReader) to the panel.
+        Each event is assigned to the first bar on or after its date, and the events that fall on the same bar are
+        combined.
+        :param events: A dictionary mapping symbols to event dataframes with a unix (seconds) or datetime date column.
+        :type events: dict
+        :param value_column: The column of the event dataframes holding the value.
+        :type value_column: str
+        :param fill_value: The value of bars without an event.
+        :type fill_value: float
+        :param combine: The ufunc combining the events of a bar with the fill value, e.g. np.add for dividends or
+        np.multiply, with a fill value of 1, for split ratios.
+        :type combine: np.ufunc
+        :return: A time x symbol dataframe of the event values.
+        :rtype: pd.DataFrame
+        """
+
+        aligned = np.full((len(self.__index), len(self.__symbols)), fill_value, dtype=np.float64)
+        bar_seconds = self.__index.as_unit('s').asi8
+
+        for symbol, event_dataframe in events.items():
+            if event_dataframe is None or event_dataframe.empty or symbol not in self.__symbols:
+                continue
+
+            # Find the bar each event falls on. Events after the last bar are not part of the panel.
+            rows = np.searchsorted(bar_seconds, unix_seconds(event_dataframe['date']), side='left')
+            in_panel = rows < len(bar_seconds)
+
+            combine.at(aligned, (rows[in_panel], self.__symbols.get_loc(symbol)),
+                       event_dataframe[value_column].to_numpy(dtype=np.float64)[in_panel])
+
+        return pd.DataFrame(aligned, index=self.__index, columns=self.__symbols)
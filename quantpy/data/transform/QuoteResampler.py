@@ -0,0 +1,235 @@
+import re
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from quantpy.utils.utils import unix_seconds
+
+
+class QuoteResampler(object):
+
+    # The number of seconds in each of the supported intraday units.
+    _INTRADAY_UNITS = {'m': 60, 'h': 3600}
+
+    # The calendar based intervals and the name of the method that buckets them.
+    _CALENDAR_INTERVALS = {'1d': '_bucket_days', '1wk': '_bucket_weeks', '1mo': '_bucket_months',
+                           '3mo': '_bucket_quarters'}
+
+    def __init__(self, interval, timezone='America/New_York', session_start='09:30', session_end='16:00',
+                 include_pre_post=False, source_interval=None):
+        """
+        Initializer method for the QuoteResampler class. The resampler builds coarser OHLCV bars out of finer bars
+        (e.g. 5m, 15m or 1h bars out of a single stored 1m series) without any extra requests to the API.
+        :param interval: The interval to resample to. Either a multiple of minutes or hours (e.g. 5m, 1h) or one of
+        1d, 1wk, 1mo, 3mo.
+        :type interval: str
+        :param timezone: The timezone of the exchange the bars were traded on.
+        :type timezone: str
+        :param session_start: The local time the regular trading session opens at (HH:MM).
+        :type session_start: str
+        :param session_end: The local time the regular trading session closes at (HH:MM).
+        :type session_end: str
+        :param include_pre_post: Include bars outside of the regular trading session?
+        :type include_pre_post: bool
+        :param source_interval: Optional. The interval of the bars being resampled. Used to make sure the requested
+        interval is coarser than the source.
+        :type source_interval: str
+        """
+
+        self.__interval = interval
+        self.__timezone = timezone
+        self.__session_start = self._parse_session_time(session_start)
+        self.__session_end = self._parse_session_time(session_end)
+        self.__include_pre_post = include_pre_post
+        self.__source_interval = source_interval
+
+        self._check_init_args()
+
+    @property
+    def interval(self):
+        return self.__interval
+
+    def _check_init_args(self):
+        """
+        Method to check that the init args are in a proper configuration.
+        :raise ValueError: If an interval is not supported or the interval is not coarser than the source interval.
+        """
+
+        if self.__session_start >= self.__session_end:
+            raise ValueError('The session start must be before the session end.')
+
+        interval_length = self._interval_length(self.__interval)
+
+        if self.__source_interval is not None and self._interval_length(self.__source_interval) >= interval_length:
+            raise ValueError('Interval {} is not coarser than the source interval {}.'
+                             .format(self.__interval, self.__source_interval))
+
+    def _interval_length(self, interval):
+        """
+        Method to get an approximate length in seconds of an interval. This is only used to order intervals.
+        :param interval: The interval string.
+        :type interval: str
+        :return: The approximate number of seconds in the interval.
+        :rtype: int
+        """
+
+        match = re.fullmatch(r'(\d+)([mh])', interval)
+
+        if match is not None:
+            return int(match.group(1)) * self._INTRADAY_UNITS[match.group(2)]
+        elif interval == '1d':
+            return 86400
+        elif interval == '1wk':
+            return 604800
+        elif interval == '1mo':
+            return 2592000
+        elif interval == '3mo':
+            return 7776000
+        else:
+            raise ValueError('Interval {} is not supported.'.format(interval))
+
+    @staticmethod
+    def _parse_session_time(session_time):
+        """
+        Method to convert a HH:MM string into the number of seconds after midnight.
+        :param session_time: The HH:MM time string.
+        :type session_time: str
+        :return: The number of seconds after midnight.
+        :rtype: int
+        """
+
+        hours, minutes = session_time.split(':')
+
+        return int(hours) * 3600 + int(minutes) * 60
+
+    def resample(self, quote_dataframe):
+        """
+        Method to resample a single quote dataframe as returned by the YahooQuoteReader.
+        :param quote_dataframe: A dataframe containing a unix (seconds) or UTC datetime date column and the open, high,
+        low, close and volume columns. An adjclose column is carried through if it is present.
+        :type quote_dataframe: pd.DataFrame
+        :return: A dataframe with the same columns containing the resampled bars labeled by their start date.
+        :rtype: pd.DataFrame
+        """
+
+        columns = [column for column in ['date', 'open', 'high', 'low', 'close', 'adjclose', 'volume']
+                   if column in quote_dataframe.columns]
+
+        # The chart API returns rows of nulls for bars without trades. They carry no information, so drop them before
+        # grouping so that the first and last values of each bucket are real prices.
+        quotes = quote_dataframe.dropna(subset=['open', 'high', 'low', 'close'], how='all')
+        quotes = quotes.sort_values('date', kind='stable')
+
+        if quotes.empty:
+            return pd.DataFrame(columns=columns)
+
+        utc_seconds = unix_seconds(quotes['date'])
+
+        # Convert the timestamps to exchange wall clock seconds so buckets line up with the trading session.
+        local_seconds = self._to_local_seconds(utc_seconds)
+        seconds_of_day = local_seconds % 86400
+
+        # Remove the pre and post market bars if they were not requested.
+        if not self.__include_pre_post:
+            in_session = (seconds_of_day >= self.__session_start) & (seconds_of_day < self.__session_end)
+            utc_seconds = utc_seconds[in_session]
+            local_seconds = local_seconds[in_session]
+            quotes = quotes[in_session]
+
+            if quotes.empty:
+                return pd.DataFrame(columns=columns)
+
+        # Find the local start of the bucket each bar falls in. Since the bars are sorted, the bucket starts are sorted
+        # as well and each bucket is one contiguous run of rows.
+        bucket_starts = self._bucket(local_seconds)
+        starts = np.flatnonzero(np.r_[True, bucket_starts[1:] != bucket_starts[:-1]])
+        ends = np.r_[starts[1:], bucket_starts.shape[0]]
+
+        # Label each bucket with its start in unix time. The UTC offset of the first bar in the bucket is used so that
+        # daylight savings changes are handled without localizing every bucket.
+        utc_offsets = local_seconds[starts] - utc_seconds[starts]
+        resampled = {'date': bucket_starts[starts] - utc_offsets}
+
+        # Reduce each column over the buckets.
+        resampled['open'] = quotes['open'].to_numpy(dtype=np.float64)[starts]
+        resampled['high'] = np.fmax.reduceat(quotes['high'].to_numpy(dtype=np.float64), starts)
+        resampled['low'] = np.fmin.reduceat(quotes['low'].to_numpy(dtype=np.float64), starts)
+        resampled['close'] = quotes['close'].to_numpy(dtype=np.float64)[ends - 1]
+
+        if 'adjclose' in quotes.columns:
+            resampled['adjclose'] = quotes['adjclose'].to_numpy(dtype=np.float64)[ends - 1]
+
+        if 'volume' in quotes.columns:
+            volume = np.nan_to_num(quotes['volume'].to_numpy(dtype=np.float64))
+            resampled['volume'] = np.add.reduceat(volume, starts).astype(np.int64)
+
+        # Compacted quotes hold UTC datetimes, so label their buckets the same way.
+        if is_datetime64_any_dtype(quotes['date']):
+            resampled['date'] = pd.to_datetime(resampled['date'], unit='s', utc=True)
+
+        return pd.DataFrame(resampled, columns=columns)
+
+    def resample_many(self, quote_dataframes):
+        """
+        Method to resample the quote dataframes of many symbols.
+        :param quote_dataframes: A dictionary mapping symbols to their quote dataframes.
+        :type quote_dataframes: dict
+        :return: A dictionary mapping symbols to their resampled quote dataframes.
+        :rtype: dict
+        """
+
+        return {symbol: self.resample(quote_dataframe) for symbol, quote_dataframe in quote_dataframes.items()}
+
+    def _to_local_seconds(self, utc_seconds):
+        """
+        Method to convert unix times into the number of wall clock seconds since the epoch in the exchange timezone.
+        :param utc_seconds: The unix times.
+        :type utc_seconds: np.ndarray
+        :return: The local wall clock times.
+        :rtype: np.ndarray
+        """
+
+        local_times = pd.to_datetime(utc_seconds, unit='s', utc=True).tz_convert(self.__timezone).tz_localize(None)
+
+        return local_times.to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+    def _bucket(self, local_seconds):
+        """
+        Method to find the local start of the bucket each bar falls into.
+        :param local_seconds: The local wall clock times of the bars.
+        :type local_seconds: np.ndarray
+        :return: The local wall clock start of each bar's bucket.
+        :rtype: np.ndarray
+        """
+
+        if self.__interval in self._CALENDAR_INTERVALS:
+            return getattr(self, self._CALENDAR_INTERVALS[self.__interval])(local_seconds)
+
+        # Intraday buckets are anchored to the session open, e.g. hourly bars start at 9:30, 10:30 and so on.
+        step = self._interval_length(self.__interval)
+        days = local_seconds - local_seconds % 86400
+        offsets = (local_seconds - days - self.__session_start) // step * step
+
+        return days + self.__session_start + offsets
+
+    @staticmethod
+    def _bucket_days(local_seconds):
+        return local_seconds - local_seconds % 86400
+
+    @staticmethod
+    def _bucket_weeks(local_seconds):
+        # The epoch was a Thursday, so shift by three days to have the weeks start on a Monday.
+        days = local_seconds // 86400
+
+        return ((days + 3) // 7 * 7 - 3) * 86400
+
+    @staticmethod
+    def _bucket_months(local_seconds):
+        months = local_seconds.astype('datetime64[s]').astype('datetime64[M]')
+
+        return months.astype('datetime64[s]').astype(np.int64)
+
+    @staticmethod
+    def _bucket_quarters(local_seconds):
+        months = local_seconds.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+
+        return (months - months % 3).astype('datetime64[M]').astype('datetime64[s]').astype(np.int64)
@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+from quantpy.calendars.TradingCalendar import TradingCalendar
+from quantpy.data.transform.QuotePanel import QuotePanel
+
+
+class QuoteValidator(object):
+
+    # The checks, in the order of their bit in the flags of a repaired panel.
+    CHECKS = ('null_ohlc', 'high_low', 'zero_volume', 'stale_close', 'jump', 'gap')
+
+    # The checks repaired by default. Zero volume and stale closes are suspicious but can be genuine.
+    REPAIR_CHECKS = ('null_ohlc', 'high_low', 'jump')
+
+    # The repair methods.
+    REPAIR_METHODS = ('drop', 'ffill', 'flag')
+
+    _PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+    def __init__(self, interval='1d', calendar=None, zero_volume_bars=5, stale_bars=5, jump_ratio=1.8, checks=None):
+        """
+        Initializer method for the QuoteValidator class. Every check is one vectorized pass over the time x symbol
+        arrays of a quote panel, and consecutive bad bars of a symbol are reported as one issue.
+        :param interval: The interval of the bars, e.g. 1d or 5m. The gaps are checked against the sessions of the
+        calendar at this interval.
+        :type interval: str
+        :param calendar: Optional. The trading calendar of the symbols. Default is the NYSE.
+        :type calendar: TradingCalendar
+        :param zero_volume_bars: The number of consecutive zero volume bars reported as an issue.
+        :type zero_volume_bars: int
+        :param stale_bars: The number of consecutive bars with the same close reported as an issue.
+        :type stale_bars: int
+        :param jump_ratio: The close to close ratio (or its inverse) reported as a split-like jump when no split
+        explains it.
+        :type jump_ratio: float
+        :param checks: Optional. The checks to run. Default is every check.
+        :type checks: list
+        """
+
+        checks = self.CHECKS if checks is None else tuple(checks)
+        unknown = set(checks) - set(self.CHECKS)
+
+        if unknown:
+            raise ValueError('Unknown checks: {}.'.format(', '.join(sorted(unknown))))
+
+        self.__interval = interval
+        self.__calendar = calendar if calendar is not None else TradingCalendar.nyse()
+        self.__zero_volume_bars = zero_volume_bars
+        self.__stale_bars = stale_bars
+        self.__jump_ratio = jump_ratio
+        self.__checks = checks
+
+    @property
+    def checks(self):
+        return self.__checks
+
+    @staticmethod
+    def _runs(mask):
+        """
+        Method to find the runs of consecutive True values down every column of a mask.
+        :param mask: A time x symbol boolean array.
+        :type mask: np.ndarray
+        :return: A tuple containing the columns, first rows and lengths of the runs, ordered by column then row.
+        :rtype: tuple
+        """
+
+        padding = np.zeros((1, mask.shape[1]), dtype=np.int8)
+        edges = np.diff(np.vstack([padding, mask.astype(np.int8), padding]), axis=0).T
+
+        # Transposed, the edges come out ordered by column, so the nth start and the nth end belong to the same run.
+        columns, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+
+        return columns, starts, ends - starts
+
+    def _masks(self, panel, splits=None):
+        """
+        Method to run the bar checks of a panel.
+        :param panel: The quote panel.
+        :type panel: QuotePanel
+        :param splits: Optional. A dictionary mapping symbols to the splits dataframe of the YahooQuoteReader. A jump on
+        the bar of a split is not an issue.
+        :type splits: dict
+        :return: A dictionary mapping checks to a tuple of a time x symbol mask of the bad bars and the time x symbol
+        values reported with them, or None.
+        :rtype: dict
+        """
+
+        prices = {field: panel.values(field) for field in self._PRICE_FIELDS if field in panel}
+        close = prices['close']
+        masks = {}
+
+        # The bars of a symbol between its first and last close. Outside of it, the symbol was not trading.
+        present = ~np.isnan(close)
+        listed = np.logical_or.accumulate(present, axis=0) & np.logical_or.accumulate(present[::-1], axis=0)[::-1]
+
+        if 'null_ohlc' in self.__checks:
+            nulls = np.zeros(close.shape, dtype=bool)
+
+            for values in prices.values():
+                nulls |= np.isnan(values)
+
+            masks['null_ohlc'] = (nulls & listed, None)
+
+        if 'high_low' in self.__checks and 'high' in prices and 'low' in prices:
+            high, low = prices['high'], prices['low']
+
+            # Comparisons with nulls are False, so null bars are only reported by null_ohlc.
+            bad = high < low
+            for field in ('open', 'close'):
+                if field in prices:
+                    bad |= (prices[field] > high) | (prices[field] < low)
+
+            masks['high_low'] = (bad, None)
+
+        if 'zero_volume' in self.__checks and 'volume' in panel:
+            zero = panel.values('volume') == 0.0
+            masks['zero_volume'] = (self._long_runs(zero, self.__zero_volume_bars), None)
+
+        if 'stale_close' in self.__checks:
+            # A bar is stale when its close repeats the previous one. A run of n repeats is n + 1 identical closes, so
+            # the bar before each run is marked too.
+            repeated = np.vstack([np.zeros((1, close.shape[1]), dtype=bool), close[1:] == close[:-1]])
+            stale = self._long_runs(repeated, self.__stale_bars - 1)
+            stale[:-1] |= stale[1:]
+            masks['stale_close'] = (stale, None)
+
+        if 'jump' in self.__checks:
+            previous_close = pd.DataFrame(close).ffill().shift(1).to_numpy()
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratios = close / previous_close
+
+            jumps = (ratios >= self.__jump_ratio) | (ratios <= 1.0 / self.__jump_ratio)
+
+            if splits:
+                split_ratios = {symbol: split_dataframe.assign(ratio=split_dataframe['numerator'] /
+                                                              split_dataframe['denominator'])
+                                for symbol, split_dataframe in splits.items() if split_dataframe is not None}
+                bar_ratios = panel.align_events(split_ratios, 'ratio', fill_value=1.0, combine=np.multiply)
+                jumps &= bar_ratios.to_numpy() == 1.0
+
+            masks['jump'] = (jumps, ratios)
+
+        return masks
+
+    def _long_runs(self, mask, min_length):
+        """
+        Method to keep the runs of a mask that are at least min_length bars long.
+        :rtype: np.ndarray
+        """
+
+        columns, starts, lengths = self._runs(mask)
+        long = lengths >= max(min_length, 1)
+
+        # Mark the bars of the long runs with +1 at their start and -1 after their end, then sum down the columns.
+        marks = np.zeros((mask.shape[0] + 1, mask.shape[1]), dtype=np.int32)
+        np.add.at(marks, (starts[long], columns[long]), 1)
+        np.add.at(marks, (starts[long] + lengths[long], columns[long]), -1)
+
+        return np.cumsum(marks[:-1], axis=0) > 0
+
+    def _gaps(self, panel):
+        """
+        Method to find the regular session bars missing from the index of a panel, i.e. missing for every symbol.
+        :return: A boolean array over the expected bars, True where the bar is missing, and the expected bar times.
+        :rtype: tuple
+        """
+
+        bar_seconds = panel.index.as_unit('s').asi8
+
+        if not len(bar_seconds):
+            return np.zeros(0, dtype=bool), bar_seconds
+
+        expected = self.__calendar.bar_times(int(bar_seconds[0]), int(bar_seconds[-1]) + 1, self.__interval)
+        missing = self.__calendar.missing_bars(bar_seconds, self.__interval, int(bar_seconds[0]),
+                                               int(bar_seconds[-1]) + 1)
+
+        return np.isin(expected, missing), expected
+
+    def validate(self, panel, splits=None):
+        """
+        Method to check a quote panel.
+        :param panel: The quote panel, e.g. QuotePanel.from_quotes of the quotes of a YahooQuoteReader read.
+        :type panel: QuotePanel
+        :param splits: Optional. A dictionary mapping symbols to the splits dataframe of the YahooQuoteReader. A jump on
+        the bar of a split is not an issue.
+        :type splits: dict
+        :return: A dataframe of the issues with one row per run of consecutive bad bars: the symbol (null for the bars
+        missing from the whole panel), the check, the first and last bar, the number of bars and, for the jumps, the
+        close to close ratio.
+        :rtype: pd.DataFrame
+        """
+
+        tables = []
+
+        for check, (mask, values) in self._masks(panel, splits).items():
+            columns, starts, lengths = self._runs(mask)
+
+            tables.append(pd.DataFrame({
+                'symbol': np.asarray(panel.symbols)[columns],
+                'check': check,
+                'start': panel.index[starts],
+                'end': panel.index[starts + lengths - 1],
+                'bars': lengths,
+                'value': values[starts, columns] if values is not None else np.nan}))
+
+        if 'gap' in self.__checks and self.__interval is not None:
+            missing, expected = self._gaps(panel)
+            _, starts, lengths = self._runs(missing[:, None])
+            times = pd.to_datetime(expected, unit='s', utc=True)
+
+            tables.append(pd.DataFrame({'symbol': None, 'check': 'gap', 'start': times[starts],
+                                        'end': times[starts + lengths - 1], 'bars': lengths, 'value': np.nan}))
+
+        issues = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(
+            columns=['symbol', 'check', 'start', 'end', 'bars', 'value'])
+
+        # Repeated strings become categories, so the table stays small for large panels.
+        issues['symbol'] = issues['symbol'].astype('category')
+        issues['check'] = pd.Categorical(issues['check'], categories=self.CHECKS)
+        issues['bars'] = issues['bars'].astype(np.int32)
+        issues['value'] = issues['value'].astype(np.float32)
+
+        return issues.sort_values(['symbol', 'start', 'check'], kind='stable').reset_index(drop=True)
+
+    def repair(self, panel, method='drop', checks=None, splits=None):
+        """
+        Method to repair the bad bars of a quote panel.
+        :param panel: The quote panel.
+        :type panel: QuotePanel
+        :param method: The repair: drop sets every field of the bad bars to null, ffill carries the last good prices
+        forward with a zero volume, and flag keeps the bars and adds a flags field holding one bit per check (in the
+        order of CHECKS) to the panel.
+        :type method: str
+        :param checks: Optional. The checks repaired. Default is null OHLC, high below low and jumps.
+        :type checks: list
+        :param splits: Optional. A dictionary mapping symbols to the splits dataframe of the YahooQuoteReader.
+        :type splits: dict
+        :return: The repaired panel.
+        :rtype: QuotePanel
+        """
+
+        if method not in self.REPAIR_METHODS:
+            raise ValueError('Method must be one of {}.'.format(', '.join(self.REPAIR_METHODS)))
+
+        checks = self.REPAIR_CHECKS if checks is None else tuple(checks)
+        masks = self._masks(panel, splits)
+        shape = (len(panel.index), len(panel.symbols))
+
+        if method == 'flag':
+            flags = np.zeros(shape, dtype=np.uint8)
+
+            for check, (mask, _) in masks.items():
+                if check in checks:
+                    flags |= mask.astype(np.uint8) << self.CHECKS.index(check)
+
+            fields = {field: panel[field] for field in panel.fields}
+            fields['flags'] = pd.DataFrame(flags, index=panel.index, columns=panel.symbols)
+
+            return QuotePanel(fields)
+
+        bad = np.zeros(shape, dtype=bool)
+        for check, (mask, _) in masks.items():
+            if check in checks:
+                bad |= mask
+
+        fields = {}
+        for field in panel.fields:
+            values = panel.values(field)
+            values[bad] = np.nan
+
+            frame = pd.DataFrame(values, index=panel.index, columns=panel.symbols)
+
+            if method == 'ffill' and field == 'volume':
+                frame = frame.mask(bad, 0.0)
+            elif method == 'ffill':
+                # Only the repaired bars are filled, so the bars before a listing stay null.
+                frame = frame.mask(bad, frame.ffill())
+
+            fields[field] = frame
+
+        return QuotePanel(fields)
@@ -0,0 +1,302 @@
+import json
+import re
+import numpy as np
+
+
+class YahooChartStreamParser(object):
+
+    # The path of the chart result in the response.
+    _RESULT = ('chart', 'result', 0)
+
+    # The numeric arrays of the chart result, by their path, and the names of their columns.
+    ARRAYS = {_RESULT + ('timestamp',): 'date',
+              _RESULT + ('indicators', 'quote', 0, 'open'): 'open',
+              _RESULT + ('indicators', 'quote', 0, 'high'): 'high',
+              _RESULT + ('indicators', 'quote', 0, 'low'): 'low',
+              _RESULT + ('indicators', 'quote', 0, 'close'): 'close',
+              _RESULT + ('indicators', 'quote', 0, 'volume'): 'volume',
+              _RESULT + ('indicators', 'adjclose', 0, 'adjclose'): 'adjclose'}
+
+    # The objects of the response that are small enough to be decoded whole, by their path.
+    OBJECTS = {_RESULT + ('meta',): 'meta',
+               _RESULT + ('events',): 'events',
+               ('chart', 'error'): 'error'}
+
+    # A JSON token after optional whitespace: a string, a punctuation character, or a literal (number, true, false or
+    # null). A string cut by the end of a chunk does not match, so it is read again once more data arrives.
+    _TOKEN = re.compile(rb'\s*(?:("(?:[^"\\]|\\.)*")|([{}\[\]:,])|([^\s{}\[\]:,"]+))')
+
+    _CLOSING = {b'{': b'}', b'[': b']'}
+
+    def __init__(self):
+        """
+        Initializer method for the YahooChartStreamParser class. The parser decodes a chart response fed to it in
+        chunks, e.g. from requests.Response.iter_content. The numbers of the timestamp and quote arrays are converted to
+        NumPy arrays a chunk at a time, never becoming Python lists, and once the timestamps are read the other arrays
+        are preallocated to their length and filled in place. The memory used is close to the size of the final arrays
+        plus one chunk, instead of the text, the decoded lists and the dataframe of response.json().
+        """
+
+        self.__buffer = b''
+        self.__position = 0
+
+        # The open containers and the path to the current value: a key for every object and an index for every array.
+        self.__containers = []
+        self.__path = []
+        self.__expect = 'value'
+
+        # The raw object being captured, from its first byte in the buffer, and its nesting depth.
+        self.__capture_start = None
+        self.__capture_depth = 0
+
+        # The numeric array being read, the length of the timestamps, and the arrays either preallocated (with the
+        # number of values filled) or, before the length is known, their chunks.
+        self.__array = None
+        self.__length = None
+        self.__filled = {}
+        self.__chunks = {}
+        self.__names = []
+
+        self.__objects = {}
+        self.__has_result = False
+
+    @classmethod
+    def parse(cls, chunks):
+        """
+        Method to parse a whole chart response.
+        :param chunks: The chunks of the response body, e.g. response.iter_content(65536).
+        :type chunks: iterable
+        :return: The parser, holding the arrays and objects of the chart.
+        :rtype: YahooChartStreamParser
+        """
+
+        parser = cls()
+
+        for chunk in chunks:
+            parser.feed(chunk)
+
+        parser.close()
+
+        return parser
+
+    @property
+    def has_result(self):
+        return self.__has_result
+
+    @property
+    def objects(self):
+        """
+        Property to get the decoded small objects of the chart: meta, events and error, when the response had them.
+        :rtype: dict
+        """
+
+        return dict(self.__objects)
+
+    @property
+    def arrays(self):
+        """
+        Property to get the numeric arrays of the chart, in the order they appeared, keyed by their column name. The
+        timestamps are int64 and the other arrays float64, with NaN for nulls.
+        :rtype: dict
+        """
+
+        return {name: self._array(name) for name in self.__names}
+
+    def _array(self, name):
+        chunks = self.__chunks.get(name, [])
+
+        if name in self.__filled:
+            array, filled = self.__filled[name]
+            chunks = [array[:filled]] + chunks
+
+        if len(chunks) == 1:
+            return chunks[0]
+
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=self._dtype(name))
+
+    @staticmethod
+    def _dtype(name):
+        return np.int64 if name == 'date' else np.float64
+
+    def feed(self, chunk):
+        """
+        Method to parse the next chunk of the response body.
+        :param chunk: The chunk.
+        :type chunk: bytes
+        """
+
+        # Only the unparsed tail of the previous chunks is kept, usually a few bytes, or an object being captured.
+        keep = self.__position if self.__capture_start is None else self.__capture_start
+
+        self.__buffer = self.__buffer[keep:] + chunk
+        self.__position -= keep
+
+        if self.__capture_start is not None:
+            self.__capture_start = 0
+
+        self._parse(final=False)
+
+    def close(self):
+        """
+        Method to parse the end of the response body.
+        :raises json.JSONDecodeError: When the body is not complete, valid JSON.
+        """
+
+        self._parse(final=True)
+
+        if self.__expect != 'end':
+            raise self._decode_error('The chart response ended before its JSON was complete', len(self.__buffer))
+
+    def _decode_error(self, message, position):
+        # The errors are JSON decode errors, like the ones of a decoded response. The position is in the kept buffer.
+        return json.JSONDecodeError(message, self.__buffer.decode('utf-8', errors='replace'), position)
+
+    def _parse(self, final):
+        while True:
+            if self.__array is not None:
+                if not self._read_numbers(final):
+                    return
+
+                continue
+
+            match = self._TOKEN.match(self.__buffer, self.__position)
+
+            # A literal at the end of the buffer could continue in the next chunk.
+            if match is None or (match.group(3) is not None and match.end() == len(self.__buffer) and not final):
+                if final and self.__buffer[self.__position:].strip():
+                    raise self._decode_error('Invalid JSON in the chart response', self.__position)
+
+                return
+
+            self.__position = match.end()
+            string, punctuation, literal = match.groups()
+            start = match.start(1 if string is not None else 2 if punctuation is not None else 3)
+
+            if self.__capture_start is not None:
+                self._capture(punctuation)
+            else:
+                self._token(string, punctuation, literal, start)
+
+    def _capture(self, punctuation):
+        # The strings of a captured object are skipped as tokens, so only its brackets change the depth.
+        if punctuation in (b'{', b'['):
+            self.__capture_depth += 1
+        elif punctuation in (b'}', b']'):
+            self.__capture_depth -= 1
+
+        if self.__capture_depth == 0:
+            name = self.OBJECTS[tuple(self.__path)]
+            self.__objects[name] = json.loads(self.__buffer[self.__capture_start:self.__position])
+            self.__capture_start = None
+            self._end_value()
+
+    def _token(self, string, punctuation, literal, start):
+        if self.__expect == 'key' and string is not None:
+            self.__path[-1] = json.loads(string)
+            self.__expect = 'colon'
+        elif self.__expect == 'colon' and punctuation == b':':
+            self.__expect = 'value'
+        elif self.__expect == 'comma' and punctuation == b',':
+            if self.__containers[-1] == b'{':
+                self.__expect = 'key'
+            else:
+                self.__path[-1] += 1
+                self.__expect = 'value'
+        elif punctuation in (b'}', b']') and self.__expect in ('key', 'comma', 'value') and self.__containers and \
+                self._CLOSING[self.__containers[-1]] == punctuation:
+            # An empty object closes where a key is expected and an empty array where a value is.
+            self.__containers.pop()
+            self.__path.pop()
+            self._end_value()
+        elif self.__expect == 'value':
+            self._value(string, punctuation, literal, start)
+        else:
+            raise self._decode_error('Unexpected token in the chart response', start)
+
+    def _value(self, string, punctuation, literal, start):
+        path = tuple(self.__path)
+
+        if path in self.OBJECTS:
+            if punctuation in (b'{', b'['):
+                self.__capture_start = start
+                self.__capture_depth = 1
+            else:
+                self.__objects[self.OBJECTS[path]] = json.loads(string if string is not None else literal)
+                self._end_value()
+        elif punctuation == b'[' and path in self.ARRAYS:
+            self.__array = self.ARRAYS[path]
+        elif punctuation in (b'{', b'['):
+            self.__has_result = self.__has_result or path == self._RESULT
+            self.__containers.append(punctuation)
+            self.__path.append(None if punctuation == b'{' else 0)
+            self.__expect = 'key' if punctuation == b'{' else 'value'
+        elif punctuation is None:
+            # The other scalars of the chart are not needed.
+            self._end_value()
+        else:
+            raise self._decode_error('Unexpected token in the chart response', start)
+
+    def _end_value(self):
+        self.__expect = 'comma' if self.__containers else 'end'
+
+    def _read_numbers(self, final):
+        """
+        Method to convert the numbers of the array being read that are in the buffer.
+        :return: Is the array complete?
+        :rtype: bool
+        """
+
+        end = self.__buffer.find(b']', self.__position)
+
+        if end < 0:
+            # Convert up to the last complete number. The one after the last comma could continue in the next chunk.
+            end = self.__buffer.rfind(b',', self.__position)
+
+            if end >= 0:
+                self._append(self.__array, self.__buffer[self.__position:end])
+                self.__position = end + 1
+            elif final:
+                raise self._decode_error('The chart response ended inside the {} array'.format(self.__array),
+                                         len(self.__buffer))
+
+            return False
+
+        self._append(self.__array, self.__buffer[self.__position:end])
+        self.__position = end + 1
+
+        # The timestamps give the length of every other array.
+        if self.__array == 'date':
+            self.__chunks['date'] = [self._array('date')]
+            self.__length = len(self.__chunks['date'][0])
+
+        self.__array = None
+        self._end_value()
+
+        return True
+
+    def _append(self, name, segment):
+        segment = segment.strip()
+
+        if not segment:
+            return
+
+        if name not in self.__names:
+            self.__names.append(name)
+
+        dtype = self._dtype(name)
+        values = np.array(segment.replace(b'null', b'nan').split(b','), dtype=dtype)
+
+        if name not in self.__filled and name not in self.__chunks and self.__length is not None:
+            self.__filled[name] = (np.empty(self.__length, dtype=dtype), 0)
+
+        if name in self.__filled and name not in self.__chunks:
+            array, filled = self.__filled[name]
+
+            if filled + len(values) <= len(array):
+                array[filled:filled + len(values)] = values
+                self.__filled[name] = (array, filled + len(values))
+
+                return
+
+        # The array is longer than the timestamps, or they are not read yet, so its chunks are joined at the end.
+        self.__chunks.setdefault(name, []).append(values)
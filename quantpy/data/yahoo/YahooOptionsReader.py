@@ -0,0 +1,349 @@
+import itertools
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from quantpy.data.base.BaseReader import BaseReader
+from quantpy.data.base.CachedSession import CachedSession
+from quantpy.data.base.ReaderHook import ReaderHook, ReadRecord
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+
+
+class YahooOptionsReader(BaseReader):
+
+    # The fields of a contract and their columns in the chain table.
+    CONTRACT_FIELDS = {'contractSymbol': 'contract_symbol', 'strike': 'strike', 'bid': 'bid', 'ask': 'ask',
+                       'lastPrice': 'last_price', 'change': 'change', 'percentChange': 'percent_change',
+                       'volume': 'volume', 'openInterest': 'open_interest', 'impliedVolatility': 'implied_volatility',
+                       'inTheMoney': 'in_the_money', 'lastTradeDate': 'last_trade_date',
+                       'contractSize': 'contract_size', 'currency': 'currency'}
+
+    # The numeric columns, stored as floats with NaN for the missing values, or as integers when none are missing.
+    FLOAT_COLUMNS = ('strike', 'bid', 'ask', 'last_price', 'change', 'percent_change', 'implied_volatility')
+    INTEGER_COLUMNS = ('volume', 'open_interest', 'last_trade_date')
+
+    # The columns of the chain table.
+    CHAIN_COLUMNS = ['symbol', 'expiry', 'type'] + list(CONTRACT_FIELDS.values())
+
+    # The contract types, in the order of their categories.
+    TYPES = ('call', 'put')
+
+    def __init__(self, symbols, expirations=None, max_expirations=None, max_connections=8, rate_limiter=None,
+                 session=None, timeout=5):
+        """
+        Initializer method for the YahooOptionsReader class. The reader gets the option chains of many underlyings. The
+        first request of a symbol discovers its expirations and holds the chain of the nearest one, then the other
+        expirations of every symbol are requested concurrently over one pooled session. The contracts of every page
+        are read into columns at once, and every chain ends up in one table.
+        :param symbols: The list of symbols to be used.
+        :type symbols: str or list
+        :param expirations: Optional. The expirations to read, as unix seconds or dates. Expirations a symbol does not
+        list are skipped. Default is every expiration.
+        :type expirations: list
+        :param max_expirations: Optional. The number of nearest expirations to read. Default is every expiration.
+        :type max_expirations: int
+        :param max_connections: The maximum number of requests in flight at once, and the size of the connection pool.
+        :type max_connections: int
+        :param rate_limiter: Optional. A rate limiter acquired before every request, e.g. the one of a batch run. A
+        CachedSession acquires its own rate limiter, so it is not acquired for it.
+        :type rate_limiter: RateLimiter
+        :param session: Optional. The session used for the requests, e.g. a CachedSession. Default is a new session
+        with a connection pool of max_connections.
+        :type session: requests.Session
+        :param timeout: The amount of time until a request times out.
+        :type timeout: float
+        """
+
+        self.__expirations = None if expirations is None else {self._unix(expiration) for expiration in expirations}
+        self.__max_expirations = max_expirations
+        self.__max_connections = max_connections
+        self.__rate_limiter = rate_limiter
+        self.__session = session
+        self.__pep_pattern = re.compile(r'(?<!^)(?=[A-Z])')
+        self.__statuses = []
+        self.__underlyings = None
+
+        # Call the super class' constructor.
+        super().__init__(symbols, timeout)
+
+    @staticmethod
+    def _unix(expiration):
+        if isinstance(expiration, (int, np.integer)):
+            return int(expiration)
+
+        # The expirations are listed at midnight UTC.
+        return int(pd.Timestamp(expiration, tz='UTC').normalize().timestamp())
+
+    @property
+    def _url(self):
+        """
+        Method to get the url of the API endpoint for Yahoo! Finance.
+        """
+
+        return 'https://query2.finance.yahoo.com/v7/finance/options/{}'
+
+    @property
+    def _params(self):
+        """
+        Method to get the parameters for the API endpoint. Without a date, the endpoint answers with the nearest
+        expiration.
+        :return: A dictionary of parameters.
+        :rtype dict
+        """
+
+        return {}
+
+    @property
+    def statuses(self):
+        """
+        Property to get the errors of the last read: one status per failed symbol and per expiration that failed.
+        :rtype: list
+        """
+
+        return self.__statuses
+
+    @property
+    def underlyings(self):
+        """
+        Property to get the quotes of the underlyings of the last read, indexed by symbol, e.g. the regular market
+        price and the trailing annual dividend yield used to price the contracts.
+        :rtype: pd.DataFrame
+        """
+
+        return self.__underlyings
+
+    def _check_init_args(self):
+        if self.__max_expirations is not None and self.__max_expirations < 1:
+            raise ValueError('max_expirations must be at least 1.')
+
+        # Drop duplicate and empty symbols, keeping the order they were given in.
+        self._symbols = list(dict.fromkeys(symbol for symbol in self._symbols if symbol))
+
+    def _session(self):
+        if self.__session is not None:
+            return self.__session
+
+        # Every thread shares the pool, so it holds a connection per thread instead of the default ten.
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.__max_connections)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def _select_expirations(self, expirations):
+        """
+        Method to pick the expirations of a symbol that are read.
+        :param expirations: The unix expirations listed by the symbol.
+        :type expirations: list
+        :rtype: list
+        """
+
+        expirations = sorted(expirations)
+
+        if self.__expirations is not None:
+            expirations = [expiration for expiration in expirations if expiration in self.__expirations]
+
+        if self.__max_expirations is not None:
+            expirations = expirations[:self.__max_expirations]
+
+        return expirations
+
+    def _fetch(self, symbol, expiration, session):
+        """
+        Method to request and parse one page of a chain. Runs in a fetch thread.
+        :param symbol: The symbol.
+        :type symbol: str
+        :param expiration: The unix expiration, or None for the nearest one.
+        :type expiration: int
+        :param session: The session.
+        :type session: requests.Session
+        :return: A tuple containing the symbol, the expiration and the parsed page.
+        :rtype: tuple
+        """
+
+        if self.__rate_limiter is not None and not isinstance(session, CachedSession):
+            self.__rate_limiter.acquire()
+
+        params = {} if expiration is None else {'date': expiration}
+
+        if not ReaderHook.enabled():
+            page = self._read_symbol(symbol, session, params=params)
+        else:
+            record = ReadRecord(self._endpoint, symbol)
+            page = self._read_symbol(symbol, session, record, params)
+            ReaderHook.emit_read(record)
+
+        return symbol, expiration, page
+
+    def read(self):
+        """
+        Function to read the option chains of the requested symbols.
+        :return: A dataframe of every contract, one row each, sorted by symbol, expiry, type and strike. The expiries
+        are unix seconds and the types categories. The errors of the read are in statuses and the underlying quotes in
+        underlyings.
+        :rtype: pd.DataFrame
+        """
+
+        self._check_init_args()
+
+        session = self._session()
+        chains, underlyings, self.__statuses = [], {}, []
+
+        # The finished requests are queued as they complete, so the loop waits on one queue however many are pending.
+        finished = queue.Queue()
+
+        try:
+            with ThreadPoolExecutor(self.__max_connections) as executor:
+                # The first page of every symbol lists its expirations, and each one found adds its own requests.
+                for symbol in self._symbols:
+                    executor.submit(self._fetch, symbol, None, session).add_done_callback(finished.put)
+
+                pending = len(self._symbols)
+
+                while pending:
+                    symbol, expiration, (page, status) = finished.get().result()
+                    pending -= 1
+
+                    if status is not None:
+                        if expiration is not None:
+                            status.module = str(expiration)
+
+                        self.__statuses.append(status)
+                        continue
+
+                    if expiration is not None:
+                        chains.append(page['chain'])
+                        continue
+
+                    underlyings[symbol] = page['quote']
+                    selected = self._select_expirations(page['expirations'])
+
+                    # The first page already holds the nearest expiration.
+                    if page['expiration'] in selected:
+                        chains.append(page['chain'])
+
+                    for expiration in selected:
+                        if expiration != page['expiration']:
+                            executor.submit(self._fetch, symbol, expiration, session).add_done_callback(finished.put)
+                            pending += 1
+        finally:
+            if self.__session is None:
+                session.close()
+
+        self.__underlyings = self._underlyings_table(underlyings)
+        self._read_called = True
+
+        return self._chain_table(chains)
+
+    def _chain_table(self, chains):
+        """
+        Method to join the column lists of the pages into one table. Each column is built once for every page, so no
+        per page dataframes are made and joined.
+        :param chains: The chains of the pages, see _parse_chain.
+        :type chains: list
+        :rtype: pd.DataFrame
+        """
+
+        chains = [chain for chain in chains if chain is not None]
+        counts = [chain['count'] for chain in chains]
+
+        columns = {'symbol': np.repeat(np.array([chain['symbol'] for chain in chains], dtype=object), counts),
+                   'expiry': np.repeat(np.array([chain['expiry'] for chain in chains], dtype=np.int64), counts),
+                   'type': pd.Categorical.from_codes(np.concatenate([chain['type'] for chain in chains] +
+                                                                    [np.empty(0, dtype=np.int8)]), self.TYPES)}
+
+        for column in self.CONTRACT_FIELDS.values():
+            values = list(itertools.chain.from_iterable(chain[column] for chain in chains))
+
+            if column in self.FLOAT_COLUMNS or column in self.INTEGER_COLUMNS:
+                # None becomes NaN.
+                values = np.array(values, dtype=np.float64)
+
+                if column in self.INTEGER_COLUMNS and not np.isnan(values).any():
+                    values = values.astype(np.int64)
+
+            columns[column] = values
+
+        chain = pd.DataFrame(columns)
+
+        # The pages arrive in any order, so the table is sorted once.
+        return chain.sort_values(['symbol', 'expiry', 'type', 'strike'], kind='stable').reset_index(drop=True)
+
+    def _underlyings_table(self, underlyings):
+        if not underlyings:
+            return pd.DataFrame(index=pd.Index([], name='symbol'))
+
+        table = pd.DataFrame.from_records(list(underlyings.values()), index=pd.Index(list(underlyings), name='symbol'))
+        table = table.drop(columns='symbol', errors='ignore')
+        table.columns = [self.__pep_pattern.sub('_', column).lower() for column in table.columns]
+
+        # Keep the order the symbols were requested in.
+        return table.reindex([symbol for symbol in self._symbols if symbol in table.index])
+
+    def _parse_response(self, symbol, response):
+        """
+        Method to parse one page of a chain: the calls and puts of one expiration.
+        :param symbol: The symbol of the request.
+        :type symbol: str
+        :param response: The response of the API call.
+        :type response: requests.Response
+        :return: A tuple containing a dictionary with the chain, its expiration, the listed expirations and the
+        underlying quote, and None, or None and a status.
+        :rtype: tuple
+        """
+
+        # Responses other than 200 carry an error description instead of the results.
+        if response.status_code != 200:
+            return None, YahooReadStatus.from_response(symbol, response, 'optionChain')
+
+        try:
+            results = response.json()['optionChain']['result']
+        except Exception:
+            return None, YahooReadStatus.from_response(symbol, response, 'optionChain')
+
+        # Unknown symbols have no results.
+        if not results:
+            return None, YahooReadStatus(YahooStatusCode.SYMBOL_NOT_FOUND, symbol=symbol, http_status=200)
+
+        result = results[0]
+
+        try:
+            options = result.get('options') or [{}]
+            chain = self._parse_chain(symbol, options[0])
+        except Exception as e:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, symbol=symbol, module='options',
+                                         message=repr(e))
+
+        return {'chain': chain, 'expiration': options[0].get('expirationDate'),
+                'expirations': result.get('expirationDates', []), 'quote': result.get('quote', {})}, None
+
+    def _parse_chain(self, symbol, option):
+        """
+        Method to read the calls and puts of an expiration into columns.
+        :param symbol: The symbol.
+        :type symbol: str
+        :param option: The option object of the expiration, holding its expirationDate, calls and puts.
+        :type option: dict
+        :return: A dictionary holding the symbol, the expiry and the number of contracts of the page, the type codes
+        and a list of values for every contract field.
+        :rtype: dict
+        """
+
+        calls, puts = option.get('calls', []), option.get('puts', [])
+        contracts = calls + puts
+
+        chain = {'symbol': symbol, 'expiry': option.get('expirationDate', 0), 'count': len(contracts),
+                 'type': np.repeat(np.array([0, 1], dtype=np.int8), [len(calls), len(puts)])}
+
+        # Missing fields, e.g. the bid of an illiquid contract, are null.
+        for field, column in self.CONTRACT_FIELDS.items():
+            chain[column] = [contract.get(field) for contract in contracts]
+
+        return chain
+
+    def _parse_response_error(self, symbol, error):
+        return None, YahooReadStatus.from_exception(symbol, error)
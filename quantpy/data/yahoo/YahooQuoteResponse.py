@@ -1,21 +1,45 @@
 from quantpy.data.base.BaseResponse import BaseResponse
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
 import warnings
 
 
 class YahooQuoteResponse(BaseResponse):
 
-    def __init__(self, symbol, exception=None):
+    def __init__(self, symbol, exception=None, status=None):
+        """
+        Constructor for the YahooQuoteResponse class. It will set all the class attributes to None and call the super
+        class's constructor.
+        :param symbol: The symbol the quote response is for.
+        :type symbol: str
+        :param exception: The exception that occurred when communicating with the Yahoo Finance API.
+        :type exception: str
+        :param status: The status of the read. Default is OK.
+        :type status: YahooReadStatus
+        """
+
         self.__quote = None
         self.__meta = None
+        self.__dividends = None
+        self.__splits = None
 
-        super().__init__(symbol=symbol, exception=exception)
+        super().__init__(symbol=symbol, exception=exception,
+                         status=status if status is not None else YahooReadStatus(YahooStatusCode.OK, symbol))
 
     def _handle_read(self, summary_object):
+        """
+        Method to handle when a YahooQuoteResponse property is read (get).
+        :param summary_object: The summary object attempting to be read from.
+        :return: The value of the property found within the summary object.
+        :rtype Pandas.Dataframe.
+        """
+
         if self._exception is None:
             if summary_object:
                 if summary_object.included:
                     return summary_object.value
                 elif summary_object.error_occurred:
+                    if isinstance(summary_object.error, YahooReadStatus):
+                        raise summary_object.error.to_exception()
                     raise Exception(summary_object.error)
                 else:
                     return None
@@ -27,14 +51,28 @@ class YahooQuoteResponse(BaseResponse):
             return None
 
     def _handle_write(self, value, error):
+        """
+        Method to handle when a YahooQuoteResponse object is written to.
+        :param value: The value to assign to the property, or the (value, error) tuple returned by a parse method.
+        :param error: A potential error associated with the value.
+        :return: A summary object containing the data.
+        :rtype BaseReponse.SummaryObject.
+        """
+
         summary_object = self.SummaryObject()
 
+        if isinstance(value, tuple) and error is None:
+            value, error = value
+
         if value is not None and error is not None:
             raise ValueError('Cannot assign both a value and an error.')
         else:
             if value is not None:
                 summary_object.value = value
-            else:
+            elif error is not None:
+                if isinstance(error, YahooReadStatus) and error.symbol is None:
+                    error.symbol = self._symbol
+
                 summary_object.error = error
 
         return summary_object
@@ -45,12 +83,28 @@ class YahooQuoteResponse(BaseResponse):
 
     @quote.setter
     def quote(self, value, error=None):
-        self._handle_write(value, error)
+        self.__quote = self._handle_write(value, error)
 
     @property
     def meta(self):
-        return self._handle_read(self.__quote)
+        return self._handle_read(self.__meta)
 
     @meta.setter
     def meta(self, value, error=None):
-        self._handle_write(value, error)
+        self.__meta = self._handle_write(value, error)
+
+    @property
+    def dividends(self):
+        return self._handle_read(self.__dividends)
+
+    @dividends.setter
+    def dividends(self, value, error=None):
+        self.__dividends = self._handle_write(value, error)
+
+    @property
+    def splits(self):
+        return self._handle_read(self.__splits)
+
+    @splits.setter
+    def splits(self, value, error=None):
+        self.__splits = self._handle_write(value, error)
@@ -0,0 +1,191 @@
+import enum
+import json
+
+import requests
+
+import quantpy.data.yahoo.YahooExceptions as YahooExceptions
+
+
+class YahooStatusCode(enum.IntEnum):
+    OK = 0
+    REQUEST_FAILED = 1
+    HTTP_ERROR = 2
+    SERVICE_DOWN = 3
+    SYMBOL_NOT_FOUND = 4
+    DECODE_ERROR = 5
+    MODULE_NOT_FOUND = 6
+    MODULE_FORMAT_ERROR = 7
+    INDICATOR_NOT_FOUND = 8
+    INDICATOR_FORMAT_ERROR = 9
+    PARSE_ERROR = 10
+
+
+class YahooReadStatus(object):
+    """
+    A lightweight description of the outcome of reading a symbol or parsing one of its modules. Statuses are cheap to
+    create and collect in bulk, unlike exceptions, and carry what a retry scheduler needs: the error code, the module,
+    the HTTP status and whether trying again could succeed. An equivalent YahooError can be built with to_exception.
+    """
+
+    __slots__ = ('code', 'symbol', 'module', 'http_status', 'message', 'retryable')
+
+    # The exception class that matches each status code.
+    _EXCEPTIONS = {YahooStatusCode.REQUEST_FAILED: YahooExceptions.YahooRequestError,
+                   YahooStatusCode.HTTP_ERROR: YahooExceptions.YahooRequestError,
+                   YahooStatusCode.SERVICE_DOWN: YahooExceptions.YahooRuntimeError,
+                   YahooStatusCode.SYMBOL_NOT_FOUND: YahooExceptions.YahooRequestError,
+                   YahooStatusCode.DECODE_ERROR: YahooExceptions.YahooRequestError,
+                   YahooStatusCode.MODULE_NOT_FOUND: YahooExceptions.YahooModuleNotFoundError,
+                   YahooStatusCode.MODULE_FORMAT_ERROR: YahooExceptions.YahooModuleFormatError,
+                   YahooStatusCode.INDICATOR_NOT_FOUND: YahooExceptions.YahooIndicatorNotFoundError,
+                   YahooStatusCode.INDICATOR_FORMAT_ERROR: YahooExceptions.YahooIndicatorFormatError,
+                   YahooStatusCode.PARSE_ERROR: YahooExceptions.YahooRuntimeError}
+
+    def __init__(self, code, symbol=None, module=None, http_status=None, message=None, retryable=None):
+        """
+        Initializer method for the YahooReadStatus class.
+        :param code: The status code.
+        :type code: YahooStatusCode
+        :param symbol: Optional. The symbol that was read.
+        :type symbol: str
+        :param module: Optional. The module (or indicator) the status is about.
+        :type module: str
+        :param http_status: Optional. The HTTP status code of the response.
+        :type http_status: int
+        :param message: Optional. A description of the error.
+        :type message: str
+        :param retryable: Optional. Could reading the symbol again succeed? Default is derived from the code and the
+        HTTP status.
+        :type retryable: bool
+        """
+
+        self.code = code
+        self.symbol = symbol
+        self.module = module
+        self.http_status = http_status
+        self.message = message
+        self.retryable = self._default_retryable(code, http_status) if retryable is None else retryable
+
+    @staticmethod
+    def _default_retryable(code, http_status):
+        # Network failures, throttling and server side errors are transient. Missing symbols and modules are not.
+        if code in (YahooStatusCode.REQUEST_FAILED, YahooStatusCode.SERVICE_DOWN):
+            return True
+
+        if http_status is not None:
+            return http_status == 429 or http_status >= 500
+
+        return False
+
+    @classmethod
+    def from_exception(cls, symbol, exception):
+        """
+        Method to describe an exception raised while requesting a symbol. Network failures can be retried. Malformed
+        JSON, invalid urls and any other error, e.g. a bug in a parser, cannot.
+        :param symbol: The symbol that was requested.
+        :type symbol: str
+        :param exception: The exception that was raised.
+        :type exception: Exception
+        :return: The status.
+        :rtype: YahooReadStatus
+        """
+
+        message = '{}: {}'.format(type(exception).__name__, exception)
+
+        # The JSON decode errors of requests derive from the standard library's, or from simplejson's.
+        if isinstance(exception, (json.JSONDecodeError, requests.JSONDecodeError)):
+            return cls(YahooStatusCode.DECODE_ERROR, symbol=symbol, message=message)
+
+        # The url errors of requests are ValueErrors too. The same request would fail again.
+        if isinstance(exception, requests.RequestException) and isinstance(exception, ValueError):
+            return cls(YahooStatusCode.REQUEST_FAILED, symbol=symbol, message=message, retryable=False)
+
+        # The exceptions of requests are OSErrors, like the socket errors they wrap.
+        if isinstance(exception, OSError):
+            return cls(YahooStatusCode.REQUEST_FAILED, symbol=symbol, message=message)
+
+        return cls(YahooStatusCode.PARSE_ERROR, symbol=symbol, message=message)
+
+    @classmethod
+    def from_response(cls, symbol, response, result_name):
+        """
+        Method to describe a response that does not contain a result. Yahoo Finance describes the error in an error
+        object next to the result, e.g. {'chart': {'result': None, 'error': {'code': 'Not Found', ...}}}.
+        :param symbol: The symbol that was requested.
+        :type symbol: str
+        :param response: The response of the API call.
+        :type response: requests.Response
+        :param result_name: The name of the top level object of the response, e.g. quoteSummary or chart.
+        :type result_name: str
+        :return: The status.
+        :rtype: YahooReadStatus
+        """
+
+        http_status = response.status_code
+
+        if 'Will be right back' in response.text:
+            return cls(YahooStatusCode.SERVICE_DOWN, symbol=symbol, http_status=http_status,
+                       message='Yahoo Finance is currently down.')
+
+        try:
+            error = response.json()[result_name]['error'] or {}
+        except Exception:
+            error = {}
+
+        return cls.from_error(symbol, error, http_status, 'Unexpected response: {}'.format(response.text[:200]))
+
+    @classmethod
+    def from_error(cls, symbol, error, http_status, default_message=None):
+        """
+        Method to describe the error object of a response, e.g. {'code': 'Not Found', 'description': '...'}.
+        :param symbol: The symbol that was requested.
+        :type symbol: str
+        :param error: The error object, which can be empty.
+        :type error: dict
+        :param http_status: The HTTP status code of the response.
+        :type http_status: int
+        :param default_message: Optional. The message used when the error has no description.
+        :type default_message: str
+        :return: The status.
+        :rtype: YahooReadStatus
+        """
+
+        message = error.get('description', default_message)
+
+        if http_status == 404 or error.get('code') == 'Not Found':
+            return cls(YahooStatusCode.SYMBOL_NOT_FOUND, symbol=symbol, http_status=http_status, message=message)
+
+        return cls(YahooStatusCode.HTTP_ERROR, symbol=symbol, http_status=http_status, message=message)
+
+    @property
+    def ok(self):
+        return self.code == YahooStatusCode.OK
+
+    def to_exception(self):
+        """
+        Method to build the YahooError that matches the status.
+        :return: The exception.
+        :rtype: YahooExceptions.YahooError
+        """
+
+        return self._EXCEPTIONS.get(self.code, YahooExceptions.YahooError)(str(self))
+
+    def to_tuple(self):
+        return self.symbol, self.module, self.code.name, self.http_status, self.retryable, self.message
+
+    def __str__(self):
+        parts = [self.code.name]
+
+        if self.symbol is not None:
+            parts.append('symbol={}'.format(self.symbol))
+        if self.module is not None:
+            parts.append('module={}'.format(self.module))
+        if self.http_status is not None:
+            parts.append('http_status={}'.format(self.http_status))
+        if self.message is not None:
+            parts.append(self.message)
+
+        return ' '.join(parts)
+
+    def __repr__(self):
+        return 'YahooReadStatus({})'.format(self)
@@ -0,0 +1,195 @@
+import re
+import urllib.parse
+import pandas as pd
+from quantpy.data.base.BaseReader import BaseReader
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+
+
+class YahooSnapshotReader(BaseReader):
+
+    def __init__(self, symbols, fields=None, max_symbols=200, max_url_length=2000, timeout=5):
+        """
+        Initializer method for the YahooSnapshotReader class. The snapshot reader gets the latest quote of many symbols
+        from the multi-symbol quote endpoint, packing up to max_symbols symbols into each request.
+        :param symbols: The list of symbols to be used.
+        :type symbols: str or list
+        :param fields: Optional. The Yahoo Finance field names to request, e.g. ['regularMarketPrice', 'bid', 'ask'].
+        Fewer fields make smaller responses. Default is every field.
+        :type fields: list
+        :param max_symbols: The maximum number of symbols packed into one request.
+        :type max_symbols: int
+        :param max_url_length: The maximum length of a request url. Requests are split further to stay below it.
+        :type max_url_length: int
+        :param timeout: The amount of time until a request times out.
+        :type timeout: float
+        """
+
+        self.__fields = list(fields) if fields else None
+        self.__max_symbols = max_symbols
+        self.__max_url_length = max_url_length
+        self.__pep_pattern = re.compile(r'(?<!^)(?=[A-Z])')
+        self.__statuses = []
+
+        # Call the super class' constructor.
+        super().__init__(symbols, timeout)
+
+    @property
+    def _url(self):
+        """
+        Method to get the url of the API endpoint for Yahoo! Finance. The symbols of a request are comma separated.
+        """
+
+        return 'https://query1.finance.yahoo.com/v7/finance/quote?symbols={}'
+
+    @property
+    def _endpoint(self):
+        return 'quote'
+
+    def _symbol_url(self, symbol):
+        """
+        Method to get the url of a request. The symbols are percent encoded, so characters such as the & of M&M.NS do not
+        end the symbols parameter, and the commas between them are kept.
+        :param symbol: The comma separated symbols of the request.
+        :type symbol: str
+        :return: The url.
+        :rtype: str
+        """
+
+        return self._url.format(','.join(urllib.parse.quote(part, safe='') for part in symbol.split(',')))
+
+    @property
+    def _params(self):
+        """
+        Method to get the parameters for the API endpoint.
+        :return: A dictionary of parameters.
+        :rtype dict
+        """
+
+        if self.__fields:
+            return {'fields': ','.join(['symbol'] + self.__fields)}
+
+        return {}
+
+    @property
+    def statuses(self):
+        """
+        Property to get the errors of the last read: one status per failed request and per symbol missing from the
+        results.
+        :rtype: list
+        """
+
+        return self.__statuses
+
+    def _check_init_args(self):
+        if self.__max_symbols < 1:
+            raise ValueError('max_symbols must be at least 1.')
+
+        # Drop duplicate and empty symbols, keeping the order they were given in.
+        self._symbols = list(dict.fromkeys(symbol for symbol in self._symbols if symbol))
+
+    def _chunk_symbols(self):
+        """
+        Method to split the symbols into the comma separated symbol lists of each request.
+        :return: The list of comma separated symbols.
+        :rtype: list
+        """
+
+        # The length of the url without any symbols. The fields are sent as a parameter, so they count too.
+        base_length = len(self._url.format('')) + len(urllib.parse.urlencode(self._params)) + 1
+
+        chunks = []
+        chunk = []
+        chunk_length = base_length
+
+        for symbol in self._symbols:
+            # Symbols such as ^GSPC and M&M.NS are percent encoded in the url, see _symbol_url.
+            symbol_length = len(urllib.parse.quote(symbol, safe='')) + 1
+
+            if chunk and (len(chunk) >= self.__max_symbols or chunk_length + symbol_length > self.__max_url_length):
+                chunks.append(','.join(chunk))
+                chunk = []
+                chunk_length = base_length
+
+            chunk.append(symbol)
+            chunk_length += symbol_length
+
+        if chunk:
+            chunks.append(','.join(chunk))
+
+        return chunks
+
+    def read(self):
+        """
+        Function to read the latest quotes of the requested symbols.
+        :return: A dataframe indexed by symbol containing one row per symbol found. The errors of the read are in
+        statuses.
+        :rtype: pd.DataFrame
+        """
+
+        self._check_init_args()
+        chunks = self._chunk_symbols()
+
+        if len(chunks) > 1:
+            # If more than one request is needed, then do a multiprocess read.
+            chunk_results = list(self.multi_read(chunks).values())
+        elif chunks:
+            chunk_results = [self.single_read(chunks[0])]
+        else:
+            chunk_results = []
+
+        frames = [frame for frame, _ in chunk_results if frame is not None]
+
+        # A failed request fails every symbol in it, so its status is repeated for each symbol.
+        self.__statuses = [YahooReadStatus(status.code, symbol, status.module, status.http_status, status.message,
+                                           status.retryable)
+                           for _, status in chunk_results if status is not None for symbol in status.symbol.split(',')]
+
+        if frames:
+            snapshot = pd.concat(frames)
+            snapshot = snapshot[~snapshot.index.duplicated(keep='first')]
+        else:
+            snapshot = pd.DataFrame(index=pd.Index([], name='symbol'))
+
+        # Symbols missing from a successful response were not found. Symbols of a failed request already have a status.
+        failed = {status.symbol for status in self.__statuses}
+        for symbol in self._symbols:
+            if symbol not in snapshot.index and symbol not in failed:
+                self.__statuses.append(YahooReadStatus(YahooStatusCode.SYMBOL_NOT_FOUND, symbol=symbol))
+
+        self._read_called = True
+
+        # Keep the order the symbols were requested in.
+        return snapshot.reindex([symbol for symbol in self._symbols if symbol in snapshot.index])
+
+    def _parse_response(self, symbol, response):
+        """
+        Method to parse the response of one request into a table.
+        :param symbol: The comma separated symbols of the request.
+        :type symbol: str
+        :param response: The response of the API call.
+        :type response: requests.Response
+        :return: A tuple containing a dataframe indexed by symbol and None, or None and a status.
+        :rtype: tuple
+        """
+
+        # Responses other than 200 carry an error description instead of the results.
+        if response.status_code != 200:
+            return None, YahooReadStatus.from_response(symbol, response, 'quoteResponse')
+
+        try:
+            results = response.json()['quoteResponse']['result']
+        except Exception:
+            return None, YahooReadStatus.from_response(symbol, response, 'quoteResponse')
+
+        if not results:
+            return None, None
+
+        # Every result is a flat dictionary of fields, so the whole response becomes one table at once.
+        snapshot = pd.DataFrame.from_records(results)
+        snapshot = snapshot.set_index('symbol')
+        snapshot.columns = [self.__pep_pattern.sub('_', column).lower() for column in snapshot.columns]
+
+        return snapshot, None
+
+    def _parse_response_error(self, symbol, error):
+        return None, YahooReadStatus.from_exception(symbol, error)
@@ -1,14 +1,57 @@
 from quantpy.data.base.BaseReader import BaseReader
+from quantpy.data.base.ReaderHook import ReaderHook
+from quantpy.data.transform.DtypeCompactor import DtypeCompactor
 from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
 from quantpy.utils.utils import flatten
 
-import quantpy.data.yahoo.YahooExceptions as YahooExceptions
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
 import pandas as pd
+import contextlib
 import re
+import threading
+import time
+import tracemalloc
 
 
 class YahooSummaryReader(BaseReader):
 
+    # The response properties filled in by each module, keyed by the name of the module's include argument without the
+    # include_ prefix.
+    MODULE_PROPERTIES = {
+        'asset_profile': ('profile', 'company_officers'),
+        'income_statement_history': ('income_statement_history',),
+        'income_statement_history_quarterly': ('income_statement_history_quarterly',),
+        'balance_sheet_history': ('balance_sheet_history',),
+        'balance_sheet_history_quarterly': ('balance_sheet_history_quarterly',),
+        'cash_flow_statement_history': ('cash_flow_statement_history',),
+        'cash_flow_statement_history_quarterly': ('cash_flow_statement_history_quarterly',),
+        'earnings': ('earnings_estimates', 'earnings_estimates_quarterly', 'financials_yearly', 'financials_quarterly'),
+        'earnings_history': ('earnings_history',),
+        'financial_data': ('financial_data',),
+        'default_key_statistics': ('default_key_statistics',),
+        'institution_ownership': ('institution_ownership',),
+        'insider_holders': ('insider_holders',),
+        'insider_transactions': ('insider_transactions',),
+        'fund_ownership': ('fund_ownership',),
+        'major_direct_holders': ('major_direct_holders',),
+        'major_direct_holders_breakdown': ('major_direct_holders_breakdown',),
+        'recommendation_trend': ('recommendation_trend',),
+        'earnings_trend': ('earnings_trend',),
+        'industry_trend': ('industry_trend',),
+        'index_trend': ('index_trend_info', 'index_trend_estimate'),
+        'sector_trend': ('sector_trend',),
+        'calendar_events': ('calendar_events_earnings', 'calendar_events_dividends'),
+        'sec_filings': ('sec_filings',),
+        'upgrade_downgrade_history': ('upgrade_downgrade_history',),
+        'net_share_purchase_activity': ('net_share_purchase_activity',),
+    }
+
+    # The columns of the profile report.
+    _PROFILE_COLUMNS = ['symbol', 'module', 'seconds', 'allocated_bytes']
+
+    # Allocations are traced for the whole process, so only one parse of the process measures them at a time.
+    _TRACE_LOCK = threading.Lock()
+
     def __init__(self, symbols,
                  include_asset_profile=False,
                  include_income_statement_history=False,
@@ -37,7 +80,10 @@ class YahooSummaryReader(BaseReader):
                  include_upgrade_downgrade_history=False,
                  include_net_share_purchase_activity=False,
                  include_all=False,
-                 timeout=5.0):
+                 timeout=5.0,
+                 profile=False,
+                 compact=None,
+                 cache=None):
         """
         Constructor for the YahooSummaryReader class to read copmany summaries from the Yahoo Finance API.
         :param symbols: The company(s) for which summaries are to be retrieved.
@@ -98,6 +144,16 @@ class YahooSummaryReader(BaseReader):
         :type include_all: bool
         :param timeout: How long too allow for the request before it
         :type timeout: float
+        :param profile: Record the wall time and allocated bytes of parsing each module. The modules are timed without
+        tracing allocations and then parsed a second time with tracemalloc to measure the allocated bytes, so profiling
+        doubles the parse time. After reading, the costs are available from the profile_report property.
+        :type profile: bool
+        :param compact: Optional. Return compact dtypes: True for the default DtypeCompactor, or a DtypeCompactor. The
+        repeated strings, e.g. sectors and firms, become categories shared by every symbol of a read.
+        :type compact: bool or DtypeCompactor
+        :param cache: Optional. A cache of the parsed modules, keyed by symbol and response property and shared with
+        other readers. A symbol whose requested modules are all cached is not requested again.
+        :type cache: ParsedCache
         """
         # Assign all financial information to the value requested.
         self.__include_asset_profile = include_all or include_asset_profile
@@ -138,6 +194,11 @@ class YahooSummaryReader(BaseReader):
         # Set the pattern used to define the response dataframe schema formatting.
         self.__pep_pattern = re.compile(r'(?<!^)(?=[A-Z])')
 
+        self.__profile = profile
+        self.__profile_report = None
+        self.__compactor = DtypeCompactor() if compact is True else compact or None
+        self.__cache = cache
+
         # Call the super class's constructor.
         super().__init__(symbols=symbols, timeout=timeout)
 
@@ -259,6 +320,68 @@ class YahooSummaryReader(BaseReader):
                 self.__include_net_share_purchase_activity):
             raise ValueError('Did not specify any summary values to get.')
 
+    @property
+    def modules(self):
+        """
+        Property to get the requested modules, named like the include arguments without the include_ prefix.
+        :rtype: list
+        """
+
+        return [module for module in self.MODULE_PROPERTIES if getattr(self, '_YahooSummaryReader__include_' + module)]
+
+    def _cache_lookup(self, symbol):
+        """
+        Overridden method to build a response from the parsed cache when every requested property of the symbol is
+        cached.
+        :param symbol: The symbol being requested.
+        :type symbol: str
+        :return: The summary response, or None.
+        :rtype: YahooSummaryResponse
+        """
+
+        if self.__cache is None:
+            return None
+
+        states = {}
+        for module in self.modules:
+            for prop in self.MODULE_PROPERTIES[module]:
+                state = self.__cache.get((symbol, prop))
+
+                if state is None:
+                    return None
+
+                states[prop] = state
+
+        ReaderHook.emit_cache_hit(self._endpoint, symbol)
+
+        ys = YahooSummaryResponse(symbol)
+        for prop, state in states.items():
+            setattr(ys, prop, state)
+
+        return ys
+
+    def _cache_store(self, symbol, symbol_data):
+        """
+        Overridden method to cache the parsed properties of a response. Failed reads are not cached, and neither are
+        modules that failed to parse, since the next read might succeed.
+        :param symbol: The symbol that was read.
+        :type symbol: str
+        :param symbol_data: The summary response.
+        :type symbol_data: YahooSummaryResponse
+        """
+
+        if self.__cache is None or symbol_data is None or (symbol_data.status is not None and
+                                                           not symbol_data.status.ok):
+            return
+
+        for module in self.modules:
+            for prop in self.MODULE_PROPERTIES[module]:
+                state = symbol_data._property_state(prop)
+
+                # A module missing from the response is cached as missing, like a parsed one.
+                if state is not None and (state[1] is None or state[1].code == YahooStatusCode.MODULE_NOT_FOUND):
+                    self.__cache.put((symbol, prop), state, module)
+
     def _parse_response_error(self, symbol, exception):
         """
         Overridden method to handle exception raised from readed the Yahoo Finance API response.
@@ -268,7 +391,7 @@ class YahooSummaryReader(BaseReader):
         :return: An empty YahooSummaryReponse object containing the exception.
         :rtype: YahooSummaryResponse
         """
-        return YahooSummaryResponse(symbol, exception)
+        return YahooSummaryResponse(symbol, exception, YahooReadStatus.from_exception(symbol, exception))
 
     def _parse_response(self, symbol, response_data_json):
         """
@@ -282,7 +405,13 @@ class YahooSummaryReader(BaseReader):
         :rtype: YahooSummaryResponse
         """
 
+        # Responses other than 200 carry an error description instead of modules.
+        if response_data_json.status_code != 200:
+            return self._parse_module_error(symbol, response_data_json)
+
+        decode_start = time.perf_counter()
         response_data = response_data_json.json()
+        decode_seconds = time.perf_counter() - decode_start
 
         # Get the modules dictionary from the unformatted JSON dictionary. Note, if the modules dictionary is not found,
         # this will raise an error.
@@ -294,110 +423,273 @@ class YahooSummaryReader(BaseReader):
         # Instantiate the YahooSummaryResponse object.
         ys = YahooSummaryResponse(symbol)
 
+        if not self.__profile:
+            return self._parse_modules(ys, modules)
+
+        # Tracing allocations slows down every allocation, so the modules are timed with tracing off and then parsed
+        # again into a scratch response with tracing on to measure their allocations. When the caller already traces
+        # allocations, the tracing is left on and the seconds include its overhead.
+        seconds, allocated_bytes = {}, {}
+        self._parse_modules(ys, modules, 'seconds', seconds)
+
+        with self._TRACE_LOCK:
+            started_tracing = not tracemalloc.is_tracing()
+
+            if started_tracing:
+                tracemalloc.start()
+
+            try:
+                self._parse_modules(YahooSummaryResponse(symbol), modules, 'allocated_bytes', allocated_bytes)
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+
+        ys.parse_costs = [('json_decode', decode_seconds, None)] + \
+            [(module_name, module_seconds, allocated_bytes.get(module_name))
+             for module_name, module_seconds in seconds.items()]
+
+        return ys
+
+    def _parse_modules(self, ys, modules, measure=None, costs=None):
+        """
+        Method to parse the requested modules into a response.
+        :param ys: The response the modules are parsed into.
+        :type ys: YahooSummaryResponse
+        :param modules: The modules dictionary of the Yahoo Finance API response.
+        :type modules: dict
+        :param measure: Optional. The cost of each module to measure, seconds or allocated_bytes. Default measures
+        nothing.
+        :type measure: str
+        :param costs: Optional. The dictionary the cost of each module is written to, keyed by response property.
+        :type costs: dict
+        :return: The response.
+        :rtype: YahooSummaryResponse
+        """
+
         if self.__include_asset_profile:
-            ys.profile = self._parse_module_asset_profile_profile(modules, 'assetProfile')
-            ys.company_officers = self._parse_module_asset_profile_company_officers(modules, 'assetProfile')
+            with self._profile_module(measure, costs, 'profile'):
+                ys.profile = self._parse_module_asset_profile_profile(modules, 'assetProfile')
+            with self._profile_module(measure, costs, 'company_officers'):
+                ys.company_officers = self._parse_module_asset_profile_company_officers(modules, 'assetProfile')
 
         if self.__include_income_statement_history:
-            ys.income_statement_history = self._parse_module(modules, 'incomeStatementHistory',
-                                                             'incomeStatementHistory')
+            with self._profile_module(measure, costs, 'income_statement_history'):
+                ys.income_statement_history = self._parse_module(modules, 'incomeStatementHistory',
+                                                                 'incomeStatementHistory')
 
         if self.__include_income_statement_history_quarterly:
-            ys.income_statement_history_quarterly = self._parse_module(modules, 'incomeStatementHistoryQuarterly',
-                                                                       'incomeStatementHistory')
+            with self._profile_module(measure, costs, 'income_statement_history_quarterly'):
+                ys.income_statement_history_quarterly = self._parse_module(modules, 'incomeStatementHistoryQuarterly',
+                                                                           'incomeStatementHistory')
 
         if self.__include_balance_sheet_history:
-            ys.balance_sheet_history = self._parse_module(modules, 'balanceSheetHistory', 'balanceSheetStatements')
+            with self._profile_module(measure, costs, 'balance_sheet_history'):
+                ys.balance_sheet_history = self._parse_module(modules, 'balanceSheetHistory', 'balanceSheetStatements')
 
         if self.__include_balance_sheet_history_quarterly:
-            ys.balance_sheet_history_quarterly = self._parse_module(modules, 'balanceSheetHistoryQuarterly',
-                                                                    'balanceSheetStatements')
+            with self._profile_module(measure, costs, 'balance_sheet_history_quarterly'):
+                ys.balance_sheet_history_quarterly = self._parse_module(modules, 'balanceSheetHistoryQuarterly',
+                                                                        'balanceSheetStatements')
 
         if self.__include_cash_flow_statement_history:
-            ys.cash_flow_statement_history = self._parse_module(modules, 'cashflowStatementHistory',
-                                                                'cashflowStatements')
+            with self._profile_module(measure, costs, 'cash_flow_statement_history'):
+                ys.cash_flow_statement_history = self._parse_module(modules, 'cashflowStatementHistory',
+                                                                    'cashflowStatements')
 
         if self.__include_cash_flow_statement_history_quarterly:
-            ys.cash_flow_statement_history_quarterly = self._parse_module(modules, 'cashflowStatementHistoryQuarterly',
-                                                                          'cashflowStatements')
+            with self._profile_module(measure, costs, 'cash_flow_statement_history_quarterly'):
+                ys.cash_flow_statement_history_quarterly = self._parse_module(modules,
+                                                                              'cashflowStatementHistoryQuarterly',
+                                                                              'cashflowStatements')
 
         if self.__include_earnings:
-            ys.earnings_estimates = self._parse_module_earnings_estimates(modules, 'earnings')
-            ys.earnings_estimates_quarterly = self._parse_module_earnings_estimates_quarterly(modules, 'earnings')
-            ys.financials_yearly = self._parse_module_earnings_finance_yearly(modules, 'earnings')
-            ys.financials_quarterly = self._parse_module_earnings_finance_quarterly(modules, 'earnings')
+            with self._profile_module(measure, costs, 'earnings_estimates'):
+                ys.earnings_estimates = self._parse_module_earnings_estimates(modules, 'earnings')
+            with self._profile_module(measure, costs, 'earnings_estimates_quarterly'):
+                ys.earnings_estimates_quarterly = self._parse_module_earnings_estimates_quarterly(modules, 'earnings')
+            with self._profile_module(measure, costs, 'financials_yearly'):
+                ys.financials_yearly = self._parse_module_earnings_finance_yearly(modules, 'earnings')
+            with self._profile_module(measure, costs, 'financials_quarterly'):
+                ys.financials_quarterly = self._parse_module_earnings_finance_quarterly(modules, 'earnings')
 
         if self.__include_earnings_history:
-            ys.earnings_history = self._parse_module(modules, 'earningsHistory', 'history')
+            with self._profile_module(measure, costs, 'earnings_history'):
+                ys.earnings_history = self._parse_module(modules, 'earningsHistory', 'history')
 
         if self.__include_financial_data:
-            ys.financial_data = self._parse_module(modules, 'financialData')
+            with self._profile_module(measure, costs, 'financial_data'):
+                ys.financial_data = self._parse_module(modules, 'financialData')
 
         if self.__include_default_key_statistics:
-            ys.default_key_statistics = self._parse_module(modules, 'defaultKeyStatistics')
+            with self._profile_module(measure, costs, 'default_key_statistics'):
+                ys.default_key_statistics = self._parse_module(modules, 'defaultKeyStatistics')
 
         if self.__include_institution_ownership:
-            ys.institution_ownership = self._parse_module(modules, 'institutionOwnership', 'ownershipList')
+            with self._profile_module(measure, costs, 'institution_ownership'):
+                ys.institution_ownership = self._parse_module(modules, 'institutionOwnership', 'ownershipList')
 
         if self.__include_insider_holders:
-            ys.insider_holders = self._parse_module(modules, 'insiderHolders', 'holders')
+            with self._profile_module(measure, costs, 'insider_holders'):
+                ys.insider_holders = self._parse_module(modules, 'insiderHolders', 'holders')
 
         if self.__include_insider_transactions:
-            ys.insider_transactions = self._parse_module(modules, 'insiderTransactions', 'transactions')
+            with self._profile_module(measure, costs, 'insider_transactions'):
+                ys.insider_transactions = self._parse_module(modules, 'insiderTransactions', 'transactions')
 
         if self.__include_fund_ownership:
-            ys.fund_ownership = self._parse_module(modules, 'fundOwnership', 'ownershipList')
+            with self._profile_module(measure, costs, 'fund_ownership'):
+                ys.fund_ownership = self._parse_module(modules, 'fundOwnership', 'ownershipList')
 
         if self.__include_major_direct_holders:
-            ys.major_direct_holders = self._parse_module(modules, 'majorDirectHolders', 'holders')
+            with self._profile_module(measure, costs, 'major_direct_holders'):
+                ys.major_direct_holders = self._parse_module(modules, 'majorDirectHolders', 'holders')
 
         if self.__include_major_direct_holders_breakdown:
-            ys.major_direct_holders_breakdown = self._parse_module(modules, 'majorHoldersBreakdown')
+            with self._profile_module(measure, costs, 'major_direct_holders_breakdown'):
+                ys.major_direct_holders_breakdown = self._parse_module(modules, 'majorHoldersBreakdown')
 
         if self.__include_recommendation_trend:
-            ys.recommendation_trend = self._parse_module(modules, 'recommendationTrend', 'trend')
+            with self._profile_module(measure, costs, 'recommendation_trend'):
+                ys.recommendation_trend = self._parse_module(modules, 'recommendationTrend', 'trend')
 
         if self.__include_earnings_trend:
-            ys.earnings_trend = self._parse_module(modules, 'earningsTrend', 'trend')
+            with self._profile_module(measure, costs, 'earnings_trend'):
+                ys.earnings_trend = self._parse_module(modules, 'earningsTrend', 'trend')
 
         if self.__include_industry_trend:
-            ys.industry_trend = self._parse_module(modules, 'industryTrend')
+            with self._profile_module(measure, costs, 'industry_trend'):
+                ys.industry_trend = self._parse_module(modules, 'industryTrend')
 
         if self.__include_index_trend:
-            ys.index_trend_info = self._parse_module_index_trend_info(modules, 'indexTrend')
-            ys.index_trend_estimate = self._parse_module_index_trend_estimates(modules, 'indexTrend')
+            with self._profile_module(measure, costs, 'index_trend_info'):
+                ys.index_trend_info = self._parse_module_index_trend_info(modules, 'indexTrend')
+            with self._profile_module(measure, costs, 'index_trend_estimate'):
+                ys.index_trend_estimate = self._parse_module_index_trend_estimates(modules, 'indexTrend')
 
         if self.__include_sector_trend:
-            ys.sector_trend = self._parse_module(modules, 'sectorTrend')
+            with self._profile_module(measure, costs, 'sector_trend'):
+                ys.sector_trend = self._parse_module(modules, 'sectorTrend')
 
         if self.__include_calendar_events:
-            ys.calendar_events_earnings = self._parse_module_calendar_events_earnings(modules, 'calendarEvents')
-            ys.calendar_events_dividends = self._parse_module_calendar_events_dividends(modules, 'calendarEvents')
+            with self._profile_module(measure, costs, 'calendar_events_earnings'):
+                ys.calendar_events_earnings = self._parse_module_calendar_events_earnings(modules, 'calendarEvents')
+            with self._profile_module(measure, costs, 'calendar_events_dividends'):
+                ys.calendar_events_dividends = self._parse_module_calendar_events_dividends(modules, 'calendarEvents')
 
         if self.__include_sec_filings:
-            ys.sec_filings = self._parse_module(modules, 'secFilings', 'filings')
+            with self._profile_module(measure, costs, 'sec_filings'):
+                ys.sec_filings = self._parse_module(modules, 'secFilings', 'filings')
 
         if self.__include_upgrade_downgrade_history:
-            ys.upgrade_downgrade_history = self._parse_module(modules, 'upgradeDowngradeHistory', 'history')
+            with self._profile_module(measure, costs, 'upgrade_downgrade_history'):
+                ys.upgrade_downgrade_history = self._parse_module(modules, 'upgradeDowngradeHistory', 'history')
 
         if self.__include_net_share_purchase_activity:
-            ys.net_share_purchase_activity = self._parse_module(modules, 'netSharePurchaseActivity')
+            with self._profile_module(measure, costs, 'net_share_purchase_activity'):
+                ys.net_share_purchase_activity = self._parse_module(modules, 'netSharePurchaseActivity')
 
         return ys
 
+    @contextlib.contextmanager
+    def _profile_module(self, measure, costs, module_name):
+        """
+        Context manager to record the cost of parsing a module when profiling is on. Otherwise it does nothing.
+        :param measure: The cost to measure, seconds or allocated_bytes, or None when not profiling.
+        :type measure: str
+        :param costs: The dictionary the cost is written to.
+        :type costs: dict
+        :param module_name: The name of the response property the module is parsed into.
+        :type module_name: str
+        """
+
+        if measure is None:
+            yield
+            return
+
+        # The allocated bytes are the peak traced memory above what was in use before parsing.
+        if measure == 'allocated_bytes':
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+
+            try:
+                yield
+            finally:
+                costs[module_name] = tracemalloc.get_traced_memory()[1] - memory_before
+
+            return
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            costs[module_name] = time.perf_counter() - start
+
+    def read(self):
+        """
+        Overridden method to read the requested summaries. When profiling, the parse costs of every symbol are collected
+        into the profile report.
+        :return: The summary response, or a dictionary mapping symbols to summary responses.
+        """
+
+        symbol_data = super().read()
+
+        if self.__profile:
+            responses = symbol_data.values() if isinstance(symbol_data, dict) else [symbol_data]
+            reports = [response.parse_costs.assign(symbol=response.symbol) for response in responses
+                       if response is not None and response.parse_costs is not None]
+
+            self.__profile_report = pd.concat(reports, ignore_index=True)[self._PROFILE_COLUMNS] if reports else \
+                pd.DataFrame(columns=self._PROFILE_COLUMNS)
+
+        if self.__compactor is not None:
+            self.__compactor.compact_responses(symbol_data, [prop for props in self.MODULE_PROPERTIES.values()
+                                                             for prop in props])
+
+        return symbol_data
+
+    @property
+    def profile_report(self):
+        """
+        Property to get the parse costs of the last read. Only available when the reader was created with profile=True.
+        :return: A dataframe with one row per symbol and module containing the seconds and allocated bytes.
+        :rtype: pd.DataFrame
+        """
+
+        return self.__profile_report
+
+    def profile_summary(self):
+        """
+        Method to aggregate the profile report of the last read by module, most expensive first.
+        :return: A module indexed dataframe of the total, mean and max seconds and the mean allocated bytes.
+        :rtype: pd.DataFrame
+        """
+
+        if self.__profile_report is None:
+            raise ValueError('The reader was not created with profile=True or has not been read.')
+
+        summary = self.__profile_report.groupby('module').agg(total_seconds=('seconds', 'sum'),
+                                                              mean_seconds=('seconds', 'mean'),
+                                                              max_seconds=('seconds', 'max'),
+                                                              mean_allocated_bytes=('allocated_bytes', 'mean'),
+                                                              symbols=('symbol', 'nunique'))
+
+        return summary.sort_values('total_seconds', ascending=False)
+
     def _parse_module_error(self, symbol, response_data):
-        if 'Will be right back' in response_data.text:
-            exception = str(YahooExceptions.YahooRuntimeError('Yahoo Finance is currently down.'))
-            return YahooSummaryResponse(symbol, exception)
+        """
+        Method to describe a response that does not contain any modules.
+        :param symbol: The symbol of the company for which the data is being parsed.
+        :type symbol: str
+        :param response_data: The response of the Yahoo Finance API call.
+        :type response_data: requests.Response
+        :return: An empty YahooSummaryResponse object containing the status of the read.
+        :rtype: YahooSummaryResponse
+        """
 
-        else:
-            if response_data['quoteSummary']['result'] is None and response_data['quoteSummary']['error'] is not None:
-                exception = str(YahooExceptions.YahooRequestError(response_data['quoteSummary']['error']['description']))
-                return YahooSummaryResponse(symbol, exception)
+        status = YahooReadStatus.from_response(symbol, response_data, 'quoteSummary')
 
-            else:
-                exception = str(YahooExceptions.YahooRequestError(response_data))
-                return YahooSummaryResponse(symbol, exception)
+        return YahooSummaryResponse(symbol, status.message, status)
 
     def _parse_module(self, modules_dict, module_name, submodule_name=None):
         """
@@ -413,29 +705,49 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the module to be parsed. If the module is not found, then it will return None and a
-        # YahooModuleNotFoundError.
-        try:
-            # Checks to see if there is a submodule.
-            if not submodule_name:
-                module = modules_dict[module_name]
-            else:
-                module = modules_dict[module_name][submodule_name]
+        # MODULE_NOT_FOUND status.
+        module = self._find_module(modules_dict, module_name, *([submodule_name] if submodule_name else []))
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if module is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             module_dataframe = self._format_dataframe(module)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the module information and
         # None since there was no error.
         return module_dataframe, None
 
+    @staticmethod
+    def _find_module(modules_dict, module_name, *submodule_names):
+        """
+        Method to find a module, or a submodule nested in it, without changing the modules dictionary. Missing modules
+        are common, so they are looked up without raising and catching an exception.
+        :param modules_dict: A dictionary containing all the modules.
+        :type modules_dict: dict
+        :param module_name: The name of the module.
+        :type module_name: str
+        :param submodule_names: The names of the nested submodules, outermost first.
+        :return: The module or None if it, or any submodule, is missing.
+        """
+
+        module = modules_dict.get(module_name)
+
+        for submodule_name in submodule_names:
+            module = module.get(submodule_name) if isinstance(module, dict) else None
+
+        return module
+
+    @staticmethod
+    def _without(module, *keys):
+        # A copy of a module without some of its submodules, which are parsed on their own.
+        return {key: value for key, value in module.items() if key not in keys}
+
     def _parse_module_asset_profile_profile(self, modules_dict, module_name):
         """
         Method to parse the assetProfile module returned from the Yahoo Finance API call. The assetProfile module is
@@ -450,22 +762,20 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the assetProfile module. If the module is not found, then it will return None and a
-        # YahooModuleNotFoundError.
-        try:
-            profile_dict = modules_dict[module_name]
+        # MODULE_NOT_FOUND status.
+        profile_dict = self._find_module(modules_dict, module_name)
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if not isinstance(profile_dict, dict):
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
-            # We are going to remove the company officer's submodule to be parsed later.
-            del profile_dict['companyOfficers']
-            profile = self._format_dataframe(profile_dict)
+            # The company officer's submodule is left out, to be parsed on its own.
+            profile = self._format_dataframe(self._without(profile_dict, 'companyOfficers'))
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the profile
         # information and None since there was no error.
@@ -485,21 +795,19 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the assetProfile and the company_officers submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            profile_dict = modules_dict[module_name]
-            company_officers_dict = profile_dict['companyOfficers']
+        # return None and a MODULE_NOT_FOUND status.
+        company_officers_dict = self._find_module(modules_dict, module_name, 'companyOfficers')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if company_officers_dict is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             company_officers = self._format_dataframe(company_officers_dict)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -520,17 +828,18 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the earnings and the earningsChart submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            earnings_estimates_dict = modules_dict[module_name]['earningsChart']
-            del earnings_estimates_dict['quarterly']
+        # return None and a MODULE_NOT_FOUND status.
+        earnings_estimates_dict = self._find_module(modules_dict, module_name, 'earningsChart')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if not isinstance(earnings_estimates_dict, dict):
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
+            # The quarterly submodule is left out, to be parsed on its own.
+            earnings_estimates_dict = self._without(earnings_estimates_dict, 'quarterly')
+
             # Sometimes the earnings data portion is returned as a list instead of a date.
             if isinstance(earnings_estimates_dict['earningsDate'], list):
                 earnings_estimates_dict['earningsDate'] = earnings_estimates_dict['earningsDate'][0]
@@ -538,7 +847,7 @@ class YahooSummaryReader(BaseReader):
             earnings_estimates = self._format_dataframe(earnings_estimates_dict)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -559,21 +868,19 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the earnings, earningsChart, and quarterly submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            module = modules_dict[module_name]
-            quarterly_earnings_estimates = module['earningsChart']['quarterly']
+        # return None and a MODULE_NOT_FOUND status.
+        quarterly_earnings_estimates = self._find_module(modules_dict, module_name, 'earningsChart', 'quarterly')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if quarterly_earnings_estimates is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             earnings_quarterly = self._format_dataframe(quarterly_earnings_estimates)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -594,21 +901,19 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the earnings, financialsChart, and yearly submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            module = modules_dict[module_name]
-            financial_yearly = module['financialsChart']['yearly']
+        # return None and a MODULE_NOT_FOUND status.
+        financial_yearly = self._find_module(modules_dict, module_name, 'financialsChart', 'yearly')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if financial_yearly is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             financial_yearly = self._format_dataframe(financial_yearly)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -629,21 +934,19 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the earnings, financialsChart, and quarterly submodule. If the module is not found, then it
-        # will return None and a YahooModuleNotFoundError.
-        try:
-            module = modules_dict[module_name]
-            financial_quarterly = module['financialsChart']['quarterly']
+        # will return None and a MODULE_NOT_FOUND status.
+        financial_quarterly = self._find_module(modules_dict, module_name, 'financialsChart', 'quarterly')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if financial_quarterly is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             financial_quarterly = self._format_dataframe(financial_quarterly)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -663,23 +966,20 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the indexTrend module. If the module is not found, then it will return None and a
-        # YahooModuleNotFoundError.
-        try:
-            index_trend_info = modules_dict[module_name]
+        # MODULE_NOT_FOUND status.
+        index_trend_info = self._find_module(modules_dict, module_name)
 
-            # Removes the estimates submodule.
-            del index_trend_info['estimates']
-
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if not isinstance(index_trend_info, dict):
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
-            index_trend_info = self._format_dataframe(index_trend_info)
+            # The estimates submodule is left out, to be parsed on its own.
+            index_trend_info = self._format_dataframe(self._without(index_trend_info, 'estimates'))
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -699,21 +999,19 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the indexTrend module and the estimates submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            index_trend_info = modules_dict[module_name]
-            index_trend_estimates = index_trend_info['estimates']
+        # return None and a MODULE_NOT_FOUND status.
+        index_trend_estimates = self._find_module(modules_dict, module_name, 'estimates')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if index_trend_estimates is None:
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
             index_trend_estimates = self._format_dataframe(index_trend_estimates)
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -733,22 +1031,23 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the calendarEvents module and the earnings submodule. If the module is not found, then it will
-        # return None and a YahooModuleNotFoundError.
-        try:
-            calender_events_earnings = modules_dict[module_name]['earnings']
+        # return None and a MODULE_NOT_FOUND status.
+        calender_events_earnings = self._find_module(modules_dict, module_name, 'earnings')
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if not isinstance(calender_events_earnings, dict):
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
+            calender_events_earnings = dict(calender_events_earnings)
+
             if isinstance(calender_events_earnings['earningsDate'], list):
                 calender_events_earnings['earningsDate'] = calender_events_earnings['earningsDate'][0]
 
             calender_events_earnings = self._format_dataframe(calender_events_earnings)
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -768,23 +1067,20 @@ class YahooSummaryReader(BaseReader):
         """
 
         # Attempt to find the calendarEvents module and the dividends submodule. If the module is not found, then it
-        # will return None and a YahooModuleNotFoundError.
-        try:
-            dividends = modules_dict[module_name]
-
-            # Removes the earnings submodule.
-            del dividends['earnings']
+        # will return None and a MODULE_NOT_FOUND status.
+        dividends = self._find_module(modules_dict, module_name)
 
-        except Exception as e:
-            return None, YahooExceptions.YahooModuleNotFoundError(e)
+        if not isinstance(dividends, dict):
+            return None, YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module=module_name)
 
         # Attempt to get a formatted dataframe from the module. If there was an error formatting the dataframe, then it
-        # will return None and a YahooModuleFormatError.
+        # will return None and a MODULE_FORMAT_ERROR status.
         try:
-            calendar_events_dividends = self._format_dataframe(dividends)
+            # The earnings submodule is left out, it is parsed on its own.
+            calendar_events_dividends = self._format_dataframe(self._without(dividends, 'earnings'))
 
         except Exception as e:
-            return None, YahooExceptions.YahooModuleFormatError(e)
+            return None, YahooReadStatus(YahooStatusCode.MODULE_FORMAT_ERROR, module=module_name, message=repr(e))
 
         # If the module was found and formatted, then it will return a dataframe containing the company officers
         # information and None since there was no error.
@@ -1,10 +1,12 @@
 from quantpy.data.base.BaseResponse import BaseResponse
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+import pandas as pd
 import warnings
 
 
 class YahooSummaryResponse(BaseResponse):
 
-    def __init__(self, symbol, exception=None):
+    def __init__(self, symbol, exception=None, status=None):
         """
         Constructor for the YahooSummaryReponse class. It will set all the class attributes to None and call the
         super class's constructor.
@@ -12,6 +14,8 @@ class YahooSummaryResponse(BaseResponse):
         :type symbol: Union[str, list]
         :param exception: The exception that occurred when communicating with the Yahoo Finance API.
         :type exception: str
+        :param status: The status of the read. Default is OK.
+        :type status: YahooReadStatus
         """
 
         # Set all the financial summary objects to None.
@@ -54,8 +58,12 @@ class YahooSummaryResponse(BaseResponse):
         self.__upgrade_downgrade_history = None
         self.__net_share_purchase_activity = None
 
+        # The (module, seconds, allocated bytes) costs of parsing each module when the reader profiled the parse.
+        self.__parse_costs = None
+
         # Call the super class's constructor.
-        super().__init__(symbol=symbol, exception=exception)
+        super().__init__(symbol=symbol, exception=exception,
+                         status=status if status is not None else YahooReadStatus(YahooStatusCode.OK, symbol))
 
     def _handle_read(self, summary_object):
         """
@@ -75,8 +83,11 @@ class YahooSummaryResponse(BaseResponse):
                 if summary_object.included:
                     return summary_object.value
 
-                # Check to see if the property data had an error.
+                # Check to see if the property data had an error. The exception is only built when the failed
+                # property is actually read.
                 elif summary_object.error_occurred:
+                    if isinstance(summary_object.error, YahooReadStatus):
+                        raise summary_object.error.to_exception()
                     raise Exception(summary_object.error)
 
                 # If neither just return None.
@@ -103,6 +114,10 @@ class YahooSummaryResponse(BaseResponse):
         # Instantiate the summary object.
         summary_object = self.SummaryObject()
 
+        # The parse methods of the reader return a (value, error) tuple which is assigned to the property as a whole.
+        if isinstance(value, tuple) and error is None:
+            value, error = value
+
         # Check to see that either a value or an error was passed.
         if value is not None and error is not None:
             raise ValueError('Cannot assign both a value and an error.')
@@ -113,7 +128,10 @@ class YahooSummaryResponse(BaseResponse):
                 summary_object.value = value
 
             # Assign the error.
-            else:
+            elif error is not None:
+                if isinstance(error, YahooReadStatus) and error.symbol is None:
+                    error.symbol = self._symbol
+
                 summary_object.error = error
 
         return summary_object
@@ -373,3 +391,21 @@ class YahooSummaryResponse(BaseResponse):
     @net_share_purchase_activity.setter
     def net_share_purchase_activity(self, value, error=None):
         self.__net_share_purchase_activity = self._handle_write(value, error)
+
+    @property
+    def parse_costs(self):
+        """
+        Property to get the costs of parsing each module, recorded when the reader was created with profile=True.
+        :return: A dataframe with the module, seconds and allocated_bytes columns, or None if the parse was not
+        profiled.
+        :rtype: pd.DataFrame
+        """
+
+        if self.__parse_costs is None:
+            return None
+
+        return pd.DataFrame(self.__parse_costs, columns=['module', 'seconds', 'allocated_bytes'])
+
+    @parse_costs.setter
+    def parse_costs(self, costs):
+        self.__parse_costs = costs
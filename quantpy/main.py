@@ -1,9 +1,133 @@
-from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
-import inspect
+import argparse
+import collections
+import sys
+from quantpy.cli.BatchRunner import BatchRunner
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
 
 
-def main():
-    quote = YahooQuoteReader('AAPL', period='max').read()
+def read_universe(path):
+    """
+    Function to read a universe file. Symbols are separated by whitespace or commas, and everything after a # is a
+    comment.
+    :param path: The path of the universe file, or - for standard input.
+    :type path: str
+    :return: The list of symbols in the order they appear.
+    :rtype: list
+    """
 
-if __name__=='__main__':
-    main()
\ No newline at end of file
+    universe_file = sys.stdin if path == '-' else open(path)
+
+    try:
+        symbols = []
+
+        for line in universe_file:
+            line = line.split('#', 1)[0]
+            symbols.extend(symbol.strip().upper() for symbol in line.replace(',', ' ').split() if symbol.strip())
+
+        return list(dict.fromkeys(symbols))
+    finally:
+        if universe_file is not sys.stdin:
+            universe_file.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m quantpy.main',
+                                     description='Read quotes or summary modules for a universe of symbols and write '
+                                                 'them to files.')
+    parser.add_argument('kind', choices=['quotes', 'summary'], help='What to read.')
+    parser.add_argument('universe', help='The universe file of symbols, or - for standard input.')
+    parser.add_argument('-o', '--output', required=True, help='The output directory.')
+    parser.add_argument('-f', '--format', default='csv', choices=sorted(BatchRunner.FORMATS),
+                        help='The output format. Parquet and Arrow need pyarrow.')
+
+    quotes = parser.add_argument_group('quotes')
+    quotes.add_argument('--period', default='max', help='The period of the quote history, e.g. 1y or max.')
+    quotes.add_argument('--start', help='The start date (YYYY-MM-DD). Replaces the period with --end.')
+    quotes.add_argument('--end', help='The end date (YYYY-MM-DD).')
+    quotes.add_argument('--interval', default='1d', help='The quote interval, e.g. 1d or 1wk.')
+    quotes.add_argument('--events', action='store_true', help='Also write the dividends and splits.')
+
+    summary = parser.add_argument_group('summary')
+    summary.add_argument('-m', '--modules', default='',
+                         help='Comma separated summary modules: {}.'.format(
+                             ', '.join(YahooSummaryReader.MODULE_PROPERTIES)))
+
+    execution = parser.add_argument_group('execution')
+    execution.add_argument('-j', '--workers', type=int, default=8, help='The number of symbols read at once.')
+    execution.add_argument('--rate-limit', type=float, help='The maximum number of requests per second.')
+    execution.add_argument('--cache-dir', help='A directory caching the responses between runs.')
+    execution.add_argument('--cache-ttl', type=float, default=86400, help='The number of seconds a cached response '
+                                                                          'is used.')
+    execution.add_argument('--resume', action='store_true', help='Skip the symbols completed by the last run.')
+    execution.add_argument('--timeout', type=float, default=5, help='The request timeout in seconds.')
+    execution.add_argument('-q', '--quiet', action='store_true', help='Do not show the progress.')
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Function to run the command line interface.
+    :return: The exit status: 0 if every symbol was read, 1 if some failed and 2 for usage errors.
+    :rtype: int
+    """
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        symbols = read_universe(args.universe)
+    except OSError as e:
+        parser.error('Cannot read the universe file: {}'.format(e))
+
+    if not symbols:
+        parser.error('The universe file has no symbols.')
+
+    quote_options = {'period': None if args.start and args.end else args.period,
+                     'start': args.start,
+                     'end': args.end,
+                     'interval': args.interval,
+                     'events': args.events}
+
+    try:
+        runner = BatchRunner(symbols, args.output,
+                             kind=args.kind,
+                             modules=[module for module in args.modules.split(',') if module],
+                             quote_options=quote_options,
+                             output_format=args.format,
+                             workers=args.workers,
+                             rate_limit=args.rate_limit,
+                             cache_dir=args.cache_dir,
+                             cache_ttl=args.cache_ttl,
+                             resume=args.resume,
+                             timeout=args.timeout,
+                             progress=None if args.quiet else sys.stderr)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+
+    try:
+        result = runner.run()
+    except KeyboardInterrupt:
+        sys.stderr.write('\nInterrupted. Run again with --resume to continue from the checkpoint.\n')
+        return 130
+
+    print('{} symbols read, {} skipped, {} failed in {:.1f}s.'.format(result['completed'], result['skipped'],
+                                                                     len(result['failed']), result['seconds']))
+
+    if not result['failed']:
+        return 0
+
+    # Summarize the failures by their kind, listing a few symbols of each.
+    by_kind = collections.defaultdict(list)
+    for symbol, status in result['failed'].items():
+        by_kind[getattr(getattr(status, 'code', None), 'name', type(status).__name__)].append(symbol)
+
+    for kind, failed_symbols in sorted(by_kind.items(), key=lambda item: -len(item[1])):
+        sys.stderr.write('{} {}: {}{}\n'.format(len(failed_symbols), kind, ' '.join(failed_symbols[:10]),
+                                                ' ...' if len(failed_symbols) > 10 else ''))
+
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
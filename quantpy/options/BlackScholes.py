@@ -0,0 +1,231 @@
+import numpy as np
+
+
+class BlackScholes(object):
+
+    # The coefficients of West's double precision approximation of the normal distribution (Hart 5666).
+    _NUMERATOR = (0.0352624965998911, 0.700383064443688, 6.37396220353165, 33.912866078383, 112.079291497871,
+                  221.213596169931, 220.206867912376)
+    _DENOMINATOR = (0.0883883476483184, 1.75566716318264, 16.064177579207, 86.7807322029461, 296.564248779674,
+                    637.333633378831, 793.826512519948, 440.413735824752)
+
+    _SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+    @classmethod
+    def norm_cdf(cls, x):
+        """
+        Method to compute the standard normal distribution function, with an absolute error below 1e-15.
+        :param x: The values.
+        :type x: np.ndarray
+        :rtype: np.ndarray
+        """
+
+        x = np.asarray(x, dtype=np.float64)
+        z = np.abs(x)
+        exponential = np.exp(-0.5 * z * z)
+
+        # A rational function near the center, and a continued fraction in the tails.
+        numerator = np.polyval(cls._NUMERATOR, z)
+        denominator = np.polyval(cls._DENOMINATOR, z)
+        tail = z + 1.0 / (z + 2.0 / (z + 3.0 / (z + 4.0 / (z + 0.65))))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            lower = np.where(z < 7.07106781186547, exponential * numerator / denominator,
+                             exponential / tail / cls._SQRT_2PI)
+
+        lower = np.where(z < 37.0, lower, 0.0)
+
+        return np.where(x > 0.0, 1.0 - lower, lower)
+
+    @classmethod
+    def norm_pdf(cls, x):
+        x = np.asarray(x, dtype=np.float64)
+
+        return np.exp(-0.5 * x * x) / cls._SQRT_2PI
+
+    @staticmethod
+    def _inputs(*arrays):
+        # Every input is broadcast to one shape of floats, and the contract types to +1 for calls and -1 for puts.
+        *arrays, is_call = np.broadcast_arrays(*[np.asarray(array, dtype=np.float64) for array in arrays[:-1]],
+                                               np.asarray(arrays[-1], dtype=bool))
+
+        return arrays + [np.where(is_call, 1.0, -1.0)]
+
+    @staticmethod
+    def _d1_d2(spot, strike, expiry, rate, dividend_yield, volatility):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            deviation = volatility * np.sqrt(expiry)
+            d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * volatility * volatility) * expiry) / deviation
+
+        return d1, d1 - deviation, deviation
+
+    @classmethod
+    def _price(cls, spot, strike, expiry, rate, dividend_yield, volatility, sign):
+        """
+        Method to price broadcast inputs. Contracts without time or volatility are worth their discounted intrinsic
+        value.
+        :return: A tuple containing the prices and the vegas.
+        :rtype: tuple
+        """
+
+        d1, d2, deviation = cls._d1_d2(spot, strike, expiry, rate, dividend_yield, volatility)
+        forward = spot * np.exp(-dividend_yield * expiry)
+        discounted_strike = strike * np.exp(-rate * expiry)
+
+        degenerate = ~(deviation > 0.0)
+        price = sign * (forward * cls.norm_cdf(sign * d1) - discounted_strike * cls.norm_cdf(sign * d2))
+        intrinsic = np.maximum(sign * (forward - discounted_strike), 0.0)
+        vega = np.where(degenerate, 0.0, forward * cls.norm_pdf(d1) * np.sqrt(expiry))
+
+        return np.where(degenerate, intrinsic, price), vega
+
+    @classmethod
+    def price(cls, spot, strike, expiry, rate, dividend_yield, volatility, is_call):
+        """
+        Method to price European options with the Black-Scholes-Merton model. Every input is an array or a scalar, and
+        they are broadcast together.
+        :param spot: The prices of the underlyings.
+        :type spot: np.ndarray
+        :param strike: The strikes.
+        :type strike: np.ndarray
+        :param expiry: The times to expiry in years.
+        :type expiry: np.ndarray
+        :param rate: The continuously compounded risk free rates.
+        :type rate: np.ndarray
+        :param dividend_yield: The continuous dividend yields.
+        :type dividend_yield: np.ndarray
+        :param volatility: The annualized volatilities.
+        :type volatility: np.ndarray
+        :param is_call: Are the contracts calls? False for puts.
+        :type is_call: np.ndarray
+        :return: The prices.
+        :rtype: np.ndarray
+        """
+
+        return cls._price(*cls._inputs(spot, strike, expiry, rate, dividend_yield, volatility, is_call))[0]
+
+    @classmethod
+    def greeks(cls, spot, strike, expiry, rate, dividend_yield, volatility, is_call):
+        """
+        Method to price European options and compute their Greeks in closed form, see price for the inputs. The vega
+        and rho are per unit of volatility and rate (not per percent), and the theta is per year.
+        :return: A dictionary mapping price, delta, gamma, vega, theta and rho to arrays.
+        :rtype: dict
+        """
+
+        spot, strike, expiry, rate, dividend_yield, volatility, sign = cls._inputs(spot, strike, expiry, rate,
+                                                                                   dividend_yield, volatility, is_call)
+
+        d1, d2, deviation = cls._d1_d2(spot, strike, expiry, rate, dividend_yield, volatility)
+        dividend_discount = np.exp(-dividend_yield * expiry)
+        discounted_strike = strike * np.exp(-rate * expiry)
+        density = cls.norm_pdf(d1)
+        probability1 = cls.norm_cdf(sign * d1)
+        probability2 = cls.norm_cdf(sign * d2)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            greeks = {
+                'price': sign * (spot * dividend_discount * probability1 - discounted_strike * probability2),
+                'delta': sign * dividend_discount * probability1,
+                'gamma': dividend_discount * density / (spot * deviation),
+                'vega': spot * dividend_discount * density * np.sqrt(expiry),
+                'theta': (-spot * dividend_discount * density * volatility / (2.0 * np.sqrt(expiry)) -
+                          sign * rate * discounted_strike * probability2 +
+                          sign * dividend_yield * spot * dividend_discount * probability1),
+                'rho': sign * discounted_strike * expiry * probability2}
+
+        # Contracts without time or volatility are priced at their discounted intrinsic value, with the delta of it.
+        degenerate = ~(deviation > 0.0)
+
+        if degenerate.any():
+            forward = spot * dividend_discount
+            in_the_money = sign * (forward - discounted_strike) > 0.0
+
+            greeks['price'] = np.where(degenerate, np.maximum(sign * (forward - discounted_strike), 0.0),
+                                       greeks['price'])
+            greeks['delta'] = np.where(degenerate, np.where(in_the_money, sign * dividend_discount, 0.0),
+                                       greeks['delta'])
+
+            for name in ('gamma', 'vega', 'theta', 'rho'):
+                greeks[name] = np.where(degenerate, 0.0, greeks[name])
+
+        return greeks
+
+    @classmethod
+    def implied_volatility(cls, price, spot, strike, expiry, rate, dividend_yield, is_call, tolerance=1e-8,
+                           max_iterations=100, lower=1e-6, upper=10.0):
+        """
+        Method to solve for the volatilities that reproduce option prices. Every contract starts from the inflection
+        point of its price in volatility (Manaster and Koehler), from which Newton steps converge monotonically. Each
+        step also narrows a bracket around the root, and a Newton step that leaves the bracket, e.g. on a flat vega, is
+        replaced by bisection, so every contract with an arbitrage free price converges. Only the contracts that have
+        not converged are computed at each iteration.
+        :param price: The option prices, e.g. the mid of the bid and ask.
+        :type price: np.ndarray
+        :param tolerance: The absolute price error at which a contract has converged.
+        :type tolerance: float
+        :param max_iterations: The maximum number of iterations.
+        :type max_iterations: int
+        :param lower: The lowest volatility searched.
+        :type lower: float
+        :param upper: The highest volatility searched.
+        :type upper: float
+        :return: A tuple containing the volatilities, NaN for prices outside of the arbitrage bounds, and a mask of the
+        contracts that converged. See price for the other inputs.
+        :rtype: tuple
+        """
+
+        spot, strike, expiry, rate, dividend_yield, price, sign = cls._inputs(spot, strike, expiry, rate,
+                                                                              dividend_yield, price, is_call)
+        shape = price.shape
+        spot, strike, expiry, rate, dividend_yield, price, sign = [array.ravel() for array in
+                                                                   (spot, strike, expiry, rate, dividend_yield, price,
+                                                                    sign)]
+
+        forward = spot * np.exp(-dividend_yield * expiry)
+        discounted_strike = strike * np.exp(-rate * expiry)
+
+        # A price at or below the discounted intrinsic value, or above the price at infinite volatility, has no
+        # volatility.
+        intrinsic = np.maximum(sign * (forward - discounted_strike), 0.0)
+        ceiling = np.where(sign > 0.0, forward, discounted_strike)
+        solvable = np.isfinite(price) & (expiry > 0.0) & (price > intrinsic) & (price < ceiling)
+
+        volatility = np.full(price.shape, np.nan)
+        converged = np.zeros(price.shape, dtype=bool)
+
+        active = np.flatnonzero(solvable)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            guess = np.sqrt(2.0 * np.abs(np.log(forward[active] / discounted_strike[active])) / expiry[active])
+
+        sigma = np.clip(np.where(guess > lower, guess, 0.2), lower, upper)
+        low = np.full(len(active), lower)
+        high = np.full(len(active), upper)
+
+        for _ in range(max_iterations):
+            if not len(active):
+                break
+
+            model_price, vega = cls._price(spot[active], strike[active], expiry[active], rate[active],
+                                           dividend_yield[active], sigma, sign[active])
+            error = model_price - price[active]
+
+            # The price grows with the volatility, so the sign of the error moves one side of the bracket.
+            high = np.where(error > 0.0, sigma, high)
+            low = np.where(error < 0.0, sigma, low)
+
+            done = (np.abs(error) < tolerance) | (high - low < tolerance * 1e-2)
+            volatility[active] = sigma
+            converged[active[done]] = True
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                newton = sigma - error / vega
+
+            inside = np.isfinite(newton) & (newton > low) & (newton < high)
+            sigma = np.where(inside, newton, 0.5 * (low + high))
+
+            keep = ~done
+            active, sigma, low, high = active[keep], sigma[keep], low[keep], high[keep]
+
+        return volatility.reshape(shape), converged.reshape(shape)
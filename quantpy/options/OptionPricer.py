@@ -0,0 +1,235 @@
+import datetime
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from quantpy.options.BlackScholes import BlackScholes
+
+
+class OptionPricer(object):
+
+    # The number of seconds in a year of the times to expiry.
+    YEAR_SECONDS = 365.0 * 86400.0
+
+    # The columns of the dividend table.
+    DIVIDEND_COLUMNS = ['amount', 'ex_dividend_date', 'yield']
+
+    def __init__(self, rate=0.0, dividends=None, dividends_per_year=4):
+        """
+        Initializer method for the OptionPricer class. The pricer prices the option chains of YahooOptionsReader with
+        BlackScholes, one vectorized call for every contract of every symbol. Dividends are turned into a continuous
+        yield for each contract: the dividends paid until its expiry, projected from the next ex-dividend date, are
+        converted to the yield that takes the same value out of the spot price. Symbols with only a yield, e.g. funds,
+        use it for every expiry.
+        :param rate: The continuously compounded risk free rate.
+        :type rate: float
+        :param dividends: Optional. A dataframe indexed by symbol with the amount of the last dividend, the next (or
+        last) ex-dividend date in unix seconds and the yield, see dividend_table. Default is no dividends.
+        :type dividends: pd.DataFrame
+        :param dividends_per_year: The number of dividends paid per year, used to project the ex-dividend dates.
+        :type dividends_per_year: int
+        """
+
+        self.__rate = rate
+        self.__dividends = dividends if dividends is not None else pd.DataFrame(
+            columns=self.DIVIDEND_COLUMNS, dtype=np.float64)
+        self.__dividends_per_year = dividends_per_year
+
+    @classmethod
+    def from_responses(cls, summary_responses, rate=0.0, dividends_per_year=4):
+        """
+        Method to build a pricer with the dividends of YahooSummaryReader responses, read with the default key
+        statistics and the calendar events modules.
+        :param summary_responses: A dictionary mapping symbols to YahooSummaryResponse objects.
+        :type summary_responses: dict
+        :rtype: OptionPricer
+        """
+
+        return cls(rate, cls.dividend_table(summary_responses), dividends_per_year)
+
+    @property
+    def dividends(self):
+        return self.__dividends
+
+    @staticmethod
+    def _module_row(response, module):
+        # The first row of a single row module, or None if the module was not read or failed to parse.
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore')
+                module_dataframe = getattr(response, module)
+        except Exception:
+            return None
+
+        if module_dataframe is None or module_dataframe.empty:
+            return None
+
+        return module_dataframe.iloc[0]
+
+    @classmethod
+    def dividend_table(cls, summary_responses):
+        """
+        Method to collect the dividends of YahooSummaryReader responses: the last dividend value and the yield from
+        default_key_statistics, and the ex-dividend date from calendar_events_dividends.
+        :param summary_responses: A dictionary mapping symbols to YahooSummaryResponse objects.
+        :type summary_responses: dict
+        :return: A dataframe indexed by symbol with the amount, ex_dividend_date and yield columns, NaN when missing.
+        :rtype: pd.DataFrame
+        """
+
+        rows = {}
+
+        for symbol, response in summary_responses.items():
+            statistics = cls._module_row(response, 'default_key_statistics')
+            calendar = cls._module_row(response, 'calendar_events_dividends')
+
+            row = {'amount': np.nan, 'ex_dividend_date': np.nan, 'yield': np.nan}
+
+            if statistics is not None:
+                row['amount'] = statistics.get('last_dividend_value', np.nan)
+                row['yield'] = statistics.get('yield', np.nan)
+
+            if calendar is not None:
+                row['ex_dividend_date'] = cls._scalar_seconds(calendar.get('ex_dividend_date', np.nan))
+
+            rows[symbol] = row
+
+        table = pd.DataFrame.from_dict(rows, orient='index', columns=cls.DIVIDEND_COLUMNS, dtype=np.float64)
+        table.index.name = 'symbol'
+
+        return table
+
+    @staticmethod
+    def _scalar_seconds(value):
+        # An ex-dividend date is unix seconds, or a UTC Timestamp once compacted.
+        if value is None or pd.isna(value):
+            return np.nan
+
+        if isinstance(value, (datetime.date, np.datetime64)):
+            value = pd.Timestamp(value)
+
+            return (value if value.tzinfo is not None else value.tz_localize('UTC')).timestamp()
+
+        return value
+
+    @staticmethod
+    def _seconds(values):
+        # The expiries are unix seconds, or UTC datetimes once compacted.
+        if is_datetime64_any_dtype(values):
+            return pd.DatetimeIndex(values).as_unit('s').asi8.astype(np.float64)
+
+        return np.asarray(values, dtype=np.float64)
+
+    def dividend_yields(self, symbols, spots, expiries, valuation_time):
+        """
+        Method to get the continuous dividend yield of every contract.
+        :param symbols: The symbol of every contract.
+        :type symbols: np.ndarray
+        :param spots: The spot price of every contract.
+        :type spots: np.ndarray
+        :param expiries: The unix expiry of every contract.
+        :type expiries: np.ndarray
+        :param valuation_time: The unix time of the valuation.
+        :type valuation_time: float
+        :rtype: np.ndarray
+        """
+
+        # The dividends of every contract, looked up once per contract by the position of its symbol.
+        positions = self.__dividends.index.get_indexer(symbols)
+        found = positions >= 0
+        dividends = self.__dividends.to_numpy(dtype=np.float64)
+        amount, ex_date, fund_yield = [np.where(found, dividends[positions, column], np.nan) for column in range(3)]
+
+        expiry = (expiries - valuation_time) / self.YEAR_SECONDS
+        period = self.YEAR_SECONDS / self.__dividends_per_year
+
+        # The first ex-dividend date after the valuation, projected forward from the last known one, and the number of
+        # ex-dividend dates until expiry.
+        with np.errstate(invalid='ignore'):
+            first = ex_date + np.maximum(np.floor((valuation_time - ex_date) / period) + 1.0, 0.0) * period
+            paid = np.where(expiries >= first, np.floor((expiries - first) / period) + 1.0, 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scheduled = -np.log1p(-amount * paid / spots) / expiry
+
+            # Without an ex-dividend date, the last dividend is assumed to be paid every period.
+            annualized = -np.log1p(-amount * self.__dividends_per_year / spots)
+
+        yields = np.where(np.isfinite(ex_date), scheduled, annualized)
+        yields = np.where(np.isfinite(yields), yields, fund_yield)
+
+        return np.where(np.isfinite(yields) & (expiry > 0.0), yields, 0.0)
+
+    def _contracts(self, chain, spots, valuation_time):
+        """
+        Method to get the pricing inputs of a chain.
+        :return: A tuple containing the spots, strikes, times to expiry, dividend yields and call masks.
+        :rtype: tuple
+        """
+
+        valuation_time = time.time() if valuation_time is None else valuation_time
+        symbols = chain['symbol'].to_numpy(dtype=object)
+
+        spot = pd.Series(spots, dtype=np.float64).reindex(symbols).to_numpy()
+        expiries = self._seconds(chain['expiry'])
+        expiry = (expiries - valuation_time) / self.YEAR_SECONDS
+        dividend_yield = self.dividend_yields(symbols, spot, expiries, valuation_time)
+        is_call = (chain['type'] == 'call').to_numpy(dtype=bool)
+
+        return spot, chain['strike'].to_numpy(dtype=np.float64), expiry, dividend_yield, is_call
+
+    def price(self, chain, spots, volatility='implied_volatility', valuation_time=None):
+        """
+        Method to price a chain and compute its Greeks.
+        :param chain: The chain table of YahooOptionsReader.read.
+        :type chain: pd.DataFrame
+        :param spots: The spot prices by symbol, e.g. the regular_market_price of YahooOptionsReader.underlyings.
+        :type spots: pd.Series or dict
+        :param volatility: The column of the chain holding the volatilities, or one volatility for every contract.
+        :type volatility: str or float
+        :param valuation_time: Optional. The unix time of the valuation. Default is now.
+        :type valuation_time: float
+        :return: A dataframe aligned with the chain with the time to expiry, the dividend yield, the price and the
+        Greeks of every contract.
+        :rtype: pd.DataFrame
+        """
+
+        spot, strike, expiry, dividend_yield, is_call = self._contracts(chain, spots, valuation_time)
+        volatility = chain[volatility].to_numpy(dtype=np.float64) if isinstance(volatility, str) else volatility
+
+        greeks = BlackScholes.greeks(spot, strike, expiry, self.__rate, dividend_yield, volatility, is_call)
+
+        return pd.DataFrame({'expiry_years': expiry, 'dividend_yield': dividend_yield, **greeks}, index=chain.index)
+
+    def implied_volatilities(self, chain, spots, price='mid', valuation_time=None, **kwargs):
+        """
+        Method to solve for the implied volatilities of a chain.
+        :param chain: The chain table of YahooOptionsReader.read.
+        :type chain: pd.DataFrame
+        :param spots: The spot prices by symbol.
+        :type spots: pd.Series or dict
+        :param price: The price solved for: mid for the mid of the bid and ask (the last price when either is
+        missing or zero), or a column of the chain, e.g. last_price.
+        :type price: str
+        :param valuation_time: Optional. The unix time of the valuation. Default is now.
+        :type valuation_time: float
+        :param kwargs: The arguments of BlackScholes.implied_volatility, e.g. tolerance.
+        :return: A dataframe aligned with the chain with the implied volatility and whether it converged.
+        :rtype: pd.DataFrame
+        """
+
+        spot, strike, expiry, dividend_yield, is_call = self._contracts(chain, spots, valuation_time)
+
+        if price == 'mid':
+            bid = chain['bid'].to_numpy(dtype=np.float64)
+            ask = chain['ask'].to_numpy(dtype=np.float64)
+            quoted = (bid > 0.0) & (ask > 0.0)
+            prices = np.where(quoted, 0.5 * (bid + ask), chain['last_price'].to_numpy(dtype=np.float64))
+        else:
+            prices = chain[price].to_numpy(dtype=np.float64)
+
+        volatility, converged = BlackScholes.implied_volatility(prices, spot, strike, expiry, self.__rate,
+                                                                dividend_yield, is_call, **kwargs)
+
+        return pd.DataFrame({'implied_volatility': volatility, 'converged': converged}, index=chain.index)
@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class LedoitWolfEstimator(object):
+
+    def __init__(self, n_assets):
+        """
+        Initializer method for the LedoitWolfEstimator class. The estimator keeps running sums of the observations in a
+        window so that rows can be added and removed in O(p^2) instead of recomputing the covariance from the whole
+        window. The covariance is shrunk towards a scaled identity matrix following Ledoit and Wolf (2004).
+        :param n_assets: The number of assets (columns) of the observations.
+        :type n_assets: int
+        """
+
+        self.__n_assets = n_assets
+        self.reset()
+
+    def reset(self):
+        """
+        Method to remove every observation from the estimator.
+        """
+
+        p = self.__n_assets
+
+        self.__n = 0
+        self.__sum = np.zeros(p)
+        self.__cross = np.zeros((p, p))
+
+        # Sums of the squared norms used by the shrinkage intensity: sum(|x|^2), sum(|x|^4) and sum(|x|^2 * x).
+        self.__norm_sum = 0.0
+        self.__norm_sq_sum = 0.0
+        self.__norm_weighted_sum = np.zeros(p)
+
+    @property
+    def n(self):
+        return self.__n
+
+    def add(self, rows):
+        """
+        Method to add observations to the window.
+        :param rows: An n x p array of observations.
+        :type rows: np.ndarray
+        """
+
+        self._update(np.atleast_2d(rows), 1)
+
+    def remove(self, rows):
+        """
+        Method to remove observations that were previously added to the window.
+        :param rows: An n x p array of observations.
+        :type rows: np.ndarray
+        """
+
+        self._update(np.atleast_2d(rows), -1)
+
+    def _update(self, rows, sign):
+        if rows.shape[0] == 0:
+            return
+
+        norms = np.einsum('ij,ij->i', rows, rows)
+
+        self.__n += sign * rows.shape[0]
+        self.__sum += sign * rows.sum(axis=0)
+        self.__cross += sign * (rows.T @ rows)
+        self.__norm_sum += sign * norms.sum()
+        self.__norm_sq_sum += sign * (norms ** 2).sum()
+        self.__norm_weighted_sum += sign * (norms @ rows)
+
+    def mean(self):
+        """
+        Method to get the mean of the observations in the window.
+        :return: The mean of each asset.
+        :rtype: np.ndarray
+        """
+
+        return self.__sum / self.__n
+
+    def covariance(self):
+        """
+        Method to get the shrunk covariance of the observations in the window.
+        :return: A tuple containing the p x p shrunk covariance matrix and the shrinkage intensity.
+        :rtype: tuple
+        """
+
+        if self.__n < 2:
+            raise ValueError('At least two observations are needed to estimate a covariance.')
+
+        n = self.__n
+        p = self.__n_assets
+        mean = self.mean()
+
+        # The maximum likelihood sample covariance of the demeaned observations.
+        sample = self.__cross / n - np.outer(mean, mean)
+
+        # The shrinkage target is the identity scaled by the average variance.
+        mu = np.trace(sample) / p
+        sample_norm = np.einsum('ij,ij->', sample, sample)
+        delta = (sample_norm - 2.0 * mu * np.trace(sample) + mu ** 2 * p) / p
+
+        # sum(|x_k - m|^4) expanded in terms of the running sums, with a = |x|^2, b = x.m and c = |m|^2.
+        c = mean @ mean
+        sum_b = self.__sum @ mean
+        sum_b_sq = mean @ self.__cross @ mean
+        sum_ab = self.__norm_weighted_sum @ mean
+        centered_norm_sq_sum = (self.__norm_sq_sum + 4.0 * sum_b_sq + n * c ** 2 - 4.0 * sum_ab
+                                + 2.0 * c * self.__norm_sum - 4.0 * c * sum_b)
+
+        # The estimate of the error of the sample covariance, which can not be larger than the distance to the target.
+        beta = max((centered_norm_sq_sum - n * sample_norm) / (n ** 2 * p), 0.0)
+        beta = min(beta, delta)
+        shrinkage = beta / delta if delta > 0 else 0.0
+
+        covariance = (1.0 - shrinkage) * sample
+        covariance[np.diag_indices(p)] += shrinkage * mu
+
+        return covariance, shrinkage
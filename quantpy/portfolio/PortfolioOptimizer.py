@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from quantpy.portfolio.LedoitWolfEstimator import LedoitWolfEstimator
+
+
+class PortfolioOptimizer(object):
+
+    def __init__(self, returns, window=252, batch_size=16):
+        """
+        Initializer method for the PortfolioOptimizer class. The optimizer estimates a Ledoit-Wolf covariance matrix
+        over a rolling window ending at each rebalance date and solves the portfolios of many rebalance dates at once.
+        :param returns: A time x symbol dataframe of returns, e.g. QuotePanel.returns(). Missing returns are treated as
+        zero.
+        :type returns: pd.DataFrame
+        :param window: The number of rows used to estimate the covariance at each rebalance date.
+        :type window: int
+        :param batch_size: The number of rebalance dates solved together. Each date holds a p x p matrix in memory.
+        :type batch_size: int
+        """
+
+        self.__symbols = returns.columns
+        self.__index = returns.index
+        self.__returns = np.ascontiguousarray(np.nan_to_num(returns.to_numpy(dtype=np.float64)))
+        self.__window = window
+        self.__batch_size = batch_size
+        self.__shrinkage = None
+
+    @property
+    def shrinkage(self):
+        """
+        Property to get the shrinkage intensities of the covariances estimated by the last optimization.
+        :rtype: pd.Series
+        """
+
+        return self.__shrinkage
+
+    def covariances(self, rebalance_dates):
+        """
+        Method to estimate the covariance and mean at each rebalance date. Consecutive windows are updated by adding the
+        new rows and removing the old ones instead of being estimated from scratch.
+        :param rebalance_dates: The dates of the returns index to estimate at.
+        :type rebalance_dates: list
+        :return: A generator of (date, covariance, mean, shrinkage) tuples in date order.
+        :rtype: generator
+        """
+
+        positions = np.sort(self.__index.get_indexer(pd.Index(rebalance_dates)))
+
+        if (positions < 0).any():
+            raise ValueError('Rebalance dates must be in the returns index.')
+
+        estimator = LedoitWolfEstimator(self.__returns.shape[1])
+        window_start, window_end = 0, 0
+
+        for position in positions:
+            new_start, new_end = max(position + 1 - self.__window, 0), position + 1
+
+            if new_start >= window_end:
+                # The windows do not overlap, so there is nothing to keep.
+                estimator.reset()
+                estimator.add(self.__returns[new_start:new_end])
+            else:
+                estimator.add(self.__returns[window_end:new_end])
+                estimator.remove(self.__returns[window_start:new_start])
+
+            window_start, window_end = new_start, new_end
+            covariance, shrinkage = estimator.covariance()
+
+            yield self.__index[position], covariance, estimator.mean(), shrinkage
+
+    def _optimize(self, rebalance_dates, solver, expected_returns=None, **solver_kwargs):
+        """
+        Method to estimate the covariances in batches and solve each batch with a solver.
+        :param rebalance_dates: The dates to rebalance at.
+        :type rebalance_dates: list
+        :param solver: A function taking a d x p x p stack of covariances and a d x p stack of means and returning a
+        d x p stack of weights.
+        :type solver: callable
+        :param expected_returns: Optional. A rebalance date x symbol dataframe used in place of the window means.
+        :type expected_returns: pd.DataFrame
+        :return: A rebalance date x symbol dataframe of the weights.
+        :rtype: pd.DataFrame
+        """
+
+        dates, weights, shrinkages = [], [], []
+        batch_covariances, batch_means = [], []
+
+        if expected_returns is not None:
+            expected_returns = expected_returns.reindex(columns=self.__symbols).fillna(0.0)
+
+        for date, covariance, mean, shrinkage in self.covariances(rebalance_dates):
+            dates.append(date)
+            shrinkages.append(shrinkage)
+            batch_covariances.append(covariance)
+            batch_means.append(mean if expected_returns is None else expected_returns.loc[date].to_numpy())
+
+            if len(batch_covariances) == self.__batch_size:
+                weights.append(solver(np.stack(batch_covariances), np.stack(batch_means), **solver_kwargs))
+                batch_covariances, batch_means = [], []
+
+        if batch_covariances:
+            weights.append(solver(np.stack(batch_covariances), np.stack(batch_means), **solver_kwargs))
+
+        self.__shrinkage = pd.Series(shrinkages, index=dates, name='shrinkage')
+
+        return pd.DataFrame(np.concatenate(weights) if weights else np.empty((0, len(self.__symbols))),
+                            index=dates, columns=self.__symbols)
+
+    def minimum_variance(self, rebalance_dates):
+        """
+        Method to get the fully invested minimum variance portfolio at each rebalance date.
+        :param rebalance_dates: The dates to rebalance at.
+        :type rebalance_dates: list
+        :return: A rebalance date x symbol dataframe of the weights.
+        :rtype: pd.DataFrame
+        """
+
+        return self._optimize(rebalance_dates, self._solve_minimum_variance)
+
+    def mean_variance(self, rebalance_dates, risk_aversion=1.0, expected_returns=None):
+        """
+        Method to get the fully invested mean-variance portfolio at each rebalance date.
+        :param rebalance_dates: The dates to rebalance at.
+        :type rebalance_dates: list
+        :param risk_aversion: The risk aversion of the investor. Larger values give portfolios closer to the minimum
+        variance portfolio.
+        :type risk_aversion: float
+        :param expected_returns: Optional. A rebalance date x symbol dataframe of the expected returns. Default is the
+        mean return over each window.
+        :type expected_returns: pd.DataFrame
+        :return: A rebalance date x symbol dataframe of the weights.
+        :rtype: pd.DataFrame
+        """
+
+        return self._optimize(rebalance_dates, self._solve_mean_variance, expected_returns=expected_returns,
+                              risk_aversion=risk_aversion)
+
+    def risk_parity(self, rebalance_dates, max_iter=1000, tolerance=1e-10):
+        """
+        Method to get the long only portfolio in which every asset contributes the same risk at each rebalance date.
+        :param rebalance_dates: The dates to rebalance at.
+        :type rebalance_dates: list
+        :param max_iter: The maximum number of iterations of the solver.
+        :type max_iter: int
+        :param tolerance: The largest change of any weight for the solver to be considered converged.
+        :type tolerance: float
+        :return: A rebalance date x symbol dataframe of the weights.
+        :rtype: pd.DataFrame
+        """
+
+        return self._optimize(rebalance_dates, self._solve_risk_parity, max_iter=max_iter, tolerance=tolerance)
+
+    @staticmethod
+    def _solve_minimum_variance(covariances, means):
+        ones = np.ones(covariances.shape[:2] + (1,))
+        inverse_ones = np.linalg.solve(covariances, ones)[..., 0]
+
+        return inverse_ones / inverse_ones.sum(axis=1, keepdims=True)
+
+    @staticmethod
+    def _solve_mean_variance(covariances, means, risk_aversion):
+        # Solve for both right hand sides at once. The weights are the minimum variance portfolio plus a zero cost
+        # tilt towards the expected returns.
+        right_hand_sides = np.stack([np.ones_like(means), means], axis=2)
+        solved = np.linalg.solve(covariances, right_hand_sides)
+        inverse_ones, inverse_means = solved[..., 0], solved[..., 1]
+
+        ones_total = inverse_ones.sum(axis=1, keepdims=True)
+        minimum_variance = inverse_ones / ones_total
+        tilt = inverse_means - inverse_means.sum(axis=1, keepdims=True) / ones_total * inverse_ones
+
+        return minimum_variance + tilt / risk_aversion
+
+    @staticmethod
+    def _solve_risk_parity(covariances, means, max_iter, tolerance):
+        # Start from the inverse volatility portfolio and iterate w = sqrt(w / (Sigma w)), which converges to equal risk
+        # contributions for positive definite covariances.
+        volatilities = np.sqrt(np.einsum('dii->di', covariances))
+        weights = 1.0 / volatilities
+        weights /= weights.sum(axis=1, keepdims=True)
+
+        for _ in range(max_iter):
+            marginal = np.einsum('dij,dj->di', covariances, weights)
+            new_weights = np.sqrt(weights / marginal)
+            new_weights /= new_weights.sum(axis=1, keepdims=True)
+
+            converged = np.abs(new_weights - weights).max() < tolerance
+            weights = new_weights
+
+            if converged:
+                break
+
+        return weights
@@ -0,0 +1,315 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from quantpy.portfolio.LedoitWolfEstimator import LedoitWolfEstimator
+
+
+class RiskEngine(object):
+
+    def __init__(self, returns, positions, window=252, confidence=0.99, horizon=1, batch_size=256):
+        """
+        Initializer method for the RiskEngine class. The engine measures the value at risk and conditional value at
+        risk of many portfolios over a shared universe of symbols. It keeps one window of returns for all portfolios,
+        the profit and loss of every portfolio on every bar of the window, and the running sums of a Ledoit-Wolf
+        covariance estimator. Both windows are rings indexed by the bar number, so a new bar replaces the oldest row in
+        O(p^2 + p * portfolios) and a position change recomputes only the changed portfolios.
+        :param returns: A time x symbol dataframe of simple returns, e.g. QuotePanel.returns('adjclose'). Rows without
+        any return are dropped and other missing returns are treated as zero. Only the last window rows are kept.
+        :type returns: pd.DataFrame
+        :param positions: A portfolio x symbol dataframe of the value held in each symbol. Symbols missing from the
+        returns are ignored.
+        :type positions: pd.DataFrame
+        :param window: The number of bars used to measure the risk.
+        :type window: int
+        :param confidence: The default confidence level, e.g. 0.99 for the loss exceeded on 1% of the bars.
+        :type confidence: float
+        :param horizon: The number of bars the losses are measured over. The historical and parametric measures are
+        scaled from one bar by the square root of time.
+        :type horizon: int
+        :param batch_size: The number of portfolios whose simulated losses are held in memory at once.
+        :type batch_size: int
+        """
+
+        returns = returns.dropna(how='all').iloc[-window:]
+
+        self.__symbols = returns.columns
+        self.__window = window
+        self.__confidence = confidence
+        self.__horizon = horizon
+        self.__batch_size = batch_size
+        self.__date = returns.index[-1] if len(returns) else None
+
+        # The return of the bar numbered t is kept in row t % window.
+        self.__returns = np.zeros((window, len(self.__symbols)))
+        self.__returns[:len(returns)] = np.nan_to_num(returns.to_numpy(dtype=np.float64))
+        self.__count = len(returns)
+
+        self.__estimator = LedoitWolfEstimator(len(self.__symbols))
+        self.__estimator.add(self.__returns[:self.__count])
+
+        self.__portfolios = pd.Index([])
+        self.__positions = np.zeros((0, len(self.__symbols)))
+        self.__pnl = np.zeros((window, 0))
+        self.set_positions(positions)
+
+    @classmethod
+    def from_panel(cls, panel, positions, field='adjclose', **kwargs):
+        """
+        Method to build an engine from the returns of a QuotePanel.
+        :param panel: The quote panel of the universe.
+        :type panel: QuotePanel
+        :param positions: A portfolio x symbol dataframe of the value held in each symbol.
+        :type positions: pd.DataFrame
+        :param field: The field to get the returns of.
+        :type field: str
+        :param kwargs: The other arguments of the engine.
+        :rtype: RiskEngine
+        """
+
+        return cls(panel.returns(field), positions, **kwargs)
+
+    @property
+    def date(self):
+        return self.__date
+
+    @property
+    def symbols(self):
+        return self.__symbols
+
+    @property
+    def portfolios(self):
+        return self.__portfolios
+
+    @property
+    def positions(self):
+        """
+        Property to get the positions of every portfolio.
+        :rtype: pd.DataFrame
+        """
+
+        return pd.DataFrame(self.__positions, index=self.__portfolios, columns=self.__symbols)
+
+    @property
+    def _filled(self):
+        return min(self.__count, self.__window)
+
+    def add_bar(self, returns, date=None):
+        """
+        Method to add the returns of a new bar to the window, dropping the oldest bar once the window is full.
+        :param returns: The return of each symbol. Symbols outside the universe are ignored and missing ones are
+        treated as zero.
+        :type returns: pd.Series
+        :param date: Optional. The date of the bar. Default is the name of the returns.
+        """
+
+        row = np.nan_to_num(returns.reindex(self.__symbols).to_numpy(dtype=np.float64))
+        slot = self.__count % self.__window
+
+        if self.__count >= self.__window:
+            self.__estimator.remove(self.__returns[slot])
+
+        self.__returns[slot] = row
+        self.__estimator.add(row)
+        self.__pnl[slot] = self.__positions @ row
+
+        self.__count += 1
+        self.__date = date if date is not None else returns.name
+
+    def set_positions(self, positions):
+        """
+        Method to set the positions of some portfolios, adding the portfolios that are new. Only the profit and loss of
+        the given portfolios is recomputed.
+        :param positions: A portfolio x symbol dataframe of the value held in each symbol. Symbols that are not given
+        are not held.
+        :type positions: pd.DataFrame
+        """
+
+        rows = np.nan_to_num(positions.reindex(columns=self.__symbols).to_numpy(dtype=np.float64))
+        indexer = self.__portfolios.get_indexer(positions.index)
+        new = indexer < 0
+
+        if new.any():
+            # The new portfolios are appended after the existing ones.
+            indexer[new] = np.arange(len(self.__portfolios), len(self.__portfolios) + new.sum())
+            self.__portfolios = self.__portfolios.append(positions.index[new])
+            self.__positions = np.vstack([self.__positions, np.zeros((new.sum(), len(self.__symbols)))])
+            self.__pnl = np.hstack([self.__pnl, np.zeros((self.__window, new.sum()))])
+
+        self.__positions[indexer] = rows
+        self.__pnl[:self._filled, indexer] = self.__returns[:self._filled] @ rows.T
+
+    def remove_portfolios(self, portfolios):
+        """
+        Method to stop measuring the risk of some portfolios.
+        :param portfolios: The portfolios to remove.
+        :type portfolios: list
+        """
+
+        keep = ~self.__portfolios.isin(portfolios)
+
+        self.__portfolios = self.__portfolios[keep]
+        self.__positions = self.__positions[keep]
+        self.__pnl = self.__pnl[:, keep]
+
+    @staticmethod
+    def _tail(losses, confidence):
+        """
+        Method to get the value at risk and conditional value at risk of every column of losses. The value at risk is
+        the smallest of the largest (1 - confidence) share of the losses, and the conditional value at risk their mean.
+        :param losses: An observation x portfolio array of losses.
+        :type losses: np.ndarray
+        :return: A tuple containing the value at risk and conditional value at risk of every portfolio.
+        :rtype: tuple
+        """
+
+        n = losses.shape[0]
+        tail = max(1, int(np.ceil(round((1.0 - confidence) * n, 9))))
+
+        # Partitioning puts the largest losses last without sorting the rest.
+        largest = np.partition(losses, n - tail, axis=0)[n - tail:]
+
+        return largest[0], largest.mean(axis=0)
+
+    def _frame(self, var, cvar):
+        return pd.DataFrame({'var': var, 'cvar': cvar}, index=self.__portfolios)
+
+    def historical(self, confidence=None):
+        """
+        Method to get the historical value at risk and conditional value at risk of every portfolio, from the losses
+        the current positions would have made on the bars of the window.
+        :param confidence: Optional. The confidence level. Default is the confidence of the engine.
+        :type confidence: float
+        :return: A portfolio dataframe with var and cvar columns, as positive losses.
+        :rtype: pd.DataFrame
+        """
+
+        if self._filled == 0:
+            raise ValueError('The window has no bars.')
+
+        var, cvar = self._tail(-self.__pnl[:self._filled], confidence or self.__confidence)
+        scale = np.sqrt(self.__horizon)
+
+        return self._frame(var * scale, cvar * scale)
+
+    def _moments(self):
+        """
+        Method to get the mean and shrunk covariance of the returns over the horizon.
+        :rtype: tuple
+        """
+
+        covariance, _ = self.__estimator.covariance()
+
+        return self.__estimator.mean() * self.__horizon, covariance * self.__horizon
+
+    def parametric(self, confidence=None):
+        """
+        Method to get the parametric value at risk and conditional value at risk of every portfolio, with normal
+        returns whose mean and Ledoit-Wolf covariance are estimated over the window.
+        :param confidence: Optional. The confidence level. Default is the confidence of the engine.
+        :type confidence: float
+        :return: A portfolio dataframe with var and cvar columns, as positive losses.
+        :rtype: pd.DataFrame
+        """
+
+        confidence = confidence or self.__confidence
+        mean, covariance = self._moments()
+        z = NormalDist().inv_cdf(confidence)
+
+        # The mean and volatility of every portfolio's profit and loss.
+        pnl_mean = self.__positions @ mean
+        pnl_std = np.sqrt(np.einsum('ij,ij->i', self.__positions @ covariance, self.__positions))
+
+        return self._frame(z * pnl_std - pnl_mean, NormalDist().pdf(z) / (1.0 - confidence) * pnl_std - pnl_mean)
+
+    def marginal(self, confidence=None):
+        """
+        Method to get the parametric marginal value at risk of every portfolio, the change of its value at risk per
+        unit of value added to each symbol.
+        :param confidence: Optional. The confidence level. Default is the confidence of the engine.
+        :type confidence: float
+        :return: A portfolio x symbol dataframe.
+        :rtype: pd.DataFrame
+        """
+
+        mean, covariance = self._moments()
+        z = NormalDist().inv_cdf(confidence or self.__confidence)
+
+        exposures = self.__positions @ covariance
+        pnl_std = np.sqrt(np.einsum('ij,ij->i', exposures, self.__positions))
+
+        # Portfolios without risk have no marginal risk.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            marginal = z * np.where(pnl_std[:, None] > 0, exposures / pnl_std[:, None], 0.0) - mean
+
+        return pd.DataFrame(marginal, index=self.__portfolios, columns=self.__symbols)
+
+    def component(self, confidence=None):
+        """
+        Method to get the parametric component value at risk of every portfolio, the share of its value at risk due to
+        each symbol. The components of a portfolio sum to its parametric value at risk.
+        :param confidence: Optional. The confidence level. Default is the confidence of the engine.
+        :type confidence: float
+        :return: A portfolio x symbol dataframe.
+        :rtype: pd.DataFrame
+        """
+
+        return self.marginal(confidence) * self.__positions
+
+    def scenarios(self, scenarios=10000, seed=None, model=None):
+        """
+        Method to simulate the returns of every symbol over the horizon.
+        :param scenarios: The number of scenarios.
+        :type scenarios: int
+        :param seed: Optional. The seed of the random generator.
+        :type seed: int
+        :param model: Optional. A path model of the symbols, e.g. a BlockBootstrap or JumpDiffusion. Default is normal
+        returns with the mean and covariance of the window.
+        :return: A scenario x symbol array of returns.
+        :rtype: np.ndarray
+        """
+
+        rng = np.random.default_rng(seed)
+
+        if model is not None:
+            if model.assets != len(self.__symbols):
+                raise ValueError('The model has {} assets, the universe {}.'.format(model.assets,
+                                                                                    len(self.__symbols)))
+
+            return np.expm1(model.log_returns(rng, scenarios, self.__horizon).sum(axis=1))
+
+        # An eigen decomposition factors the covariance even when it is singular.
+        mean, covariance = self._moments()
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+        return rng.standard_normal((scenarios, len(self.__symbols))) @ factor.T + mean
+
+    def monte_carlo(self, confidence=None, scenarios=10000, seed=None, model=None):
+        """
+        Method to get the Monte Carlo value at risk and conditional value at risk of every portfolio. Every portfolio
+        is valued on the same scenarios, in batches of portfolios.
+        :param confidence: Optional. The confidence level. Default is the confidence of the engine.
+        :type confidence: float
+        :param scenarios: The number of scenarios, or a scenario x symbol array of returns from the scenarios method.
+        :type scenarios: int
+        :param seed: Optional. The seed of the random generator.
+        :type seed: int
+        :param model: Optional. A path model of the symbols, see the scenarios method.
+        :return: A portfolio dataframe with var and cvar columns, as positive losses.
+        :rtype: pd.DataFrame
+        """
+
+        confidence = confidence or self.__confidence
+
+        if np.ndim(scenarios) == 0:
+            scenarios = self.scenarios(scenarios, seed, model)
+
+        var, cvar = np.empty(len(self.__portfolios)), np.empty(len(self.__portfolios))
+
+        for start in range(0, len(self.__portfolios), self.__batch_size):
+            batch = slice(start, start + self.__batch_size)
+            var[batch], cvar[batch] = self._tail(-(scenarios @ self.__positions[batch].T), confidence)
+
+        return self._frame(var, cvar)
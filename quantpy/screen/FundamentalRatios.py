@@ -0,0 +1,252 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+class FundamentalRatios(object):
+
+    # Income statement and cash flow fields that are flows over a period and are summed to a trailing twelve months.
+    _FLOW_FIELDS = ['total_revenue', 'gross_profit', 'operating_income', 'ebit', 'net_income',
+                    'total_cash_from_operating_activities', 'capital_expenditures', 'dividends_paid']
+
+    # Balance sheet fields that are stocks at the end of a period.
+    _STOCK_FIELDS = ['total_assets', 'total_liab', 'total_stockholder_equity', 'total_current_assets',
+                     'total_current_liabilities', 'long_term_debt', 'short_long_term_debt', 'cash']
+
+    def __init__(self, income_statements, balance_sheets, cash_flow_statements, quarterly=True, market_caps=None):
+        """
+        Initializer method for the FundamentalRatios class. The statements of every symbol are stacked into one long
+        table aligned by symbol and end_date, so every ratio is computed as one column operation over the universe.
+        :param income_statements: A dictionary mapping symbols to income statement history dataframes.
+        :type income_statements: dict
+        :param balance_sheets: A dictionary mapping symbols to balance sheet history dataframes.
+        :type balance_sheets: dict
+        :param cash_flow_statements: A dictionary mapping symbols to cash flow statement history dataframes.
+        :type cash_flow_statements: dict
+        :param quarterly: Are the statements quarterly? Quarterly flows are summed over the trailing four quarters.
+        :type quarterly: bool
+        :param market_caps: Optional. A series mapping symbols to their market capitalization. Needed for the free cash
+        flow yield.
+        :type market_caps: pd.Series
+        """
+
+        self.__quarterly = quarterly
+        self.__market_caps = market_caps
+
+        income = self._stack(income_statements)
+        balance = self._stack(balance_sheets)
+        cash_flow = self._stack(cash_flow_statements)
+
+        # Outer join the statements on (symbol, end_date). A field reported by more than one statement (e.g. net_income
+        # in both the income and cash flow statements) is taken from the first.
+        statements = income.join(balance[balance.columns.difference(income.columns)], how='outer')
+        statements = statements.join(cash_flow[cash_flow.columns.difference(statements.columns)], how='outer')
+
+        self.__statements = statements.sort_index()
+
+    @classmethod
+    def from_responses(cls, responses, quarterly=True):
+        """
+        Method to build the ratios from YahooSummaryReader responses. The responses need the income statement, balance
+        sheet and cash flow statement histories of the matching frequency. If the financial data and key statistics
+        modules were requested too, the market capitalization is computed from the current price and shares outstanding.
+        :param responses: A dictionary mapping symbols to YahooSummaryResponse objects.
+        :type responses: dict
+        :param quarterly: Use the quarterly statement histories?
+        :type quarterly: bool
+        :return: The ratios object.
+        :rtype: FundamentalRatios
+        """
+
+        suffix = '_quarterly' if quarterly else ''
+        income = cls._module_frames(responses, 'income_statement_history' + suffix)
+        balance = cls._module_frames(responses, 'balance_sheet_history' + suffix)
+        cash_flow = cls._module_frames(responses, 'cash_flow_statement_history' + suffix)
+
+        financial_data = cls._module_frames(responses, 'financial_data')
+        key_statistics = cls._module_frames(responses, 'default_key_statistics')
+        market_caps = None
+
+        if financial_data and key_statistics:
+            prices = cls._stack_latest(financial_data, 'current_price')
+            shares = cls._stack_latest(key_statistics, 'shares_outstanding')
+            market_caps = (prices * shares).dropna()
+
+        return cls(income, balance, cash_flow, quarterly, market_caps)
+
+    @staticmethod
+    def _module_frames(responses, module):
+        """
+        Method to get the dataframes of one module from many responses, skipping the symbols without it.
+        :return: A dictionary mapping symbols to the module dataframes.
+        :rtype: dict
+        """
+
+        frames = {}
+
+        for symbol, response in responses.items():
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    module_dataframe = getattr(response, module)
+            except Exception:
+                continue
+
+            if module_dataframe is not None and not module_dataframe.empty:
+                frames[symbol] = module_dataframe
+
+        return frames
+
+    @staticmethod
+    def _stack_latest(frames, column):
+        # One value per symbol from single row modules such as financial_data.
+        stacked = pd.concat({symbol: frame.iloc[:1] for symbol, frame in frames.items()}, names=['symbol', None])
+
+        if column not in stacked.columns:
+            return pd.Series(dtype=np.float64)
+
+        return stacked[column].droplevel(1).astype(np.float64)
+
+    @staticmethod
+    def _stack(frames):
+        """
+        Method to stack the statement histories of many symbols into one table indexed by (symbol, end_date).
+        :param frames: A dictionary mapping symbols to statement dataframes with an end_date (unix seconds) column.
+        :type frames: dict
+        :return: The stacked statements.
+        :rtype: pd.DataFrame
+        """
+
+        if not frames:
+            return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], []], names=['symbol', 'end_date']))
+
+        stacked = pd.concat(frames, names=['symbol', None]).droplevel(1).reset_index()
+        stacked['end_date'] = pd.to_datetime(stacked['end_date'], unit='s')
+        stacked = stacked.drop(columns=['max_age'], errors='ignore')
+        stacked = stacked.drop_duplicates(['symbol', 'end_date'], keep='first')
+
+        return stacked.set_index(['symbol', 'end_date'])
+
+    @property
+    def statements(self):
+        """
+        Property to get the aligned statements of every symbol.
+        :rtype: pd.DataFrame
+        """
+
+        return self.__statements
+
+    def _field(self, frame, field):
+        # Statements differ in the fields they report, so a missing field is a column of NaN.
+        if field in frame.columns:
+            return frame[field].astype(np.float64)
+
+        return pd.Series(np.nan, index=frame.index)
+
+    def _grouped_shift(self, values, periods):
+        return values.groupby(level='symbol').shift(periods)
+
+    def _end_date_span(self, periods):
+        # The time between each statement and the statement a number of periods before it of the same symbol.
+        end_dates = self.__statements.index.get_level_values('end_date').to_series(index=self.__statements.index)
+
+        return end_dates - self._grouped_shift(end_dates, periods)
+
+    def _year_ago(self, values):
+        """
+        Method to get the values of the statement a year before each statement. A gap in the reported statements makes
+        the value NaN rather than silently comparing with a statement more than a year old.
+        :param values: The values indexed by (symbol, end_date).
+        :type values: pd.Series
+        :return: The year-ago values.
+        :rtype: pd.Series
+        """
+
+        year_ago = self._grouped_shift(values, 4 if self.__quarterly else 1)
+        year_ago[~(self._end_date_span(4 if self.__quarterly else 1) <= pd.Timedelta(days=400))] = np.nan
+
+        return year_ago
+
+    def trailing(self):
+        """
+        Method to get the trailing twelve month flows and the year-ago balance sheet stocks of every statement.
+        :return: A dataframe indexed by (symbol, end_date) of the trailing flows.
+        :rtype: pd.DataFrame
+        """
+
+        statements = self.__statements
+        flows = pd.DataFrame({field: self._field(statements, field) for field in self._FLOW_FIELDS})
+
+        if not self.__quarterly:
+            return flows
+
+        # Sum each quarter with the three before it. A gap in the reported quarters makes the sum NaN rather than
+        # silently summing more than a year.
+        trailing = flows + sum(self._grouped_shift(flows, lag) for lag in range(1, 4))
+        trailing[~(self._end_date_span(3) <= pd.Timedelta(days=300))] = np.nan
+
+        return trailing
+
+    def ratios(self):
+        """
+        Method to compute the fundamental ratios of every symbol and statement date.
+        :return: A dataframe indexed by (symbol, end_date) containing the trailing flows, margins, returns, leverage,
+        liquidity, free cash flow yield and growth rates.
+        :rtype: pd.DataFrame
+        """
+
+        statements = self.__statements
+        trailing = self.trailing()
+
+        revenue = trailing['total_revenue']
+        net_income = trailing['net_income']
+        free_cash_flow = trailing['total_cash_from_operating_activities'] + trailing['capital_expenditures']
+
+        # Returns are measured against the average of the current and year-ago balance, or the current balance when
+        # there is no year-ago statement.
+        equity = self._field(statements, 'total_stockholder_equity')
+        assets = self._field(statements, 'total_assets')
+        average_equity = ((equity + self._year_ago(equity)) / 2).fillna(equity)
+        average_assets = ((assets + self._year_ago(assets)) / 2).fillna(assets)
+
+        debt = self._field(statements, 'long_term_debt').fillna(0.0) + \
+            self._field(statements, 'short_long_term_debt').fillna(0.0)
+
+        year_ago_net_income = self._year_ago(net_income)
+        year_ago_free_cash_flow = self._year_ago(free_cash_flow)
+
+        ratios = pd.DataFrame({
+            'revenue_ttm': revenue,
+            'net_income_ttm': net_income,
+            'free_cash_flow_ttm': free_cash_flow,
+            'gross_margin': trailing['gross_profit'] / revenue,
+            'operating_margin': trailing['operating_income'] / revenue,
+            'net_margin': net_income / revenue,
+            'return_on_equity': net_income / average_equity,
+            'return_on_assets': net_income / average_assets,
+            'debt_to_equity': debt / equity,
+            'liabilities_to_assets': self._field(statements, 'total_liab') / assets,
+            'equity_multiplier': assets / equity,
+            'current_ratio': self._field(statements, 'total_current_assets') /
+                             self._field(statements, 'total_current_liabilities'),
+            'revenue_growth': revenue / self._year_ago(revenue) - 1.0,
+            'net_income_growth': net_income / year_ago_net_income.abs() - np.sign(year_ago_net_income),
+            'free_cash_flow_growth': free_cash_flow / year_ago_free_cash_flow.abs() - np.sign(year_ago_free_cash_flow),
+        })
+
+        if self.__market_caps is not None:
+            market_caps = self.__market_caps.reindex(statements.index.get_level_values('symbol')).to_numpy()
+            ratios['free_cash_flow_yield'] = free_cash_flow / market_caps
+
+        # Divisions by zero give infinities, which are as meaningless as a missing value.
+        return ratios.replace([np.inf, -np.inf], np.nan)
+
+    def latest(self):
+        """
+        Method to get the ratios of the most recent statement of every symbol.
+        :return: A symbol indexed dataframe of the ratios.
+        :rtype: pd.DataFrame
+        """
+
+        return self.ratios().groupby(level='symbol').tail(1).droplevel('end_date')
@@ -0,0 +1,252 @@
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+
+
+class FundamentalScreener(object):
+
+    # The summary modules the screener can keep, mapped to the YahooSummaryReader argument that requests them.
+    _MODULES = {'financial_data': 'include_financial_data',
+                'default_key_statistics': 'include_default_key_statistics',
+                'income_statement_history': 'include_income_statement_history',
+                'income_statement_history_quarterly': 'include_income_statement_history_quarterly',
+                'balance_sheet_history': 'include_balance_sheet_history',
+                'balance_sheet_history_quarterly': 'include_balance_sheet_history_quarterly',
+                'cash_flow_statement_history': 'include_cash_flow_statement_history',
+                'cash_flow_statement_history_quarterly': 'include_cash_flow_statement_history_quarterly'}
+
+    # Columns every module carries that mean nothing in a cross section.
+    _DROP_COLUMNS = ['max_age', 'end_date']
+
+    def __init__(self, symbols, modules=('financial_data', 'default_key_statistics', 'income_statement_history',
+                                         'balance_sheet_history'),
+                 max_age=86400.0, chunk_size=200, timeout=5.0):
+        """
+        Initializer method for the FundamentalScreener class. The screener keeps one symbol indexed table containing the
+        latest values of the requested summary modules for a whole universe. Screens run over the in-memory table, and
+        only symbols whose values are older than max_age are requested again.
+        :param symbols: The universe of symbols.
+        :type symbols: Union[str, list]
+        :param modules: The summary modules to keep. Statement histories contribute their most recent statement.
+        :type modules: tuple
+        :param max_age: The number of seconds after which a symbol's values are stale.
+        :type max_age: float
+        :param chunk_size: The number of symbols requested per reader.
+        :type chunk_size: int
+        :param timeout: The amount of time until a request times out.
+        :type timeout: float
+        """
+
+        if isinstance(symbols, str):
+            symbols = symbols.split(' ')
+
+        unknown_modules = [module for module in modules if module not in self._MODULES]
+
+        if unknown_modules:
+            raise ValueError('Modules {} can not be screened.'.format(', '.join(unknown_modules)))
+
+        self.__symbols = list(dict.fromkeys(symbols))
+        self.__modules = list(modules)
+        self.__max_age = max_age
+        self.__chunk_size = chunk_size
+        self.__timeout = timeout
+
+        # The columnar snapshot of the universe and the unix time each symbol was last fetched at.
+        self.__table = pd.DataFrame(index=pd.Index([], name='symbol'))
+        self.__fetched_at = pd.Series(np.nan, index=pd.Index(self.__symbols, name='symbol'), name='fetched_at')
+
+    @property
+    def table(self):
+        """
+        Property to get the symbol indexed table of the latest values.
+        :rtype: pd.DataFrame
+        """
+
+        return self.__table
+
+    @property
+    def fetched_at(self):
+        return self.__fetched_at
+
+    def add_symbols(self, symbols):
+        """
+        Method to add symbols to the universe. They are fetched on the next refresh.
+        :param symbols: The symbols to add.
+        :type symbols: Union[str, list]
+        """
+
+        if isinstance(symbols, str):
+            symbols = symbols.split(' ')
+
+        new_symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self.__fetched_at.index]
+        self.__symbols += new_symbols
+        self.__fetched_at = pd.concat([self.__fetched_at, pd.Series(np.nan, index=new_symbols, name='fetched_at')])
+        self.__fetched_at.index.name = 'symbol'
+
+    def stale_symbols(self, now=None):
+        """
+        Method to get the symbols that were never fetched, failed or are older than max_age.
+        :param now: Optional. The current unix time.
+        :type now: float
+        :return: The list of stale symbols.
+        :rtype: list
+        """
+
+        now = time.time() if now is None else now
+        stale = self.__fetched_at.isna() | (self.__fetched_at < now - self.__max_age)
+
+        return self.__fetched_at.index[stale].tolist()
+
+    def refresh(self, force=False):
+        """
+        Method to request the stale symbols and update their rows of the table.
+        :param force: Request every symbol regardless of its age.
+        :type force: bool
+        :return: The list of symbols that failed to refresh.
+        :rtype: list
+        """
+
+        stale = list(self.__symbols) if force else self.stale_symbols()
+        failed = []
+
+        for chunk_start in range(0, len(stale), self.__chunk_size):
+            chunk = stale[chunk_start:chunk_start + self.__chunk_size]
+            reader = YahooSummaryReader(chunk, timeout=self.__timeout,
+                                        **{self._MODULES[module]: True for module in self.__modules})
+            responses = reader.read()
+
+            # A single symbol read returns the response itself rather than a dictionary.
+            if not isinstance(responses, dict):
+                responses = {responses.symbol: responses}
+
+            rows = {}
+
+            for symbol in chunk:
+                row = self._response_row(responses.get(symbol))
+
+                if row is None:
+                    failed.append(symbol)
+                else:
+                    rows[symbol] = row
+
+            self._update_rows(rows)
+
+        return failed
+
+    def _response_row(self, response):
+        """
+        Method to flatten the requested modules of a summary response into one row.
+        :param response: The summary response of a symbol.
+        :type response: YahooSummaryResponse
+        :return: A dictionary mapping column names to values, or None if the response had an error.
+        :rtype: dict
+        """
+
+        if response is None or response.exception is not None:
+            return None
+
+        row = {}
+
+        for module in self.__modules:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    module_dataframe = getattr(response, module)
+            except Exception:
+                # A single missing module leaves its columns empty for the symbol.
+                continue
+
+            if module_dataframe is None or module_dataframe.empty:
+                continue
+
+            # Statement histories are ordered newest first, so the first row is the latest statement.
+            latest = module_dataframe.iloc[0].drop(labels=self._DROP_COLUMNS, errors='ignore')
+
+            # The first module to provide a column wins, e.g. financial_data's profit_margins over the key statistics'.
+            for column, value in latest.items():
+                row.setdefault(column, value)
+
+        return row
+
+    def _update_rows(self, rows):
+        """
+        Method to replace the rows of the refreshed symbols in the table.
+        :param rows: A dictionary mapping symbols to their rows.
+        :type rows: dict
+        """
+
+        if not rows:
+            return
+
+        new_rows = pd.DataFrame.from_dict(rows, orient='index').infer_objects()
+        new_rows.index.name = 'symbol'
+
+        self.__table = pd.concat([self.__table.drop(index=new_rows.index, errors='ignore'), new_rows])
+        self.__fetched_at.loc[new_rows.index] = time.time()
+
+    def screen(self, query=None, percentile_ranks=None, rank_by=None, ascending=False, top=None, columns=None):
+        """
+        Method to screen the universe. Every step runs over whole columns of the table.
+        :param query: Optional. A boolean expression over the columns of the table, e.g.
+        'return_on_equity > 0.15 and debt_to_equity < 100'. See pd.DataFrame.query.
+        :type query: str
+        :param percentile_ranks: Optional. Columns to add percentile rank columns (named <column>_rank, between 0 and 1)
+        for before the query is run, so the query can filter on ranks within the universe.
+        :type percentile_ranks: list
+        :param rank_by: Optional. The column to sort the screened symbols by.
+        :type rank_by: str
+        :param ascending: Sort the screened symbols in ascending order?
+        :type ascending: bool
+        :param top: Optional. The number of symbols to keep after sorting.
+        :type top: int
+        :param columns: Optional. The columns to return. Default is every column.
+        :type columns: list
+        :return: The screened rows of the table.
+        :rtype: pd.DataFrame
+        """
+
+        table = self.__table
+
+        if percentile_ranks:
+            table = table.assign(**{'{}_rank'.format(column): table[column].rank(pct=True)
+                                    for column in percentile_ranks})
+
+        if query:
+            table = table.query(query)
+
+        if rank_by is not None:
+            table = table.sort_values(rank_by, ascending=ascending, na_position='last')
+
+        if top is not None:
+            table = table.head(top)
+
+        if columns is not None:
+            table = table[columns]
+
+        return table
+
+    def save(self, path):
+        """
+        Method to save the table and the fetch times to a pickle file.
+        :param path: The file path.
+        :type path: str
+        """
+
+        pd.to_pickle({'table': self.__table, 'fetched_at': self.__fetched_at}, path)
+
+    def load(self, path):
+        """
+        Method to load a table saved by save. Symbols of the saved table that are not in the universe are added.
+        :param path: The file path.
+        :type path: str
+        """
+
+        saved = pd.read_pickle(path)
+
+        self.add_symbols(list(saved['fetched_at'].index))
+        self.__table = saved['table']
+        self.__fetched_at.loc[saved['fetched_at'].index] = saved['fetched_at']
@@ -0,0 +1,29 @@
+import argparse
+from quantpy.server.QuantpyServer import QuantpyServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m quantpy.serve',
+                                     description='Serve quote histories and summary modules over HTTP from one shared '
+                                                 'cache.')
+    parser.add_argument('--host', default='127.0.0.1', help='The address to listen on.')
+    parser.add_argument('--port', type=int, default=8000, help='The port to listen on.')
+    parser.add_argument('--ttl', type=float, default=300, help='The number of seconds a read is cached.')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='The maximum number of upstream reads.')
+    parser.add_argument('--rate-limit', type=float, default=5.0, help='The maximum upstream reads per second.')
+    parser.add_argument('--timeout', type=float, default=5, help='The upstream request timeout in seconds.')
+    parser.add_argument('--max-cache-entries', type=int, default=10000, help='The maximum number of cached reads.')
+    parser.add_argument('--parsed-cache-mb', type=float, default=0,
+                        help='The memory budget in MB of the cache of parsed modules. 0 disables it.')
+    args = parser.parse_args(argv)
+
+    server = QuantpyServer(host=args.host, port=args.port, ttl=args.ttl, max_concurrency=args.max_concurrency,
+                           rate_limit=args.rate_limit, timeout=args.timeout, max_cache_entries=args.max_cache_entries,
+                           parsed_cache_bytes=int(args.parsed_cache_mb * 1024 ** 2))
+
+    print('Serving on http://{}:{}'.format(args.host, args.port))
+    server.run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+
+class AsyncRateLimiter(object):
+
+    def __init__(self, rate, burst=1):
+        """
+        Initializer method for the AsyncRateLimiter class. A token bucket shared by the coroutines of one event loop.
+        :param rate: The number of acquisitions allowed per second. None or 0 disables the limit.
+        :type rate: float
+        :param burst: The number of acquisitions allowed at once after being idle.
+        :type burst: int
+        """
+
+        self.__rate = rate
+        self.__burst = max(burst, 1)
+        self.__tokens = float(self.__burst)
+        self.__updated = time.monotonic()
+        self.__lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Method to wait until a token is available and take it.
+        """
+
+        if not self.__rate:
+            return
+
+        # The lock makes the waiters take their turns in order.
+        async with self.__lock:
+            while True:
+                now = time.monotonic()
+                self.__tokens = min(self.__burst, self.__tokens + (now - self.__updated) * self.__rate)
+                self.__updated = now
+
+                if self.__tokens >= 1.0:
+                    self.__tokens -= 1.0
+                    return
+
+                await asyncio.sleep((1.0 - self.__tokens) / self.__rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        return False
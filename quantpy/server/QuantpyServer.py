@@ -0,0 +1,433 @@
+import asyncio
+import email.utils
+import gzip
+import hashlib
+import io
+import json
+import time
+import urllib.parse
+import warnings
+from collections import OrderedDict
+import pandas as pd
+from quantpy.data.base.ParsedCache import ParsedCache
+from quantpy.data.base.ReaderHook import ReaderHook
+from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.server.AsyncRateLimiter import AsyncRateLimiter
+
+
+class QuantpyServer(object):
+
+    # The maximum number of symbols of one batch request.
+    MAX_SYMBOLS = 500
+
+    # Responses smaller than this are not worth compressing.
+    _MIN_COMPRESS_BYTES = 1024
+
+    _REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error', 501: 'Not Implemented'}
+
+    def __init__(self, host='127.0.0.1', port=8000, ttl=300, max_concurrency=8, rate_limit=5.0, timeout=5,
+                 max_cache_entries=10000, parsed_cache_bytes=None, module_ttls=None):
+        """
+        Initializer method for the QuantpyServer class. The server answers quote history and summary module requests
+        for many clients from one cache, so they share one warm cache and one rate limited connection to Yahoo Finance.
+        Concurrent identical requests are collapsed into one upstream read.
+        :param host: The address to listen on.
+        :type host: str
+        :param port: The port to listen on.
+        :type port: int
+        :param ttl: The number of seconds a read is served from the cache.
+        :type ttl: float
+        :param max_concurrency: The maximum number of upstream reads in flight.
+        :type max_concurrency: int
+        :param rate_limit: The maximum number of upstream reads started per second. None disables the limit.
+        :type rate_limit: float
+        :param timeout: The amount of time until an upstream request times out.
+        :type timeout: float
+        :param max_cache_entries: The maximum number of symbol reads kept in the cache.
+        :type max_cache_entries: int
+        :param parsed_cache_bytes: Optional. The memory budget of a cache of parsed modules shared by every request,
+        so requests for different module combinations do not parse the same module again. Default disables it.
+        :type parsed_cache_bytes: int
+        :param module_ttls: Optional. A dictionary mapping modules (or quote intervals) to the ttl of their parsed
+        cache entries. Default is the ttl.
+        :type module_ttls: dict
+        """
+
+        self.__host = host
+        self.__port = port
+        self.__ttl = ttl
+        self.__max_concurrency = max_concurrency
+        self.__rate_limit = rate_limit
+        self.__timeout = timeout
+        self.__max_cache_entries = max_cache_entries
+
+        # The cache maps a read key to the time it was read and the reader's response, least recently used first.
+        self.__cache = OrderedDict()
+        self.__in_flight = {}
+        self.__parsed_cache = ParsedCache(parsed_cache_bytes, ttl, module_ttls) if parsed_cache_bytes else None
+
+        # Created when the server starts, since they belong to the server's event loop.
+        self.__semaphore = None
+        self.__rate_limiter = None
+
+    @property
+    def cache_size(self):
+        return len(self.__cache)
+
+    async def start(self):
+        """
+        Method to start listening.
+        :return: The asyncio server. Its sockets give the address the server is listening on.
+        :rtype: asyncio.Server
+        """
+
+        self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        self.__rate_limiter = AsyncRateLimiter(self.__rate_limit)
+
+        return await asyncio.start_server(self._handle_connection, self.__host, self.__port)
+
+    async def serve_forever(self):
+        server = await self.start()
+
+        async with server:
+            await server.serve_forever()
+
+    def run(self):
+        """
+        Method to run the server until it is interrupted.
+        """
+
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    async def _read(self, key, reader):
+        """
+        Method to get a read from the cache, or from upstream if it is not cached. Concurrent reads of the same key
+        share one upstream read.
+        :param key: The cache key. Its first two items are the endpoint and the symbol.
+        :type key: tuple
+        :param reader: The reader of the symbol.
+        :type reader: BaseReader
+        :return: A tuple of the unix time of the read and the response.
+        :rtype: tuple
+        """
+
+        entry = self.__cache.get(key)
+
+        if entry is not None and time.time() - entry[0] < self.__ttl:
+            self.__cache.move_to_end(key)
+            ReaderHook.emit_cache_hit(key[0], key[1])
+
+            return entry
+
+        if key in self.__in_flight:
+            return await asyncio.shield(self.__in_flight[key])
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__in_flight[key] = future
+
+        try:
+            async with self.__semaphore:
+                await self.__rate_limiter.acquire()
+
+                # The readers block, so they run in the loop's thread pool.
+                response = await loop.run_in_executor(None, reader.single_read, key[1])
+
+            entry = (time.time(), response)
+
+            # Errors that could go away are not cached, so the next request tries again.
+            if response.status is None or not response.status.retryable:
+                self.__cache[key] = entry
+                self.__cache.move_to_end(key)
+
+                while len(self.__cache) > self.__max_cache_entries:
+                    self.__cache.popitem(last=False)
+
+            future.set_result(entry)
+
+        except BaseException as e:
+            future.set_exception(e)
+
+            # Mark the exception as retrieved when no other request is waiting for it.
+            future.exception()
+            raise
+
+        finally:
+            del self.__in_flight[key]
+
+        return entry
+
+    async def _handle_connection(self, stream_reader, stream_writer):
+        try:
+            while True:
+                request_line = await stream_reader.readline()
+
+                if not request_line.strip():
+                    break
+
+                # Read the headers, which end with an empty line.
+                headers = {}
+                while True:
+                    line = await stream_reader.readline()
+
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write(stream_writer, 400, {}, self._json_error('Malformed request line.'), False)
+                    break
+
+                try:
+                    status, response_headers, body = await self._dispatch(method, target, headers)
+                except Exception as e:
+                    status, response_headers, body = 500, {}, self._json_error(repr(e))
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await self._write(stream_writer, status, response_headers, b'' if method == 'HEAD' else body,
+                                  keep_alive, len(body))
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            stream_writer.close()
+
+    async def _write(self, stream_writer, status, headers, body, keep_alive, content_length=None):
+        headers = dict(headers)
+        headers.setdefault('Content-Type', 'application/json')
+        headers['Content-Length'] = str(len(body) if content_length is None else content_length)
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+
+        head = 'HTTP/1.1 {} {}\r\n'.format(status, self._REASONS.get(status, ''))
+        head += ''.join('{}: {}\r\n'.format(name, value) for name, value in headers.items())
+
+        stream_writer.write(head.encode('latin-1') + b'\r\n' + body)
+        await stream_writer.drain()
+
+    async def _dispatch(self, method, target, headers):
+        """
+        Method to answer a request.
+        :return: A tuple of the status code, the response headers and the body.
+        :rtype: tuple
+        """
+
+        if method not in ('GET', 'HEAD'):
+            return 405, {'Allow': 'GET, HEAD'}, self._json_error('Only GET and HEAD are supported.')
+
+        url = urllib.parse.urlsplit(target)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        path = [part for part in url.path.split('/') if part]
+
+        if path == ['health']:
+            health = {'status': 'ok', 'cache_entries': len(self.__cache)}
+
+            if self.__parsed_cache is not None:
+                health['parsed_cache'] = self.__parsed_cache.stats
+
+            return 200, {}, json.dumps(health).encode('utf-8')
+
+        if not path or path[0] not in ('quote', 'summary') or len(path) > 2:
+            return 404, {}, self._json_error('Unknown path {}.'.format(url.path))
+
+        # The symbols of a batch are comma separated, either in the path or in the symbols parameter.
+        symbols = urllib.parse.unquote(path[1]) if len(path) == 2 else query.get('symbols', '')
+        symbols = list(dict.fromkeys(symbol for symbol in symbols.split(',') if symbol))
+
+        if not symbols:
+            return 400, {}, self._json_error('No symbols requested.')
+        if len(symbols) > self.MAX_SYMBOLS:
+            return 400, {}, self._json_error('At most {} symbols per request.'.format(self.MAX_SYMBOLS))
+
+        try:
+            if path[0] == 'quote':
+                keys, readers, properties = self._quote_readers(symbols, query)
+            else:
+                keys, readers, properties = self._summary_readers(symbols, query)
+        except (ValueError, TypeError) as e:
+            return 400, {}, self._json_error(str(e))
+
+        entries = await asyncio.gather(*(self._read(keys[symbol], readers[symbol]) for symbol in symbols))
+
+        return self._respond(dict(zip(symbols, entries)), properties, query, headers)
+
+    def _quote_readers(self, symbols, query):
+        start = query.get('start')
+        end = query.get('end')
+        period = None if start and end else query.get('period', 'max')
+        interval = query.get('interval', '1d')
+        events = query.get('events', 'false').lower() in ('1', 'true')
+        pre_post = query.get('pre_post', 'false').lower() in ('1', 'true')
+
+        keys = {symbol: ('chart', symbol, start, end, period, interval, events, pre_post) for symbol in symbols}
+        readers = {symbol: YahooQuoteReader(symbol, start, end, period, interval, events, pre_post, self.__timeout,
+                                            cache=self.__parsed_cache)
+                   for symbol in symbols}
+        properties = ['quote', 'meta'] + (['dividends', 'splits'] if events else [])
+
+        return keys, readers, properties
+
+    def _summary_readers(self, symbols, query):
+        modules = sorted(set(module for module in query.get('modules', '').split(',') if module))
+
+        if not modules:
+            raise ValueError('No modules requested. Choose from {}.'.format(
+                ', '.join(YahooSummaryReader.MODULE_PROPERTIES)))
+
+        unknown = [module for module in modules if module not in YahooSummaryReader.MODULE_PROPERTIES]
+        if unknown:
+            raise ValueError('Unknown modules {}.'.format(', '.join(unknown)))
+
+        include = {'include_' + module: True for module in modules}
+        keys = {symbol: ('quoteSummary', symbol, tuple(modules)) for symbol in symbols}
+        readers = {symbol: YahooSummaryReader(symbol, timeout=self.__timeout, cache=self.__parsed_cache, **include)
+                   for symbol in symbols}
+        properties = [prop for module in modules for prop in YahooSummaryReader.MODULE_PROPERTIES[module]]
+
+        return keys, readers, properties
+
+    def _respond(self, entries, properties, query, headers):
+        """
+        Method to build the response of a batch of reads.
+        :param entries: A dictionary mapping the symbols to their (read time, response) tuples.
+        :type entries: dict
+        :param properties: The response properties to send.
+        :type properties: list
+        :param query: The query parameters.
+        :type query: dict
+        :param headers: The request headers.
+        :type headers: dict
+        :return: A tuple of the status code, the response headers and the body.
+        :rtype: tuple
+        """
+
+        response_format = query.get('format', 'json')
+        tables = {symbol: self._tables(response, properties) for symbol, (_, response) in entries.items()}
+
+        if response_format == 'json':
+            body = self._json_body(tables)
+            content_type = 'application/json'
+        elif response_format == 'arrow':
+            table_name = query.get('table', properties[0] if len(properties) == 1 or 'quote' in properties else None)
+
+            if table_name not in properties:
+                return 400, {}, self._json_error('Arrow responses hold one table. Choose one with the table parameter.')
+
+            try:
+                body = self._arrow_body(tables, table_name)
+            except ImportError:
+                return 501, {}, self._json_error('Arrow responses need pyarrow to be installed.')
+
+            content_type = 'application/vnd.apache.arrow.stream'
+        else:
+            return 400, {}, self._json_error('Unknown format {}.'.format(response_format))
+
+        # The validators describe the uncompressed body, so they match however the client asks for it.
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        last_modified = int(max(read_time for read_time, _ in entries.values()))
+        response_headers = {'Content-Type': content_type,
+                            'ETag': etag,
+                            'Last-Modified': email.utils.formatdate(last_modified, usegmt=True),
+                            'Cache-Control': 'max-age={}'.format(int(self.__ttl)),
+                            'Vary': 'Accept-Encoding'}
+
+        if self._not_modified(headers, etag, last_modified):
+            return 304, response_headers, b''
+
+        if 'gzip' in headers.get('accept-encoding', '') and len(body) >= self._MIN_COMPRESS_BYTES:
+            body = gzip.compress(body, compresslevel=6)
+            response_headers['Content-Encoding'] = 'gzip'
+
+        return 200, response_headers, body
+
+    @staticmethod
+    def _not_modified(headers, etag, last_modified):
+        # If-None-Match takes precedence over If-Modified-Since.
+        if 'if-none-match' in headers:
+            tags = [tag.strip() for tag in headers['if-none-match'].split(',')]
+            return '*' in tags or etag in tags or 'W/' + etag in tags
+
+        if 'if-modified-since' in headers:
+            try:
+                since = email.utils.parsedate_to_datetime(headers['if-modified-since']).timestamp()
+            except (TypeError, ValueError):
+                return False
+
+            return last_modified <= since
+
+        return False
+
+    @staticmethod
+    def _tables(response, properties):
+        """
+        Method to get the requested tables of a response.
+        :return: A dictionary mapping the properties to their dataframes, or a dictionary with the error of the read.
+        :rtype: dict
+        """
+
+        if response.status is not None and not response.status.ok:
+            return {'error': str(response.status)}
+
+        tables = {}
+
+        for prop in properties:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    tables[prop] = getattr(response, prop)
+            except Exception as e:
+                tables.setdefault('errors', {})[prop] = str(e)
+
+        return tables
+
+    @staticmethod
+    def _json_body(tables):
+        payload = {}
+
+        for symbol, symbol_tables in tables.items():
+            payload[symbol] = {}
+
+            for name, table in symbol_tables.items():
+                if isinstance(table, pd.DataFrame):
+                    # Missing values become null.
+                    table = table.astype(object).where(table.notna(), None).to_dict('records')
+
+                payload[symbol][name] = table
+
+        return json.dumps(payload, default=str).encode('utf-8')
+
+    @staticmethod
+    def _arrow_body(tables, table_name):
+        import pyarrow
+
+        frames = {symbol: symbol_tables[table_name] for symbol, symbol_tables in tables.items()
+                  if isinstance(symbol_tables.get(table_name), pd.DataFrame)}
+
+        if frames:
+            frame = pd.concat(frames, names=['symbol', None]).reset_index(level='symbol').reset_index(drop=True)
+        else:
+            frame = pd.DataFrame({'symbol': pd.Series(dtype=str)})
+
+        table = pyarrow.Table.from_pandas(frame, preserve_index=False)
+        sink = io.BytesIO()
+
+        with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+        return sink.getvalue()
+
+    @staticmethod
+    def _json_error(message):
+        return json.dumps({'error': message}).encode('utf-8')
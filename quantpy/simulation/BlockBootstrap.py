@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+
+class BlockBootstrap(object):
+
+    def __init__(self, log_returns, block_size=20, symbols=None):
+        """
+        Initializer method for the BlockBootstrap class. A path model that resamples historical returns: every path is
+        a sequence of blocks of consecutive bars, each starting at a random bar and wrapping around the end of the
+        history. The bars of a block keep their order and every asset moves together, so the volatility clustering
+        and the correlations of the history carry over to the paths.
+        :param log_returns: A time x asset array or dataframe of historical log returns. Bars with a missing return are
+        dropped.
+        :type log_returns: np.ndarray
+        :param block_size: The number of consecutive bars in a block.
+        :type block_size: int
+        :param symbols: Optional. The symbols of the assets. Default is the columns of a dataframe.
+        :type symbols: list
+        """
+
+        if isinstance(log_returns, pd.DataFrame):
+            symbols = list(log_returns.columns) if symbols is None else symbols
+            log_returns = log_returns.to_numpy(dtype=np.float64)
+
+        log_returns = np.asarray(log_returns, dtype=np.float64).reshape(len(log_returns), -1)
+        self.__log_returns = log_returns[~np.isnan(log_returns).any(axis=1)]
+
+        if not len(self.__log_returns):
+            raise ValueError('The history has no bars with a return for every asset.')
+
+        self.__block_size = max(1, min(block_size, len(self.__log_returns)))
+        self.__symbols = list(symbols) if symbols is not None else None
+
+    @classmethod
+    def from_prices(cls, prices, block_size=20):
+        """
+        Method to build a bootstrap from price histories, e.g. the adjusted closes of a QuotePanel built from
+        YahooQuoteReader responses.
+        :param prices: A time x symbol dataframe of prices.
+        :type prices: pd.DataFrame
+        :param block_size: The number of consecutive bars in a block.
+        :type block_size: int
+        :rtype: BlockBootstrap
+        """
+
+        return cls(np.log(prices).diff().iloc[1:], block_size)
+
+    @property
+    def assets(self):
+        return self.__log_returns.shape[1]
+
+    @property
+    def symbols(self):
+        return self.__symbols
+
+    def log_returns(self, rng, paths, steps):
+        """
+        Method to draw the log returns of every step of a chunk of paths.
+        :param rng: The random generator of the chunk.
+        :type rng: np.random.Generator
+        :param paths: The number of paths.
+        :type paths: int
+        :param steps: The number of steps.
+        :type steps: int
+        :return: A paths x steps x assets array.
+        :rtype: np.ndarray
+        """
+
+        bars = len(self.__log_returns)
+        blocks = -(-steps // self.__block_size)
+
+        # The bar of every step is the start of its block plus its offset in the block, modulo the history.
+        starts = rng.integers(0, bars, (paths, blocks, 1))
+        rows = (starts + np.arange(self.__block_size)) % bars
+
+        return self.__log_returns[rows.reshape(paths, -1)[:, :steps]]
@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class GeometricBrownianMotion(object):
+
+    def __init__(self, drift, volatility, correlation=None, symbols=None, periods_per_year=252):
+        """
+        Initializer method for the GeometricBrownianMotion class. A path model of correlated assets whose log prices
+        move by normal increments each step.
+        :param drift: The annualized expected return of every asset, or one for all.
+        :type drift: np.ndarray
+        :param volatility: The annualized volatility of every asset, or one for all.
+        :type volatility: np.ndarray
+        :param correlation: Optional. The correlation matrix of the assets. Default is independent assets. A matrix that
+        is not positive semidefinite is replaced by the nearest one found by clipping its negative eigenvalues.
+        :type correlation: np.ndarray
+        :param symbols: Optional. The symbols of the assets.
+        :type symbols: list
+        :param periods_per_year: The number of steps in a year.
+        :type periods_per_year: int
+        """
+
+        self._drift, self._volatility = [np.atleast_1d(np.asarray(value, dtype=np.float64))
+                                         for value in np.broadcast_arrays(drift, volatility)]
+        self._dt = 1.0 / periods_per_year
+        self.__symbols = list(symbols) if symbols is not None else None
+
+        # The factor turns independent normals into correlated ones. An eigen decomposition with the negative eigenvalues
+        # clipped factors a correlation matrix that is not positive semidefinite, e.g. one estimated from pairs of
+        # histories that overlap on different bars. The rows are scaled back to unit variances.
+        self.__factor = None
+
+        if correlation is not None:
+            eigenvalues, eigenvectors = np.linalg.eigh(np.asarray(correlation, dtype=np.float64))
+            factor = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+            norms = np.sqrt((factor ** 2).sum(axis=1, keepdims=True))
+            self.__factor = factor / np.where(norms > 0.0, norms, 1.0)
+
+    @classmethod
+    def from_prices(cls, prices, periods_per_year=252, **kwargs):
+        """
+        Method to estimate a model from price histories, e.g. the adjusted closes of a QuotePanel built from
+        YahooQuoteReader responses.
+        :param prices: A time x symbol dataframe of prices.
+        :type prices: pd.DataFrame
+        :param periods_per_year: The number of bars in a year.
+        :type periods_per_year: int
+        :param kwargs: The other arguments of the model, e.g. the jumps of a JumpDiffusion.
+        :rtype: GeometricBrownianMotion
+        """
+
+        log_returns = np.log(prices).diff().iloc[1:]
+
+        # The volatility and drift are annualized from the mean and deviation of the log returns, using every bar
+        # of each symbol and every pair of bars for the correlations.
+        volatility = log_returns.std().to_numpy() * np.sqrt(periods_per_year)
+        drift = log_returns.mean().to_numpy() * periods_per_year + 0.5 * volatility ** 2
+        correlation = log_returns.corr().fillna(0.0).to_numpy(copy=True)
+        np.fill_diagonal(correlation, 1.0)
+
+        return cls(drift, volatility, correlation=correlation, symbols=list(prices.columns),
+                   periods_per_year=periods_per_year, **kwargs)
+
+    @property
+    def assets(self):
+        return len(self._volatility)
+
+    @property
+    def symbols(self):
+        return self.__symbols
+
+    def _normals(self, rng, paths, steps):
+        normals = rng.standard_normal((paths, steps, self.assets))
+
+        if self.__factor is not None:
+            normals = normals @ self.__factor.T
+
+        return normals
+
+    def log_returns(self, rng, paths, steps):
+        """
+        Method to draw the log returns of every step of a chunk of paths.
+        :param rng: The random generator of the chunk.
+        :type rng: np.random.Generator
+        :param paths: The number of paths.
+        :type paths: int
+        :param steps: The number of steps.
+        :type steps: int
+        :return: A paths x steps x assets array.
+        :rtype: np.ndarray
+        """
+
+        log_returns = self._normals(rng, paths, steps)
+        log_returns *= self._volatility * np.sqrt(self._dt)
+        log_returns += (self._drift - 0.5 * self._volatility ** 2) * self._dt
+
+        return log_returns
@@ -0,0 +1,48 @@
+import numpy as np
+from quantpy.simulation.GeometricBrownianMotion import GeometricBrownianMotion
+
+
+class JumpDiffusion(GeometricBrownianMotion):
+
+    def __init__(self, drift, volatility, jump_intensity=0.0, jump_mean=0.0, jump_std=0.0, correlation=None,
+                 symbols=None, periods_per_year=252):
+        """
+        Initializer method for the JumpDiffusion class. Merton's jump diffusion: a geometric Brownian motion whose log
+        price also jumps by normal amounts at the times of a Poisson process. The jumps of the assets are independent,
+        and the drift is compensated so the expected return stays the drift.
+        :param jump_intensity: The expected number of jumps per year of every asset.
+        :type jump_intensity: np.ndarray
+        :param jump_mean: The mean of the log jump sizes.
+        :type jump_mean: np.ndarray
+        :param jump_std: The standard deviation of the log jump sizes.
+        :type jump_std: np.ndarray
+        See GeometricBrownianMotion for the other arguments.
+        """
+
+        super().__init__(drift, volatility, correlation, symbols, periods_per_year)
+
+        self.__jump_intensity, self.__jump_mean, self.__jump_std = [
+            np.broadcast_to(np.asarray(value, dtype=np.float64), self._volatility.shape)
+            for value in (jump_intensity, jump_mean, jump_std)]
+
+    def log_returns(self, rng, paths, steps):
+        """
+        Method to draw the log returns of every step of a chunk of paths, see GeometricBrownianMotion.log_returns.
+        :rtype: np.ndarray
+        """
+
+        log_returns = super().log_returns(rng, paths, steps)
+
+        # The expected relative size of a jump, removed from the drift.
+        expected_jump = np.exp(self.__jump_mean + 0.5 * self.__jump_std ** 2) - 1.0
+        log_returns -= self.__jump_intensity * expected_jump * self._dt
+
+        # The sum of n normal jumps is normal with n times their mean and variance.
+        counts = rng.poisson(self.__jump_intensity * self._dt, log_returns.shape)
+        jumps = rng.standard_normal(log_returns.shape)
+        jumps *= np.sqrt(counts) * self.__jump_std
+        jumps += counts * self.__jump_mean
+
+        log_returns += jumps
+
+        return log_returns
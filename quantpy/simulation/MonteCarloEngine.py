@@ -0,0 +1,164 @@
+import multiprocessing
+import numpy as np
+from pebble import ProcessPool
+from quantpy.simulation.SimulationResult import SimulationResult
+
+
+class MonteCarloEngine(object):
+
+    def __init__(self, model, steps=252, chunk_size=10000, workers=None, seed=None, reducers=None,
+                 terminal_range=(-4.0, 4.0), bins=4000):
+        """
+        Initializer method for the MonteCarloEngine class. The engine simulates price paths in chunks. Every chunk is
+        drawn at once as a paths x steps x assets array, reduced to its statistics and dropped, so the memory used
+        depends on the chunk size and not on the number of paths. The chunks are spread over a process pool, and each
+        chunk draws from its own random stream spawned from the seed, so a run gives the same result for any number of
+        workers.
+        :param model: The path model, e.g. a GeometricBrownianMotion, JumpDiffusion or BlockBootstrap.
+        :param steps: The number of steps of every path.
+        :type steps: int
+        :param chunk_size: The number of paths drawn at once.
+        :type chunk_size: int
+        :param workers: Optional. The number of processes. 1 runs in this process. Default is the number of cores.
+        :type workers: int
+        :param seed: Optional. The seed of the random streams. Default is a fresh seed every run.
+        :type seed: int
+        :param reducers: Optional. A dictionary mapping names to module level functions that take the paths x steps x
+        assets prices of a chunk and return one value (or row of values) per path, e.g. MonteCarloEngine.terminal or
+        the value of a portfolio. Their values are kept for every path.
+        :type reducers: dict
+        :param terminal_range: The range of the terminal log returns counted in the histogram of the quantiles.
+        :type terminal_range: tuple
+        :param bins: The number of bins of the histogram.
+        :type bins: int
+        """
+
+        self.__model = model
+        self.__steps = steps
+        self.__chunk_size = chunk_size
+        self.__workers = workers or multiprocessing.cpu_count()
+        self.__seed = seed
+        self.__reducers = dict(reducers or {})
+        self.__edges = np.linspace(terminal_range[0], terminal_range[1], bins + 1)
+
+    @staticmethod
+    def terminal(prices):
+        """
+        Reducer keeping the terminal price of every asset.
+        :rtype: np.ndarray
+        """
+
+        return prices[:, -1, :].copy()
+
+    @staticmethod
+    def simulate_chunk(model, paths, steps, initial_prices, seed, edges, reducers):
+        """
+        Method to simulate one chunk of paths and reduce it to its statistics.
+        :param seed: The seed sequence of the chunk's random stream.
+        :type seed: np.random.SeedSequence
+        :return: A tuple containing the number of paths, the steps x assets mean, sum of squared deviations, minimum
+        and maximum of the prices, the histogram of the terminal log returns and the values of the reducers.
+        :rtype: tuple
+        """
+
+        rng = np.random.default_rng(seed)
+
+        # The prices are built in place from the log returns, to hold only one array of the chunk.
+        prices = model.log_returns(rng, paths, steps)
+        np.cumsum(prices, axis=1, out=prices)
+
+        # Every asset's terminal log return falls in one bin, with the outliers in the first and last.
+        bins = np.searchsorted(edges, prices[:, -1, :], side='right')
+        histogram = np.stack([np.bincount(bins[:, asset], minlength=len(edges) + 1)
+                              for asset in range(prices.shape[2])])
+
+        np.exp(prices, out=prices)
+        prices *= initial_prices
+
+        mean = prices.mean(axis=0)
+        m2 = ((prices - mean) ** 2).sum(axis=0)
+        reduced = {name: reducer(prices) for name, reducer in reducers.items()}
+
+        return paths, mean, m2, prices.min(axis=0), prices.max(axis=0), histogram, reduced
+
+    @staticmethod
+    def _merge(total, chunk):
+        """
+        Method to merge the statistics of a chunk into the running statistics, with Chan's parallel update of the means
+        and squared deviations.
+        :rtype: list
+        """
+
+        if total is None:
+            return [chunk[0], chunk[1], chunk[2], chunk[3], chunk[4], chunk[5],
+                    {name: [values] for name, values in chunk[6].items()}]
+
+        count, mean, m2 = total[0], total[1], total[2]
+        chunk_count, chunk_mean, chunk_m2 = chunk[0], chunk[1], chunk[2]
+        merged_count = count + chunk_count
+        delta = chunk_mean - mean
+
+        total[0] = merged_count
+        total[1] = mean + delta * chunk_count / merged_count
+        total[2] = m2 + chunk_m2 + delta ** 2 * count * chunk_count / merged_count
+        total[3] = np.minimum(total[3], chunk[3])
+        total[4] = np.maximum(total[4], chunk[4])
+        total[5] = total[5] + chunk[5]
+
+        for name, values in chunk[6].items():
+            total[6][name].append(values)
+
+        return total
+
+    def run(self, paths, initial_prices=1.0):
+        """
+        Method to simulate the paths.
+        :param paths: The number of paths, at least 1.
+        :type paths: int
+        :param initial_prices: The price of every asset at the start, or one for all.
+        :type initial_prices: np.ndarray
+        :return: The statistics of the paths.
+        :rtype: SimulationResult
+        """
+
+        if paths < 1:
+            raise ValueError('The number of paths must be at least 1, got {}.'.format(paths))
+
+        initial_prices = np.broadcast_to(np.asarray(initial_prices, dtype=np.float64), (self.__model.assets,))
+
+        # One random stream per chunk, in the order of the chunks.
+        sizes = [min(self.__chunk_size, paths - start) for start in range(0, paths, self.__chunk_size)]
+        seeds = np.random.SeedSequence(self.__seed).spawn(len(sizes))
+        total = None
+
+        if self.__workers == 1 or len(sizes) == 1:
+            for size, seed in zip(sizes, seeds):
+                total = self._merge(total, self.simulate_chunk(self.__model, size, self.__steps, initial_prices, seed,
+                                                               self.__edges, self.__reducers))
+        else:
+            initargs = (self.__model, self.__steps, initial_prices, self.__edges, self.__reducers)
+
+            with ProcessPool(self.__workers, initializer=_attach_worker, initargs=initargs) as pool:
+                # The chunks are returned in order as they finish, and merged one at a time.
+                for chunk in pool.map(_simulate_worker, sizes, seeds).result():
+                    total = self._merge(total, chunk)
+
+        reduced = {name: np.concatenate(values) for name, values in total[6].items()}
+
+        return SimulationResult(total[0], total[1], total[2], total[3], total[4], total[5], self.__edges,
+                                initial_prices, reduced, self.__model.symbols)
+
+
+# The model and settings of the worker processes, set once by the pool initializer instead of being pickled with
+# every chunk.
+_worker_state = {}
+
+
+def _attach_worker(model, steps, initial_prices, edges, reducers):
+    _worker_state.update(model=model, steps=steps, initial_prices=initial_prices, edges=edges, reducers=reducers)
+
+
+def _simulate_worker(paths, seed):
+    return MonteCarloEngine.simulate_chunk(_worker_state['model'], paths, _worker_state['steps'],
+                                           _worker_state['initial_prices'], seed, _worker_state['edges'],
+                                           _worker_state['reducers'])
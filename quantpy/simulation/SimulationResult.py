@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+
+class SimulationResult(object):
+
+    def __init__(self, paths, mean, m2, minimum, maximum, histogram, edges, initial_prices, reduced=None,
+                 symbols=None):
+        """
+        Initializer method for the SimulationResult class. The statistics of a Monte Carlo run, aggregated over every
+        path without keeping the paths.
+        :param paths: The number of paths.
+        :type paths: int
+        :param mean: A steps x assets array of the mean price of every step.
+        :type mean: np.ndarray
+        :param m2: A steps x assets array of the sum of the squared deviations from the mean of every step.
+        :type m2: np.ndarray
+        :param minimum: A steps x assets array of the lowest price of every step.
+        :type minimum: np.ndarray
+        :param maximum: A steps x assets array of the highest price of every step.
+        :type maximum: np.ndarray
+        :param histogram: An assets x bins array counting the terminal log returns in every bin, with the counts below
+        and above the edges in the first and last bins.
+        :type histogram: np.ndarray
+        :param edges: The edges of the inner bins of the histogram.
+        :type edges: np.ndarray
+        :param initial_prices: The initial price of every asset.
+        :type initial_prices: np.ndarray
+        :param reduced: Optional. A dictionary mapping the names of the reducers to their values for every path.
+        :type reduced: dict
+        :param symbols: Optional. The symbols of the assets.
+        :type symbols: list
+        """
+
+        self.__paths = paths
+        self.__mean = mean
+        self.__m2 = m2
+        self.__minimum = minimum
+        self.__maximum = maximum
+        self.__histogram = histogram
+        self.__edges = edges
+        self.__initial_prices = initial_prices
+        self.__reduced = reduced or {}
+        self.__symbols = symbols if symbols is not None else list(range(mean.shape[1]))
+
+    @property
+    def paths(self):
+        return self.__paths
+
+    @property
+    def reduced(self):
+        return self.__reduced
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=pd.RangeIndex(1, len(values) + 1, name='step'), columns=self.__symbols)
+
+    @property
+    def mean(self):
+        """
+        Property to get the mean price of every step.
+        :rtype: pd.DataFrame
+        """
+
+        return self._frame(self.__mean)
+
+    @property
+    def std(self):
+        """
+        Property to get the standard deviation of the price of every step.
+        :rtype: pd.DataFrame
+        """
+
+        return self._frame(np.sqrt(self.__m2 / max(self.__paths - 1, 1)))
+
+    @property
+    def minimum(self):
+        return self._frame(self.__minimum)
+
+    @property
+    def maximum(self):
+        return self._frame(self.__maximum)
+
+    def terminal_quantiles(self, quantiles=(0.01, 0.05, 0.5, 0.95, 0.99)):
+        """
+        Method to estimate quantiles of the terminal prices from the histogram of the terminal log returns, by linear
+        interpolation within the bins. Quantiles in the outer bins are clipped to the edges.
+        :param quantiles: The quantiles.
+        :type quantiles: list
+        :return: A quantile x asset dataframe of terminal prices.
+        :rtype: pd.DataFrame
+        """
+
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        values = np.empty((len(quantiles), self.__histogram.shape[0]))
+
+        for asset, counts in enumerate(self.__histogram):
+            # The cumulative share of paths at each inner edge.
+            cumulative = np.cumsum(counts)[:-1] / max(counts.sum(), 1)
+            values[:, asset] = np.interp(quantiles, cumulative, self.__edges)
+
+        return pd.DataFrame(self.__initial_prices * np.exp(values), index=pd.Index(quantiles, name='quantile'),
+                            columns=self.__symbols)
@@ -0,0 +1,342 @@
+import json
+import math
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+
+
+class PointInTimeStore(object):
+
+    # Multi-row properties whose rows are identified by a column rather than their position, e.g. the rows of the
+    # recommendation trend are the periods 0m, -1m, -2m and -3m.
+    KEY_COLUMNS = {'recommendation_trend': 'period',
+                   'earnings_trend': 'period',
+                   'index_trend_estimate': 'period',
+                   'income_statement_history': 'end_date',
+                   'income_statement_history_quarterly': 'end_date',
+                   'balance_sheet_history': 'end_date',
+                   'balance_sheet_history_quarterly': 'end_date',
+                   'cash_flow_statement_history': 'end_date',
+                   'cash_flow_statement_history_quarterly': 'end_date'}
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS changes (
+            module TEXT NOT NULL,
+            field TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            observed_at INTEGER NOT NULL,
+            value,
+            PRIMARY KEY (module, field, symbol, observed_at)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS keys (
+            module TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            field TEXT NOT NULL,
+            first_seen INTEGER NOT NULL,
+            PRIMARY KEY (module, symbol, field)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS fetches (
+            module TEXT NOT NULL,
+            symbol TEXT NOT NULL,
+            observed_at INTEGER NOT NULL,
+            PRIMARY KEY (module, symbol, observed_at)
+        ) WITHOUT ROWID;
+    """
+
+    # The value of each (module, symbol, field) key at a point in time is found with one index seek into the changes
+    # table, so the query does not slow down as the history grows.
+    _AS_OF_QUERY = """
+        SELECT k.symbol, k.field,
+               (SELECT c.value FROM changes c
+                WHERE c.module = k.module AND c.field = k.field AND c.symbol = k.symbol AND c.observed_at <= :as_of
+                ORDER BY c.observed_at DESC LIMIT 1) AS value
+        FROM keys k
+        WHERE k.module = :module AND k.first_seen <= :as_of
+    """
+
+    def __init__(self, path):
+        """
+        Initializer method for the PointInTimeStore class. The store is an append-only log of the changes of every
+        field of every symbol, keyed by the time it was observed. Each fetch only writes the fields that changed since
+        the last fetch, and a field that disappears is written as a null. Querying as of a date only sees what had
+        been observed by then, so there is no look-ahead bias.
+        :param path: The path of the SQLite database, or :memory:.
+        :type path: str
+        """
+
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__lock = threading.Lock()
+
+        with self.__lock:
+            if path != ':memory:':
+                # Let readers query while a fetch is being appended.
+                self.__connection.execute('PRAGMA journal_mode=WAL')
+
+            self.__connection.executescript(self._SCHEMA)
+
+    def close(self):
+        self.__connection.close()
+
+    @staticmethod
+    def _timestamp(date):
+        # Times are stored as unix seconds in UTC.
+        date = pd.Timestamp.now(tz='UTC') if date is None else pd.Timestamp(date)
+        date = date.tz_localize('UTC') if date.tzinfo is None else date
+
+        return int(date.timestamp())
+
+    @staticmethod
+    def _value(value):
+        # SQLite stores python scalars, and missing values are nulls.
+        if isinstance(value, np.generic):
+            value = value.item()
+
+        if value is None or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+            return None
+
+        # Dates are unix seconds, whether or not the frames were compacted.
+        if isinstance(value, pd.Timestamp):
+            return int(value.timestamp())
+
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, sort_keys=True)
+
+        return value
+
+    def _fields(self, module, frame):
+        """
+        Method to turn a module dataframe into a dictionary of fields. A single row module gives one field per column.
+        The fields of a multi-row module are prefixed with the row key, e.g. 0m.strong_buy.
+        :rtype: dict
+        """
+
+        key_column = self.KEY_COLUMNS.get(module)
+
+        if key_column is None and len(frame) == 1:
+            return {str(column): self._value(value) for column, value in frame.iloc[0].items()}
+
+        fields = {}
+        for position, (_, row) in enumerate(frame.iterrows()):
+            row_key = row[key_column] if key_column is not None and key_column in frame.columns else position
+
+            for column, value in row.items():
+                if column != key_column:
+                    fields['{}.{}'.format(self._value(row_key), column)] = self._value(value)
+
+        return fields
+
+    def append(self, responses, observed_at=None, modules=None):
+        """
+        Method to append a fetch of YahooSummaryReader responses.
+        :param responses: A dictionary mapping symbols to YahooSummaryResponse objects.
+        :type responses: dict
+        :param observed_at: Optional. The time of the fetch. Default is now.
+        :type observed_at: str, datetime, Timestamp
+        :param modules: Optional. The response properties to store. Default is every property of the responses.
+        :type modules: list
+        :return: The number of changed fields written.
+        :rtype: int
+        :raise ValueError: If a module of a symbol was already fetched after observed_at. Nothing is written then.
+        """
+
+        modules = [prop for props in YahooSummaryReader.MODULE_PROPERTIES.values() for prop in props] \
+            if modules is None else modules
+
+        fetches = {}
+        for module in modules:
+            frames = {}
+
+            for symbol, response in responses.items():
+                # Failed reads and modules are skipped: a missing module is not evidence that its fields were removed.
+                if response.status is not None and not response.status.ok:
+                    continue
+
+                state = response._property_state(module)
+
+                if state is not None and state[0] is not None:
+                    frames[symbol] = state[0]
+
+            if frames:
+                fetches[module] = frames
+
+        # Every module is checked before any is written, so a fetch out of order leaves the store unchanged.
+        observed_at = self._timestamp(observed_at)
+
+        with self.__lock:
+            for module, frames in fetches.items():
+                self._check_order(module, list(frames), observed_at)
+
+        observed_at = pd.Timestamp(observed_at, unit='s', tz='UTC')
+
+        return sum(self.append_frames(module, frames, observed_at) for module, frames in fetches.items())
+
+    def append_frames(self, module, frames, observed_at=None):
+        """
+        Method to append a fetch of one module.
+        :param module: The name of the module, e.g. financial_data.
+        :type module: str
+        :param frames: A dictionary mapping symbols to the module dataframes.
+        :type frames: dict
+        :param observed_at: Optional. The time of the fetch. Default is now. It cannot be earlier than a fetch of the
+        module already appended for one of the symbols.
+        :type observed_at: str, datetime, Timestamp
+        :return: The number of changed fields written.
+        :rtype: int
+        :raise ValueError: If a symbol was already fetched after observed_at.
+        """
+
+        observed_at = self._timestamp(observed_at)
+        fetched = {symbol: self._fields(module, frame) for symbol, frame in frames.items()}
+
+        with self.__lock:
+            self._check_order(module, list(fetched), observed_at)
+
+            # Compare with what was known at the time of the fetch.
+            known = self._query(module, observed_at, list(fetched), None)
+
+            rows = []
+            for symbol, fields in fetched.items():
+                known_fields = known.get(symbol, {})
+
+                for field, value in fields.items():
+                    if known_fields.get(field) != value:
+                        rows.append((module, field, symbol, observed_at, value))
+
+                # Fields that are gone are closed with a null.
+                for field, value in known_fields.items():
+                    if field not in fields and value is not None:
+                        rows.append((module, field, symbol, observed_at, None))
+
+            with self.__connection:
+                self.__connection.executemany('INSERT OR REPLACE INTO changes VALUES (?, ?, ?, ?, ?)', rows)
+                self.__connection.executemany(
+                    'INSERT INTO keys VALUES (?, ?, ?, ?) ON CONFLICT (module, symbol, field) '
+                    'DO UPDATE SET first_seen = MIN(first_seen, excluded.first_seen)',
+                    [(module, symbol, field, observed_at) for module, field, symbol, observed_at, _ in rows])
+                self.__connection.executemany('INSERT OR IGNORE INTO fetches VALUES (?, ?, ?)',
+                                              [(module, symbol, observed_at) for symbol in fetched])
+
+        return len(rows)
+
+    def _check_order(self, module, symbols, observed_at):
+        """
+        Method to check that a fetch is not older than the last fetch of any of its symbols. The changes of a fetch are
+        only compared with the earlier ones, so an older fetch would close fields that later fetches still hold.
+        Called with the lock held.
+        :raise ValueError: If a symbol was already fetched after observed_at.
+        """
+
+        later = [row[0] for row in self.__connection.execute(
+            'SELECT DISTINCT symbol FROM fetches WHERE module = ? AND observed_at > ? '
+            'AND symbol IN (SELECT value FROM json_each(?))', (module, observed_at, json.dumps(symbols)))]
+
+        if later:
+            raise ValueError('The {} fetch of {} at {} is older than one already appended. Fetches must be appended '
+                             'in time order.'.format(module, ', '.join(sorted(later)),
+                                                     pd.Timestamp(observed_at, unit='s', tz='UTC')))
+
+    def _query(self, module, as_of, symbols, fields):
+        """
+        Method to get the fields of a module known at a point in time.
+        :return: A dictionary mapping symbols to dictionaries of their fields.
+        :rtype: dict
+        """
+
+        query = self._AS_OF_QUERY
+        parameters = {'module': module, 'as_of': as_of}
+
+        # The filters are passed as one JSON array each, so any number of symbols or fields fits in one query.
+        if symbols is not None:
+            query += ' AND k.symbol IN (SELECT value FROM json_each(:symbols))'
+            parameters['symbols'] = json.dumps(list(symbols))
+
+        if fields is not None:
+            query += ' AND k.field IN (SELECT value FROM json_each(:fields))'
+            parameters['fields'] = json.dumps(list(fields))
+
+        known = {}
+        for symbol, field, value in self.__connection.execute(query, parameters):
+            known.setdefault(symbol, {})[field] = value
+
+        return known
+
+    def as_of(self, date, symbols=None, fields=None):
+        """
+        Method to get the cross section of fields known at a point in time.
+        :param date: The point in time. Only the fetches observed at or before it are seen.
+        :type date: str, datetime, Timestamp
+        :param symbols: Optional. The symbols. Default is every symbol.
+        :type symbols: list
+        :param fields: The fields, named module.field (e.g. financial_data.current_price), or a module name for all of
+        its fields.
+        :type fields: list
+        :return: A dataframe indexed by symbol with one column per field.
+        :rtype: pd.DataFrame
+        """
+
+        if not fields:
+            raise ValueError('No fields requested.')
+
+        as_of = self._timestamp(date)
+
+        # Group the requested fields by module. None means every field of the module.
+        requested = {}
+        for name in fields:
+            module, _, field = name.partition('.')
+
+            if not field:
+                requested[module] = None
+            elif requested.get(module, []) is not None:
+                requested.setdefault(module, []).append(field)
+
+        columns = {}
+        with self.__lock:
+            for module, module_fields in requested.items():
+                for symbol, values in self._query(module, as_of, symbols, module_fields).items():
+                    for field, value in values.items():
+                        columns.setdefault('{}.{}'.format(module, field), {})[symbol] = value
+
+        found = {symbol for values in columns.values() for symbol in values}
+        table = pd.DataFrame(columns, index=pd.Index(sorted(found | set(symbols or [])), name='symbol'))
+
+        # Keep the requested order of the named fields, and drop the fields that were only ever nulls.
+        ordered = [name for name in fields if name in table.columns]
+        ordered += sorted(column for column in table.columns if column not in ordered)
+
+        return table[ordered].dropna(axis=1, how='all').infer_objects()
+
+    def history(self, symbol, field):
+        """
+        Method to get every observed change of one field of one symbol.
+        :param symbol: The symbol.
+        :type symbol: str
+        :param field: The field, named module.field.
+        :type field: str
+        :return: A series of the values indexed by the time they were observed.
+        :rtype: pd.Series
+        """
+
+        module, _, field = field.partition('.')
+
+        with self.__lock:
+            rows = self.__connection.execute('SELECT observed_at, value FROM changes '
+                                             'WHERE module = ? AND field = ? AND symbol = ? ORDER BY observed_at',
+                                             (module, field, symbol)).fetchall()
+
+        index = pd.to_datetime([row[0] for row in rows], unit='s', utc=True)
+
+        return pd.Series([row[1] for row in rows], index=index, name='{}.{}'.format(module, field), dtype=object)
+
+    def fetch_times(self, module, symbol):
+        """
+        Method to get the times a module of a symbol was fetched, whether or not anything changed.
+        :rtype: pd.DatetimeIndex
+        """
+
+        with self.__lock:
+            rows = self.__connection.execute('SELECT observed_at FROM fetches WHERE module = ? AND symbol = ? '
+                                             'ORDER BY observed_at', (module, symbol)).fetchall()
+
+        return pd.to_datetime([row[0] for row in rows], unit='s', utc=True)
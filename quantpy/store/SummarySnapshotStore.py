@@ -0,0 +1,336 @@
+import json
+import os
+import shutil
+import pandas as pd
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
+
+
+class SummarySnapshotStore(object):
+
+    # The file extension of each storage format. Both are written through pyarrow.
+    FORMATS = {'parquet': 'parquet', 'feather': 'arrow'}
+
+    # The names of the files of a snapshot that are not module tables.
+    MANIFEST_FILE = '_manifest.json'
+    STATUS_TABLE = '_status'
+
+    # The formats of the snapshot directory names: whole seconds, or with microseconds for snapshots taken within a
+    # second of each other.
+    _AS_OF_FORMAT = '%Y%m%dT%H%M%SZ'
+    _AS_OF_MICROSECOND_FORMAT = '%Y%m%dT%H%M%S.%fZ'
+
+    def __init__(self, root, storage_format='parquet', compression='zstd'):
+        """
+        Initializer method for the SummarySnapshotStore class. A snapshot is a whole YahooSummaryReader read stored as
+        one columnar table per response property, e.g. <root>/20240102T210000Z/financial_data.parquet holds the
+        financial data of every symbol with a symbol column. Loading one module for every symbol reads one file. The
+        columns and dtypes of every symbol's frames are kept in the manifest, so loading a snapshot gives back the
+        frames that were written.
+        :param root: The directory of the snapshots.
+        :type root: str
+        :param storage_format: The storage format: parquet or feather (Arrow IPC).
+        :type storage_format: str
+        :param compression: The compression codec of the tables.
+        :type compression: str
+        """
+
+        if storage_format not in self.FORMATS:
+            raise ValueError('Storage format must be one of {}.'.format(', '.join(self.FORMATS)))
+
+        self.__root = root
+        self.__storage_format = storage_format
+        self.__compression = compression
+
+    @staticmethod
+    def _properties():
+        return [prop for props in YahooSummaryReader.MODULE_PROPERTIES.values() for prop in props]
+
+    @classmethod
+    def _as_of(cls, as_of):
+        # Snapshots are keyed by UTC time with microsecond resolution, so two reads never share a snapshot.
+        as_of = pd.Timestamp.now(tz='UTC') if as_of is None else pd.Timestamp(as_of)
+        as_of = as_of.tz_localize('UTC') if as_of.tzinfo is None else as_of.tz_convert('UTC')
+
+        return as_of.floor('us')
+
+    def _snapshot_dir(self, as_of):
+        as_of_format = self._AS_OF_FORMAT if as_of.microsecond == 0 else self._AS_OF_MICROSECOND_FORMAT
+
+        return os.path.join(self.__root, as_of.strftime(as_of_format))
+
+    @classmethod
+    def _parse_snapshot_name(cls, name):
+        # Names that are not snapshot times, e.g. the temporary directory of an interrupted write, give None.
+        for as_of_format in (cls._AS_OF_FORMAT, cls._AS_OF_MICROSECOND_FORMAT):
+            try:
+                return pd.to_datetime(name, format=as_of_format, utc=True)
+            except ValueError:
+                continue
+
+        return None
+
+    def _table_path(self, snapshot_dir, name):
+        return os.path.join(snapshot_dir, '{}.{}'.format(name, self.FORMATS[self.__storage_format]))
+
+    def snapshots(self):
+        """
+        Method to get the times of the stored snapshots.
+        :return: The sorted list of snapshot times.
+        :rtype: list
+        """
+
+        try:
+            names = os.listdir(self.__root)
+        except OSError:
+            return []
+
+        times = []
+        for name in names:
+            if not os.path.isfile(os.path.join(self.__root, name, self.MANIFEST_FILE)):
+                continue
+
+            as_of = self._parse_snapshot_name(name)
+
+            if as_of is not None:
+                times.append(as_of)
+
+        return sorted(times)
+
+    def resolve(self, as_of=None):
+        """
+        Method to find the snapshot that was current at a point in time: the last one taken at or before it.
+        :param as_of: Optional. The point in time. Default is the latest snapshot.
+        :type as_of: str, datetime, Timestamp
+        :return: The time of the snapshot.
+        :rtype: pd.Timestamp
+        """
+
+        snapshots = self.snapshots()
+
+        if as_of is not None:
+            as_of = self._as_of(as_of)
+            snapshots = [snapshot for snapshot in snapshots if snapshot <= as_of]
+
+        if not snapshots:
+            raise KeyError('No snapshot at or before {}.'.format(as_of))
+
+        return snapshots[-1]
+
+    def write(self, responses, as_of=None):
+        """
+        Method to store a read as a snapshot.
+        :param responses: A dictionary mapping symbols to YahooSummaryResponse objects, i.e. the result of read.
+        :type responses: dict
+        :param as_of: Optional. The time of the snapshot. Default is now. A snapshot already stored at that time is
+        replaced.
+        :type as_of: str, datetime, Timestamp
+        :return: The time of the snapshot.
+        :rtype: pd.Timestamp
+        """
+
+        if isinstance(responses, YahooSummaryResponse):
+            responses = {responses.symbol: responses}
+
+        as_of = self._as_of(as_of)
+        snapshot_dir = self._snapshot_dir(as_of)
+
+        # Write into a temporary directory and move it in place, so a snapshot is either complete or missing.
+        temporary_dir = snapshot_dir + '.tmp'
+        shutil.rmtree(temporary_dir, ignore_errors=True)
+        os.makedirs(temporary_dir)
+
+        statuses = []
+        columns = {}
+        dtypes = {}
+        encoded = {}
+
+        for symbol, response in responses.items():
+            if response.status is not None and not response.status.ok:
+                statuses.append((symbol, None) + response.status.to_tuple()[1:])
+
+        # One table per property, holding the rows of every symbol.
+        for prop in self._properties():
+            frames = {}
+
+            for symbol, response in responses.items():
+                state = response._property_state(prop)
+
+                if state is None:
+                    continue
+
+                value, error = state
+
+                if error is not None:
+                    statuses.append((symbol, prop) + error.to_tuple()[1:])
+                elif value is not None:
+                    frames[symbol] = value
+
+            if not frames:
+                continue
+
+            # The columns and dtypes of each symbol are kept, since the stacked table has the union of the columns and
+            # e.g. an integer column becomes float when another symbol lacks it.
+            columns[prop] = {symbol: [str(column) for column in frame.columns] for symbol, frame in frames.items()}
+            dtypes[prop] = {symbol: {str(column): str(dtype) for column, dtype in frame.dtypes.items()}
+                            for symbol, frame in frames.items()}
+
+            table = pd.concat(frames, names=['symbol', None]).reset_index(level='symbol').reset_index(drop=True)
+            table, encoded[prop] = self._normalize(table)
+            self._write_table(table, self._table_path(temporary_dir, prop))
+
+        status_table = pd.DataFrame.from_records(statuses, columns=['symbol', 'property', 'module', 'code',
+                                                                    'http_status', 'retryable', 'message'])
+        self._write_table(self._normalize(status_table)[0], self._table_path(temporary_dir, self.STATUS_TABLE))
+
+        with open(os.path.join(temporary_dir, self.MANIFEST_FILE), 'w') as manifest_file:
+            json.dump({'as_of': as_of.isoformat(), 'symbols': list(responses), 'columns': columns, 'dtypes': dtypes,
+                       'encoded': encoded}, manifest_file)
+
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        os.replace(temporary_dir, snapshot_dir)
+
+        return as_of
+
+    @staticmethod
+    def _normalize(table):
+        """
+        Method to make a stacked table storable. Columns mixing value types across symbols, e.g. numbers and strings,
+        are stored as JSON strings since a columnar format needs one type per column, and are decoded on load.
+        :return: A tuple containing the table and the list of the JSON encoded columns.
+        :rtype: tuple
+        """
+
+        encoded = []
+
+        for column in table.columns[table.dtypes == object]:
+            types = set(type(value) for value in table[column].dropna())
+
+            if len(types) > 1:
+                table[column] = table[column].map(lambda value: value if pd.isna(value) else
+                                                  json.dumps(value, default=SummarySnapshotStore._json_default))
+                encoded.append(str(column))
+
+        return table, encoded
+
+    @staticmethod
+    def _json_default(value):
+        # NumPy scalars become the Python values they hold, anything else its string.
+        return value.item() if hasattr(value, 'item') else str(value)
+
+    def _write_table(self, table, path):
+        if self.__storage_format == 'parquet':
+            table.to_parquet(path, compression=self.__compression, index=False)
+        else:
+            table.to_feather(path, compression=self.__compression)
+
+    def _read_table(self, path, symbols=None, columns=None):
+        if columns is not None:
+            columns = ['symbol'] + [column for column in columns if column != 'symbol']
+
+        if self.__storage_format == 'parquet':
+            # The symbol filter is pushed down to the parquet reader.
+            filters = [('symbol', 'in', list(symbols))] if symbols is not None else None
+            return pd.read_parquet(path, columns=columns, filters=filters)
+
+        table = pd.read_feather(path, columns=columns)
+
+        return table[table['symbol'].isin(symbols)] if symbols is not None else table
+
+    def _manifest(self, snapshot_dir):
+        with open(os.path.join(snapshot_dir, self.MANIFEST_FILE)) as manifest_file:
+            return json.load(manifest_file)
+
+    def load_module(self, prop, as_of=None, symbols=None, columns=None):
+        """
+        Method to load one property of every symbol, without building any response objects.
+        :param prop: The response property, e.g. financial_data or income_statement_history_quarterly.
+        :type prop: str
+        :param as_of: Optional. The point in time. Default is the latest snapshot.
+        :type as_of: str, datetime, Timestamp
+        :param symbols: Optional. The symbols to load. Default is every symbol.
+        :type symbols: list
+        :param columns: Optional. The columns to load. Default is every column.
+        :type columns: list
+        :return: The stacked table with a symbol column.
+        :rtype: pd.DataFrame
+        """
+
+        path = self._table_path(self._snapshot_dir(self.resolve(as_of)), prop)
+
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=['symbol'])
+
+        return self._read_table(path, symbols, columns).reset_index(drop=True)
+
+    def statuses(self, as_of=None):
+        """
+        Method to load the errors of a snapshot: the failed reads and the properties that failed to parse.
+        :rtype: pd.DataFrame
+        """
+
+        return self._read_table(self._table_path(self._snapshot_dir(self.resolve(as_of)), self.STATUS_TABLE))
+
+    def load(self, as_of=None, symbols=None, properties=None):
+        """
+        Method to load a snapshot back into YahooSummaryResponse objects.
+        :param as_of: Optional. The point in time. Default is the latest snapshot.
+        :type as_of: str, datetime, Timestamp
+        :param symbols: Optional. The symbols to load. Default is every symbol.
+        :type symbols: list
+        :param properties: Optional. The properties to load. Default is every stored property.
+        :type properties: list
+        :return: A dictionary mapping symbols to YahooSummaryResponse objects.
+        :rtype: dict
+        """
+
+        snapshot_dir = self._snapshot_dir(self.resolve(as_of))
+        manifest = self._manifest(snapshot_dir)
+        symbols = manifest['symbols'] if symbols is None else [symbol for symbol in symbols
+                                                               if symbol in manifest['symbols']]
+        properties = self._properties() if properties is None else list(properties)
+
+        statuses = self._read_table(self._table_path(snapshot_dir, self.STATUS_TABLE), symbols)
+        statuses = statuses.astype(object).where(statuses.notna(), None)
+
+        responses = {}
+        for symbol in symbols:
+            responses[symbol] = YahooSummaryResponse(symbol)
+
+        for row in statuses.itertuples(index=False):
+            status = YahooReadStatus(YahooStatusCode[row.code], row.symbol, row.module,
+                                     None if row.http_status is None else int(row.http_status), row.message,
+                                     bool(row.retryable))
+
+            if row.property is None:
+                # A failed read has no properties.
+                responses[row.symbol] = YahooSummaryResponse(row.symbol, status.message, status)
+            elif row.property in properties:
+                setattr(responses[row.symbol], row.property, (None, status))
+
+        for prop in properties:
+            if prop not in manifest['columns']:
+                continue
+
+            table = self._read_table(self._table_path(snapshot_dir, prop), symbols)
+            encoded = manifest.get('encoded', {}).get(prop, [])
+            dtypes = manifest.get('dtypes', {}).get(prop, {})
+
+            # Split the stacked table back into the frames of each symbol, with the columns and dtypes each symbol had.
+            for symbol, frame in table.groupby('symbol', sort=False):
+                symbol_columns = manifest['columns'][prop][symbol]
+                frame = frame.drop(columns='symbol').reset_index(drop=True)
+                frame.columns = [str(column) for column in frame.columns]
+                frame = frame[symbol_columns]
+
+                for column in encoded:
+                    if column in frame.columns:
+                        frame[column] = frame[column].map(lambda value: value if pd.isna(value) else json.loads(value))
+
+                if symbol in dtypes:
+                    frame = frame.astype(dtypes[symbol])
+
+                setattr(responses[symbol], prop, frame)
+
+        return responses
@@ -0,0 +1,108 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.backtest.BacktestResult import BacktestResult
+from quantpy.backtest.Backtester import Backtester
+from quantpy.data.transform.QuotePanel import QuotePanel
+
+
+def momentum(prices, lookback=1, leverage=1.0):
+    # Hold the symbols that rose over the lookback, equally weighted.
+    rising = (prices.pct_change(lookback) > 0).astype(float)
+
+    return rising.div(rising.sum(axis=1).replace(0.0, np.nan), axis=0).fillna(0.0) * leverage
+
+
+def always_first(prices):
+    return np.tile([1.0, 0.0], (len(prices), 1))
+
+
+class TestBacktester(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = 1577975400 + 86400 * np.arange(6)
+        self.quotes = {'AAA': pd.DataFrame({'date': self.dates, 'close': [10.0, 11.0, 12.1, 6.05, 6.655, 7.0]}),
+                       'BBB': pd.DataFrame({'date': self.dates, 'close': [20.0, 19.0, 19.5, 20.0, 21.0, 20.5]})}
+        self.panel = QuotePanel.from_quotes(self.quotes, fields=('close',))
+
+    def test_total_returns_include_events(self):
+        splits = {'AAA': pd.DataFrame({'date': [self.dates[3]], 'numerator': [2.0], 'denominator': [1.0]})}
+        dividends = {'BBB': pd.DataFrame({'date': [self.dates[2] - 3600], 'amount': [0.5]})}
+
+        returns = Backtester(self.panel, dividends=dividends, splits=splits, prices_split_adjusted=False).asset_returns
+
+        # The raw price halves on the split, but a holder has twice the shares.
+        self.assertAlmostEqual(returns['AAA'].iloc[3], 0.0)
+        self.assertAlmostEqual(returns['BBB'].iloc[2], 1.0 / 19.0)
+        self.assertEqual(returns['AAA'].iloc[0], 0.0)
+
+        adjusted = Backtester(self.panel, splits=splits).asset_returns
+        self.assertAlmostEqual(adjusted['AAA'].iloc[3], -0.5)
+
+    def test_events_on_the_same_bar_are_combined(self):
+        # Two dividends paid between the same bars, and a 2 for 1 and a 3 for 2 split on one bar.
+        dividends = {'BBB': pd.DataFrame({'date': [self.dates[2] - 7200, self.dates[2] - 3600], 'amount': [0.5, 0.25]})}
+        splits = {'AAA': pd.DataFrame({'date': [self.dates[3], self.dates[3]], 'numerator': [2.0, 3.0],
+                                       'denominator': [1.0, 2.0]})}
+
+        self.assertEqual(self.panel.align_events(dividends, 'amount')['BBB'].tolist(), [0, 0, 0.75, 0, 0, 0])
+
+        returns = Backtester(self.panel, dividends=dividends, splits=splits, prices_split_adjusted=False).asset_returns
+
+        self.assertAlmostEqual(returns['BBB'].iloc[2], (19.5 + 0.75) / 19.0 - 1.0)
+        self.assertAlmostEqual(returns['AAA'].iloc[3], 6.05 * 3.0 / 12.1 - 1.0)
+
+    def test_weights_are_held_over_the_next_bar(self):
+        result = Backtester(self.panel).run(always_first)
+
+        self.assertEqual(result.weights['AAA'].tolist(), [0.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        self.assertAlmostEqual(result.returns['gross_return'].iloc[0], 0.0)
+        self.assertAlmostEqual(result.returns['gross_return'].iloc[1], 0.1)
+        self.assertAlmostEqual(result.equity.iloc[-1], 0.7)
+
+    def test_costs(self):
+        result = Backtester(self.panel, commission_bps=5.0, slippage_bps=5.0).run(always_first)
+        returns = result.returns
+
+        # The first bar buys the whole portfolio and the weights never drift from one asset.
+        np.testing.assert_allclose(returns['turnover'], [1.0, 0.0, 0.0, 0.0, 0.0, 0.0], atol=1e-12)
+        self.assertAlmostEqual(returns['cost'].iloc[0], 0.001)
+        np.testing.assert_allclose(returns['net_return'], returns['gross_return'] - returns['cost'])
+
+    def test_metrics(self):
+        metrics = BacktestResult.compute_metrics(np.array([0.1, -0.5, 0.2]), np.array([1.0, 0.0, 0.5]))
+
+        self.assertAlmostEqual(metrics['total_return'], 1.1 * 0.5 * 1.2 - 1.0)
+        self.assertAlmostEqual(metrics['max_drawdown'], -0.5)
+        self.assertAlmostEqual(metrics['average_turnover'], 0.5)
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), 'the shared memory blocks are not listed as files')
+    def test_sweep_releases_shared_memory(self):
+        before = set(os.listdir('/dev/shm'))
+        Backtester(self.panel).sweep(momentum, [{'lookback': 1}], max_workers=1)
+
+        self.assertEqual(set(os.listdir('/dev/shm')), before)
+
+    def test_bad_weights_shape(self):
+        with self.assertRaises(ValueError):
+            Backtester(self.panel).run(lambda prices: np.ones((2, 2)))
+
+    def test_sweep_matches_run(self):
+        backtester = Backtester(self.panel, commission_bps=10.0)
+        sweep = backtester.sweep(momentum, {'lookback': [1, 2], 'leverage': [0.5, 1.0]}, max_workers=2)
+
+        self.assertEqual(sweep[['lookback', 'leverage']].values.tolist(), [[1, 0.5], [1, 1.0], [2, 0.5], [2, 1.0]])
+        self.assertEqual(len(sweep), 4)
+
+        for _, row in sweep.iterrows():
+            metrics = backtester.run(momentum, lookback=int(row['lookback']), leverage=row['leverage']).metrics
+
+            for name, value in metrics.items():
+                self.assertAlmostEqual(row[name], value)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
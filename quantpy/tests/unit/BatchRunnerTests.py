@@ -0,0 +1,92 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from quantpy.cli.BatchRunner import BatchRunner
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+
+
+def chart_handler(url, params):
+    symbol = url.rsplit('/', 1)[-1]
+
+    if symbol == 'BAD':
+        return FakeResponse(FakeResponse.chart_error(), 404)
+
+    return FakeResponse(FakeResponse.chart(symbol, [1577975400, 1578061800], [10.0, 11.0]))
+
+
+class InterruptingProgress(object):
+    # A progress stream that interrupts the run like a Ctrl-C after a number of updates.
+
+    def __init__(self, updates):
+        self.updates = updates
+
+    def write(self, text):
+        self.updates -= 1
+
+        if self.updates == 0:
+            raise KeyboardInterrupt
+
+    def flush(self):
+        pass
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_dir = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def checkpoint(self):
+        with open(os.path.join(self.output_dir, BatchRunner.CHECKPOINT_FILE)) as checkpoint_file:
+            return json.load(checkpoint_file)
+
+    def test_run_writes_tables_and_checkpoint(self):
+        session = FakeSession(chart_handler)
+        runner = BatchRunner(['AAA', 'BAD', 'BBB'], self.output_dir, workers=2, progress=None, session=session)
+
+        result = runner.run()
+
+        self.assertEqual(result['completed'], 2)
+        self.assertEqual(list(result['failed']), ['BAD'])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.output_dir, 'quote'))), ['AAA.csv', 'BBB.csv'])
+        self.assertEqual(self.checkpoint()['completed'], ['AAA', 'BBB'])
+        self.assertFalse(session.closed)
+
+    def test_resume_skips_completed_symbols(self):
+        BatchRunner(['AAA'], self.output_dir, progress=None, session=FakeSession(chart_handler)).run()
+        session = FakeSession(chart_handler)
+
+        result = BatchRunner(['AAA', 'BBB'], self.output_dir, resume=True, progress=None, session=session).run()
+
+        self.assertEqual(result['skipped'], 1)
+        self.assertEqual([url.rsplit('/', 1)[-1] for url, _ in session.requests], ['BBB'])
+
+    def test_interrupt_stops_pending_symbols(self):
+        symbols = ['S{}'.format(i) for i in range(200)]
+        session = FakeSession(chart_handler, delay=0.02)
+        runner = BatchRunner(symbols, self.output_dir, workers=2, progress=InterruptingProgress(5),
+                             progress_interval=0.0, session=session)
+
+        start = time.monotonic()
+        with self.assertRaises(KeyboardInterrupt):
+            runner.run()
+
+        # Reading every symbol would take about 2 seconds.
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertLess(len(session.requests), len(symbols))
+
+        # Only the symbols whose result was collected are checkpointed.
+        completed = self.checkpoint()['completed']
+        self.assertEqual(len(completed), 5)
+        self.assertTrue(set(completed) <= set(os.path.splitext(name)[0]
+                                              for name in os.listdir(os.path.join(self.output_dir, 'quote'))))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
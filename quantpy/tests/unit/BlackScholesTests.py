@@ -0,0 +1,101 @@
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.options.BlackScholes import BlackScholes
+from quantpy.data.transform.DtypeCompactor import DtypeCompactor
+from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
+from quantpy.options.OptionPricer import OptionPricer
+
+
+class TestBlackScholes(unittest.TestCase):
+
+    def test_norm_cdf(self):
+        x = np.linspace(-8.0, 8.0, 1601)
+        expected = np.array([0.5 * math.erfc(-value / math.sqrt(2.0)) for value in x])
+
+        np.testing.assert_allclose(BlackScholes.norm_cdf(x), expected, rtol=0.0, atol=1e-15)
+
+    def test_price(self):
+        # Hull's textbook example and the put of the same contract from put-call parity.
+        call = BlackScholes.price(42.0, 40.0, 0.5, 0.1, 0.0, 0.2, True)
+        put = BlackScholes.price(42.0, 40.0, 0.5, 0.1, 0.0, 0.2, False)
+
+        self.assertAlmostEqual(float(call), 4.7594, places=4)
+        self.assertAlmostEqual(float(call - put), 42.0 - 40.0 * math.exp(-0.05), places=12)
+
+    def test_greeks(self):
+        arguments = dict(spot=100.0, strike=105.0, expiry=0.75, rate=0.04, dividend_yield=0.02, volatility=0.3,
+                         is_call=np.array([True, False]))
+        greeks = BlackScholes.greeks(**arguments)
+        step = 1e-5
+
+        def bumped(name, size):
+            return BlackScholes.price(**dict(arguments, **{name: arguments[name] + size}))
+
+        np.testing.assert_allclose(greeks['delta'], (bumped('spot', step) - bumped('spot', -step)) / (2 * step),
+                                   rtol=1e-6)
+        np.testing.assert_allclose(greeks['vega'],
+                                   (bumped('volatility', step) - bumped('volatility', -step)) / (2 * step), rtol=1e-6)
+        np.testing.assert_allclose(greeks['theta'], -(bumped('expiry', step) - bumped('expiry', -step)) / (2 * step),
+                                   rtol=1e-6)
+        np.testing.assert_allclose(greeks['rho'], (bumped('rate', step) - bumped('rate', -step)) / (2 * step),
+                                   rtol=1e-6)
+
+    def test_implied_volatility(self):
+        rng = np.random.default_rng(7)
+        spot = rng.uniform(50.0, 150.0, 10000)
+        strike = spot * rng.uniform(0.8, 1.2, 10000)
+        expiry = rng.uniform(0.05, 2.0, 10000)
+        volatility = rng.uniform(0.15, 0.8, 10000)
+        is_call = rng.random(10000) < 0.5
+
+        prices = BlackScholes.price(spot, strike, expiry, 0.03, 0.01, volatility, is_call)
+        solved, converged = BlackScholes.implied_volatility(prices, spot, strike, expiry, 0.03, 0.01, is_call)
+
+        self.assertTrue(converged.all())
+        np.testing.assert_allclose(BlackScholes.price(spot, strike, expiry, 0.03, 0.01, solved, is_call), prices,
+                                   atol=1e-7)
+
+        # Prices outside of the arbitrage bounds have no volatility.
+        solved, converged = BlackScholes.implied_volatility([0.5, 120.0], 100.0, 90.0, 1.0, 0.0, 0.0, True)
+
+        self.assertTrue(np.isnan(solved).all())
+        self.assertFalse(converged.any())
+
+    def test_dividend_yields(self):
+        # A quarterly dividend of 1 on a spot of 100, with the last ex-dividend date 30 days before the valuation.
+        day = 86400.0
+        dividends = pd.DataFrame({'amount': [1.0, np.nan], 'ex_dividend_date': [-30 * day, np.nan],
+                                  'yield': [np.nan, 0.02]}, index=['A', 'B'])
+        pricer = OptionPricer(dividends=dividends)
+        expiries = np.array([30.0, 90.0, 200.0, 30.0]) * day
+
+        yields = pricer.dividend_yields(np.array(['A', 'A', 'A', 'B']), np.full(4, 100.0), expiries, 0.0)
+
+        # The next ex-dividend dates are 61.25 and 152.5 days after the valuation.
+        self.assertEqual(yields[0], 0.0)
+        self.assertAlmostEqual(yields[1], -math.log(0.99) / (90.0 / 365.0))
+        self.assertAlmostEqual(yields[2], -math.log(0.98) / (200.0 / 365.0))
+        self.assertEqual(yields[3], 0.02)
+
+    def test_dividend_table_of_compacted_responses(self):
+        raw, compacted = YahooSummaryResponse('A'), YahooSummaryResponse('A')
+        statistics = pd.DataFrame({'last_dividend_value': [0.25], 'yield': [np.nan]})
+        calendar = pd.DataFrame({'ex_dividend_date': [1700006400]})
+
+        raw.default_key_statistics, raw.calendar_events_dividends = statistics, calendar
+        compacted.default_key_statistics = DtypeCompactor().compact(statistics)
+        compacted.calendar_events_dividends = DtypeCompactor().compact(calendar)
+
+        table = OptionPricer.dividend_table({'A': compacted})
+
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(compacted.calendar_events_dividends['ex_dividend_date']))
+        pd.testing.assert_frame_equal(table, OptionPricer.dividend_table({'A': raw}))
+        self.assertEqual(table.loc['A', 'ex_dividend_date'], 1700006400.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
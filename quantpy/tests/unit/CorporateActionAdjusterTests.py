@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.transform.CorporateActionAdjuster import CorporateActionAdjuster
+from quantpy.data.transform.QuotePanel import QuotePanel
+
+
+def splits_frame(dates, numerators, denominators=None):
+    return pd.DataFrame({'date': dates, 'numerator': numerators,
+                         'denominator': denominators or [1.0] * len(numerators)})
+
+
+def dividends_frame(dates, amounts):
+    return pd.DataFrame({'date': dates, 'amount': amounts})
+
+
+class TestCorporateActionAdjuster(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = 1577975400 + 86400 * np.arange(8)
+        closes = {'AAA': [10.0, 11.0, 12.0, 6.0, 6.5, 7.0, 7.5, 8.0],
+                  'BBB': [20.0, 21.0, 20.5, 22.0, 23.0, 22.5, 11.0, 11.5]}
+        self.quotes = {symbol: pd.DataFrame({'date': self.dates,
+                                             'open': np.array(close) - 0.25,
+                                             'close': close,
+                                             'volume': np.arange(8, dtype=float) * 100 + 1000})
+                       for symbol, close in closes.items()}
+        self.panel = QuotePanel.from_quotes(self.quotes, fields=('open', 'close', 'volume'))
+
+    def test_split_adjustment(self):
+        adjuster = CorporateActionAdjuster(self.panel, splits={'AAA': splits_frame([self.dates[3]], [2.0])})
+
+        # The prices before the split are halved and the volumes doubled.
+        np.testing.assert_allclose(adjuster.split_adjusted()['AAA'], [5.0, 5.5, 6.0, 6.0, 6.5, 7.0, 7.5, 8.0])
+        np.testing.assert_allclose(adjuster.split_adjusted('volume')['AAA'].iloc[:4], [2000, 2200, 2400, 1300])
+        np.testing.assert_allclose(adjuster.split_factors()['BBB'], 1.0)
+        pd.testing.assert_frame_equal(adjuster.total_return_adjusted(), adjuster.split_adjusted())
+
+    def test_dividend_adjustment(self):
+        adjuster = CorporateActionAdjuster(self.panel, dividends={'BBB': dividends_frame([self.dates[2] - 3600],
+                                                                                         [0.42])})
+        adjusted = adjuster.total_return_adjusted()['BBB']
+
+        # The previous close is reduced by the dividend, like the adjusted close of the chart API.
+        self.assertAlmostEqual(adjusted.iloc[2] / adjusted.iloc[1], 20.5 / (21.0 - 0.42))
+        self.assertAlmostEqual(adjuster.dividend_factors()['BBB'].iloc[0], 1.0 - 0.42 / 21.0)
+        np.testing.assert_allclose(adjusted.iloc[2:], self.quotes['BBB']['close'].iloc[2:])
+
+    def test_events_outside_the_panel_are_dropped(self):
+        adjuster = CorporateActionAdjuster(self.panel)
+        applied = adjuster.add_events(splits={'AAA': splits_frame([self.dates[-1] + 86400], [2.0]),
+                                              'ZZZ': splits_frame([self.dates[3]], [2.0])})
+
+        self.assertEqual(applied, 0)
+        np.testing.assert_allclose(adjuster.split_factors(), 1.0)
+
+    def test_add_events_matches_a_full_rebuild(self):
+        splits = {'AAA': splits_frame([self.dates[3]], [2.0]), 'BBB': splits_frame([self.dates[6]], [2.0])}
+        dividends = {'AAA': dividends_frame([self.dates[3], self.dates[6]], [0.1, 0.05]),
+                     'BBB': dividends_frame([self.dates[2], self.dates[6]], [0.3, 0.2])}
+        expected = CorporateActionAdjuster(self.panel, splits, dividends)
+
+        # The new events land on bars without events, on bars with events of the other kind and with the same kind.
+        adjuster = CorporateActionAdjuster(self.panel, {'BBB': splits['BBB']},
+                                           {'AAA': dividends_frame([self.dates[3]], [0.1]),
+                                            'BBB': dividends_frame([self.dates[2]], [0.1])})
+        applied = adjuster.add_events(splits={'AAA': splits['AAA']},
+                                      dividends={'AAA': dividends_frame([self.dates[6]], [0.05]),
+                                                 'BBB': dividends_frame([self.dates[2], self.dates[6]], [0.2, 0.2])})
+
+        self.assertEqual(applied, 4)
+        pd.testing.assert_frame_equal(adjuster.split_factors(), expected.split_factors())
+        pd.testing.assert_frame_equal(adjuster.dividend_factors(), expected.dividend_factors())
+
+        for field in ('open', 'close', 'volume'):
+            pd.testing.assert_frame_equal(adjuster.total_return_adjusted(field), expected.total_return_adjusted(field))
+            pd.testing.assert_frame_equal(adjuster.split_adjusted(field), expected.split_adjusted(field))
+
+    def test_adjusted_panel(self):
+        adjuster = CorporateActionAdjuster(self.panel, splits={'AAA': splits_frame([self.dates[3]], [2.0])})
+        panel = adjuster.adjusted_panel()
+
+        self.assertEqual(sorted(panel.fields), ['close', 'open', 'volume'])
+        pd.testing.assert_frame_equal(panel['close'], adjuster.total_return_adjusted())
+
+        # The panel holds copies, so changing it leaves the adjuster alone.
+        panel['close'].iloc[0, 0] = 0.0
+        self.assertEqual(adjuster.total_return_adjusted().iloc[0, 0], 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
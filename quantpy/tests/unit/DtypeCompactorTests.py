@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.transform.CorporateActionAdjuster import CorporateActionAdjuster
+from quantpy.data.transform.DtypeCompactor import DtypeCompactor
+from quantpy.data.transform.QuotePanel import QuotePanel
+from quantpy.data.transform.QuoteResampler import QuoteResampler
+
+
+def nanosecond_dates(frame):
+    # pandas 2 builds the datetimes of unix seconds in nanoseconds, pandas 3 in seconds. Test both.
+    frame = frame.copy()
+    frame['date'] = pd.to_datetime(frame['date'], unit='s', utc=True).dt.as_unit('ns')
+
+    return frame
+
+
+class TestDtypeCompactor(unittest.TestCase):
+
+    def setUp(self):
+        self.dates = 1577975400 + 86400 * np.arange(5)
+        self.quotes = {symbol: pd.DataFrame({'date': self.dates,
+                                             'open': np.arange(5, dtype=float) + offset,
+                                             'high': np.arange(5, dtype=float) + offset + 1,
+                                             'low': np.arange(5, dtype=float) + offset - 1,
+                                             'close': np.arange(5, dtype=float) + offset + 0.5,
+                                             'volume': np.arange(5, dtype=float) * 100})
+                       for symbol, offset in [('AAA', 10.0), ('BBB', 20.0)]}
+        self.splits = {'AAA': pd.DataFrame({'date': [self.dates[2]], 'numerator': [2.0], 'denominator': [1.0]})}
+        self.dividends = {'BBB': pd.DataFrame({'date': [self.dates[3] - 3600], 'amount': [0.5]})}
+        self.compactor = DtypeCompactor()
+
+    def test_compact_dtypes(self):
+        compact = self.compactor.compact(self.quotes['AAA'])
+
+        self.assertEqual(compact['close'].dtype, np.float32)
+        self.assertEqual(compact['volume'].dtype, np.uint64)
+        self.assertEqual(compact['date'].iloc[0], pd.Timestamp(self.dates[0], unit='s', tz='UTC'))
+
+        with_nulls = self.quotes['AAA'].assign(volume=[1.0, None, 3.0, 4.0, 5.0])
+        self.assertEqual(str(self.compactor.compact(with_nulls)['volume'].dtype), 'UInt64')
+
+    def test_categories_are_shared(self):
+        first = self.compactor.compact(pd.DataFrame({'sector': ['Technology', 'Energy']}))
+        second = self.compactor.compact(pd.DataFrame({'sector': ['Energy', 'Utilities']}))
+
+        self.assertEqual(list(second['sector'].cat.categories), ['Technology', 'Energy', 'Utilities'])
+        self.assertTrue(second['sector'].cat.categories[:2].equals(first['sector'].cat.categories))
+
+    def test_compact_dates_align_events(self):
+        panel = QuotePanel.from_quotes(self.quotes)
+        expected = panel.align_events(self.splits, 'numerator')
+
+        for convert in [self.compactor.compact, nanosecond_dates]:
+            splits = {symbol: convert(frame) for symbol, frame in self.splits.items()}
+            pd.testing.assert_frame_equal(panel.align_events(splits, 'numerator'), expected)
+
+    def test_compact_dates_adjust(self):
+        panel = QuotePanel.from_quotes(self.quotes)
+        expected = CorporateActionAdjuster(panel, self.splits, self.dividends).total_return_adjusted()
+
+        for convert in [self.compactor.compact, nanosecond_dates]:
+            splits = {symbol: convert(frame) for symbol, frame in self.splits.items()}
+            dividends = {symbol: convert(frame) for symbol, frame in self.dividends.items()}
+            adjusted = CorporateActionAdjuster(panel, splits, dividends).total_return_adjusted()
+
+            pd.testing.assert_frame_equal(adjusted, expected)
+
+        # The close of 10.5 before the 2 for 1 split.
+        self.assertEqual(expected['AAA'].iloc[0], 5.25)
+
+    def test_compact_dates_resample(self):
+        expected = QuoteResampler('1wk').resample(self.quotes['AAA'])
+
+        for convert in [self.compactor.compact, nanosecond_dates]:
+            weekly = QuoteResampler('1wk').resample(convert(self.quotes['AAA']))
+
+            self.assertEqual(weekly['date'].dt.as_unit('s').astype('int64').tolist(), expected['date'].tolist())
+            np.testing.assert_allclose(weekly['close'], expected['close'])
+
+    def test_compact_panel(self):
+        panel = self.compactor.compact_panel(QuotePanel.from_quotes(self.quotes))
+
+        self.assertEqual(panel['close'].dtypes.unique().tolist(), [np.float32])
+        self.assertEqual(panel['volume'].dtypes.unique().tolist(), [np.float32])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+
+class FakeResponse(object):
+
+    def __init__(self, body, status_code=200, url=''):
+        """
+        Initializer method for the FakeResponse class. A canned response standing in for a requests.Response.
+        :param body: The JSON body, as an object or bytes.
+        :param status_code: The HTTP status code.
+        :type status_code: int
+        :param url: The url of the request.
+        :type url: str
+        """
+
+        self.content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.status_code = status_code
+        self.url = url
+        self.headers = {'Content-Length': str(len(self.content))}
+        self.encoding = 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def chart(symbol, timestamps, closes, events=None):
+        """
+        Method to build the body of a daily chart with the same price for every field.
+        :rtype: dict
+        """
+
+        quote = {field: list(closes) for field in ('open', 'high', 'low', 'close')}
+        quote['volume'] = [1000] * len(closes)
+        result = {'meta': {'symbol': symbol, 'currency': 'USD'}, 'timestamp': list(timestamps),
+                  'indicators': {'quote': [quote], 'adjclose': [{'adjclose': list(closes)}]}}
+
+        if events is not None:
+            result['events'] = events
+
+        return {'chart': {'result': [result], 'error': None}}
+
+    @staticmethod
+    def chart_error(code='Not Found', description='No data found, symbol may be delisted'):
+        return {'chart': {'result': None, 'error': {'code': code, 'description': description}}}
+
+
+class FakeSession(object):
+
+    def __init__(self, handler, delay=0.0):
+        """
+        Initializer method for the FakeSession class. A session standing in for a requests.Session that answers every
+        request with a handler instead of the network.
+        :param handler: A function taking the url and the parameters of a request and returning a FakeResponse.
+        :type handler: callable
+        :param delay: The number of seconds every request takes.
+        :type delay: float
+        """
+
+        self.__handler = handler
+        self.__delay = delay
+        self.__lock = threading.Lock()
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, params=None, timeout=None, stream=False, **kwargs):
+        with self.__lock:
+            self.requests.append((url, dict(params or {})))
+
+        if self.__delay:
+            time.sleep(self.__delay)
+
+        response = self.__handler(url, dict(params or {}))
+        response.url = response.url or url
+
+        return response
+
+    def close(self):
+        self.closed = True
@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.screen.FundamentalRatios import FundamentalRatios
+
+
+def quarter_ends(quarters):
+    return [int(pd.Timestamp(quarter).timestamp()) for quarter in quarters]
+
+
+def statements(quarters, revenues):
+    end_dates = quarter_ends(quarters)
+    income = pd.DataFrame({'end_date': end_dates, 'total_revenue': revenues, 'net_income': np.array(revenues) / 10})
+    balance = pd.DataFrame({'end_date': end_dates, 'total_assets': np.array(revenues) * 4,
+                            'total_stockholder_equity': np.array(revenues) * 2})
+    cash_flow = pd.DataFrame({'end_date': end_dates, 'total_cash_from_operating_activities': np.array(revenues) / 5,
+                              'capital_expenditures': -np.array(revenues) / 20})
+
+    return income, balance, cash_flow
+
+
+class TestFundamentalRatios(unittest.TestCase):
+
+    def setUp(self):
+        # AAA reports eight consecutive quarters. BBB did not report 2022-12-31, so four statements before its
+        # 2023-12-31 statement is 2022-09-30, fifteen months earlier.
+        self.aaa = statements(['2022-03-31', '2022-06-30', '2022-09-30', '2022-12-31',
+                               '2023-03-31', '2023-06-30', '2023-09-30', '2023-12-31'],
+                              [100.0, 100.0, 100.0, 100.0, 110.0, 110.0, 110.0, 110.0])
+        self.bbb = statements(['2021-12-31', '2022-03-31', '2022-06-30', '2022-09-30',
+                               '2023-03-31', '2023-06-30', '2023-09-30', '2023-12-31'],
+                              [50.0, 50.0, 50.0, 50.0, 60.0, 60.0, 60.0, 60.0])
+
+        self.ratios = FundamentalRatios(*[{'AAA': aaa, 'BBB': bbb} for aaa, bbb in zip(self.aaa, self.bbb)])
+
+    def test_statements_are_stacked(self):
+        self.assertEqual(self.ratios.statements.index.names, ['symbol', 'end_date'])
+        self.assertEqual(len(self.ratios.statements), 16)
+
+    def test_trailing_sums_skip_gaps(self):
+        trailing = self.ratios.trailing()['total_revenue']
+
+        self.assertEqual(trailing.loc[('AAA', pd.Timestamp('2023-12-31'))], 440.0)
+        self.assertEqual(trailing.loc[('BBB', pd.Timestamp('2022-09-30'))], 200.0)
+        self.assertEqual(trailing.loc[('BBB', pd.Timestamp('2023-12-31'))], 240.0)
+        self.assertTrue(np.isnan(trailing.loc[('BBB', pd.Timestamp('2023-03-31'))]))
+
+    def test_growth_skips_gaps(self):
+        ratios = self.ratios.ratios()
+
+        self.assertAlmostEqual(ratios.loc[('AAA', pd.Timestamp('2023-12-31')), 'revenue_growth'], 0.1)
+        self.assertAlmostEqual(ratios.loc[('AAA', pd.Timestamp('2023-12-31')), 'return_on_equity'], 44.0 / 210.0)
+
+        # BBB has trailing sums on both 2022-09-30 and 2023-12-31, but they are not a year apart.
+        self.assertTrue(np.isnan(ratios.loc[('BBB', pd.Timestamp('2023-12-31')), 'revenue_growth']))
+        self.assertTrue(np.isnan(ratios.loc[('BBB', pd.Timestamp('2023-12-31')), 'net_income_growth']))
+        self.assertTrue(np.isnan(ratios.loc[('BBB', pd.Timestamp('2023-12-31')), 'free_cash_flow_growth']))
+
+        # Without a year-ago statement, returns use the current balance.
+        self.assertAlmostEqual(ratios.loc[('BBB', pd.Timestamp('2023-12-31')), 'return_on_equity'], 24.0 / 120.0)
+
+    def test_annual_growth_skips_gaps(self):
+        income, balance, cash_flow = statements(['2020-12-31', '2021-12-31', '2023-12-31'], [100.0, 120.0, 150.0])
+        ratios = FundamentalRatios({'AAA': income}, {'AAA': balance}, {'AAA': cash_flow}, quarterly=False).ratios()
+
+        self.assertAlmostEqual(ratios.loc[('AAA', pd.Timestamp('2021-12-31')), 'revenue_growth'], 0.2)
+        self.assertTrue(np.isnan(ratios.loc[('AAA', pd.Timestamp('2023-12-31')), 'revenue_growth']))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
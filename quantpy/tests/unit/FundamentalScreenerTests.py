@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
+from quantpy.screen.FundamentalScreener import FundamentalScreener
+from quantpy.tests.unit.FakeSession import FakeResponse
+from quantpy.utils.utils import flatten
+
+
+def value(raw):
+    return {'raw': raw, 'fmt': str(raw)}
+
+
+# The return on equity and debt to equity of every symbol that exists.
+FUNDAMENTALS = {'AAA': (0.25, 50.0), 'BBB': (0.10, 20.0), 'CCC': (0.30, 150.0), 'DDD': (0.20, 80.0)}
+
+
+def summary_handler(url, params):
+    symbol = url.rsplit('/', 1)[-1]
+
+    if symbol not in FUNDAMENTALS:
+        return FakeResponse({'quoteSummary': {'result': None, 'error': {
+            'code': 'Not Found', 'description': 'Quote not found for ticker symbol: {}'.format(symbol)}}}, 404)
+
+    return_on_equity, debt_to_equity = FUNDAMENTALS[symbol]
+
+    return FakeResponse({'quoteSummary': {'result': [{
+        'financialData': {'returnOnEquity': value(return_on_equity), 'debtToEquity': value(debt_to_equity),
+                          'maxAge': 86400},
+        'defaultKeyStatistics': {'sharesOutstanding': value(1000), 'returnOnEquity': value(-1.0)}}], 'error': None}})
+
+
+class SummarySession(object):
+    # A session answering with the canned summaries, picklable so it can be sent to the read processes.
+
+    def get(self, url, params=None, timeout=None, stream=False, **kwargs):
+        response = summary_handler(url, params)
+        response.url = url
+
+        return response
+
+    def close(self):
+        pass
+
+
+class TestFundamentalScreener(unittest.TestCase):
+
+    def setUp(self):
+        self.screener = FundamentalScreener(['AAA', 'BBB', 'CCC', 'DDD', 'GONE'],
+                                            modules=('financial_data', 'default_key_statistics'), chunk_size=1)
+
+        with mock.patch('quantpy.data.base.BaseReader.requests.get', SummarySession().get):
+            self.failed = self.screener.refresh()
+
+    def test_refresh(self):
+        table = self.screener.table
+
+        self.assertEqual(self.failed, ['GONE'])
+        self.assertEqual(sorted(table.index), ['AAA', 'BBB', 'CCC', 'DDD'])
+        self.assertNotIn('max_age', table.columns)
+
+        # The financial data comes first, so its return on equity is kept over the key statistics'.
+        self.assertEqual(table.loc['AAA', 'return_on_equity'], 0.25)
+        self.assertEqual(table.loc['AAA', 'shares_outstanding'], 1000)
+
+    def test_stale_symbols(self):
+        self.assertEqual(self.screener.stale_symbols(), ['GONE'])
+        self.assertEqual(self.screener.stale_symbols(now=time.time() + 2 * 86400), ['AAA', 'BBB', 'CCC', 'DDD', 'GONE'])
+
+        self.screener.add_symbols('EEE AAA')
+        self.assertEqual(self.screener.stale_symbols(), ['GONE', 'EEE'])
+
+    def test_screen(self):
+        screened = self.screener.screen('return_on_equity > 0.15 and debt_to_equity < 100',
+                                        rank_by='return_on_equity', columns=['return_on_equity'])
+
+        self.assertEqual(list(screened.index), ['AAA', 'DDD'])
+
+        ranked = self.screener.screen('debt_to_equity_rank <= 0.5', percentile_ranks=['debt_to_equity'],
+                                      rank_by='debt_to_equity', ascending=True, top=1)
+
+        self.assertEqual(list(ranked.index), ['BBB'])
+        self.assertEqual(ranked.loc['BBB', 'debt_to_equity_rank'], 0.25)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'screener.pkl')
+            self.screener.save(path)
+
+            loaded = FundamentalScreener(['AAA'], modules=('financial_data',))
+            loaded.load(path)
+
+        self.assertTrue(loaded.table.equals(self.screener.table))
+        self.assertEqual(loaded.stale_symbols(), ['GONE'])
+
+    def test_unknown_module(self):
+        with self.assertRaises(ValueError):
+            FundamentalScreener(['AAA'], modules=('financial_data', 'asset_profile'))
+
+
+class TestMultiSymbolSummaryRead(unittest.TestCase):
+
+    def test_symbol_list_is_kept_flat(self):
+        self.assertEqual(YahooSummaryReader(['AAA', 'BBB'], include_financial_data=True)._symbols, ['AAA', 'BBB'])
+        self.assertEqual(YahooSummaryReader('AAA BBB', include_financial_data=True)._symbols, ['AAA', 'BBB'])
+
+    def test_multi_read_maps_symbols_to_responses(self):
+        reader = YahooSummaryReader(['AAA', 'BBB', 'GONE'], include_financial_data=True)
+
+        with mock.patch('quantpy.data.base.BaseReader.requests.Session', SummarySession):
+            responses = reader.read()
+
+        self.assertEqual(sorted(responses), ['AAA', 'BBB', 'GONE'])
+        self.assertEqual(responses['BBB'].financial_data.loc[0, 'return_on_equity'], 0.10)
+        self.assertEqual(responses['GONE'].status.code, YahooStatusCode.SYMBOL_NOT_FOUND)
+
+    def test_parse_tuples_are_unpacked(self):
+        response = YahooSummaryResponse('AAA')
+        status = YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND, module='financialData')
+
+        response.financial_data = (None, status)
+
+        self.assertIs(response._property_state('financial_data')[1], status)
+        self.assertEqual(status.symbol, 'AAA')
+
+    def test_flatten(self):
+        self.assertEqual(flatten({'a': {'b': 1, 'c': {'d': 2}}, 'e': 3}), {'a.b': 1, 'a.c.d': 2, 'e': 3})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
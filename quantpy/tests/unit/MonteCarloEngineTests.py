@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.simulation.BlockBootstrap import BlockBootstrap
+from quantpy.simulation.GeometricBrownianMotion import GeometricBrownianMotion
+from quantpy.simulation.MonteCarloEngine import MonteCarloEngine
+
+
+def staggered_prices():
+    # AAA and BBB share the first bars, BBB and CCC the middle bars and AAA and CCC the last bars. The pairwise
+    # correlations are about 1, 1 and -1, which no set of three assets can have.
+    rng = np.random.default_rng(0)
+    returns = pd.DataFrame(np.nan, index=range(300), columns=['AAA', 'BBB', 'CCC'])
+    first, middle, last = [rng.normal(0.0, 0.01, 100) for _ in range(3)]
+
+    returns.loc[0:99, 'AAA'], returns.loc[0:99, 'BBB'] = first, first + rng.normal(0.0, 0.001, 100)
+    returns.loc[100:199, 'BBB'], returns.loc[100:199, 'CCC'] = middle, middle + rng.normal(0.0, 0.001, 100)
+    returns.loc[200:299, 'AAA'], returns.loc[200:299, 'CCC'] = last, -last + rng.normal(0.0, 0.001, 100)
+
+    # Each symbol only has prices on the bars it has returns for.
+    return 100.0 * np.exp(returns.fillna(0.0).cumsum()).where(returns.notna())
+
+
+class TestMonteCarloEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.model = GeometricBrownianMotion([0.05, 0.10], [0.2, 0.3], correlation=[[1.0, 0.5], [0.5, 1.0]],
+                                             symbols=['AAA', 'BBB'])
+
+    def test_paths_must_be_positive(self):
+        engine = MonteCarloEngine(self.model, steps=10, workers=1, seed=1)
+
+        for paths in [0, -5]:
+            with self.assertRaises(ValueError):
+                engine.run(paths)
+
+    def test_same_result_for_any_number_of_workers(self):
+        reducers = {'terminal': MonteCarloEngine.terminal}
+        results = [MonteCarloEngine(self.model, steps=20, chunk_size=500, workers=workers, seed=7,
+                                    reducers=reducers).run(2000, initial_prices=[10.0, 20.0])
+                   for workers in [1, 3]]
+
+        pd.testing.assert_frame_equal(results[0].mean, results[1].mean)
+        pd.testing.assert_frame_equal(results[0].std, results[1].std)
+        pd.testing.assert_frame_equal(results[0].terminal_quantiles(), results[1].terminal_quantiles())
+        np.testing.assert_array_equal(results[0].reduced['terminal'], results[1].reduced['terminal'])
+        self.assertEqual(results[0].paths, 2000)
+
+    def test_moments(self):
+        steps, paths = 252, 20000
+        result = MonteCarloEngine(self.model, steps=steps, chunk_size=5000, workers=1, seed=3,
+                                  reducers={'terminal': MonteCarloEngine.terminal}).run(paths)
+        log_terminal = np.log(result.reduced['terminal'])
+
+        # After a year, the mean price is e to the drift and the log price has the annual volatility.
+        np.testing.assert_allclose(result.mean.iloc[-1], np.exp([0.05, 0.10]), rtol=0.01)
+        np.testing.assert_allclose(log_terminal.std(axis=0), [0.2, 0.3], rtol=0.03)
+        np.testing.assert_allclose(np.corrcoef(log_terminal.T)[0, 1], 0.5, atol=0.03)
+
+        # The mean and deviation merged over the chunks match the reduced terminal prices.
+        np.testing.assert_allclose(result.mean.iloc[-1], result.reduced['terminal'].mean(axis=0))
+        np.testing.assert_allclose(result.std.iloc[-1], result.reduced['terminal'].std(axis=0, ddof=1))
+
+    def test_model_of_staggered_histories(self):
+        prices = staggered_prices()
+
+        with self.assertRaises(np.linalg.LinAlgError):
+            np.linalg.cholesky(np.log(prices).diff().corr().to_numpy())
+
+        model = GeometricBrownianMotion.from_prices(prices)
+        log_returns = model.log_returns(np.random.default_rng(0), 20000, 1)[:, 0, :]
+
+        # The assets keep their volatility and the first pair its correlation.
+        np.testing.assert_allclose(log_returns.std(axis=0), model._volatility * np.sqrt(1.0 / 252), rtol=0.03)
+        self.assertGreater(np.corrcoef(log_returns.T)[0, 1], 0.5)
+
+    def test_block_bootstrap_resamples_history(self):
+        history = np.arange(10, dtype=np.float64).reshape(5, 2) / 100.0
+        model = BlockBootstrap(history, block_size=5)
+        log_returns = model.log_returns(np.random.default_rng(0), 4, 5)
+
+        # Every path is one block: the history rotated to a random start.
+        for path in log_returns:
+            start = int(round(path[0, 0] * 50))
+            np.testing.assert_array_equal(path, np.roll(history, -start, axis=0))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,145 @@
+import pickle
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.base.ParsedCache import ParsedCache
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.tests.unit.FakeSession import FakeSession
+from quantpy.tests.unit.YahooReadStatusTests import summary_handler
+
+
+class Clock(object):
+    # A monotonic clock moved by hand.
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParsedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.frame = pd.DataFrame({'close': np.zeros(100)})
+        self.size = ParsedCache.sizeof(self.frame)
+        self.clock = Clock()
+        self.patch = mock.patch('quantpy.data.base.ParsedCache.time.monotonic', self.clock)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def test_sizeof(self):
+        self.assertEqual(self.size, self.frame.memory_usage(index=True, deep=True).sum())
+        self.assertGreater(ParsedCache.sizeof({'a': self.frame, 'b': [self.frame]}), 2 * self.size)
+
+    def test_least_recently_used_are_evicted(self):
+        cache = ParsedCache(max_bytes=3 * self.size)
+
+        for symbol in ('AAA', 'BBB', 'CCC'):
+            self.assertTrue(cache.put((symbol, 'quote'), self.frame))
+
+        # Reading AAA makes BBB the least recently used, so it makes room for DDD.
+        cache.get(('AAA', 'quote'))
+        cache.put(('DDD', 'quote'), self.frame)
+
+        self.assertIsNone(cache.get(('BBB', 'quote')))
+        self.assertIs(cache.get(('AAA', 'quote')), self.frame)
+        self.assertEqual({key: cache.stats[key] for key in ('entries', 'bytes', 'evictions')},
+                         {'entries': 3, 'bytes': 3 * self.size, 'evictions': 1})
+
+        # An entry twice as large evicts the two least recently used.
+        cache.put(('EEE', 'quote'), pd.concat([self.frame, self.frame], ignore_index=True))
+
+        self.assertEqual([cache.get((symbol, 'quote')) is not None for symbol in ('CCC', 'DDD', 'AAA', 'EEE')],
+                         [False, False, True, True])
+        self.assertLessEqual(cache.stats['bytes'], 3 * self.size)
+
+    def test_replacing_an_entry_keeps_the_bytes(self):
+        cache = ParsedCache(max_bytes=2 * self.size)
+
+        cache.put(('AAA', 'quote'), self.frame)
+        cache.put(('AAA', 'quote'), self.frame.copy())
+
+        self.assertEqual((cache.stats['entries'], cache.stats['bytes'], cache.stats['evictions']), (1, self.size, 0))
+
+    def test_values_over_the_budget_are_rejected(self):
+        cache = ParsedCache(max_bytes=self.size)
+        cache.put(('AAA', 'quote'), self.frame)
+
+        self.assertFalse(cache.put(('BBB', 'quote'), pd.concat([self.frame, self.frame])))
+        self.assertIs(cache.get(('AAA', 'quote')), self.frame)
+        self.assertEqual(cache.stats['rejections'], 1)
+
+    def test_expiry(self):
+        cache = ParsedCache(ttl=60, module_ttls={'financial_data': 10})
+
+        cache.put(('AAA', 'quote'), self.frame)
+        cache.put(('AAA', 'financial_data'), self.frame, module='financial_data')
+
+        self.clock.now += 10
+        self.assertIsNone(cache.get(('AAA', 'financial_data')))
+        self.assertIs(cache.get(('AAA', 'quote')), self.frame)
+
+        self.clock.now += 50
+        self.assertIsNone(cache.get(('AAA', 'quote')))
+
+        stats = cache.stats
+        self.assertEqual((stats['expirations'], stats['hits'], stats['misses'], stats['bytes']), (2, 1, 2, 0))
+        self.assertAlmostEqual(stats['hit_rate'], 1 / 3)
+
+    def test_invalidate(self):
+        cache = ParsedCache()
+
+        for key in [('AAA', 'quote'), ('AAA', 'financial_data'), ('BBB', 'quote')]:
+            cache.put(key, self.frame)
+
+        cache.invalidate('AAA')
+        self.assertEqual((cache.stats['entries'], cache.stats['bytes']), (1, self.size))
+
+        cache.invalidate()
+        self.assertEqual((cache.stats['entries'], cache.stats['bytes']), (0, 0))
+
+    def test_pickle_keeps_the_settings_only(self):
+        cache = ParsedCache(max_bytes=5 * self.size, ttl=30, module_ttls={'1m': 5})
+        cache.put(('AAA', '1m'), self.frame)
+
+        copy = pickle.loads(pickle.dumps(cache))
+
+        self.assertEqual((copy.stats['entries'], copy.stats['max_bytes']), (0, 5 * self.size))
+        self.assertEqual((copy.ttl(), copy.ttl('1m')), (30, 5))
+
+
+class TestReaderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ParsedCache()
+        self.session = FakeSession(summary_handler)
+        self.reader = YahooSummaryReader('AAPL', include_financial_data=True, cache=self.cache)
+
+    def test_cached_modules_are_not_requested(self):
+        first = self.reader.single_read('AAPL', self.session)
+        second = self.reader.single_read('AAPL', self.session)
+
+        self.assertEqual(len(self.session.requests), 1)
+        self.assertIs(second.financial_data, first.financial_data)
+
+        # A reader asking for a module that is not cached requests the symbol again.
+        YahooSummaryReader('AAPL', include_financial_data=True, include_earnings=True,
+                           cache=self.cache).single_read('AAPL', self.session)
+        self.assertEqual(len(self.session.requests), 2)
+
+    def test_failed_reads_are_not_cached(self):
+        self.reader.single_read('GONE', self.session)
+        self.reader.single_read('GONE', self.session)
+
+        self.assertEqual(len(self.session.requests), 2)
+        self.assertEqual(self.cache.stats['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,87 @@
+import unittest
+
+import pandas as pd
+
+from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
+from quantpy.store.PointInTimeStore import PointInTimeStore
+
+
+def response(symbol, current_price, target_price=None):
+    summary = YahooSummaryResponse(symbol)
+    financial_data = {'current_price': [current_price]}
+
+    if target_price is not None:
+        financial_data['target_mean_price'] = [target_price]
+
+    summary.financial_data = pd.DataFrame(financial_data)
+    summary.recommendation_trend = pd.DataFrame({'period': ['0m', '-1m'], 'strong_buy': [5, 4]})
+
+    return summary
+
+
+class TestPointInTimeStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = PointInTimeStore(':memory:')
+
+        self.store.append({'AAPL': response('AAPL', 100.0, 120.0), 'MSFT': response('MSFT', 300.0, 350.0)},
+                          observed_at='2024-01-02')
+        self.written = self.store.append({'AAPL': response('AAPL', 101.0, 120.0), 'MSFT': response('MSFT', 300.0)},
+                                         observed_at='2024-01-03')
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_only_changes_are_written(self):
+        # AAPL's price changed and MSFT's target price disappeared. Everything else is a duplicate.
+        self.assertEqual(self.written, 2)
+
+    def test_as_of_does_not_see_later_fetches(self):
+        table = self.store.as_of('2024-01-02 12:00', fields=['financial_data.current_price',
+                                                             'financial_data.target_mean_price'])
+
+        self.assertEqual(table.loc['AAPL', 'financial_data.current_price'], 100.0)
+        self.assertEqual(table.loc['MSFT', 'financial_data.target_mean_price'], 350.0)
+
+    def test_as_of_latest(self):
+        table = self.store.as_of('2024-01-04', symbols=['AAPL', 'MSFT', 'GOOG'],
+                                 fields=['financial_data', 'recommendation_trend.0m.strong_buy'])
+
+        self.assertEqual(table.loc['AAPL', 'financial_data.current_price'], 101.0)
+        self.assertTrue(pd.isna(table.loc['MSFT', 'financial_data.target_mean_price']))
+        self.assertEqual(table.loc['MSFT', 'recommendation_trend.0m.strong_buy'], 5)
+        self.assertTrue(table.loc['GOOG'].isna().all())
+
+    def test_fetches_out_of_order_are_rejected(self):
+        store = PointInTimeStore(':memory:')
+        store.append_frames('financial_data', {'AAPL': pd.DataFrame({'q': [5]})}, observed_at='2024-01-01')
+        store.append_frames('financial_data', {'AAPL': pd.DataFrame({'q': [5]})}, observed_at='2024-01-03')
+
+        # A back-filled fetch without q would close it before the later fetch that still holds it.
+        with self.assertRaisesRegex(ValueError, 'AAPL'):
+            store.append_frames('financial_data', {'AAPL': pd.DataFrame({'r': [1]})}, observed_at='2024-01-02')
+
+        self.assertEqual(store.as_of('2024-01-04', fields=['financial_data.q']).loc['AAPL', 'financial_data.q'], 5)
+        self.assertEqual(len(store.fetch_times('financial_data', 'AAPL')), 2)
+
+        # Appending the same fetch again, or a fetch of a symbol or module with no later fetch, is allowed.
+        store.append_frames('financial_data', {'AAPL': pd.DataFrame({'q': [5]})}, observed_at='2024-01-03')
+        store.append_frames('financial_data', {'MSFT': pd.DataFrame({'q': [7]})}, observed_at='2024-01-02')
+        store.close()
+
+    def test_append_out_of_order_writes_nothing(self):
+        with self.assertRaises(ValueError):
+            self.store.append({'AAPL': response('AAPL', 99.0), 'GOOG': response('GOOG', 140.0)},
+                              observed_at='2024-01-02 12:00')
+
+        self.assertEqual(self.store.fetch_times('financial_data', 'GOOG').size, 0)
+        self.assertEqual(self.store.fetch_times('recommendation_trend', 'AAPL').size, 2)
+
+    def test_history(self):
+        history = self.store.history('AAPL', 'financial_data.current_price')
+
+        self.assertEqual(list(history), [100.0, 101.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.portfolio.LedoitWolfEstimator import LedoitWolfEstimator
+from quantpy.portfolio.PortfolioOptimizer import PortfolioOptimizer
+
+
+def ledoit_wolf(rows):
+    # Direct implementation of the Ledoit-Wolf (2004) estimator to compare against.
+    n, p = rows.shape
+    centered = rows - rows.mean(axis=0)
+    sample = centered.T @ centered / n
+    mu = np.trace(sample) / p
+    delta = np.sum((sample - mu * np.eye(p)) ** 2) / p
+    beta = sum(np.sum((np.outer(x, x) - sample) ** 2) for x in centered) / n ** 2 / p
+    shrinkage = min(beta, delta) / delta
+
+    return (1 - shrinkage) * sample + shrinkage * mu * np.eye(p), shrinkage
+
+
+class TestLedoitWolfEstimator(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = np.random.default_rng(0).normal(0.001, 0.02, (200, 8))
+
+    def test_matches_direct_estimate(self):
+        estimator = LedoitWolfEstimator(8)
+        estimator.add(self.rows)
+
+        covariance, shrinkage = estimator.covariance()
+        expected_covariance, expected_shrinkage = ledoit_wolf(self.rows)
+
+        np.testing.assert_allclose(covariance, expected_covariance, rtol=1e-8)
+        self.assertAlmostEqual(shrinkage, expected_shrinkage)
+
+    def test_rolling_update_matches_direct_estimate(self):
+        estimator = LedoitWolfEstimator(8)
+        estimator.add(self.rows[:100])
+        estimator.add(self.rows[100:150])
+        estimator.remove(self.rows[:50])
+
+        covariance, _ = estimator.covariance()
+
+        np.testing.assert_allclose(covariance, ledoit_wolf(self.rows[50:150])[0], rtol=1e-8)
+
+
+class TestPortfolioOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        index = pd.date_range('2020-01-01', periods=300, freq='B')
+        self.returns = pd.DataFrame(rng.normal(0.0005, 0.01, (300, 5)) * np.arange(1, 6), index=index,
+                                    columns=list('ABCDE'))
+        self.dates = index[[99, 149, 199, 249, 299]]
+        self.optimizer = PortfolioOptimizer(self.returns, window=100, batch_size=2)
+
+    def test_minimum_variance_is_fully_invested(self):
+        weights = self.optimizer.minimum_variance(self.dates)
+
+        self.assertEqual(weights.shape, (5, 5))
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        self.assertTrue((weights['A'] > weights['E']).all())
+
+    def test_mean_variance_tends_to_minimum_variance(self):
+        minimum_variance = self.optimizer.minimum_variance(self.dates)
+        mean_variance = self.optimizer.mean_variance(self.dates, risk_aversion=1e12)
+
+        np.testing.assert_allclose(mean_variance, minimum_variance, atol=1e-8)
+
+    def test_risk_parity_has_equal_risk_contributions(self):
+        weights = self.optimizer.risk_parity(self.dates)
+        _, covariance, _, _ = list(self.optimizer.covariances(self.dates))[-1]
+        last = weights.iloc[-1].to_numpy()
+        contributions = last * (covariance @ last)
+
+        np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
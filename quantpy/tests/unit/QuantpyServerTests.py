@@ -0,0 +1,184 @@
+import asyncio
+import gzip
+import json
+import time
+import unittest
+from unittest import mock
+
+from quantpy.server.AsyncRateLimiter import AsyncRateLimiter
+from quantpy.server.QuantpyServer import QuantpyServer
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+from quantpy.tests.unit.YahooReadStatusTests import summary_handler
+
+
+def chart_handler(url, params):
+    timestamps = [1577975400 + 86400 * day for day in range(200)]
+
+    return FakeResponse(FakeResponse.chart(url.rsplit('/', 1)[-1], timestamps, [100.0 + day for day in range(200)]))
+
+
+def handler(url, params):
+    return chart_handler(url, params) if '/chart/' in url else summary_handler(url, params)
+
+
+async def read_response(stream_reader, method='GET'):
+    # The status line, the headers and a body of Content-Length bytes, which HEAD responses leave out.
+    status = int((await stream_reader.readline()).split()[1])
+    headers = {}
+
+    while True:
+        line = (await stream_reader.readline()).decode('latin-1')
+
+        if line in ('\r\n', ''):
+            break
+
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    has_body = method != 'HEAD' and status != 304
+    body = await stream_reader.readexactly(int(headers.get('content-length', 0))) if has_body else b''
+
+    return status, headers, body
+
+
+class TestQuantpyServer(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession(handler, delay=0.05)
+        self.server = QuantpyServer(port=0, rate_limit=None)
+        self.patch = mock.patch('quantpy.data.base.BaseReader.requests.get', self.session.get)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    def serve(self, client):
+        # Run a client coroutine against the server on a fresh event loop.
+        async def run():
+            server = await self.server.start()
+            port = server.sockets[0].getsockname()[1]
+
+            try:
+                return await client(port)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        return asyncio.run(run())
+
+    def get(self, *targets, headers=None, method='GET'):
+        async def client(port):
+            stream_reader, stream_writer = await asyncio.open_connection('127.0.0.1', port)
+            responses = []
+
+            # Every request is sent on the same keep alive connection.
+            for target in targets:
+                head = '{} {} HTTP/1.1\r\nHost: localhost\r\n'.format(method, target)
+                head += ''.join('{}: {}\r\n'.format(name, value) for name, value in (headers or {}).items())
+                stream_writer.write((head + '\r\n').encode('latin-1'))
+                await stream_writer.drain()
+                responses.append(await read_response(stream_reader, method))
+
+            stream_writer.close()
+
+            return responses
+
+        return self.serve(client)
+
+    def test_health(self):
+        [(status, _, body)] = self.get('/health')
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(body), {'status': 'ok', 'cache_entries': 0})
+
+    def test_summary_batch(self):
+        [(status, headers, body)] = self.get('/summary/AAPL,GONE?modules=financial_data')
+        payload = json.loads(body)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/json')
+        self.assertEqual(payload['AAPL']['financial_data'][0]['current_price'], 150.0)
+        self.assertIn('SYMBOL_NOT_FOUND', payload['GONE']['error'])
+
+    def test_reads_are_cached(self):
+        first, second = self.get('/quote/AAPL?period=1y', '/quote/AAPL?period=1y')
+
+        self.assertEqual(first[2], second[2])
+        self.assertEqual(len(self.session.requests), 1)
+        self.assertEqual(self.server.cache_size, 1)
+
+    def test_retryable_errors_are_not_cached(self):
+        self.get('/summary/BUSY?modules=financial_data', '/summary/BUSY?modules=financial_data')
+
+        self.assertEqual(len(self.session.requests), 2)
+        self.assertEqual(self.server.cache_size, 0)
+
+    def test_concurrent_reads_are_collapsed(self):
+        async def client(port):
+            async def one_request():
+                stream_reader, stream_writer = await asyncio.open_connection('127.0.0.1', port)
+                stream_writer.write(b'GET /quote/AAPL HTTP/1.1\r\nConnection: close\r\n\r\n')
+                response = await read_response(stream_reader)
+                stream_writer.close()
+
+                return response
+
+            return await asyncio.gather(*(one_request() for _ in range(5)))
+
+        responses = self.serve(client)
+
+        self.assertEqual([status for status, _, _ in responses], [200] * 5)
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_conditional_and_compressed_responses(self):
+        [(status, headers, body)] = self.get('/quote/AAPL', headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual(headers['content-encoding'], 'gzip')
+        self.assertIn('AAPL', json.loads(gzip.decompress(body)))
+
+        [(status, _, body)] = self.get('/quote/AAPL', headers={'If-None-Match': headers['etag']})
+
+        self.assertEqual((status, body), (304, b''))
+
+    def test_head_has_no_body(self):
+        [(status, headers, body)] = self.get('/quote/AAPL', '/quote/AAPL', method='HEAD')[1:]
+
+        self.assertEqual((status, body), (200, b''))
+        self.assertGreater(int(headers['content-length']), 0)
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_bad_requests(self):
+        responses = self.get('/summary/AAPL', '/summary/AAPL?modules=nope', '/quote', '/other/AAPL')
+
+        self.assertEqual([status for status, _, _ in responses], [400, 400, 400, 404])
+        self.assertIn('Unknown modules nope', json.loads(responses[1][2])['error'])
+
+        [(status, headers, _)] = self.get('/health', method='POST')
+        self.assertEqual((status, headers['allow']), (405, 'GET, HEAD'))
+
+    def test_too_many_symbols(self):
+        symbols = ','.join('S{}'.format(index) for index in range(QuantpyServer.MAX_SYMBOLS + 1))
+        [(status, _, _)] = self.get('/quote/' + symbols)
+
+        self.assertEqual(status, 400)
+        self.assertEqual(self.session.requests, [])
+
+
+class TestAsyncRateLimiter(unittest.TestCase):
+
+    def test_rate(self):
+        async def acquire(limiter, count):
+            start = time.monotonic()
+
+            for _ in range(count):
+                await limiter.acquire()
+
+            return time.monotonic() - start
+
+        # The first token is free, then one every 1 / rate seconds.
+        self.assertGreaterEqual(asyncio.run(acquire(AsyncRateLimiter(50.0), 6)), 0.09)
+        self.assertLess(asyncio.run(acquire(AsyncRateLimiter(None), 100)), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
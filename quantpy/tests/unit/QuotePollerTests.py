@@ -0,0 +1,113 @@
+import json
+import socket
+import time
+import unittest
+
+import pandas as pd
+
+from quantpy.data.stream.QuoteDelta import QuoteDelta
+from quantpy.data.stream.QuoteDeltaPublisher import QuoteDeltaPublisher
+from quantpy.data.stream.QuotePoller import QuotePoller
+from quantpy.data.yahoo.YahooReadStatus import YahooStatusCode
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+
+
+class TestQuotePoller(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1700000000
+        self.bars = {self.now - 180: 1.0, self.now - 120: 2.0, self.now - 60: 3.0}
+        self.session = FakeSession(self.chart_handler)
+        self.poller = QuotePoller(['AAA'], interval='1m', revision_bars=2, session=self.session)
+
+    def chart_handler(self, url, params):
+        if not self.bars:
+            return FakeResponse(FakeResponse.chart_error(), 404)
+
+        times = sorted(self.bars)
+
+        return FakeResponse(FakeResponse.chart('AAA', times, [self.bars[bar_time] for bar_time in times]))
+
+    def test_new_and_revised_bars(self):
+        first = self.poller.poll('AAA', now=self.now)
+
+        self.assertEqual(len(first.new_bars), 3)
+        self.assertTrue(first.revised_bars.empty)
+        self.assertEqual(self.poller.last_bar_time('AAA'), self.now - 60)
+
+        # The forming bar of the last poll changed and a new bar started.
+        self.bars[self.now - 60] = 3.5
+        self.bars[self.now] = 4.0
+        second = self.poller.poll('AAA', now=self.now + 60)
+
+        self.assertEqual(second.new_bars['close'].tolist(), [4.0])
+        self.assertEqual(second.revised_bars['close'].tolist(), [3.5])
+
+        # Nothing changed since the last poll.
+        self.assertTrue(self.poller.poll('AAA', now=self.now + 60).empty)
+
+    def test_failing_subscriber_does_not_stop_delivery(self):
+        received = []
+
+        def failing(delta):
+            raise RuntimeError('subscriber failed')
+
+        self.poller.subscribe(failing)
+        self.poller.subscribe(received.append)
+
+        delta = self.poller.poll('AAA', now=self.now)
+
+        self.assertEqual(received, [delta])
+        self.assertIsInstance(self.poller.subscriber_errors[failing], RuntimeError)
+
+        self.poller.unsubscribe(failing)
+        self.assertEqual(self.poller.subscriber_errors, {})
+
+    def test_failed_poll_records_status(self):
+        self.bars = {}
+
+        self.assertIsNone(self.poller.poll('AAA', now=self.now))
+        self.assertEqual(self.poller.errors['AAA'].http_status, 404)
+
+    def test_unparsed_quote_records_its_status(self):
+        # The read succeeds, but the chart has no indicators to build the quote from.
+        session = FakeSession(lambda url, params: FakeResponse({'chart': {'result': [{'meta': {'symbol': 'AAA'}}],
+                                                                          'error': None}}))
+        poller = QuotePoller(['AAA'], interval='1m', session=session)
+
+        self.assertIsNone(poller.poll('AAA', now=self.now))
+        self.assertEqual(poller.errors['AAA'].code, YahooStatusCode.INDICATOR_NOT_FOUND)
+        self.assertEqual(poller.errors['AAA'].symbol, 'AAA')
+
+
+class TestQuoteDelta(unittest.TestCase):
+
+    def test_to_json(self):
+        new_bars = pd.DataFrame({'date': [1700000000], 'close': [1.5], 'volume': [None]})
+        delta = QuoteDelta('AAA', 1700000060, new_bars, new_bars.iloc[:0])
+
+        self.assertEqual(json.loads(delta.to_json()), {'symbol': 'AAA', 'polled_at': 1700000060, 'revised': [],
+                                                       'new': [{'date': 1700000000, 'close': 1.5, 'volume': None}]})
+        self.assertFalse(delta.empty)
+
+    def test_publisher_sends_lines(self):
+        publisher = QuoteDeltaPublisher()
+        client = socket.create_connection(publisher.address)
+
+        try:
+            # Wait for the publisher to accept the client.
+            deadline = time.monotonic() + 5.0
+            while publisher.subscriber_count == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            publisher(QuoteDelta('AAA', 1, pd.DataFrame({'close': [1.0]}), pd.DataFrame({'close': []})))
+            line = client.makefile().readline()
+
+            self.assertEqual(json.loads(line)['new'], [{'close': 1.0}])
+        finally:
+            client.close()
+            publisher.close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
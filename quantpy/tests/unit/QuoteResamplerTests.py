@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.transform.QuoteResampler import QuoteResampler
+
+
+class TestIntradayResample(unittest.TestCase):
+
+    def setUp(self):
+        # One regular session of 1m bars on 2020-01-02 (09:30 EST is 14:30 UTC).
+        session_open = int(pd.Timestamp('2020-01-02 14:30', tz='UTC').timestamp())
+        self.dates = session_open + 60 * np.arange(390)
+        self.quotes = pd.DataFrame({'open': np.arange(390, dtype=float),
+                                    'high': np.arange(390, dtype=float) + 1,
+                                    'low': np.arange(390, dtype=float) - 1,
+                                    'close': np.arange(390, dtype=float) + 0.5,
+                                    'volume': np.ones(390),
+                                    'date': self.dates})
+
+    def test_hourly_bars_anchor_to_session_open(self):
+        hourly = QuoteResampler('1h').resample(self.quotes)
+
+        self.assertEqual(len(hourly), 7)
+        self.assertEqual(hourly['date'].iloc[0], self.dates[0])
+        self.assertEqual(hourly['date'].iloc[1], self.dates[60])
+        self.assertEqual(hourly['open'].iloc[0], 0)
+        self.assertEqual(hourly['high'].iloc[0], 60)
+        self.assertEqual(hourly['low'].iloc[0], -1)
+        self.assertEqual(hourly['close'].iloc[0], 59.5)
+        self.assertEqual(hourly['volume'].iloc[0], 60)
+        self.assertEqual(hourly['volume'].iloc[-1], 30)
+
+    def test_null_bars_are_ignored(self):
+        self.quotes.loc[0, ['open', 'high', 'low', 'close']] = np.nan
+        five_minute = QuoteResampler('5m').resample(self.quotes)
+
+        self.assertEqual(len(five_minute), 78)
+        self.assertEqual(five_minute['open'].iloc[0], 1)
+        self.assertEqual(five_minute['date'].iloc[0], self.dates[0])
+
+    def test_pre_post_bars_are_dropped(self):
+        pre_market = self.quotes.iloc[:1].copy()
+        pre_market['date'] = self.dates[0] - 3600
+        quotes = pd.concat([pre_market, self.quotes], ignore_index=True)
+
+        self.assertEqual(len(QuoteResampler('1d').resample(quotes)), 1)
+        self.assertEqual(len(QuoteResampler('1h', include_pre_post=True).resample(quotes)), 8)
+
+    def test_interval_must_be_coarser(self):
+        with self.assertRaises(ValueError):
+            QuoteResampler('1m', source_interval='5m')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
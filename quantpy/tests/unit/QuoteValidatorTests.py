@@ -0,0 +1,115 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.calendars.TradingCalendar import TradingCalendar
+from quantpy.data.transform.QuotePanel import QuotePanel
+from quantpy.data.transform.QuoteValidator import QuoteValidator
+
+
+def unix(local_time):
+    return int(pd.Timestamp(local_time, tz='America/New_York').timestamp())
+
+
+def quote(dates, close, volume=None):
+    close = np.asarray(close, dtype=float)
+
+    return pd.DataFrame({'date': dates, 'open': close, 'high': close + 1.0, 'low': close - 1.0, 'close': close,
+                         'volume': np.full(len(close), 1000.0) if volume is None else volume})
+
+
+class TestQuoteValidator(unittest.TestCase):
+
+    def setUp(self):
+        # Eleven daily bars of June 2024, with the sixth session missing from every symbol.
+        sessions = TradingCalendar.nyse().bar_times(unix('2024-06-03 00:00'), unix('2024-06-30 00:00'), '1d')
+        self.dropped = sessions[5]
+        self.dates = np.delete(sessions[:12], 5)
+
+        # AAA has a null open, a high below its low and a 2 for 1 split on the seventh bar.
+        aaa = quote(self.dates, [10.0, 10.5, 11.0, 11.5, 12.0, 12.5, 6.3, 6.4, 6.5, 6.6, 6.7])
+        aaa.loc[2, 'open'] = np.nan
+        aaa.loc[4, 'high'] = 10.0
+
+        # BBB repeats its first close five times, trades nothing for five bars and jumps with no split.
+        bbb = quote(self.dates, [20.0, 20.0, 20.0, 20.0, 20.0, 21.0, 22.0, 23.0, 24.0, 50.0, 25.0],
+                    volume=[1000.0] * 5 + [0.0] * 5 + [1000.0])
+
+        # CCC is listed on the fourth bar, so the bars before are not null bars.
+        ccc = quote(self.dates, [np.nan] * 3 + [30.0 + bar for bar in range(8)])
+
+        self.panel = QuotePanel.from_quotes({'AAA': aaa, 'BBB': bbb, 'CCC': ccc})
+        self.splits = {'AAA': pd.DataFrame({'date': [self.dates[6]], 'numerator': [2.0], 'denominator': [1.0]})}
+        self.validator = QuoteValidator()
+
+    def issues(self, issues):
+        # The bars of the symbols are given by their row in the panel, the bars missing from the panel by their time.
+        rows = []
+
+        for symbol, check, start, bars in issues[['symbol', 'check', 'start', 'bars']].itertuples(index=False):
+            symbol = None if pd.isna(symbol) else symbol
+            rows.append((symbol, check, start if symbol is None else self.panel.index.get_loc(start), bars))
+
+        return rows
+
+    def test_validate(self):
+        issues = self.validator.validate(self.panel, self.splits)
+
+        self.assertEqual(self.issues(issues), [
+            ('AAA', 'null_ohlc', 2, 1), ('AAA', 'high_low', 4, 1),
+            ('BBB', 'stale_close', 0, 5), ('BBB', 'zero_volume', 5, 5), ('BBB', 'jump', 9, 2),
+            (None, 'gap', pd.Timestamp(self.dropped, unit='s', tz='UTC'), 1)])
+
+        # A jump reports the close to close ratio of its first bar.
+        self.assertAlmostEqual(issues.loc[issues['check'] == 'jump', 'value'].iloc[0], 50.0 / 24.0, places=5)
+        self.assertEqual(list(issues['check'].cat.categories), list(QuoteValidator.CHECKS))
+
+    def test_unexplained_split_is_a_jump(self):
+        issues = self.validator.validate(self.panel)
+        jumps = issues[(issues['check'] == 'jump') & (issues['symbol'] == 'AAA')]
+
+        self.assertEqual(self.issues(jumps), [('AAA', 'jump', 6, 1)])
+
+    def test_thresholds_and_checks(self):
+        validator = QuoteValidator(zero_volume_bars=6, stale_bars=6, checks=['zero_volume', 'stale_close'])
+
+        self.assertTrue(validator.validate(self.panel).empty)
+        self.assertEqual(list(QuoteValidator(checks=['gap']).validate(self.panel)['check']), ['gap'])
+
+        with self.assertRaises(ValueError):
+            QuoteValidator(checks=['null_ohlc', 'spikes'])
+
+    def test_repair_drop(self):
+        repaired = self.validator.repair(self.panel, splits=self.splits)
+
+        self.assertEqual(np.flatnonzero(repaired['close']['AAA'].isna()).tolist(), [2, 4])
+        self.assertEqual(np.flatnonzero(repaired['volume']['BBB'].isna()).tolist(), [9, 10])
+        self.assertEqual(np.flatnonzero(repaired['close']['CCC'].isna()).tolist(), [0, 1, 2])
+
+    def test_repair_ffill(self):
+        repaired = self.validator.repair(self.panel, method='ffill', splits=self.splits)
+
+        self.assertEqual(repaired['close']['AAA'].iloc[[2, 4]].tolist(), [10.5, 11.5])
+        self.assertEqual(repaired['volume']['AAA'].iloc[[2, 4]].tolist(), [0.0, 0.0])
+        self.assertEqual(repaired['close']['BBB'].iloc[9:].tolist(), [24.0, 24.0])
+
+        # The bars before a listing are not repaired.
+        self.assertEqual(repaired['close']['CCC'].isna().sum(), 3)
+
+    def test_repair_flag(self):
+        repaired = self.validator.repair(self.panel, method='flag', checks=QuoteValidator.CHECKS)
+        flags = repaired['flags']
+
+        self.assertEqual(flags['AAA'].iloc[2], 1 << QuoteValidator.CHECKS.index('null_ohlc'))
+        self.assertEqual(flags['AAA'].iloc[6], 1 << QuoteValidator.CHECKS.index('jump'))
+        self.assertEqual(flags['BBB'].iloc[4], 1 << QuoteValidator.CHECKS.index('stale_close'))
+        self.assertEqual(flags['CCC'].sum(), 0)
+        pd.testing.assert_frame_equal(repaired['close'], self.panel['close'])
+
+        with self.assertRaises(ValueError):
+            self.validator.repair(self.panel, method='interpolate')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
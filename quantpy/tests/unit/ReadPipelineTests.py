@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+
+import requests
+
+from quantpy.data.base.ReaderHook import ReaderHook
+from quantpy.data.base.ReadPipeline import ReadPipeline
+from quantpy.data.yahoo.YahooReadStatus import YahooStatusCode
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.tests.unit.FakeSession import FakeSession
+from quantpy.tests.unit.ReaderHookTests import RecordingHook
+from quantpy.tests.unit.YahooReadStatusTests import summary_handler
+
+
+def failing_handler(url, params):
+    if url.endswith('/FAIL'):
+        raise requests.ConnectionError('Connection refused')
+
+    return summary_handler(url, params)
+
+
+class OrderedSink(object):
+    # A sink recording its calls, failing if two of them overlap.
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.written = []
+        self.threads = set()
+        self.__active = 0
+
+    def __call__(self, symbol, response):
+        self.__active += 1
+        active = self.__active
+        time.sleep(self.seconds)
+        self.__active -= 1
+
+        if active > 1:
+            raise AssertionError('The sink was called concurrently.')
+
+        self.threads.add(threading.get_ident())
+        self.written.append((symbol, response))
+
+
+class TestReadPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = YahooSummaryReader('AAPL', include_financial_data=True)
+        self.session = FakeSession(failing_handler, delay=0.01)
+        self.symbols = ['S{}'.format(index) for index in range(12)]
+
+    def test_results_without_sink(self):
+        responses = ReadPipeline(self.reader, workers=2, session=self.session).run(self.symbols + ['GONE'])
+
+        self.assertEqual(sorted(responses), sorted(self.symbols + ['GONE']))
+        self.assertEqual(responses['S3'].financial_data.loc[0, 'current_price'], 150.0)
+        self.assertEqual(responses['GONE'].status.code, YahooStatusCode.SYMBOL_NOT_FOUND)
+
+    def test_sink_follows_the_symbols_with_one_connection(self):
+        sink = OrderedSink()
+        written = ReadPipeline(self.reader, sink, max_connections=1, workers=1, session=self.session).run(
+            iter(self.symbols))
+
+        self.assertEqual(written, len(self.symbols))
+        self.assertEqual([symbol for symbol, _ in sink.written], self.symbols)
+
+    def test_sink_is_called_one_at_a_time(self):
+        sink = OrderedSink(seconds=0.005)
+        pipeline = ReadPipeline(self.reader, sink, max_connections=8, workers=2, queue_size=2, session=self.session)
+
+        self.assertEqual(pipeline.run(self.symbols), len(self.symbols))
+        self.assertEqual(sorted(symbol for symbol, _ in sink.written), sorted(self.symbols))
+        self.assertEqual(len(sink.threads), 1)
+
+        # The bounded queues never hold more than their capacity.
+        stats = pipeline.stats
+        self.assertEqual((stats['fetched'], stats['parsed'], stats['written']), (12, 12, 12))
+        self.assertLessEqual(max(stats['max_fetched_queue'], stats['max_parsed_queue']), 2)
+
+    def test_failed_reads_reach_the_sink(self):
+        hook = RecordingHook()
+        ReaderHook.register(hook)
+
+        try:
+            responses = ReadPipeline(self.reader, workers=1, session=self.session).run(['AAPL', 'FAIL', 'GONE', 'BUSY'])
+        finally:
+            ReaderHook.unregister(hook)
+
+        self.assertTrue(responses['AAPL'].status is None or responses['AAPL'].status.ok)
+        self.assertFalse(responses['FAIL'].status.ok)
+        self.assertEqual(responses['GONE'].status.code, YahooStatusCode.SYMBOL_NOT_FOUND)
+        self.assertTrue(responses['BUSY'].status.retryable)
+
+        # The records of the reads are emitted in this process.
+        errors = {record.symbol: (record.status_code, record.error) for record in hook.records}
+        self.assertEqual(errors['AAPL'], (200, None))
+        self.assertEqual(errors['GONE'], (404, 'SYMBOL_NOT_FOUND'))
+        self.assertIsNone(errors['FAIL'][0])
+
+    def test_sink_error_stops_the_pipeline(self):
+        def sink(symbol, response):
+            if symbol == 'S2':
+                raise IOError('Disk full')
+
+        pipeline = ReadPipeline(self.reader, sink, max_connections=1, workers=1, queue_size=1, session=self.session)
+
+        with self.assertRaisesRegex(IOError, 'Disk full'):
+            pipeline.run(self.symbols)
+
+        # The fetchers stop with the sink instead of reading the rest of the symbols.
+        self.assertLess(len(self.session.requests), len(self.symbols))
+        self.assertEqual(pipeline.stats['written'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+
+from quantpy.data.base.CachedSession import CachedSession
+from quantpy.data.base.ReaderHook import ReaderHook, ReadRecord
+from quantpy.data.base.ReaderMetrics import ReaderMetrics
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.tests.unit.FakeSession import FakeSession
+from quantpy.tests.unit.YahooReadStatusTests import summary_handler
+
+
+class RecordingHook(ReaderHook):
+
+    def __init__(self):
+        self.records = []
+        self.cache_hits = []
+
+    def on_read(self, record):
+        self.records.append(record)
+
+    def on_cache_hit(self, endpoint, symbol):
+        self.cache_hits.append((endpoint, symbol))
+
+
+class TestReaderHook(unittest.TestCase):
+
+    def setUp(self):
+        self.hook = RecordingHook()
+        self.reader = YahooSummaryReader('AAPL', include_financial_data=True)
+        self.session = FakeSession(summary_handler)
+
+    def tearDown(self):
+        ReaderHook.unregister(self.hook)
+
+    def test_no_records_without_hooks(self):
+        self.assertFalse(ReaderHook.enabled())
+
+        self.reader.single_read('AAPL', self.session)
+
+        self.assertEqual(self.hook.records, [])
+
+    def test_register_once(self):
+        ReaderHook.register(self.hook)
+        ReaderHook.register(self.hook)
+
+        self.reader.single_read('AAPL', self.session)
+
+        self.assertEqual(len(self.hook.records), 1)
+
+        ReaderHook.unregister(self.hook)
+        self.assertFalse(ReaderHook.enabled())
+
+    def test_read_records(self):
+        ReaderHook.register(self.hook)
+
+        self.reader.single_read('AAPL', self.session)
+        self.reader.single_read('GONE', self.session)
+
+        ok, gone = self.hook.records
+
+        self.assertEqual((ok.endpoint, ok.symbol, ok.status_code, ok.error), ('quoteSummary', 'AAPL', 200, None))
+        self.assertEqual(set(ok.phases), {'request', 'download', 'decode', 'parse'})
+        self.assertEqual(ok.response_bytes, len(self.session.get('/AAPL').content))
+        self.assertAlmostEqual(ok.total_seconds, sum(ok.phases.values()))
+        self.assertEqual((gone.status_code, gone.error), (404, 'SYMBOL_NOT_FOUND'))
+
+    def test_cached_session_reports_hits(self):
+        ReaderHook.register(self.hook)
+
+        with tempfile.TemporaryDirectory() as directory:
+            session = CachedSession(directory)
+            url = 'https://query2.finance.yahoo.com/v10/finance/quoteSummary/AAPL'
+            path = session._cache_path(url, {'modules': 'financialData'})
+
+            os.makedirs(os.path.dirname(path))
+            with open(path, 'wb') as cache_file:
+                cache_file.write(b'{}')
+
+            self.assertEqual(session.get(url, params={'modules': 'financialData'}).json(), {})
+
+        self.assertEqual(self.hook.cache_hits, [('quoteSummary', 'AAPL')])
+
+
+class TestReaderMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.metrics = ReaderMetrics(buckets=(0.1, 1.0), prefix='test')
+
+        for symbol, seconds, error in [('AAA', 0.05, None), ('BBB', 0.5, None), ('CCC', 2.0, 'HTTP_ERROR')]:
+            record = ReadRecord('chart', symbol)
+            record.add_phase('request', seconds)
+            record.response_bytes = 100
+            record.error = error
+            self.metrics.on_read(record)
+
+        self.metrics.on_cache_hit('chart', 'AAA')
+
+    def test_snapshot(self):
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(snapshot['requests'], {'chart': 3})
+        self.assertEqual(snapshot['response_bytes'], {'chart': 300})
+        self.assertEqual(snapshot['cache_hits'], {'chart': 1})
+        self.assertEqual(snapshot['errors'], {('chart', 'HTTP_ERROR'): 1})
+        self.assertEqual(snapshot['latency'][('chart', 'request')], ([1, 1, 1], 2.55, 3))
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot()['requests'], {})
+
+    def test_to_prometheus(self):
+        lines = self.metrics.to_prometheus().splitlines()
+
+        self.assertIn('# TYPE test_requests_total counter', lines)
+        self.assertIn('test_requests_total{endpoint="chart"} 3', lines)
+        self.assertIn('test_errors_total{endpoint="chart",error="HTTP_ERROR"} 1', lines)
+        self.assertIn('test_phase_seconds_bucket{endpoint="chart",phase="request",le="0.1"} 1', lines)
+        self.assertIn('test_phase_seconds_bucket{endpoint="chart",phase="request",le="1.0"} 2', lines)
+        self.assertIn('test_phase_seconds_bucket{endpoint="chart",phase="request",le="+Inf"} 3', lines)
+        self.assertIn('test_phase_seconds_count{endpoint="chart",phase="total"} 3', lines)
+        self.assertNotIn('# EOF', lines)
+
+        self.assertEqual(self.metrics.to_prometheus(openmetrics=True).splitlines()[-1], '# EOF')
+
+    def test_labels_are_escaped(self):
+        self.assertEqual(ReaderMetrics._labels([('symbol', 'C"C\\')]), 'symbol="C\\"C\\\\"')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.risk.RiskEngine import RiskEngine
+
+
+class TestRiskEngine(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        index = pd.date_range('2020-01-01', periods=300, freq='B')
+        self.returns = pd.DataFrame(rng.normal(0.0005, 0.01, (300, 6)) * np.arange(1, 7), index=index,
+                                    columns=list('ABCDEF'))
+        self.positions = pd.DataFrame(rng.uniform(0, 1000, (4, 6)), index=['w', 'x', 'y', 'z'],
+                                      columns=list('ABCDEF'))
+
+    def test_historical_matches_sorted_losses(self):
+        engine = RiskEngine(self.returns, self.positions, window=200, confidence=0.95)
+        losses = -(self.returns.iloc[-200:].to_numpy() @ self.positions.to_numpy().T)
+        largest = np.sort(losses, axis=0)[-10:]
+
+        risk = engine.historical()
+
+        np.testing.assert_allclose(risk['var'], largest[0])
+        np.testing.assert_allclose(risk['cvar'], largest.mean(axis=0))
+
+    def test_incremental_updates_match_rebuild(self):
+        engine = RiskEngine(self.returns.iloc[:250], self.positions, window=200)
+
+        for _, row in self.returns.iloc[250:].iterrows():
+            engine.add_bar(row)
+
+        changed = self.positions.loc[['x']] * 2.0
+        engine.set_positions(changed)
+        positions = self.positions.copy()
+        positions.loc['x'] = changed.loc['x']
+        rebuilt = RiskEngine(self.returns, positions, window=200)
+
+        self.assertEqual(engine.date, self.returns.index[-1])
+        np.testing.assert_allclose(engine.historical(), rebuilt.historical())
+        np.testing.assert_allclose(engine.parametric(), rebuilt.parametric())
+
+    def test_components_sum_to_parametric_var(self):
+        engine = RiskEngine(self.returns, self.positions, window=200)
+
+        np.testing.assert_allclose(engine.component().sum(axis=1), engine.parametric()['var'])
+
+    def test_monte_carlo_tends_to_parametric(self):
+        engine = RiskEngine(self.returns, self.positions, window=200)
+
+        np.testing.assert_allclose(engine.monte_carlo(scenarios=200000, seed=0), engine.parametric(), rtol=0.03)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
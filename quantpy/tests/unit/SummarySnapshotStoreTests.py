@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.yahoo.YahooSummaryResponse import YahooSummaryResponse
+from quantpy.store.SummarySnapshotStore import SummarySnapshotStore
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def responses():
+    first, second = YahooSummaryResponse('AAA'), YahooSummaryResponse('BBB')
+
+    # BBB lacks the integer shares column and mixes a number into the rating column.
+    first.financial_data = pd.DataFrame({'current_price': [1.5], 'shares': np.array([10], dtype=np.int64),
+                                         'rating': ['buy']})
+    second.financial_data = pd.DataFrame({'current_price': [2.5], 'rating': [4], 'listed': [True]})
+
+    return {'AAA': first, 'BBB': second}
+
+
+class TestSummarySnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = SummarySnapshotStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def make_snapshot_dir(self, name):
+        os.makedirs(os.path.join(self.directory.name, name))
+
+        with open(os.path.join(self.directory.name, name, SummarySnapshotStore.MANIFEST_FILE), 'w') as manifest:
+            manifest.write('{}')
+
+    def test_snapshots_skip_interrupted_writes(self):
+        self.make_snapshot_dir('20240102T210000Z')
+        self.make_snapshot_dir('20240103T210000Z.tmp')
+        self.make_snapshot_dir('notes')
+
+        self.assertEqual(self.store.snapshots(), [pd.Timestamp('2024-01-02 21:00', tz='UTC')])
+        self.assertEqual(self.store.resolve('2024-01-04'), pd.Timestamp('2024-01-02 21:00', tz='UTC'))
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_load_restores_columns_and_dtypes(self):
+        written = responses()
+        as_of = self.store.write(written, as_of='2024-01-02 21:00')
+
+        loaded = self.store.load(as_of)
+
+        for symbol, response in written.items():
+            pd.testing.assert_frame_equal(loaded[symbol].financial_data, response.financial_data, check_dtype=False)
+            self.assertEqual([str(dtype) for dtype in loaded[symbol].financial_data.dtypes],
+                             [str(dtype) for dtype in response.financial_data.dtypes])
+
+        self.assertEqual(loaded['BBB'].financial_data.loc[0, 'rating'], 4)
+
+    @unittest.skipUnless(pyarrow, 'pyarrow is not installed')
+    def test_writes_within_a_second_are_kept_apart(self):
+        first = self.store.write(responses(), as_of='2024-01-02 21:00:00.100')
+        second = self.store.write(responses(), as_of='2024-01-02 21:00:00.200')
+
+        self.assertEqual(self.store.snapshots(), [first, second])
+        self.assertEqual(self.store.resolve('2024-01-02 21:00:00.150'), first)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
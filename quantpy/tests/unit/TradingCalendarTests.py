@@ -0,0 +1,71 @@
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from quantpy.calendars.TradingCalendar import TradingCalendar
+
+
+def unix(local_time):
+    return int(pd.Timestamp(local_time, tz='America/New_York').timestamp())
+
+
+class TestTradingCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = TradingCalendar.nyse()
+
+    def test_sessions(self):
+        self.assertEqual(self.calendar.session_count('2024-01-01', '2024-12-31'), 252)
+        self.assertEqual(list(self.calendar.is_session(['2024-07-04', '2024-07-05', '2024-03-29'])),
+                         [False, True, False])
+
+    def test_is_open(self):
+        # The day before Independence Day closes at 13:00.
+        times = [unix('2024-07-03 12:59'), unix('2024-07-03 13:00'), unix('2024-03-11 09:30'), unix('2024-03-08 09:29')]
+
+        self.assertEqual(list(self.calendar.is_open(times)), [True, False, True, False])
+
+    def test_session_offset(self):
+        moved = self.calendar.session_offset(['2024-07-03', '2024-07-06'], [1, -1])
+
+        self.assertEqual(list(moved), list(np.array(['2024-07-05', '2024-07-05'], dtype='datetime64[D]')))
+
+    def test_period_start(self):
+        end = unix('2024-07-08 12:00')
+
+        self.assertEqual(self.calendar.period_start(end, '5d'), unix('2024-07-01 09:30'))
+        self.assertEqual(self.calendar.period_start(end, '1mo'), unix('2024-06-08 12:00'))
+        self.assertEqual(self.calendar.period_start(end, 'ytd'), unix('2024-01-02 09:30'))
+
+    def test_missing_bars(self):
+        start, end = unix('2024-07-03 00:00'), unix('2024-07-05 23:59')
+        bars = self.calendar.bar_times(start, end, '1m')
+        missing = self.calendar.missing_bars(np.delete(bars, 5), '1m', start, end)
+
+        self.assertEqual(len(bars), 600)
+        self.assertEqual(list(missing), [bars[5]])
+
+    def test_independence_day_early_closes(self):
+        early = set(str(date) for date in self.calendar.early_closes)
+
+        # Before 2013 a Wednesday July 3 was a full session and the Friday after the holiday closed early.
+        self.assertTrue({'1996-07-05', '2002-07-05', '2007-07-03', '2008-07-03', '2012-07-03', '2013-07-03',
+                         '2019-07-03'} <= early)
+        self.assertFalse({'1991-07-03', '2002-07-03', '2013-07-05', '2009-07-03'} & early)
+
+        # The intraday bars end at the early close.
+        bars = self.calendar.bar_times(unix('2012-07-03 00:00'), unix('2012-07-03 23:59'), '1h')
+        self.assertEqual(len(bars), 4)
+
+    def test_early_closes_do_not_warn(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            TradingCalendar.nyse(start='2000-01-01', end='2000-12-31')
+
+        self.assertEqual([str(warning.message) for warning in caught], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import json
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from quantpy.data.base.ReadPipeline import RawResponse
+from quantpy.data.yahoo.YahooChartStreamParser import YahooChartStreamParser
+from quantpy.data.yahoo.YahooQuoteReader import YahooQuoteReader
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestYahooChartStreamParser(unittest.TestCase):
+
+    def setUp(self):
+        close = [150.25, None, 151.5, 149.75]
+
+        self.chart = {'chart': {'result': [{
+            'meta': {'symbol': 'AAPL', 'note': 'a "quoted" ] value'},
+            'timestamp': [1700000000, 1700086400, 1700172800, 1700259200],
+            'events': {'splits': {'1700086400': {'date': 1700086400, 'numerator': 4, 'denominator': 1,
+                                                 'splitRatio': '4:1'}}},
+            'indicators': {'quote': [{'open': close, 'high': close, 'low': close, 'close': close,
+                                      'volume': [100, 200, 300, 400]}],
+                           'adjclose': [{'adjclose': close}]}}], 'error': None}}
+        self.body = json.dumps(self.chart, indent=1).encode()
+
+    def test_chunk_boundaries(self):
+        # Every chunk size splits the numbers, strings and keys at different places.
+        for size in (1, 3, 7, 64, len(self.body)):
+            parser = YahooChartStreamParser.parse(chunked(self.body, size))
+            arrays = parser.arrays
+
+            self.assertTrue(parser.has_result)
+            self.assertEqual(arrays['date'].dtype, np.int64)
+            self.assertEqual(list(arrays['date']), self.chart['chart']['result'][0]['timestamp'])
+            np.testing.assert_array_equal(arrays['close'], [150.25, np.nan, 151.5, 149.75])
+            self.assertEqual(parser.objects['meta'], self.chart['chart']['result'][0]['meta'])
+            self.assertEqual(parser.objects['events'], self.chart['chart']['result'][0]['events'])
+
+    def test_matches_decoded_chart(self):
+        reader = YahooQuoteReader('AAPL', events=True)
+        stream_reader = YahooQuoteReader('AAPL', events=True, stream=True)
+
+        expected = reader._parse_response('AAPL', RawResponse('', 200, self.body))
+        streamed = stream_reader._parse_response('AAPL', RawResponse('', 200, self.body))
+
+        pd.testing.assert_frame_equal(streamed.quote, expected.quote)
+        pd.testing.assert_frame_equal(streamed.meta, expected.meta)
+        pd.testing.assert_frame_equal(streamed.splits, expected.splits)
+
+    def test_errors(self):
+        body = json.dumps({'chart': {'result': None, 'error': {'code': 'Not Found', 'description': 'No data'}}})
+        response = YahooQuoteReader('ZZZ', stream=True)._parse_response('ZZZ', RawResponse('', 200, body.encode()))
+
+        self.assertEqual(response.status.code.name, 'SYMBOL_NOT_FOUND')
+        self.assertEqual(response.status.message, 'No data')
+
+        with self.assertRaises(json.JSONDecodeError):
+            YahooChartStreamParser.parse(chunked(self.body[:-40], 16))
+
+
+if __name__ == '__main__':
+    unittest.main()
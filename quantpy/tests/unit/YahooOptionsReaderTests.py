@@ -0,0 +1,142 @@
+import unittest
+
+import numpy as np
+
+from quantpy.data.base.ReaderHook import ReaderHook
+from quantpy.data.base.ReaderMetrics import ReaderMetrics
+from quantpy.data.yahoo.YahooOptionsReader import YahooOptionsReader
+from quantpy.data.yahoo.YahooReadStatus import YahooStatusCode
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+
+# Three weekly expirations at midnight UTC, from 2024-06-21.
+EXPIRATIONS = [1718928000 + 7 * 86400 * week for week in range(3)]
+
+
+def contract(symbol, expiration, kind, strike, **fields):
+    values = {'contractSymbol': '{}{}{}{}'.format(symbol, expiration, kind[0].upper(), int(strike)), 'strike': strike,
+              'bid': strike / 100, 'ask': strike / 100 + 0.1, 'lastPrice': strike / 100, 'volume': 10,
+              'openInterest': 100, 'impliedVolatility': 0.25, 'inTheMoney': False, 'lastTradeDate': expiration - 86400,
+              'contractSize': 'REGULAR', 'currency': 'USD'}
+    values.update(fields)
+
+    return {key: value for key, value in values.items() if value is not None}
+
+
+def options_handler(url, params):
+    symbol = url.rsplit('/', 1)[-1]
+    expiration = params.get('date', EXPIRATIONS[0])
+
+    if symbol == 'GONE':
+        return FakeResponse({'finance': {'result': None, 'error': {'code': 'Not Found',
+                                                                   'description': 'No data found'}}}, 404)
+    if symbol == 'NONE':
+        return FakeResponse({'optionChain': {'result': [], 'error': None}})
+    if expiration == EXPIRATIONS[2] and symbol == 'BBB':
+        return FakeResponse(b'<html>Will be right back...</html>', 503)
+
+    # The put of the largest strike has no bid and no volume.
+    calls = [contract(symbol, expiration, 'call', strike) for strike in (110.0, 100.0)]
+    puts = [contract(symbol, expiration, 'put', strike, bid=None, volume=None) if strike == 110.0 else
+            contract(symbol, expiration, 'put', strike) for strike in (100.0, 110.0)]
+
+    return FakeResponse({'optionChain': {'result': [{
+        'underlyingSymbol': symbol, 'expirationDates': EXPIRATIONS, 'strikes': [100.0, 110.0],
+        'quote': {'symbol': symbol, 'regularMarketPrice': 105.0, 'trailingAnnualDividendYield': 0.01},
+        'options': [{'expirationDate': expiration, 'calls': calls, 'puts': puts}]}], 'error': None}})
+
+
+class TestYahooOptionsReader(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession(options_handler)
+
+    def read(self, symbols, **kwargs):
+        reader = YahooOptionsReader(symbols, session=self.session, max_connections=4, **kwargs)
+
+        return reader, reader.read()
+
+    def requested(self):
+        # The first page of a symbol is requested without a date.
+        return sorted((url.rsplit('/', 1)[-1], params.get('date', 0)) for url, params in self.session.requests)
+
+    def test_expirations_fan_out(self):
+        reader, chain = self.read(['AAA', 'BBB'])
+
+        # The first page of a symbol holds the nearest expiration, so only the later ones are requested again.
+        self.assertEqual(self.requested(), [('AAA', 0), ('AAA', EXPIRATIONS[1]), ('AAA', EXPIRATIONS[2]),
+                                            ('BBB', 0), ('BBB', EXPIRATIONS[1]), ('BBB', EXPIRATIONS[2])])
+
+        # Every contract of the read expirations is in the table, sorted by symbol, expiry, type and strike.
+        self.assertEqual(len(chain), 4 * 3 + 4 * 2)
+        self.assertEqual(list(chain.columns), YahooOptionsReader.CHAIN_COLUMNS)
+        self.assertEqual(chain[['symbol', 'expiry']].drop_duplicates().values.tolist(),
+                         [['AAA', expiration] for expiration in EXPIRATIONS] +
+                         [['BBB', expiration] for expiration in EXPIRATIONS[:2]])
+        self.assertEqual(chain['type'].iloc[:4].tolist(), ['call', 'call', 'put', 'put'])
+        self.assertEqual(chain['strike'].iloc[:4].tolist(), [100.0, 110.0, 100.0, 110.0])
+
+        # The failed expiration is reported with its date.
+        [status] = reader.statuses
+        self.assertEqual((status.symbol, status.module, status.http_status), ('BBB', str(EXPIRATIONS[2]), 503))
+
+    def test_missing_fields_are_null(self):
+        _, chain = self.read('AAA', max_expirations=1)
+        put = chain[(chain['type'] == 'put') & (chain['strike'] == 110.0)].iloc[0]
+
+        self.assertTrue(np.isnan(put['bid']) and np.isnan(put['volume']))
+        self.assertEqual(chain['volume'].dtype, np.float64)
+        self.assertEqual(chain['open_interest'].dtype, np.int64)
+
+    def test_selected_expirations(self):
+        _, chain = self.read('AAA', expirations=['2024-06-28', EXPIRATIONS[2], '2025-01-17'])
+
+        self.assertEqual(sorted(chain['expiry'].unique()), EXPIRATIONS[1:])
+        self.assertEqual(self.requested(), [('AAA', 0), ('AAA', EXPIRATIONS[1]), ('AAA', EXPIRATIONS[2])])
+
+        _, chain = self.read('AAA', max_expirations=2)
+        self.assertEqual(sorted(chain['expiry'].unique()), EXPIRATIONS[:2])
+
+    def test_unknown_symbols(self):
+        reader, chain = self.read(['AAA', 'NONE', 'GONE'], max_expirations=1)
+
+        self.assertEqual(chain['symbol'].unique().tolist(), ['AAA'])
+        self.assertEqual(sorted((status.symbol, status.code) for status in reader.statuses),
+                         [('GONE', YahooStatusCode.SYMBOL_NOT_FOUND), ('NONE', YahooStatusCode.SYMBOL_NOT_FOUND)])
+
+        # The symbols with no chain are not requested again.
+        self.assertEqual([symbol for symbol, _ in self.requested()], ['AAA', 'GONE', 'NONE'])
+        self.assertEqual(list(reader.underlyings.index), ['AAA'])
+        self.assertEqual(reader.underlyings.loc['AAA', 'regular_market_price'], 105.0)
+
+    def test_failed_pages_are_counted_as_errors(self):
+        metrics = ReaderMetrics()
+        ReaderHook.register(metrics)
+
+        try:
+            self.read(['AAA', 'BBB', 'GONE'])
+            self.session = FakeSession(lambda url, params: FakeResponse(b'Internal Server Error', 500))
+            reader, chain = self.read(['AAA', 'BBB'])
+        finally:
+            ReaderHook.unregister(metrics)
+
+        # The expiration of BBB that is down and the unknown symbol, then both first pages of the failing session.
+        snapshot = metrics.snapshot()
+        self.assertTrue(chain.empty)
+        self.assertEqual(snapshot['requests'], {'options': 9})
+        self.assertEqual(snapshot['errors'], {('options', 'SERVICE_DOWN'): 1, ('options', 'SYMBOL_NOT_FOUND'): 1,
+                                              ('options', 'HTTP_ERROR'): 2})
+
+    def test_empty_read(self):
+        reader, chain = self.read(['NONE'])
+
+        self.assertTrue(chain.empty)
+        self.assertEqual(list(chain.columns), YahooOptionsReader.CHAIN_COLUMNS)
+        self.assertTrue(reader.underlyings.empty)
+
+    def test_max_expirations(self):
+        with self.assertRaises(ValueError):
+            self.read('AAA', max_expirations=0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
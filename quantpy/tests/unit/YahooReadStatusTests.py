@@ -0,0 +1,150 @@
+import json
+import unittest
+import warnings
+from unittest import mock
+
+import requests
+
+from quantpy.data.base.BaseReader import BaseReader
+from quantpy.data.yahoo.YahooExceptions import YahooModuleNotFoundError
+from quantpy.data.yahoo.YahooReadStatus import YahooReadStatus, YahooStatusCode
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+
+
+def value(raw):
+    return {'raw': raw, 'fmt': str(raw)}
+
+
+MODULES = {
+    'assetProfile': {'industry': 'Software', 'fullTimeEmployees': 100,
+                     'companyOfficers': [{'name': 'A', 'age': 50}, {'name': 'B', 'age': 60}]},
+    'earnings': {'earningsChart': {'quarterly': [{'date': '1Q2024', 'actual': value(1.0), 'estimate': value(0.9)}],
+                                   'currentQuarterEstimate': value(1.1), 'earningsDate': [value(1700000000)]},
+                 'financialsChart': {'yearly': [{'date': 2023, 'revenue': value(1000)}],
+                                     'quarterly': [{'date': '4Q2023', 'revenue': value(250)}]}},
+    'indexTrend': {'symbol': 'SP5', 'peRatio': value(20.0), 'estimates': [{'period': '0q', 'growth': value(0.1)}]},
+    'calendarEvents': {'earnings': {'earningsDate': [value(1700000000)], 'earningsAverage': value(1.2)},
+                       'exDividendDate': value(1690000000), 'dividendDate': value(1691000000)},
+    'financialData': {'currentPrice': value(150.0)},
+}
+
+
+def summary_handler(url, params):
+    symbol = url.rsplit('/', 1)[-1]
+
+    if symbol == 'GONE':
+        return FakeResponse({'quoteSummary': {'result': None, 'error': {
+            'code': 'Not Found', 'description': 'Quote not found for ticker symbol: GONE'}}}, 404)
+    if symbol == 'BUSY':
+        return FakeResponse(b'Too Many Requests', 429)
+    if symbol == 'DOWN':
+        return FakeResponse(b'<html>Will be right back...</html>', 503)
+
+    return FakeResponse({'quoteSummary': {'result': [MODULES], 'error': None}})
+
+
+class TestYahooReadStatus(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = YahooSummaryReader('AAPL', include_asset_profile=True, include_earnings=True,
+                                         include_index_trend=True, include_calendar_events=True,
+                                         include_financial_data=True, include_default_key_statistics=True)
+        self.session = FakeSession(summary_handler)
+
+    def read(self, symbols):
+        return {symbol: self.reader.single_read(symbol, self.session) for symbol in symbols}
+
+    def test_default_retryable(self):
+        self.assertTrue(YahooReadStatus(YahooStatusCode.REQUEST_FAILED).retryable)
+        self.assertTrue(YahooReadStatus(YahooStatusCode.HTTP_ERROR, http_status=503).retryable)
+        self.assertTrue(YahooReadStatus(YahooStatusCode.HTTP_ERROR, http_status=429).retryable)
+        self.assertFalse(YahooReadStatus(YahooStatusCode.SYMBOL_NOT_FOUND, http_status=404).retryable)
+        self.assertFalse(YahooReadStatus(YahooStatusCode.MODULE_NOT_FOUND).retryable)
+
+    def test_submodules_parse_independently(self):
+        response = self.read(['AAPL'])['AAPL']
+
+        self.assertTrue(response.status.ok)
+        self.assertEqual(list(response.company_officers['name']), ['A', 'B'])
+        self.assertNotIn('company_officers', response.profile.columns)
+        self.assertEqual(len(response.earnings_estimates_quarterly), 1)
+        self.assertNotIn('quarterly', response.earnings_estimates.columns)
+        self.assertEqual(list(response.financials_yearly['revenue']), [1000])
+        self.assertEqual(list(response.index_trend_estimate['period']), ['0q'])
+        self.assertEqual(response.calendar_events_earnings.loc[0, 'earnings_date'], 1700000000)
+        self.assertEqual(response.calendar_events_dividends.loc[0, 'ex_dividend_date'], 1690000000)
+
+        # The canned modules are left as they were.
+        self.assertIn('companyOfficers', MODULES['assetProfile'])
+        self.assertIn('quarterly', MODULES['earnings']['earningsChart'])
+
+    def test_missing_module_status(self):
+        response = self.read(['AAPL'])['AAPL']
+
+        with self.assertRaises(YahooModuleNotFoundError):
+            response.default_key_statistics
+
+        report = BaseReader.status_report(response)
+
+        self.assertEqual(report[['symbol', 'module', 'code']].values.tolist(),
+                         [['AAPL', 'defaultKeyStatistics', 'MODULE_NOT_FOUND']])
+
+    def test_failed_reads(self):
+        responses = self.read(['AAPL', 'GONE', 'BUSY', 'DOWN'])
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            self.assertIsNone(responses['GONE'].financial_data)
+
+        self.assertEqual(responses['GONE'].status.code, YahooStatusCode.SYMBOL_NOT_FOUND)
+        self.assertEqual(responses['GONE'].status.message, 'Quote not found for ticker symbol: GONE')
+        self.assertEqual(responses['BUSY'].status.code, YahooStatusCode.HTTP_ERROR)
+        self.assertEqual(responses['DOWN'].status.code, YahooStatusCode.SERVICE_DOWN)
+
+        report = BaseReader.status_report(responses).set_index(['symbol', 'module'])
+
+        self.assertEqual(report.loc[('GONE', None), 'http_status'], 404)
+        self.assertEqual(report.loc[('BUSY', None), 'code'], 'HTTP_ERROR')
+        self.assertEqual(report.loc[('AAPL', 'defaultKeyStatistics'), 'code'], 'MODULE_NOT_FOUND')
+        self.assertEqual(BaseReader.retryable_symbols(responses), ['BUSY', 'DOWN'])
+
+    def test_request_exception_is_retryable(self):
+        def raising_handler(url, params):
+            raise ConnectionError('connection reset')
+
+        response = self.reader.single_read('AAPL', FakeSession(raising_handler))
+
+        self.assertEqual(response.status.code, YahooStatusCode.REQUEST_FAILED)
+        self.assertEqual(BaseReader.retryable_symbols({'AAPL': response}), ['AAPL'])
+
+    def test_from_exception(self):
+        # Only the errors of the network are worth another request.
+        cases = [(requests.ConnectionError('connection reset'), YahooStatusCode.REQUEST_FAILED, True),
+                 (requests.Timeout('read timed out'), YahooStatusCode.REQUEST_FAILED, True),
+                 (requests.exceptions.InvalidURL('no host'), YahooStatusCode.REQUEST_FAILED, False),
+                 (requests.exceptions.MissingSchema('no scheme'), YahooStatusCode.REQUEST_FAILED, False),
+                 (json.JSONDecodeError('Expecting value', '<html>', 0), YahooStatusCode.DECODE_ERROR, False),
+                 (requests.JSONDecodeError('Expecting value', '<html>', 0), YahooStatusCode.DECODE_ERROR, False),
+                 (KeyError('result'), YahooStatusCode.PARSE_ERROR, False),
+                 (TypeError('NoneType is not subscriptable'), YahooStatusCode.PARSE_ERROR, False),
+                 (ValueError('Length mismatch'), YahooStatusCode.PARSE_ERROR, False)]
+
+        for exception, code, retryable in cases:
+            status = YahooReadStatus.from_exception('AAPL', exception)
+
+            self.assertEqual((status.code, status.retryable), (code, retryable), type(exception).__name__)
+            self.assertTrue(status.message.startswith(type(exception).__name__))
+
+    def test_parser_errors_are_not_retried(self):
+        session = FakeSession(lambda url, params: FakeResponse({'quoteSummary': {'result': [[]], 'error': None}}))
+
+        with mock.patch.object(YahooSummaryReader, '_parse_response', side_effect=KeyError('financialData')):
+            response = self.reader.single_read('AAPL', session)
+
+        self.assertEqual(response.status.code, YahooStatusCode.PARSE_ERROR)
+        self.assertEqual(BaseReader.retryable_symbols({'AAPL': response}), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,110 @@
+import unittest
+import urllib.parse
+from unittest import mock
+
+import requests
+
+from quantpy.data.base.ReaderHook import ReaderHook
+from quantpy.data.base.ReaderMetrics import ReaderMetrics
+from quantpy.data.yahoo.YahooReadStatus import YahooStatusCode
+from quantpy.data.yahoo.YahooSnapshotReader import YahooSnapshotReader
+from quantpy.tests.unit.FakeSession import FakeResponse, FakeSession
+
+
+def requested_symbols(url):
+    return urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)['symbols'][0].split(',')
+
+
+def quote_handler(url, params):
+    # Only the listed symbols exist.
+    results = [{'symbol': symbol, 'regularMarketPrice': 100.0 + index}
+               for index, symbol in enumerate(requested_symbols(url)) if symbol in ('M&M.NS', '^GSPC', 'AAPL')]
+
+    return FakeResponse({'quoteResponse': {'result': results, 'error': None}})
+
+
+class TestYahooSnapshotReader(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession(quote_handler)
+
+    def test_symbols_are_encoded(self):
+        reader = YahooSnapshotReader(['M&M.NS', '^GSPC', 'A+B'], fields=['regularMarketPrice'])
+        url = requests.Request('GET', reader._symbol_url('M&M.NS,^GSPC,A+B'), params=reader._params).prepare().url
+
+        self.assertIn('symbols=M%26M.NS,%5EGSPC,A%2BB&fields=', url)
+        self.assertEqual(requested_symbols(url), ['M&M.NS', '^GSPC', 'A+B'])
+
+    def test_read(self):
+        reader = YahooSnapshotReader(['AAPL', 'M&M.NS', 'NONE', 'AAPL'])
+
+        with mock.patch('quantpy.data.base.BaseReader.requests.get', self.session.get):
+            snapshot = reader.read()
+
+        self.assertEqual(list(snapshot.index), ['AAPL', 'M&M.NS'])
+        self.assertEqual(list(snapshot['regular_market_price']), [100.0, 101.0])
+        self.assertEqual([(status.symbol, status.code) for status in reader.statuses],
+                         [('NONE', YahooStatusCode.SYMBOL_NOT_FOUND)])
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_failed_request_fails_its_symbols(self):
+        reader = YahooSnapshotReader(['AAPL', 'M&M.NS'])
+        session = FakeSession(lambda url, params: FakeResponse(b'Too Many Requests', 429))
+
+        with mock.patch('quantpy.data.base.BaseReader.requests.get', session.get):
+            snapshot = reader.read()
+
+        self.assertTrue(snapshot.empty)
+        self.assertEqual([(status.symbol, status.http_status) for status in reader.statuses],
+                         [('AAPL', 429), ('M&M.NS', 429)])
+
+    def test_failed_chunks_are_counted_as_errors(self):
+        reader = YahooSnapshotReader(['AAPL', 'M&M.NS'])
+        session = FakeSession(lambda url, params: FakeResponse(b'Internal Server Error', 500))
+        metrics = ReaderMetrics()
+        ReaderHook.register(metrics)
+
+        try:
+            with mock.patch('quantpy.data.base.BaseReader.requests.get', session.get):
+                reader.read()
+        finally:
+            ReaderHook.unregister(metrics)
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['requests'], {'quote': 1})
+        self.assertEqual(snapshot['errors'], {('quote', 'HTTP_ERROR'): 1})
+
+    def test_status_report_of_a_chunk(self):
+        reader = YahooSnapshotReader(['AAPL', 'M&M.NS'])
+        session = FakeSession(lambda url, params: FakeResponse(b'Too Many Requests', 429))
+        chunk = reader.single_read('AAPL,M&M.NS', session)
+
+        self.assertEqual(YahooSnapshotReader.status_report(chunk)['http_status'].tolist(), [429])
+        self.assertEqual(YahooSnapshotReader.retryable_symbols({'AAPL,M&M.NS': chunk}), ['AAPL,M&M.NS'])
+        self.assertTrue(YahooSnapshotReader.status_report(reader.single_read('AAPL', self.session)).empty)
+
+    def test_chunks_fit_the_url_length(self):
+        symbols = ['M&M{}.NS'.format(index) for index in range(300)] + ['^IDX{}'.format(index) for index in range(300)]
+        reader = YahooSnapshotReader(symbols, fields=['regularMarketPrice', 'bid', 'ask'], max_symbols=200,
+                                     max_url_length=500)
+        reader._check_init_args()
+
+        chunks = reader._chunk_symbols()
+
+        self.assertEqual([symbol for chunk in chunks for symbol in chunk.split(',')], symbols)
+
+        for chunk in chunks:
+            url = requests.Request('GET', reader._symbol_url(chunk), params=reader._params).prepare().url
+
+            self.assertLessEqual(len(url), 500)
+            self.assertEqual(requested_symbols(url), chunk.split(','))
+
+    def test_chunks_hold_at_most_max_symbols(self):
+        reader = YahooSnapshotReader(['S{}'.format(index) for index in range(450)], max_symbols=200)
+        reader._check_init_args()
+
+        self.assertEqual([len(chunk.split(',')) for chunk in reader._chunk_symbols()], [200, 200, 50])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
@@ -0,0 +1,75 @@
+import tracemalloc
+import unittest
+from unittest import mock
+
+from quantpy.data.yahoo.YahooSummaryReader import YahooSummaryReader
+from quantpy.tests.unit.FakeSession import FakeSession
+from quantpy.tests.unit.YahooReadStatusTests import summary_handler
+
+
+class TestYahooSummaryProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession(summary_handler)
+
+    def reader(self, profile=True):
+        return YahooSummaryReader('AAPL', include_asset_profile=True, include_earnings=True,
+                                  include_calendar_events=True, include_financial_data=True, profile=profile)
+
+    def test_parse_costs(self):
+        response = self.reader().single_read('AAPL', self.session)
+        costs = response.parse_costs.set_index('module')
+
+        self.assertEqual(list(costs.index), ['json_decode', 'profile', 'company_officers', 'earnings_estimates',
+                                             'earnings_estimates_quarterly', 'financials_yearly',
+                                             'financials_quarterly', 'financial_data', 'calendar_events_earnings',
+                                             'calendar_events_dividends'])
+        self.assertTrue((costs['seconds'] >= 0).all())
+        self.assertTrue((costs['allocated_bytes'].drop('json_decode') > 0).all())
+
+        # The allocation pass parses into a scratch response, so the timed response keeps its own parse.
+        self.assertEqual(list(response.company_officers['name']), ['A', 'B'])
+
+    def test_tracing_is_off_after_the_parse(self):
+        self.reader().single_read('AAPL', self.session)
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_caller_tracing_is_left_on(self):
+        tracemalloc.start()
+
+        try:
+            response = self.reader().single_read('AAPL', self.session)
+
+            self.assertTrue(tracemalloc.is_tracing())
+            self.assertTrue((response.parse_costs['allocated_bytes'].iloc[1:] > 0).all())
+        finally:
+            tracemalloc.stop()
+
+    def test_no_costs_without_profile(self):
+        reader = self.reader(profile=False)
+
+        self.assertIsNone(reader.single_read('AAPL', self.session).parse_costs)
+
+        with self.assertRaises(ValueError):
+            reader.profile_summary()
+
+    def test_profile_report_and_summary(self):
+        reader = self.reader()
+
+        with mock.patch('quantpy.data.base.BaseReader.requests.get', self.session.get):
+            reader.read()
+
+        report = reader.profile_report
+
+        self.assertEqual(list(report.columns), ['symbol', 'module', 'seconds', 'allocated_bytes'])
+        self.assertEqual(set(report['symbol']), {'AAPL'})
+
+        summary = reader.profile_summary()
+
+        self.assertEqual(len(summary), len(report))
+        self.assertTrue(summary['total_seconds'].is_monotonic_decreasing)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=0)
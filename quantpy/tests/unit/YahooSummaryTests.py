@@ -14,7 +14,7 @@ class TestAllRequested(unittest.TestCase):
         dont_check_properties = [prop for prop in dir(self.summary_all)
                                  if prop.startswith("__") or prop.startswith("_")]
 
-        dont_check_properties += ['symbol', 'exception']
+        dont_check_properties += ['symbol', 'exception', 'status']
 
         for prop in dir(self.summary_all):
             if prop not in dont_check_properties:
@@ -49,7 +49,7 @@ class TestIndividualRequests(unittest.TestCase):
         temp_summary = YahooSummaryReader(self.symbol, include_all=True).read()
         self.dont_check_properties = [prop for prop in dir(temp_summary)
                                       if prop.startswith("__") or prop.startswith("_")]
-        self.dont_check_properties += ['symbol', 'exception', 'SummaryObject']
+        self.dont_check_properties += ['symbol', 'exception', 'status', 'SummaryObject']
 
     def check_none_values(self, summary, extra_dont_check_properties):
         all_dont_check_properties = self.dont_check_properties + extra_dont_check_properties
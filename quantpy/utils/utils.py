@@ -1,4 +1,7 @@
-from collections import MutableMapping
+from collections.abc import MutableMapping
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 
 
 def flatten(d, parent_key='', sep='.'):
@@ -10,3 +13,20 @@ def flatten(d, parent_key='', sep='.'):
         else:
             items.append((new_key, v))
     return dict(items)
+
+
+def unix_seconds(values):
+    """
+    Function to get the unix seconds of a date column, whether it holds unix seconds or the UTC datetimes of a compacted
+    dataframe. The datetimes are converted by their unit, which is seconds or nanoseconds depending on the pandas
+    version that built them.
+    :param values: The dates.
+    :type values: pd.Series
+    :return: The unix seconds.
+    :rtype: np.ndarray
+    """
+
+    if is_datetime64_any_dtype(values):
+        return pd.DatetimeIndex(values).as_unit('s').asi8
+
+    return np.asarray(values, dtype=np.int64)